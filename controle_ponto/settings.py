@@ -56,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ponto.middleware.JanelaEscritaMiddleware',
 ]
 
 ROOT_URLCONF = 'controle_ponto.urls'
@@ -82,7 +83,8 @@ WSGI_APPLICATION = 'controle_ponto.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-from decouple import config
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 import os
 
 # Segurança
@@ -101,6 +103,112 @@ DATABASES = {
     }
 }
 
+# Perfil de conexões com o banco (DB_PERFIL):
+# - simples: uma conexão nova por requisição (padrão);
+# - persistente: cada processo/thread reaproveita a sua conexão por DB_CONN_MAX_AGE segundos,
+#   verificando-a antes de reutilizar (CONN_HEALTH_CHECKS);
+# - pool: pool de conexões por processo, de DB_POOL_MIN a DB_POOL_MAX conexões, esperando até
+#   DB_POOL_TIMEOUT segundos por uma livre (apenas PostgreSQL com psycopg 3 e psycopg_pool).
+# Compare os perfis com `manage.py benchmark_conexoes`.
+DB_PERFIL = config('DB_PERFIL', default='simples')
+if DB_PERFIL == 'persistente':
+    DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_PERFIL == 'pool':
+    if DATABASES['default']['ENGINE'] != 'django.db.backends.postgresql':
+        raise ImproperlyConfigured("DB_PERFIL=pool exige DB_ENGINE=django.db.backends.postgresql.")
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        },
+    }
+elif DB_PERFIL != 'simples':
+    raise ImproperlyConfigured(f"DB_PERFIL inválido: {DB_PERFIL!r} (use simples, persistente ou pool).")
+
+# Réplicas de leitura (opcional): hosts (host ou host:porta) separados por vírgula, com o mesmo banco,
+# usuário e senha do principal; no SQLite, caminhos de arquivos. Listagens, relatórios e leituras da
+# API vão para uma réplica, exceto por PONTO_REPLICAS_JANELA segundos após uma escrita do próprio
+# usuário (o atraso máximo esperado da replicação).
+PONTO_REPLICAS = []
+for indice, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    alias = f'replica_{indice}'
+    if 'sqlite' in DATABASES['default']['ENGINE']:
+        DATABASES[alias] = {**DATABASES['default'], 'NAME': replica}
+    else:
+        host, _, porta = replica.partition(':')
+        DATABASES[alias] = {**DATABASES['default'], 'HOST': host, 'PORT': porta or DATABASES['default']['PORT']}
+    # Nos testes, a réplica é o próprio banco de teste do principal
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    PONTO_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['ponto.routers.RoteadorReplicas']
+PONTO_REPLICAS_JANELA = config('PONTO_REPLICAS_JANELA', default=5, cast=int)
+
+
+# Relatórios
+# Tamanho do lote lido pelo cursor no servidor e quantas páginas são enviadas por vez no modo streaming
+RELATORIO_CHUNK_SIZE = config('RELATORIO_CHUNK_SIZE', default=2000, cast=int)
+RELATORIO_PAGINAS_POR_BLOCO = config('RELATORIO_PAGINAS_POR_BLOCO', default=10, cast=int)
+# Segundos até um job "processando" ser considerado abandonado e voltar para a fila
+RELATORIO_JOB_TIMEOUT = config('RELATORIO_JOB_TIMEOUT', default=600, cast=int)
+# Dias que os jobs concluídos (e os PDFs gerados) são mantidos antes de serem apagados pelo worker (0 = sempre)
+RELATORIO_JOB_RETENCAO_DIAS = config('RELATORIO_JOB_RETENCAO_DIAS', default=7, cast=int)
+# Processos que geram os relatórios do pacote de uma empresa (leitura, cálculo e PDF), compartilhados entre as
+# requisições de cada processo do servidor (0 = um por CPU, até 4)
+RELATORIO_PACOTE_WORKERS = config('RELATORIO_PACOTE_WORKERS', default=0, cast=int)
+# Threads que desenham os PDFs das views assíncronas (ASGI); os demais relatórios esperam a vez
+RELATORIO_ASYNC_WORKERS = config('RELATORIO_ASYNC_WORKERS', default=2, cast=int)
+
+# Cache dos relatórios gerados. BACKEND pode ser MemoriaBackend, ArquivoBackend (LOCATION = diretório)
+# ou DjangoCacheBackend (LOCATION = alias em CACHES). A versão dos dados fica no cache "default",
+# que deve ser compartilhado entre os processos (Redis/Memcached) quando houver mais de um worker.
+RELATORIO_CACHE = {
+    'BACKEND': config('RELATORIO_CACHE_BACKEND', default='ponto.utils.cache.MemoriaBackend'),
+    'LOCATION': config('RELATORIO_CACHE_LOCATION', default=''),
+    'MAX_BYTES': config('RELATORIO_CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+}
+
+# Listagem de pontos: registros por página (o parâmetro ?por_pagina= aceita até o máximo)
+PONTO_LISTA_POR_PAGINA = config('PONTO_LISTA_POR_PAGINA', default=50, cast=int)
+PONTO_LISTA_MAXIMO_POR_PAGINA = config('PONTO_LISTA_MAXIMO_POR_PAGINA', default=500, cast=int)
+
+# Ingestão de pontos em lote (relógios de ponto e aplicativo): itens por requisição e por INSERT
+PONTO_INGESTAO_MAXIMO_ITENS = config('PONTO_INGESTAO_MAXIMO_ITENS', default=10000, cast=int)
+PONTO_INGESTAO_LOTE = config('PONTO_INGESTAO_LOTE', default=1000, cast=int)
+
+# Marcação de ponto em um toque: segundos mínimos entre a entrada e a saída (evita toques duplos)
+PONTO_BATER_INTERVALO_MINIMO = config('PONTO_BATER_INTERVALO_MINIMO', default=60, cast=int)
+
+# Painel de presença da página inicial: segundos até um recálculo completo da presença em cache
+# (corrige divergências das atualizações incrementais) e nomes exibidos por grupo
+PONTO_PRESENCA_RECALCULO = config('PONTO_PRESENCA_RECALCULO', default=600, cast=int)
+PONTO_PRESENCA_NOMES = config('PONTO_PRESENCA_NOMES', default=10, cast=int)
+
+# Fragmentos das linhas das listagens em cache: segundos até o descarte. As chaves incluem as datas
+# de alteração, então um fragmento nunca fica desatualizado; a validade só limita a memória usada
+PONTO_FRAGMENTOS_VALIDADE = config('PONTO_FRAGMENTOS_VALIDADE', default=3600, cast=int)
+
+# API REST (/api/v1/): registros por página (?por_pagina= aceita até o máximo) e versões aceitas na URL
+PONTO_API_POR_PAGINA = config('PONTO_API_POR_PAGINA', default=100, cast=int)
+PONTO_API_MAXIMO_POR_PAGINA = config('PONTO_API_MAXIMO_POR_PAGINA', default=1000, cast=int)
+REST_FRAMEWORK = {
+    'ALLOWED_VERSIONS': ['v1'],
+}
+
+# Particionamento mensal da tabela de pontos no PostgreSQL (opcional, ver `manage.py particoes_ponto`):
+# meses futuros com partição criada de antemão e meses mantidos antes de desanexar (0 = nunca desanexa)
+PONTO_PARTICOES_MESES_FUTUROS = config('PONTO_PARTICOES_MESES_FUTUROS', default=3, cast=int)
+PONTO_PARTICOES_RETER_MESES = config('PONTO_PARTICOES_RETER_MESES', default=0, cast=int)
+PONTO_PARTICOES_ESQUEMA_ARQUIVO = config('PONTO_PARTICOES_ESQUEMA_ARQUIVO', default='')
+
+# Busca de funcionários e empresas nos campos de seleção: resultados por busca e segundos em cache
+AUTOCOMPLETE_LIMITE = config('AUTOCOMPLETE_LIMITE', default=20, cast=int)
+AUTOCOMPLETE_CACHE_TTL = config('AUTOCOMPLETE_CACHE_TTL', default=30, cast=int)
+
+# Arquivos gerados (relatórios em segundo plano)
+MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
 
 
 # Password validation
@@ -1,12 +1,14 @@
 from django.contrib import admin
-from django.urls import path, include
-from django.shortcuts import render
+from django.urls import path, re_path, include
+from ponto.views.painel_views import home
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('ponto.urls.auth')),
-    path('', lambda request: render(request, 'home.html'), name='home'),
+    path('', home, name='home'),
     path('empresas/', include('ponto.urls.empresas')),  # Criamos um novo arquivo de URLs por entidade
     path('funcionarios/', include('ponto.urls.funcionarios')),
     path('pontos/', include('ponto.urls.pontos')),
+    path('relatorios/', include('ponto.urls.relatorios')),
+    re_path(r'^api/(?P<version>v1)/', include('ponto.urls.api')),
 ]
@@ -1,3 +1,8 @@
 from django.contrib import admin
+from ponto.models import Jornada
 
 # Register your models here.
+@admin.register(Jornada)
+class JornadaAdmin(admin.ModelAdmin):
+    list_display = ('nome', 'empresa', 'inicio', 'fim', 'intervalo_minutos', 'dias_semana', 'tolerancia_minutos', 'padrao')
+    list_filter = ('empresa', 'padrao')
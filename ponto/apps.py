@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class PontoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ponto'
+
+    def ready(self):
+        # Registra os sinais que invalidam o cache de relatórios
+        from ponto import signals  # noqa: F401
@@ -0,0 +1,21 @@
+from ponto.benchmarks.carga import executar_carga
+from ponto.benchmarks.conexoes import executar_requisicoes
+from ponto.benchmarks.dados import semear
+from ponto.benchmarks.servidores import comparar_servidores
+from ponto.benchmarks.suite import (
+    CENARIOS,
+    medir,
+    executar_benchmarks,
+    comparar_resultados,
+)
+
+__all__ = [
+    'CENARIOS',
+    'semear',
+    'medir',
+    'executar_benchmarks',
+    'comparar_resultados',
+    'executar_carga',
+    'executar_requisicoes',
+    'comparar_servidores',
+]
@@ -0,0 +1,133 @@
+import queue
+import statistics
+import threading
+import time
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.timezone import localdate
+from ponto.models import Empresa, Funcionario, Ponto, ResumoDiario, ResumoMensal
+from ponto.utils.resumos import METRICAS, reconstruir_resumos
+
+def _percentil(tempos, percentual):
+    ordenados = sorted(tempos)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * percentual / 100))]
+
+def _disparar(usuarios, concorrencia):
+    """
+    Envia uma marcação por usuário de `usuarios`, com `concorrencia` threads ao mesmo tempo.
+
+    Cada thread usa a própria conexão com o banco, aberta uma vez e fechada ao final, como um
+    processo do servidor. As threads começam juntas, como no horário de entrada de uma empresa.
+
+    Retorna:
+    list[tuple[int, int, float]]: (id do usuário, status HTTP, latência em ms) de cada marcação.
+    """
+    fila = queue.SimpleQueue()
+    for usuario in usuarios:
+        fila.put(usuario)
+    resultados, inicio = [], threading.Barrier(concorrencia)
+    url = reverse('ponto-bater')
+
+    def trabalhar():
+        client = Client()
+        try:
+            inicio.wait()
+            while True:
+                try:
+                    usuario = fila.get_nowait()
+                except queue.Empty:
+                    return
+                # O login (com a sessão gravada no banco) fica fora da medição
+                client.force_login(usuario)
+                comeco = time.perf_counter()
+                try:
+                    codigo = client.post(url).status_code
+                except Exception:
+                    # O cliente de teste propaga as exceções da view, que o servidor responderia com 500
+                    codigo = 500
+                resultados.append((usuario.pk, codigo, (time.perf_counter() - comeco) * 1000))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=trabalhar) for _ in range(concorrencia)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+def _resumo_rodada(resultados, esperados):
+    tempos = [latencia for _, _, latencia in resultados]
+    codigos = {}
+    for _, codigo, _ in resultados:
+        codigos[codigo] = codigos.get(codigo, 0) + 1
+    return {
+        'marcacoes': len(resultados),
+        'status': codigos,
+        'correta': codigos == esperados,
+        'latencia_ms': {
+            'p50': round(statistics.median(tempos), 2),
+            'p99': round(_percentil(tempos, 99), 2),
+            'max': round(max(tempos), 2),
+        },
+    }
+
+def executar_carga(funcionarios=2000, concorrencia=100, progresso=None):
+    """
+    Teste de carga de `POST /pontos/bater/`: muitos funcionários de uma empresa marcando juntos.
+
+    Cria a empresa e os funcionários no banco atual (use um banco descartável) e executa três
+    rodadas, todas com `concorrencia` requisições simultâneas:
+
+    - entrada: cada funcionário toca duas vezes ao mesmo tempo; uma marcação deve registrar a
+      entrada (201) e a outra ser recusada como toque duplo (409);
+    - saida: cada funcionário marca uma vez, sem intervalo mínimo, e registra a saída (200);
+    - completo: novas marcações são todas recusadas (409).
+
+    Ao final, confere se cada funcionário tem um único ponto no dia com entrada e saída e se os
+    resumos, atualizados a cada marcação, são iguais aos de uma reconstrução completa.
+
+    Retorna:
+    dict: Por rodada, as contagens de status, se estão corretas e a latência (p50, p99, máximo)
+        em ms; e `consistente`, o resultado da conferência final.
+    """
+    progresso = progresso or (lambda mensagem: None)
+    empresa = Empresa.objects.create(nome="Empresa Carga", endereco="Rua Carga, 100", telefone="(11) 0000-0000")
+    # Senhas inutilizáveis: as requisições são autenticadas com force_login
+    usuarios = User.objects.bulk_create([
+        User(username=f"carga_{indice}", password="!") for indice in range(funcionarios)
+    ])
+    Funcionario.objects.bulk_create([Funcionario(user=usuario, empresa=empresa) for usuario in usuarios])
+
+    rodadas = {}
+    total = len(usuarios)
+    for nome, lista, esperados, intervalo_minimo in (
+        ('entrada', usuarios * 2, {201: total, 409: total}, None),
+        ('saida', usuarios, {200: total}, 0),
+        ('completo', usuarios, {409: total}, None),
+    ):
+        configuracao = {} if intervalo_minimo is None else {'PONTO_BATER_INTERVALO_MINIMO': intervalo_minimo}
+        with override_settings(**configuracao):
+            rodadas[nome] = _resumo_rodada(_disparar(lista, concorrencia), esperados)
+        progresso(f'{nome}: {rodadas[nome]["status"]} p99 {rodadas[nome]["latencia_ms"]["p99"]} ms')
+
+    hoje = localdate()
+    pontos = Ponto.objects.filter(funcionario__empresa=empresa, data=hoje)
+    completos = pontos.filter(entrada__isnull=False, saida__isnull=False).count()
+
+    def resumos():
+        return [
+            set(modelo.objects.filter(empresa=empresa).values_list('funcionario_id', campo, *METRICAS))
+            for modelo, campo in ((ResumoDiario, 'data'), (ResumoMensal, 'mes'))
+        ]
+
+    incrementais = resumos()
+    reconstruir_resumos()
+    return {
+        'funcionarios': total,
+        'concorrencia': concorrencia,
+        'rodadas': rodadas,
+        'consistente': pontos.count() == completos == total and incrementais == resumos(),
+    }
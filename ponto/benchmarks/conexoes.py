@@ -0,0 +1,123 @@
+import queue
+import statistics
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from ponto.benchmarks.carga import _percentil
+
+USUARIO_BENCHMARK = 'benchmark_conexoes'
+
+def _conexoes_no_banco():
+    """
+    Conexões abertas no banco atual por outros processos/threads (apenas PostgreSQL).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()"
+        )
+        return cursor.fetchone()[0]
+
+def executar_requisicoes(url, requisicoes=2000, concorrencia=8):
+    """
+    Mede a vazão de GETs autenticados em `url` com o perfil de conexões atual (`DB_PERFIL`).
+
+    Cada uma das `concorrencia` threads é como uma thread de um servidor: usa o próprio cliente,
+    logado com um usuário temporário, e a própria conexão com o banco, que abre, reaproveita ou
+    devolve ao pool conforme o perfil ao fim de cada requisição. Use o banco real (por exemplo o
+    `ponto_database` do docker-compose), já semeado, para medir o custo real das conexões.
+
+    As conexões abertas são contadas pelo Django (sinal `connection_created`) nos perfis sem pool;
+    com pool, o sinal marca cada empréstimo, e as conexões abertas vêm das estatísticas do pool. No
+    PostgreSQL, também é registrado o pico de conexões no banco durante a rodada.
+
+    Retorna:
+    dict: Perfil, requisições por segundo, latência (p50, p99, máximo) em ms, contagem dos status
+        HTTP, conexões abertas e, no PostgreSQL, o pico de conexões no banco.
+    """
+    usuario, _ = User.objects.get_or_create(username=USUARIO_BENCHMARK, defaults={'password': '!'})
+    postgresql = connection.vendor == 'postgresql'
+    fila = queue.SimpleQueue()
+    for indice in range(requisicoes):
+        fila.put(indice)
+    resultados, abertas, trava = [], [0], threading.Lock()
+    inicio = threading.Barrier(concorrencia + 1)
+
+    def contar(sender, connection, **kwargs):
+        with trava:
+            abertas[0] += 1
+
+    def trabalhar():
+        client = Client()
+        client.force_login(usuario)
+        # O login também abre conexões; apenas as das requisições medidas são contadas
+        connections.close_all()
+        try:
+            inicio.wait()
+            while True:
+                try:
+                    fila.get_nowait()
+                except queue.Empty:
+                    return
+                comeco = time.perf_counter()
+                # O cliente de teste não fecha as conexões ao fim da requisição; o servidor sim
+                close_old_connections()
+                try:
+                    codigo = client.get(url).status_code
+                except Exception:
+                    codigo = 500
+                close_old_connections()
+                resultados.append((codigo, (time.perf_counter() - comeco) * 1000))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=trabalhar) for _ in range(concorrencia)]
+    pico = 0
+    # Fora dos testes, o host do cliente de teste precisa ser aceito
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for thread in threads:
+            thread.start()
+        try:
+            if postgresql:
+                _conexoes_no_banco()  # abre a conexão de medição antes da rodada
+            connection_created.connect(contar)
+            inicio.wait()
+            comeco = time.perf_counter()
+            while any(thread.is_alive() for thread in threads):
+                if postgresql:
+                    pico = max(pico, _conexoes_no_banco())
+                time.sleep(0.05)
+            duracao = time.perf_counter() - comeco
+        finally:
+            connection_created.disconnect(contar)
+            for thread in threads:
+                thread.join()
+
+    pool = connection.pool if postgresql else None
+    if pool is not None:
+        abertas[0] = pool.get_stats().get('connections_num', 0)
+    usuario.delete()
+
+    tempos = [latencia for _, latencia in resultados]
+    codigos = {}
+    for codigo, _ in resultados:
+        codigos[codigo] = codigos.get(codigo, 0) + 1
+    resultado = {
+        'perfil': settings.DB_PERFIL,
+        'requisicoes': len(resultados),
+        'concorrencia': concorrencia,
+        'requisicoes_por_segundo': round(len(resultados) / duracao, 1),
+        'latencia_ms': {
+            'p50': round(statistics.median(tempos), 2),
+            'p99': round(_percentil(tempos, 99), 2),
+            'max': round(max(tempos), 2),
+        },
+        'status': codigos,
+        'conexoes_abertas': abertas[0],
+    }
+    if postgresql:
+        resultado['pico_conexoes_no_banco'] = pico
+    return resultado
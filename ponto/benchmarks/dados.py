@@ -0,0 +1,74 @@
+import random
+from datetime import date, time, timedelta
+from django.contrib.auth.models import User
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.cache import incrementar_versao_dados
+from ponto.utils.resumos import reconstruir_resumos
+
+PONTOS_POR_FUNCIONARIO = 250
+FUNCIONARIOS_POR_EMPRESA = 50
+LOTE = 10_000
+
+def semear(linhas, semente=42):
+    """
+    Completa o banco com dados sintéticos até ter `linhas` registros de ponto.
+
+    Cada funcionário recebe `PONTOS_POR_FUNCIONARIO` dias consecutivos de ponto (cerca de 5% sem
+    saída) e cada empresa agrupa `FUNCIONARIOS_POR_EMPRESA` funcionários. Os dados são acrescentados
+    ao que já existe, então chamadas com tamanhos crescentes (1k, 100k, 1M) reaproveitam o que já
+    foi gravado. Tudo é gravado com `bulk_create`; os resumos e a versão dos dados são atualizados
+    ao final.
+
+    Parâmetros:
+    linhas (int): Quantidade total de registros de ponto desejada.
+    semente (int): Semente dos valores aleatórios.
+
+    Retorna:
+    dict: Quantidades de empresas, funcionários e pontos após a carga.
+    """
+    aleatorio = random.Random(semente + linhas)
+    total_funcionarios = max(1, linhas // PONTOS_POR_FUNCIONARIO)
+    existentes = Funcionario.objects.count()
+
+    if total_funcionarios > existentes:
+        total_empresas = -(-total_funcionarios // FUNCIONARIOS_POR_EMPRESA)
+        Empresa.objects.bulk_create([
+            Empresa(nome=f"Empresa {indice}", endereco=f"Rua {indice}, 100", telefone="(11) 0000-0000")
+            for indice in range(Empresa.objects.count(), total_empresas)
+        ])
+        empresas = list(Empresa.objects.order_by('pk').values_list('pk', flat=True))
+
+        # Senhas inutilizáveis: gerar hashes de milhares de senhas dominaria o tempo da carga
+        novos = range(existentes, total_funcionarios)
+        usuarios = User.objects.bulk_create(
+            [User(username=f"funcionario_{indice}", password="!") for indice in novos], batch_size=LOTE
+        )
+        funcionarios = Funcionario.objects.bulk_create([
+            Funcionario(user=usuario, empresa_id=empresas[indice // FUNCIONARIOS_POR_EMPRESA])
+            for indice, usuario in zip(novos, usuarios)
+        ], batch_size=LOTE)
+
+        lote = []
+        for funcionario in funcionarios:
+            for dia in range(PONTOS_POR_FUNCIONARIO):
+                completo = aleatorio.random() > 0.05
+                lote.append(Ponto(
+                    funcionario_id=funcionario.pk,
+                    data=date(2024, 1, 1) + timedelta(days=dia),
+                    entrada=time(aleatorio.randint(7, 9), aleatorio.randint(0, 59)),
+                    intervalo=time(1, aleatorio.choice([0, 15, 30])),
+                    saida=time(aleatorio.randint(16, 19), aleatorio.randint(0, 59)) if completo else None,
+                ))
+                if len(lote) >= LOTE:
+                    Ponto.objects.bulk_create(lote)
+                    lote = []
+        Ponto.objects.bulk_create(lote)
+
+        reconstruir_resumos()
+        incrementar_versao_dados()
+
+    return {
+        'empresas': Empresa.objects.count(),
+        'funcionarios': Funcionario.objects.count(),
+        'pontos': Ponto.objects.count(),
+    }
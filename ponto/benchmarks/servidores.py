@@ -0,0 +1,149 @@
+import asyncio
+import queue
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from ponto.benchmarks.carga import _percentil
+from ponto.benchmarks.dados import semear
+from ponto.models import Funcionario
+from ponto.utils.cache import incrementar_versao_dados
+
+USUARIO_BENCHMARK = 'benchmark_servidores'
+
+def _urls(relatorios, paginas):
+    """
+    URLs dos relatórios de todos os pontos (cada um com outro `data_fim`, para não vir do cache) e
+    das páginas rápidas: a lista de pontos de um funcionário, como quem confere as próprias marcações.
+    """
+    funcionario_id = Funcionario.objects.order_by('pk').values_list('pk', flat=True).first()
+    lentas = [
+        f"{reverse('relatorio')}?data_inicio=2024-01-01&data_fim={date(2024, 12, 31) - timedelta(days=indice)}"
+        for indice in range(relatorios)
+    ]
+    return lentas, [f"{reverse('ponto-list')}?funcionario={funcionario_id}"] * paginas
+
+def _wsgi(usuario, lentas, rapidas, workers):
+    """
+    Um servidor WSGI com `workers` threads: cada requisição ocupa uma thread até terminar.
+    """
+    clientes = queue.SimpleQueue()
+    for _ in range(workers):
+        client = Client()
+        client.force_login(usuario)
+        clientes.put(client)
+
+    def atender(url):
+        client = clientes.get()
+        try:
+            return client.get(url).status_code
+        except Exception:
+            return 500
+        finally:
+            # Sem CONN_MAX_AGE, o servidor fecha a conexão ao fim de cada requisição
+            connections.close_all()
+            clientes.put(client)
+
+    with ThreadPoolExecutor(max_workers=workers) as servidor:
+        inicio = time.perf_counter()
+        pendentes = [servidor.submit(atender, url) for url in lentas]
+        paginas = []
+        for url in rapidas:
+            comeco = time.perf_counter()
+            codigo = servidor.submit(atender, url).result()
+            paginas.append((codigo, (time.perf_counter() - comeco) * 1000))
+        relatorios = [pendente.result() for pendente in pendentes]
+        duracao = time.perf_counter() - inicio
+    return paginas, relatorios, duracao
+
+async def _asgi(usuario, lentas, rapidas):
+    """
+    Um servidor ASGI com um único event loop, como um worker do uvicorn.
+    """
+    login = AsyncClient()
+    await login.aforce_login(usuario)
+
+    async def atender(url):
+        client = AsyncClient()
+        client.cookies = login.cookies
+        # Como o `ASGIHandler`, cada requisição tem o próprio contexto para o código síncrono
+        async with ThreadSensitiveContext():
+            try:
+                return (await client.get(url)).status_code
+            except Exception:
+                return 500
+            finally:
+                await sync_to_async(connections.close_all)()
+
+    inicio = time.perf_counter()
+    pendentes = [asyncio.create_task(atender(url)) for url in lentas]
+    await asyncio.sleep(0)  # os relatórios começam antes das páginas rápidas, como no WSGI
+    paginas = []
+    for url in rapidas:
+        comeco = time.perf_counter()
+        codigo = await atender(url)
+        paginas.append((codigo, (time.perf_counter() - comeco) * 1000))
+    relatorios = await asyncio.gather(*pendentes)
+    return paginas, relatorios, time.perf_counter() - inicio
+
+def _resumo(paginas, relatorios, duracao):
+    tempos = [latencia for _, latencia in paginas]
+    codigos = {}
+    for codigo in [codigo for codigo, _ in paginas] + list(relatorios):
+        codigos[codigo] = codigos.get(codigo, 0) + 1
+    return {
+        'paginas_latencia_ms': {
+            'p50': round(statistics.median(tempos), 2),
+            'p99': round(_percentil(tempos, 99), 2),
+            'max': round(max(tempos), 2),
+        },
+        'duracao_s': round(duracao, 2),
+        'status': codigos,
+    }
+
+def comparar_servidores(linhas=5000, relatorios=4, paginas=50, workers=4, progresso=None):
+    """
+    Compara o caminho assíncrono (ASGI) com o síncrono (WSGI) sob relatórios lentos.
+
+    Semeia `linhas` registros no banco atual (use um banco descartável) e, em cada modo, dispara
+    `relatorios` PDFs de todos os pontos ao mesmo tempo; enquanto são gerados, um usuário abre a
+    lista de pontos de um funcionário `paginas` vezes, uma após a outra. A latência dessas páginas
+    rápidas mostra se elas esperam atrás dos relatórios:
+
+    - wsgi: `workers` threads, cada uma presa a uma requisição até o fim, como o gunicorn com threads;
+    - asgi: um único event loop chamando o `ASGIHandler` no próprio processo (`AsyncClient`), com
+      os PDFs desenhados em `executor_relatorios`.
+
+    Nenhum servidor HTTP é iniciado: as requisições passam pelos handlers do Django diretamente,
+    então a comparação mede o agendamento das views, não a rede. O desenho dos PDFs continua
+    disputando o GIL com as páginas; o ganho do ASGI é não deixá-las na fila atrás dos relatórios.
+
+    Retorna:
+    dict: Por modo, latência das páginas rápidas (p50, p99, máximo) em ms, duração total da rodada
+        em segundos e contagem dos status HTTP.
+    """
+    progresso = progresso or (lambda mensagem: None)
+    semear(linhas)
+    usuario, _ = User.objects.get_or_create(username=USUARIO_BENCHMARK, defaults={'password': '!'})
+    lentas, rapidas = _urls(relatorios, paginas)
+
+    resultado = {'linhas': linhas, 'relatorios': relatorios, 'paginas': paginas, 'workers': workers}
+    # Fora dos testes, o host do cliente de teste precisa ser aceito
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for modo in ('wsgi', 'asgi'):
+            # Nova versão dos dados: os relatórios de cada modo são gerados, não lidos do cache
+            incrementar_versao_dados()
+            if modo == 'wsgi':
+                rodada = _wsgi(usuario, lentas, rapidas, workers)
+            else:
+                rodada = asyncio.run(_asgi(usuario, lentas, rapidas))
+            resultado[modo] = _resumo(*rodada)
+            progresso(f'{modo}: p99 {resultado[modo]["paginas_latencia_ms"]["p99"]} ms {resultado[modo]["status"]}')
+    usuario.delete()
+    return resultado
@@ -0,0 +1,212 @@
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+import django
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils.timezone import now
+from ponto.benchmarks.dados import semear
+from ponto.models import Funcionario
+from ponto.utils.cache import incrementar_versao_dados
+
+def _relatorio(client, contexto):
+    # Nova versão dos dados a cada execução: mede a geração do PDF, não o cache
+    incrementar_versao_dados()
+    return client.get(reverse('relatorio'), {'funcionario': contexto['funcionario'].pk})
+
+def _ponto_list(client, contexto):
+    return client.get(reverse('ponto-list'))
+
+def _funcionario_list(client, contexto):
+    return client.get(reverse('funcionario-list'))
+
+def _ponto_form(client, contexto):
+    return client.get(reverse('ponto-create'))
+
+def _ponto_create(client, contexto):
+    contexto['contador'] += 1
+    return client.post(reverse('ponto-create'), {
+        'funcionario': contexto['funcionario'].pk,
+        'data': (date(2030, 1, 1) + timedelta(days=contexto['contador'])).isoformat(),
+        'entrada': '08:00',
+        'intervalo': '01:00',
+        'saida': '17:00',
+    })
+
+def _ponto_update(client, contexto):
+    contexto['contador'] += 1
+    ponto = contexto['ponto']
+    return client.post(reverse('ponto-update', args=[ponto.pk]), {
+        'funcionario': ponto.funcionario_id,
+        'data': ponto.data.isoformat(),
+        'entrada': '08:00',
+        'intervalo': '01:00',
+        'saida': '17:00' if contexto['contador'] % 2 else '18:00',
+    })
+
+# Itens por lote no cenário de ingestão, espalhados pelos funcionários e por dias ainda sem ponto
+LOTE_INGESTAO = 1000
+
+def _ponto_ingestao(client, contexto):
+    if 'funcionario_ids' not in contexto:
+        contexto['funcionario_ids'] = list(Funcionario.objects.order_by('pk').values_list('pk', flat=True)[:LOTE_INGESTAO])
+    ids = contexto['funcionario_ids']
+    itens = []
+    while len(itens) < LOTE_INGESTAO:
+        contexto['contador'] += 1
+        data = (date(2031, 1, 1) + timedelta(days=contexto['contador'])).isoformat()
+        itens.extend(
+            {'funcionario': pk, 'data': data, 'entrada': '08:00', 'intervalo': '01:00', 'saida': '17:00'}
+            for pk in ids[:LOTE_INGESTAO - len(itens)]
+        )
+    return client.post(reverse('ponto-ingestao'), itens, content_type='application/json')
+
+CENARIOS = {
+    'relatorio': _relatorio,
+    'ponto_list': _ponto_list,
+    'funcionario_list': _funcionario_list,
+    'ponto_form': _ponto_form,
+    'ponto_create': _ponto_create,
+    'ponto_update': _ponto_update,
+    'ponto_ingestao': _ponto_ingestao,
+}
+
+class ContadorConsultas:
+    """
+    Conta as consultas SQL executadas, para uso com `connection.execute_wrapper`.
+
+    Ao contrário de `CaptureQueriesContext`, não guarda o SQL e não tem limite de consultas.
+    """
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+def _executar(cenario, client, contexto):
+    response = cenario(client, contexto)
+    if response.status_code not in (200, 302):
+        raise RuntimeError(f'Resposta inesperada: HTTP {response.status_code}')
+    # O tempo inclui o envio completo do corpo, inclusive em respostas streaming
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+def medir(cenario, client, contexto, repeticoes=5):
+    """
+    Mede um cenário: latência, quantidade de consultas SQL e pico de memória.
+
+    Após uma execução de aquecimento, a latência é medida em `repeticoes` execuções sem
+    instrumentação. Consultas e memória são medidas em uma execução à parte, com
+    `ContadorConsultas` e `tracemalloc` (que só enxerga alocações feitas pelo Python;
+    a memória usada internamente pelo fitz não entra no pico).
+
+    Retorna:
+    dict: `latencia_ms` (min, mediana, max), `consultas` e `memoria_pico_kb`.
+    """
+    _executar(cenario, client, contexto)
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _executar(cenario, client, contexto)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    consultas = ContadorConsultas()
+    tracemalloc.start()
+    try:
+        with connection.execute_wrapper(consultas):
+            _executar(cenario, client, contexto)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'latencia_ms': {
+            'min': round(min(tempos), 2),
+            'mediana': round(statistics.median(tempos), 2),
+            'max': round(max(tempos), 2),
+        },
+        'consultas': consultas.total,
+        'memoria_pico_kb': round(pico / 1024),
+    }
+
+def executar_benchmarks(tamanhos, repeticoes=5, cenarios=None, progresso=None):
+    """
+    Executa os cenários de benchmark para cada tamanho de base.
+
+    Os dados são semeados no banco atual com `semear`, em ordem crescente de tamanho; use
+    um banco descartável (o comando `benchmark` cria um banco de teste para isso).
+
+    Parâmetros:
+    tamanhos (Iterable[int]): Quantidades de registros de ponto (por exemplo 1000, 100000, 1000000).
+    repeticoes (int): Execuções medidas de cada cenário.
+    cenarios (Iterable[str], opcional): Nomes de `CENARIOS` a executar (padrão: todos).
+    progresso (callable, opcional): Recebe uma mensagem a cada etapa concluída.
+
+    Retorna:
+    dict: Resultados serializáveis em JSON, com o ambiente e as medições por tamanho e cenário.
+    """
+    progresso = progresso or (lambda mensagem: None)
+    cenarios = list(cenarios or CENARIOS)
+    usuario, _ = User.objects.get_or_create(username='benchmark', defaults={'is_staff': True})
+    client = Client()
+    client.force_login(usuario)
+
+    resultados = {
+        'ambiente': {
+            'data': now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'banco': connection.vendor,
+            'repeticoes': repeticoes,
+        },
+        'tamanhos': {},
+    }
+    for tamanho in sorted(tamanhos):
+        inicio = time.perf_counter()
+        dados = semear(tamanho)
+        progresso(f'{tamanho} registros semeados em {time.perf_counter() - inicio:.1f}s')
+
+        funcionario = Funcionario.objects.order_by('pk').first()
+        contexto = {'funcionario': funcionario, 'ponto': funcionario.pontos.order_by('data').first(), 'contador': 0}
+        medicoes = {}
+        for nome in cenarios:
+            medicoes[nome] = medir(CENARIOS[nome], client, contexto, repeticoes)
+            progresso(f'{tamanho} / {nome}: {medicoes[nome]["latencia_ms"]["mediana"]} ms')
+        resultados['tamanhos'][str(tamanho)] = {'dados': dados, 'cenarios': medicoes}
+    return resultados
+
+def comparar_resultados(atual, base, tolerancia=0.25, folga_ms=5, folga_kb=256):
+    """
+    Compara duas execuções e lista as regressões.
+
+    Há regressão quando a mediana de latência ou o pico de memória passam do valor de `base`
+    em mais de `tolerancia` (e de `folga_ms`/`folga_kb`, para ignorar ruído em medições
+    pequenas), ou quando a quantidade de consultas SQL aumenta. Tamanhos e cenários que não
+    existem nas duas execuções são ignorados.
+
+    Retorna:
+    list[str]: Descrição de cada regressão (vazia se não houver nenhuma).
+    """
+    regressoes = []
+    for tamanho, medicoes in atual['tamanhos'].items():
+        anteriores = base.get('tamanhos', {}).get(tamanho, {}).get('cenarios', {})
+        for nome, medicao in medicoes['cenarios'].items():
+            anterior = anteriores.get(nome)
+            if anterior is None:
+                continue
+            latencia, latencia_base = medicao['latencia_ms']['mediana'], anterior['latencia_ms']['mediana']
+            if latencia > latencia_base * (1 + tolerancia) and latencia - latencia_base > folga_ms:
+                regressoes.append(f'{tamanho} / {nome}: latência {latencia_base} ms -> {latencia} ms')
+            if medicao['consultas'] > anterior['consultas']:
+                regressoes.append(f'{tamanho} / {nome}: consultas {anterior["consultas"]} -> {medicao["consultas"]}')
+            memoria, memoria_base = medicao['memoria_pico_kb'], anterior['memoria_pico_kb']
+            if memoria > memoria_base * (1 + tolerancia) and memoria - memoria_base > folga_kb:
+                regressoes.append(f'{tamanho} / {nome}: memória {memoria_base} KB -> {memoria} KB')
+    return regressoes
@@ -0,0 +1,31 @@
+from ponto.engine.jornadas import (
+    CAMPOS,
+    LinhaJornada,
+    ResultadoJornadas,
+    calcular_jornadas,
+    calcular_em_lotes,
+    anotar_em_lotes,
+    formatar_minutos,
+)
+from ponto.engine.regras import (
+    JORNADA_PADRAO,
+    RegraJornada,
+    compilar_jornada,
+    regras_dos_funcionarios,
+    regra_do_funcionario,
+)
+
+__all__ = [
+    'CAMPOS',
+    'LinhaJornada',
+    'ResultadoJornadas',
+    'calcular_jornadas',
+    'calcular_em_lotes',
+    'anotar_em_lotes',
+    'formatar_minutos',
+    'JORNADA_PADRAO',
+    'RegraJornada',
+    'compilar_jornada',
+    'regras_dos_funcionarios',
+    'regra_do_funcionario',
+]
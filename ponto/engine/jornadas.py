@@ -0,0 +1,215 @@
+from collections import namedtuple
+from datetime import timedelta
+from django.db import models
+from ponto.engine.regras import JORNADA_PADRAO, regras_dos_funcionarios
+from ponto.utils.carregamento import ModuloSobDemanda
+
+# O NumPy só é importado no primeiro cálculo, não na inicialização (sinais, URLs e comandos)
+np = ModuloSobDemanda('numpy')
+
+# Colunas lidas de Ponto via values_list, nesta ordem
+CAMPOS = ('id', 'data', 'entrada', 'intervalo', 'saida', 'funcionario_id')
+
+LinhaJornada = namedtuple(
+    'LinhaJornada',
+    [*CAMPOS, 'horas_trabalhadas', 'atraso', 'extra', 'minutos_trabalhados'],
+)
+LinhaJornada.__doc__ = """
+Resultado do cálculo de um registro de ponto.
+
+Atributos:
+    id, data, entrada, intervalo, saida, funcionario_id: Valores originais do Ponto.
+    horas_trabalhadas (str): Horas trabalhadas no formato "Xh Ym", ou "N/A" sem entrada/saída.
+    atraso (timedelta): Tempo faltante para completar a jornada.
+    extra (timedelta): Tempo trabalhado além da jornada.
+    minutos_trabalhados (int): Minutos trabalhados (0 sem entrada/saída).
+"""
+
+def formatar_minutos(minutos):
+    """
+    Formata uma quantidade de minutos no formato "Xh Ym", o mesmo de `Ponto.horas_trabalhadas`.
+    """
+    return f"{minutos // 60}h {minutos % 60}m"
+
+def _segundos(horarios, total):
+    """
+    Converte uma coluna de `datetime.time` em um array de segundos desde a meia-noite (-1 para nulos).
+    """
+    return np.fromiter(
+        (h.hour * 3600 + h.minute * 60 + h.second if h is not None else -1 for h in horarios),
+        dtype=np.int64, count=total,
+    )
+
+def _dias_da_semana(datas, total):
+    """
+    Converte uma coluna de `date` no dia da semana de cada data (0 = segunda, 6 = domingo).
+    """
+    # Equivale a date.weekday(); o ordinal 1 (01/01/0001) foi uma segunda-feira
+    return (np.fromiter((d.toordinal() for d in datas), dtype=np.int64, count=total) + 6) % 7
+
+def _como_linha(ponto):
+    if isinstance(ponto, models.Model):
+        return tuple(getattr(ponto, campo) for campo in CAMPOS)
+    return tuple(ponto)
+
+
+class ResultadoJornadas:
+    """
+    Horas trabalhadas, atrasos e horas extras de um lote de registros de ponto.
+
+    O cálculo é feito uma única vez, com operações de array do NumPy sobre as colunas do lote,
+    em vez de aritmética de `datetime`/`timedelta` linha a linha. Os resultados reproduzem
+    exatamente `Ponto.horas_trabalhadas` e `calcular_atrasos_e_extras`.
+
+    A jornada esperada vem da `RegraJornada` de cada funcionário, buscada uma vez por funcionário
+    do lote (`regras_dos_funcionarios`), e é aplicada conforme o dia da semana de cada registro.
+    Diferenças dentro da tolerância da jornada não contam como atraso nem hora extra.
+
+    Atributos:
+        completo (ndarray[bool]): Se o registro tem entrada e saída.
+        minutos_trabalhados (ndarray[int]): Minutos trabalhados (0 nos registros incompletos).
+        atraso_segundos (ndarray[int]): Atraso de cada registro, em segundos.
+        extra_segundos (ndarray[int]): Horas extras de cada registro, em segundos.
+
+    Iterar sobre o resultado gera um `LinhaJornada` por registro, na ordem original.
+    """
+
+    def __init__(self, linhas, regra=None):
+        self._linhas = linhas
+        total = len(linhas)
+        colunas = list(zip(*linhas)) if total else [()] * len(CAMPOS)
+        _, datas, entradas, intervalos, saidas, funcionarios = colunas
+
+        entrada = _segundos(entradas, total)
+        saida = _segundos(saidas, total)
+        # O intervalo é uma duração em horas e minutos; os segundos são ignorados, como no cálculo original
+        intervalo = _segundos(intervalos, total)
+        intervalo = np.where(intervalo >= 0, intervalo // 60 * 60, 0)
+
+        self.completo = (entrada >= 0) & (saida >= 0)
+        trabalhado = np.where(self.completo, saida - entrada - intervalo, 0)
+
+        self.minutos_trabalhados = np.where(
+            self.completo, saida // 60 - entrada // 60 - intervalo // 60, 0
+        )
+
+        # Uma regra por funcionário distinto do lote; cada registro usa a linha da sua regra
+        if regra is not None:
+            regras, indices = [regra], np.zeros(total, dtype=np.int64)
+        else:
+            ids, indices = np.unique(np.fromiter(
+                (pk if pk is not None else -1 for pk in funcionarios), dtype=np.int64, count=total
+            ), return_inverse=True)
+            por_funcionario = regras_dos_funcionarios([pk for pk in ids.tolist() if pk >= 0])
+            regras = [por_funcionario.get(pk, JORNADA_PADRAO) for pk in ids.tolist()] or [JORNADA_PADRAO]
+        esperado = np.array([r.segundos_por_dia for r in regras], dtype=np.int64)[indices, _dias_da_semana(datas, total)]
+        tolerancia = np.array([r.tolerancia_segundos for r in regras], dtype=np.int64)[indices]
+
+        diferenca = trabalhado - esperado
+        self.atraso_segundos = np.where(self.completo & (-diferenca > tolerancia), -diferenca, 0)
+        self.extra_segundos = np.where(self.completo & (diferenca > tolerancia), diferenca, 0)
+
+    def __len__(self):
+        return len(self._linhas)
+
+    def __iter__(self):
+        # Os valores distintos são poucos (no máximo um por minuto/segundo do dia), então cada
+        # texto e timedelta é criado uma vez e reaproveitado entre as linhas
+        horas = {
+            minutos: formatar_minutos(minutos)
+            for minutos in np.unique(self.minutos_trabalhados[self.completo]).tolist()
+        }
+        duracoes = {
+            segundos: timedelta(seconds=segundos)
+            for segundos in np.unique(np.concatenate([self.atraso_segundos, self.extra_segundos])).tolist()
+        }
+        for linha, completo, minutos, atraso, extra in zip(
+            self._linhas,
+            self.completo.tolist(),
+            self.minutos_trabalhados.tolist(),
+            self.atraso_segundos.tolist(),
+            self.extra_segundos.tolist(),
+        ):
+            yield LinhaJornada._make((
+                *linha,
+                horas[minutos] if completo else "N/A",
+                duracoes[atraso],
+                duracoes[extra],
+                minutos,
+            ))
+
+    @property
+    def total_minutos_trabalhados(self):
+        return int(self.minutos_trabalhados.sum())
+
+    @property
+    def total_atraso(self):
+        return timedelta(seconds=int(self.atraso_segundos.sum()))
+
+    @property
+    def total_extra(self):
+        return timedelta(seconds=int(self.extra_segundos.sum()))
+
+
+def calcular_jornadas(pontos, regra=None):
+    """
+    Calcula horas trabalhadas, atrasos e horas extras de um conjunto de registros de ponto.
+
+    Parâmetros:
+    pontos (QuerySet | Iterable): Um QuerySet de Ponto (lido com `values_list`, sem instanciar
+        modelos), instâncias de Ponto já carregadas ou tuplas na ordem de `CAMPOS`.
+    regra (RegraJornada, opcional): Jornada aplicada a todos os registros, em vez da jornada de
+        cada funcionário.
+
+    Retorna:
+    ResultadoJornadas: Resultados por registro e totais.
+    """
+    if isinstance(pontos, models.QuerySet):
+        linhas = list(pontos.values_list(*CAMPOS))
+    else:
+        linhas = [_como_linha(ponto) for ponto in pontos]
+    return ResultadoJornadas(linhas, regra)
+
+def _lotes(itens, tamanho):
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) == tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def calcular_em_lotes(pontos, chunk_size, regra=None):
+    """
+    Versão em lotes de `calcular_jornadas` para QuerySets grandes.
+
+    Os registros são lidos com um cursor no servidor (`.iterator(chunk_size=...)`) e calculados
+    a cada `chunk_size` linhas, então apenas um lote fica em memória por vez.
+
+    Parâmetros:
+    pontos (QuerySet): Registros de ponto, já filtrados e ordenados.
+    chunk_size (int): Número de linhas por lote.
+    regra (RegraJornada, opcional): Jornada aplicada a todos os registros.
+
+    Gera:
+    LinhaJornada: Um resultado por registro, na ordem do QuerySet.
+    """
+    for lote in _lotes(pontos.values_list(*CAMPOS).iterator(chunk_size=chunk_size), chunk_size):
+        yield from ResultadoJornadas(lote, regra)
+
+def anotar_em_lotes(pontos, chunk_size, regra=None):
+    """
+    Como `calcular_em_lotes`, mas para instâncias de Ponto, quando outras colunas ou relações
+    (por exemplo, via `select_related`) também são necessárias.
+
+    Parâmetros:
+    pontos (Iterable[Ponto]): Instâncias de Ponto, por exemplo `queryset.iterator(chunk_size=...)`.
+    chunk_size (int): Número de instâncias por lote.
+    regra (RegraJornada, opcional): Jornada aplicada a todos os registros.
+
+    Gera:
+    tuple: Pares (ponto, LinhaJornada), na ordem recebida.
+    """
+    for lote in _lotes(pontos, chunk_size):
+        yield from zip(lote, ResultadoJornadas([_como_linha(ponto) for ponto in lote], regra))
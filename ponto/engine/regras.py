@@ -0,0 +1,158 @@
+import threading
+from datetime import time
+from django.db.models import Q
+from ponto.models import Funcionario, Jornada
+from ponto.utils.cache import versao_jornadas
+
+DIAS = ('segunda', 'terça', 'quarta', 'quinta', 'sexta', 'sábado', 'domingo')
+
+def _hora(horario):
+    return f"{horario.hour}h{horario.minute:02d}" if horario.minute else f"{horario.hour}h"
+
+def _duracao(minutos):
+    horas, minutos = divmod(minutos, 60)
+    if not horas:
+        return f"{minutos}min"
+    return f"{horas}h{minutos:02d}" if minutos else f"{horas}h"
+
+def _dias(dias_semana):
+    indices = sorted({int(dia) - 1 for dia in dias_semana})
+    if len(indices) == 7:
+        return "todos os dias"
+    if len(indices) > 2 and indices == list(range(indices[0], indices[-1] + 1)):
+        return f"de {DIAS[indices[0]]} a {DIAS[indices[-1]]}"
+    nomes = [DIAS[indice] for indice in indices]
+    return nomes[0] if len(nomes) == 1 else f"{', '.join(nomes[:-1])} e {nomes[-1]}"
+
+
+class RegraJornada:
+    """
+    Jornada compilada para o cálculo em lote de atrasos e horas extras.
+
+    Atributos:
+        segundos_por_dia (tuple[int]): Segundos esperados de segunda (0) a domingo (6); 0 nos dias de folga.
+        tolerancia_segundos (int): Diferença diária que não conta como atraso nem hora extra.
+        descricao (str): Texto da jornada para o cabeçalho dos relatórios.
+    """
+    __slots__ = ('segundos_por_dia', 'tolerancia_segundos', 'descricao')
+
+    def __init__(self, segundos_por_dia, tolerancia_segundos=0, descricao=''):
+        self.segundos_por_dia = tuple(segundos_por_dia)
+        self.tolerancia_segundos = tolerancia_segundos
+        self.descricao = descricao
+
+    def __eq__(self, outra):
+        return isinstance(outra, RegraJornada) and (
+            (self.segundos_por_dia, self.tolerancia_segundos) == (outra.segundos_por_dia, outra.tolerancia_segundos)
+        )
+
+    def __hash__(self):
+        return hash((self.segundos_por_dia, self.tolerancia_segundos))
+
+    def __repr__(self):
+        return f"RegraJornada({self.descricao!r})"
+
+
+def compilar_jornada(inicio, fim, intervalo_minutos, dias_semana, tolerancia_minutos=0, nome=None):
+    """
+    Compila os campos de uma jornada em uma `RegraJornada`.
+
+    A duração esperada é o tempo entre `inicio` e `fim` (somando 24h se o fim for antes do início,
+    em turnos que viram a noite) menos o intervalo, nos dias de `dias_semana`.
+    """
+    minutos = (fim.hour * 60 + fim.minute) - (inicio.hour * 60 + inicio.minute)
+    if minutos <= 0:
+        minutos += 24 * 60
+    minutos -= intervalo_minutos
+    segundos_por_dia = [minutos * 60 if str(dia + 1) in dias_semana else 0 for dia in range(7)]
+
+    descricao = (
+        f"Jornada{f' {nome}' if nome else ''}: {_hora(inicio)} às {_hora(fim)}, "
+        f"com {_duracao(intervalo_minutos)} de intervalo, {_dias(dias_semana)} "
+        f"({_duracao(sum(segundos_por_dia) // 60)} semanais"
+    )
+    descricao += f", tolerância de {tolerancia_minutos} min)" if tolerancia_minutos else ")"
+    return RegraJornada(segundos_por_dia, tolerancia_minutos * 60, descricao)
+
+# Jornada usada quando a empresa não tem jornada cadastrada: o cálculo original, 8h em todos os dias
+JORNADA_PADRAO = compilar_jornada(time(8, 0), time(17, 0), 60, '1234567')
+
+
+class CacheRegras:
+    """
+    Cache, em memória do processo, das regras compiladas de cada funcionário.
+
+    As regras são carregadas apenas para os funcionários que ainda não estão no cache, com duas
+    consultas por lote (funcionários e jornadas), e compiladas uma única vez. O cache inteiro é
+    descartado quando a versão das jornadas (`versao_jornadas`) muda, o que acontece sempre que
+    uma jornada é salva ou um funcionário troca de jornada ou de empresa, em qualquer processo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versao = None
+        self._regras = {}
+
+    def obter(self, funcionario_ids):
+        """
+        Retorna um dicionário {funcionario_id: RegraJornada} para os funcionários informados.
+        """
+        versao = versao_jornadas()
+        with self._lock:
+            if versao != self._versao:
+                self._versao, self._regras = versao, {}
+            regras = {pk: self._regras[pk] for pk in funcionario_ids if pk in self._regras}
+
+        faltantes = set(funcionario_ids) - regras.keys()
+        if faltantes:
+            carregadas = self._carregar(faltantes)
+            regras.update(carregadas)
+            with self._lock:
+                if self._versao == versao:
+                    self._regras.update(carregadas)
+        return regras
+
+    def limpar(self):
+        with self._lock:
+            self._versao, self._regras = None, {}
+
+    def _carregar(self, funcionario_ids):
+        funcionarios = list(Funcionario.objects.filter(pk__in=funcionario_ids).values_list('pk', 'empresa_id', 'jornada_id'))
+        proprias = {jornada_id for _, _, jornada_id in funcionarios if jornada_id}
+        empresas = {empresa_id for _, empresa_id, jornada_id in funcionarios if not jornada_id}
+
+        compiladas, padrao_da_empresa = {}, {}
+        if funcionarios:
+            for jornada in Jornada.objects.filter(Q(pk__in=proprias) | Q(empresa_id__in=empresas, padrao=True)):
+                compiladas[jornada.pk] = compilar_jornada(
+                    jornada.inicio, jornada.fim, jornada.intervalo_minutos,
+                    jornada.dias_semana, jornada.tolerancia_minutos, jornada.nome,
+                )
+                if jornada.padrao:
+                    padrao_da_empresa[jornada.empresa_id] = compiladas[jornada.pk]
+
+        regras = dict.fromkeys(funcionario_ids, JORNADA_PADRAO)
+        for pk, empresa_id, jornada_id in funcionarios:
+            regras[pk] = compiladas.get(jornada_id) or padrao_da_empresa.get(empresa_id, JORNADA_PADRAO)
+        return regras
+
+cache_regras = CacheRegras()
+
+def regras_dos_funcionarios(funcionario_ids):
+    """
+    Retorna as regras de jornada de vários funcionários, com uma busca no cache por funcionário.
+
+    Parâmetros:
+    funcionario_ids (Iterable[int]): IDs dos funcionários.
+
+    Retorna:
+    dict: {funcionario_id: RegraJornada}. Funcionários sem jornada própria usam a jornada padrão
+    da empresa e, na falta dela, `JORNADA_PADRAO`.
+    """
+    return cache_regras.obter(funcionario_ids)
+
+def regra_do_funcionario(funcionario_id):
+    """
+    Retorna a `RegraJornada` de um funcionário (veja `regras_dos_funcionarios`).
+    """
+    return regras_dos_funcionarios([funcionario_id])[funcionario_id]
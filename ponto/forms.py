@@ -1,9 +1,53 @@
 from django import forms
 from django.contrib.auth.models import User
-from .models import Funcionario, Empresa
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from .models import Funcionario, Empresa, Ponto
 from django.contrib.auth.forms import AuthenticationForm
 from ponto.utils.telefone import validar_telefone
 from ponto.utils.email import validar_email
+from ponto.utils.jornada import validar_jornada
+
+class AutocompleteSelect(forms.Select):
+    """
+    Campo de seleção cujas opções são carregadas sob demanda de um endpoint de autocomplete.
+
+    Apenas a opção vazia e a opção selecionada são renderizadas; o script `ponto/autocomplete.js`
+    adiciona uma caixa de busca e preenche as demais opções com o JSON de `url_name`
+    (`{"resultados": [{"id": ..., "texto": ...}]}`). A validação continua sendo feita pelo
+    queryset do `ModelChoiceField`.
+
+    Parâmetros:
+        url_name (str): Nome da URL do endpoint de autocomplete.
+    """
+    class Media:
+        js = ('ponto/autocomplete.js',)
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(self.url_name)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        iterador = self.choices
+        opcoes = []
+        if iterador.field.empty_label is not None:
+            opcoes.append(('', iterador.field.empty_label))
+        selecionados = [valor for valor in value if valor]
+        if selecionados:
+            try:
+                opcoes += [iterador.choice(obj) for obj in iterador.queryset.filter(pk__in=selecionados)]
+            except (ValueError, TypeError, ValidationError):
+                pass  # Valor inválido: o erro é exibido pela validação do campo
+        self.choices = opcoes
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterador
 
 class RegistroForm(forms.ModelForm):
     """
@@ -27,7 +71,9 @@ class RegistroForm(forms.ModelForm):
     username = forms.CharField(max_length=150, label="Nome de Usuário")
     password = forms.CharField(widget=forms.PasswordInput, label="Senha")
     email = forms.EmailField(label="E-mail")
-    empresa = forms.ModelChoiceField(queryset=Empresa.objects.all(), label="Empresa")  # Corrigido para Empresa#-
+    empresa = forms.ModelChoiceField(  # Corrigido para Empresa#-
+        queryset=Empresa.objects.all(), label="Empresa", widget=AutocompleteSelect('empresa-autocomplete')
+    )
 
     class Meta:#-
         model = Funcionario#-
@@ -76,6 +122,7 @@ class FuncionarioForm(forms.ModelForm):
     Métodos:
         clean_telefone(): Valida o campo telefone utilizando a função `validar_telefone`.
         clean_email(): Valida o campo email utilizando a função `validar_email`.
+        clean_jornada(): Valida se a jornada pertence à empresa utilizando a função `validar_jornada`.
         save(commit=True): Cria um usuário e associa a um funcionário, salvando ambos no banco de dados.
     """
     username = forms.CharField(label="Nome de Usuário", max_length=150)
@@ -84,7 +131,13 @@ class FuncionarioForm(forms.ModelForm):
 
     class Meta:
         model = Funcionario
-        fields = ['empresa', 'telefone']
+        fields = ['empresa', 'telefone', 'jornada']
+        widgets = {'empresa': AutocompleteSelect('empresa-autocomplete')}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # O nome de cada jornada inclui a empresa: carregada na mesma consulta
+        self.fields['jornada'].queryset = self.fields['jornada'].queryset.select_related('empresa')
 
     def clean_telefone(self):
         telefone = self.cleaned_data.get('telefone')
@@ -95,6 +148,11 @@ class FuncionarioForm(forms.ModelForm):
         email = self.cleaned_data.get('email')
         validar_email(email)
         return email
+
+    def clean_jornada(self):
+        jornada = self.cleaned_data.get('jornada')
+        validar_jornada(jornada, self.cleaned_data.get('empresa'))
+        return jornada
     
     def save(self, commit=True):
         # Cria o usuário primeiro
@@ -124,6 +182,7 @@ class FuncionarioUpdateForm(forms.ModelForm):
         __init__(self, *args, **kwargs): Inicializa o formulário, preenchendo os campos do User se o funcionário estiver associado a um usuário.
         clean_telefone(self): Valida o campo telefone utilizando a função validar_telefone.
         clean_email(self): Valida o campo email utilizando a função validar_email.
+        clean_jornada(self): Valida se a jornada pertence à empresa utilizando a função validar_jornada.
         save(self, commit=True): Salva as alterações nos modelos User e Funcionario.
     """
     username = forms.CharField(label="Nome de Usuário", max_length=150)
@@ -131,11 +190,13 @@ class FuncionarioUpdateForm(forms.ModelForm):
 
     class Meta:
         model = Funcionario
-        fields = ['empresa', 'telefone']
+        fields = ['empresa', 'telefone', 'jornada']
+        widgets = {'empresa': AutocompleteSelect('empresa-autocomplete')}
     def __init__(self, *args, **kwargs):
         # Obtenha o usuário relacionado ao funcionário
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
+        self.fields['jornada'].queryset = self.fields['jornada'].queryset.select_related('empresa')
 
         # Preencha os campos do User no formulário
         if self.instance and self.instance.user:
@@ -152,6 +213,11 @@ class FuncionarioUpdateForm(forms.ModelForm):
         validar_email(email)
         return email
 
+    def clean_jornada(self):
+        jornada = self.cleaned_data.get('jornada')
+        validar_jornada(jornada, self.cleaned_data.get('empresa'))
+        return jornada
+
     def save(self, commit=True):
         # Atualiza o modelo User
         user = self.instance.user
@@ -189,3 +255,36 @@ class EmpresaForm(forms.ModelForm):
         telefone = self.cleaned_data.get('telefone')
         validar_telefone(telefone)  # Reutiliza a função genérica
         return telefone
+
+class RelatorioFiltroForm(forms.Form):
+    """
+    Formulário com os filtros de um relatório de pontos solicitado em segundo plano.
+
+    Atributos:
+        funcionario (forms.ModelChoiceField): Funcionário a ser filtrado (opcional).
+        data_inicio (forms.DateField): Data de início do período (opcional).
+        data_fim (forms.DateField): Data de fim do período (opcional).
+    """
+    funcionario = forms.ModelChoiceField(queryset=Funcionario.objects.all(), required=False, label="Funcionário")
+    data_inicio = forms.DateField(required=False, label="Data Início")
+    data_fim = forms.DateField(required=False, label="Data Fim")
+
+class PontoForm(forms.ModelForm):
+    """
+    Formulário para criação e edição de registros de ponto.
+
+    Meta:
+        model (Ponto): Modelo associado ao formulário.
+        fields (list): Lista de campos do modelo a serem incluídos no formulário.
+
+    O funcionário é escolhido com `AutocompleteSelect`: apenas o funcionário selecionado é
+    renderizado, com o nome de usuário carregado na mesma consulta (`select_related`).
+    """
+    class Meta:
+        model = Ponto
+        fields = ['funcionario', 'data', 'entrada', 'intervalo', 'saida']
+        widgets = {'funcionario': AutocompleteSelect('funcionario-autocomplete')}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['funcionario'].queryset = self.fields['funcionario'].queryset.select_related('user')
@@ -0,0 +1,52 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from ponto.benchmarks import CENARIOS, executar_benchmarks, comparar_resultados
+
+class Command(BaseCommand):
+    help = 'Mede latência, consultas SQL e pico de memória do relatório, das listagens e dos formulários'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 100_000, 1_000_000], help='Quantidades de registros de ponto')
+        parser.add_argument('--repeticoes', type=int, default=5, help='Execuções medidas de cada cenário')
+        parser.add_argument('--cenarios', nargs='+', choices=sorted(CENARIOS), help='Cenários a executar (padrão: todos)')
+        parser.add_argument('--saida', default='benchmark.json', help='Arquivo JSON com os resultados')
+        parser.add_argument('--comparar', help='JSON de uma execução anterior; regressões encerram o comando com erro')
+        parser.add_argument('--tolerancia', type=float, default=0.25, help='Piora relativa aceita na comparação (0.25 = 25%%)')
+
+    def handle(self, *args, **options):
+        base = None
+        if options['comparar']:
+            with open(options['comparar']) as arquivo:
+                base = json.load(arquivo)
+
+        # Os dados sintéticos vão para um banco de teste, criado e removido aqui
+        setup_test_environment()
+        nome_original = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            resultados = executar_benchmarks(
+                options['tamanhos'], options['repeticoes'], options['cenarios'], progresso=self.stdout.write
+            )
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+            teardown_test_environment()
+
+        with open(options['saida'], 'w') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+        for tamanho, medicoes in resultados['tamanhos'].items():
+            self.stdout.write(f'\n{tamanho} registros')
+            for nome, medicao in medicoes['cenarios'].items():
+                self.stdout.write(
+                    f'  {nome:<18} {medicao["latencia_ms"]["mediana"]:10.1f} ms'
+                    f'  {medicao["consultas"]:6} consultas  {medicao["memoria_pico_kb"]:8} KB'
+                )
+        self.stdout.write(self.style.SUCCESS(f'\nResultados gravados em {options["saida"]}.'))
+
+        if base is not None:
+            regressoes = comparar_resultados(resultados, base, options['tolerancia'])
+            if regressoes:
+                raise CommandError('Regressões encontradas:\n' + '\n'.join(regressoes))
+            self.stdout.write(self.style.SUCCESS('Nenhuma regressão em relação à execução anterior.'))
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from ponto.benchmarks import executar_requisicoes
+
+class Command(BaseCommand):
+    help = (
+        'Compara requisições por segundo e conexões abertas entre os perfis de conexão com o banco '
+        '(DB_PERFIL), no banco configurado (por exemplo o ponto_database do docker-compose)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--perfis', nargs='+', choices=['simples', 'persistente', 'pool'], default=None,
+                            help='Perfis comparados (padrão: todos; pool apenas no PostgreSQL)')
+        parser.add_argument('--requisicoes', type=int, default=2000, help='Requisições por perfil')
+        parser.add_argument('--concorrencia', type=int, default=8, help='Requisições simultâneas (threads)')
+        parser.add_argument('--url', default=None, help='URL medida (padrão: lista de pontos, que exige login)')
+        parser.add_argument('--saida', default=None, help='Arquivo JSON com os resultados')
+        parser.add_argument('--rodada', action='store_true', help='Uso interno: mede apenas o perfil atual')
+
+    def handle(self, *args, **options):
+        url = options['url'] or reverse('ponto-list')
+        if options['rodada']:
+            resultado = executar_requisicoes(url, options['requisicoes'], options['concorrencia'])
+            self.stdout.write(json.dumps(resultado))
+            return
+
+        perfis = options['perfis'] or ['simples', 'persistente'] + (['pool'] if connection.vendor == 'postgresql' else [])
+        # Cada perfil roda em um processo próprio, pois as configurações do banco são lidas na inicialização
+        resultados = []
+        for perfil in perfis:
+            self.stdout.write(f'Medindo o perfil {perfil}...')
+            processo = subprocess.run(
+                [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_conexoes', '--rodada',
+                 '--requisicoes', str(options['requisicoes']), '--concorrencia', str(options['concorrencia']),
+                 '--url', url],
+                env={**os.environ, 'DB_PERFIL': perfil}, capture_output=True, text=True,
+            )
+            if processo.returncode != 0:
+                raise CommandError(f'Falha ao medir o perfil {perfil}:\n{processo.stderr.strip()}')
+            resultados.append(json.loads(processo.stdout.strip().splitlines()[-1]))
+
+        self.stdout.write(f'\n{options["requisicoes"]} requisições GET {url}, {options["concorrencia"]} simultâneas')
+        for resultado in resultados:
+            latencia = resultado['latencia_ms']
+            pico = resultado.get('pico_conexoes_no_banco')
+            self.stdout.write(
+                f'  {resultado["perfil"]:<12} {resultado["requisicoes_por_segundo"]:8.1f} req/s'
+                f'  p50 {latencia["p50"]:7.1f} ms  p99 {latencia["p99"]:7.1f} ms'
+                f'  {resultado["conexoes_abertas"]:6} conexões abertas'
+                + (f'  pico de {pico} no banco' if pico is not None else '')
+                + f'  {resultado["status"]}'
+            )
+        if options['saida']:
+            with open(options['saida'], 'w') as arquivo:
+                json.dump(resultados, arquivo, indent=2)
+        if any(set(map(int, resultado['status'])) != {200} for resultado in resultados):
+            raise CommandError('Houve respostas diferentes de 200: confira a URL e o pool (DB_POOL_MAX).')
+        self.stdout.write(self.style.SUCCESS('Comparação concluída.'))
@@ -0,0 +1,69 @@
+import random
+import time
+from datetime import date, time as horario, timedelta
+from django.core.management.base import BaseCommand
+from ponto.engine import CAMPOS, JORNADA_PADRAO, ResultadoJornadas
+from ponto.models import Ponto
+from ponto.utils.reports import calcular_atrasos_e_extras
+
+class Command(BaseCommand):
+    help = 'Compara o cálculo de jornadas linha a linha com o motor vetorizado de ponto.engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=100_000, help='Quantidade de registros sintéticos')
+        parser.add_argument('--repeticoes', type=int, default=3, help='Execuções de cada caminho (vale a melhor)')
+
+    def handle(self, *args, **options):
+        # Registros em memória, sem banco de dados, para medir apenas o cálculo
+        aleatorio = random.Random(42)
+        pontos = []
+        for indice in range(options['linhas']):
+            completo = aleatorio.random() > 0.05
+            pontos.append(Ponto(
+                id=indice,
+                data=date(2024, 1, 1) + timedelta(days=indice % 365),
+                entrada=horario(aleatorio.randint(7, 9), aleatorio.randint(0, 59)) if completo else None,
+                intervalo=horario(1, aleatorio.choice([0, 15, 30])),
+                saida=horario(aleatorio.randint(16, 19), aleatorio.randint(0, 59)) if completo else None,
+            ))
+        linhas = [tuple(getattr(ponto, campo) for campo in CAMPOS) for ponto in pontos]
+
+        def por_linha():
+            total_atrasos = total_extras = timedelta(0)
+            for ponto in pontos:
+                ponto.horas_trabalhadas() if ponto.horas_trabalhadas() != "N/A" else "-"
+                atraso, extra = calcular_atrasos_e_extras(ponto, JORNADA_PADRAO)
+                total_atrasos += atraso
+                total_extras += extra
+            return total_atrasos, total_extras
+
+        def vetorizado():
+            resultado = ResultadoJornadas(linhas, JORNADA_PADRAO)
+            for _ in resultado:
+                pass
+            return resultado.total_atraso, resultado.total_extra
+
+        def somente_totais():
+            resultado = ResultadoJornadas(linhas, JORNADA_PADRAO)
+            return resultado.total_atraso, resultado.total_extra
+
+        def medir(funcao):
+            melhor = None
+            for _ in range(options['repeticoes']):
+                inicio = time.perf_counter()
+                totais = funcao()
+                duracao = time.perf_counter() - inicio
+                melhor = duracao if melhor is None else min(melhor, duracao)
+            return melhor, totais
+
+        tempo_linha, totais_linha = medir(por_linha)
+        tempo_vetor, totais_vetor = medir(vetorizado)
+        tempo_totais, totais_somente = medir(somente_totais)
+        if not totais_linha == totais_vetor == totais_somente:
+            self.stdout.write(self.style.ERROR(f'Totais divergentes: {totais_linha} != {totais_vetor}'))
+            return
+
+        self.stdout.write(f'Registros: {len(pontos)}')
+        self.stdout.write(f'Linha a linha:                {tempo_linha * 1000:.1f} ms')
+        self.stdout.write(f'Vetorizado (linhas e totais): {tempo_vetor * 1000:.1f} ms ({tempo_linha / tempo_vetor:.1f}x)')
+        self.stdout.write(f'Vetorizado (apenas totais):   {tempo_totais * 1000:.1f} ms ({tempo_linha / tempo_totais:.1f}x)')
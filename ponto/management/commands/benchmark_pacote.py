@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ponto.models import Empresa
+from ponto.utils.pacote import executor_pacotes, gerar_pacote_zip
+
+class Command(BaseCommand):
+    help = 'Mede o pacote de relatórios de uma empresa com diferentes números de processos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('empresa_id', type=int, help='ID da empresa')
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Números de processos comparados')
+        parser.add_argument('--data-inicio', help='Data de início (YYYY-MM-DD)')
+        parser.add_argument('--data-fim', help='Data de fim (YYYY-MM-DD)')
+        parser.add_argument('--repeticoes', type=int, default=2, help='Execuções de cada configuração (vale a melhor)')
+
+    def handle(self, *args, **options):
+        try:
+            empresa = Empresa.objects.get(pk=options['empresa_id'])
+        except Empresa.DoesNotExist:
+            raise CommandError(f'Empresa {options["empresa_id"]} não encontrada.')
+        funcionario_ids = list(empresa.funcionarios.order_by('pk').values_list('pk', flat=True))
+        if not funcionario_ids:
+            raise CommandError(f'A empresa {empresa.pk} não tem funcionários.')
+
+        self.stdout.write(f'Funcionários: {len(funcionario_ids)}')
+        referencia = None
+        for workers in options['workers']:
+            if workers > 1:
+                # Inicia os processos do pool antes de medir, como em um servidor já aquecido
+                for futuro in [executor_pacotes(workers).submit(int) for _ in range(workers)]:
+                    futuro.result()
+            melhor = None
+            for _ in range(options['repeticoes']):
+                inicio = time.perf_counter()
+                tamanho = sum(len(parte) for parte in gerar_pacote_zip(
+                    funcionario_ids, options['data_inicio'], options['data_fim'], workers
+                ))
+                duracao = time.perf_counter() - inicio
+                melhor = duracao if melhor is None else min(melhor, duracao)
+            referencia = referencia or melhor
+            self.stdout.write(
+                f'{workers:>2} processo(s): {melhor:7.2f}s  {len(funcionario_ids) / melhor:7.1f} relatórios/s  '
+                f'{tamanho / 1024:9.1f} KB  ({referencia / melhor:.1f}x)'
+            )
@@ -0,0 +1,48 @@
+import random
+import time
+from datetime import date, time as horario, timedelta
+from django.core.management.base import BaseCommand
+from ponto.engine import JORNADA_PADRAO, calcular_jornadas
+from ponto.utils.reports import paginar_relatorio, renderizar_pdf, renderizar_pdf_por_celula, stream_pdf
+
+class Command(BaseCommand):
+    help = 'Compara o desenho do relatório em PDF célula a célula com o desenho por colunas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=3000, help='Quantidade de registros sintéticos')
+        parser.add_argument('--repeticoes', type=int, default=3, help='Execuções de cada renderizador (vale a melhor)')
+
+    def handle(self, *args, **options):
+        # Registros em memória, sem banco de dados, para medir apenas o desenho
+        aleatorio = random.Random(42)
+        registros = []
+        for indice in range(options['linhas']):
+            completo = aleatorio.random() > 0.05
+            registros.append((
+                indice,
+                date(2024, 1, 1) + timedelta(days=indice % 365),
+                horario(aleatorio.randint(7, 9), aleatorio.randint(0, 59)) if completo else None,
+                horario(1, aleatorio.choice([0, 15, 30])),
+                horario(aleatorio.randint(16, 19), aleatorio.randint(0, 59)) if completo else None,
+                None,
+            ))
+        paginas = list(paginar_relatorio(None, calcular_jornadas(registros, JORNADA_PADRAO), observacao=JORNADA_PADRAO.descricao))
+
+        renderizadores = [
+            ('Célula a célula (fitz)', renderizar_pdf_por_celula),
+            ('Por colunas (fitz)', renderizar_pdf),
+            ('Streaming', lambda paginas: b''.join(stream_pdf(paginas))),
+        ]
+        self.stdout.write(f'Registros: {len(registros)} | Páginas: {len(paginas)}')
+        referencia = None
+        for nome, renderizar in renderizadores:
+            melhor = None
+            for _ in range(options['repeticoes']):
+                inicio = time.perf_counter()
+                pdf = renderizar(paginas)
+                duracao = time.perf_counter() - inicio
+                melhor = duracao if melhor is None else min(melhor, duracao)
+            referencia = referencia or melhor
+            self.stdout.write(
+                f'{nome:<24} {len(paginas) / melhor:8.1f} páginas/s  {len(pdf) / 1024:8.1f} KB  ({referencia / melhor:.1f}x)'
+            )
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from ponto.benchmarks import comparar_servidores
+
+class Command(BaseCommand):
+    help = (
+        'Compara a latência das páginas rápidas no caminho ASGI (assíncrono) e no WSGI (threads) '
+        'enquanto relatórios lentos são gerados'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=5000, help='Registros de ponto semeados')
+        parser.add_argument('--relatorios', type=int, default=4, help='Relatórios lentos simultâneos')
+        parser.add_argument('--paginas', type=int, default=50, help='Páginas rápidas abertas durante os relatórios')
+        parser.add_argument('--workers', type=int, default=4, help='Threads do servidor WSGI')
+        parser.add_argument('--saida', default=None, help='Arquivo JSON com os resultados')
+
+    def handle(self, *args, **options):
+        # Os dados vão para um banco de teste, criado e removido aqui. No SQLite, um arquivo
+        # temporário: o banco em memória não é compartilhado entre as threads das requisições.
+        setup_test_environment()
+        nome_original = connection.settings_dict['NAME']
+        arquivo = None
+        if connection.vendor == 'sqlite':
+            descritor, arquivo = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(descritor)
+            connection.settings_dict['TEST']['NAME'] = arquivo
+            connection.settings_dict['OPTIONS'].setdefault('timeout', 60)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            resultado = comparar_servidores(
+                options['linhas'], options['relatorios'], options['paginas'], options['workers'],
+                progresso=self.stdout.write,
+            )
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+            teardown_test_environment()
+            if arquivo and os.path.exists(arquivo):
+                os.remove(arquivo)
+
+        self.stdout.write(
+            f'\n{resultado["relatorios"]} relatórios de {resultado["linhas"]} registros e '
+            f'{resultado["paginas"]} páginas da lista de pontos ({resultado["workers"]} threads no WSGI)'
+        )
+        for modo in ('wsgi', 'asgi'):
+            rodada = resultado[modo]
+            latencia = rodada['paginas_latencia_ms']
+            self.stdout.write(
+                f'  {modo:<5} páginas p50 {latencia["p50"]:8.1f} ms  p99 {latencia["p99"]:8.1f} ms'
+                f'  max {latencia["max"]:8.1f} ms  rodada {rodada["duracao_s"]:6.2f} s  {rodada["status"]}'
+            )
+        if options['saida']:
+            with open(options['saida'], 'w') as arquivo_saida:
+                json.dump(resultado, arquivo_saida, indent=2)
+        if any(set(resultado[modo]['status']) != {200} for modo in ('wsgi', 'asgi')):
+            raise CommandError('Houve respostas diferentes de 200.')
+        self.stdout.write(self.style.SUCCESS('Comparação concluída.'))
@@ -0,0 +1,45 @@
+import os
+import tempfile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from ponto.benchmarks import executar_carga
+
+class Command(BaseCommand):
+    help = 'Teste de carga da marcação de ponto em um toque, com muitos funcionários marcando ao mesmo tempo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--funcionarios', type=int, default=2000, help='Funcionários marcando o ponto')
+        parser.add_argument('--concorrencia', type=int, default=100, help='Requisições simultâneas')
+
+    def handle(self, *args, **options):
+        # Os dados vão para um banco de teste, criado e removido aqui. No SQLite, um arquivo
+        # temporário: o banco em memória não aceita escritas de várias conexões ao mesmo tempo.
+        # Como o SQLite grava uma transação por vez, as conexões esperam mais pelo bloqueio.
+        setup_test_environment()
+        nome_original = connection.settings_dict['NAME']
+        arquivo = None
+        if connection.vendor == 'sqlite':
+            descritor, arquivo = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(descritor)
+            connection.settings_dict['TEST']['NAME'] = arquivo
+            connection.settings_dict['OPTIONS'].setdefault('timeout', 60)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            resultado = executar_carga(options['funcionarios'], options['concorrencia'], progresso=self.stdout.write)
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+            teardown_test_environment()
+            if arquivo and os.path.exists(arquivo):
+                os.remove(arquivo)
+
+        self.stdout.write(f'\n{resultado["funcionarios"]} funcionários, {resultado["concorrencia"]} requisições simultâneas')
+        for nome, rodada in resultado['rodadas'].items():
+            latencia = rodada['latencia_ms']
+            self.stdout.write(
+                f'  {nome:<10} {rodada["marcacoes"]:7} marcações  p50 {latencia["p50"]:8.1f} ms'
+                f'  p99 {latencia["p99"]:8.1f} ms  max {latencia["max"]:8.1f} ms  {rodada["status"]}'
+            )
+        if not resultado['consistente'] or not all(rodada['correta'] for rodada in resultado['rodadas'].values()):
+            raise CommandError('Resultados incorretos: marcações perdidas, duplicadas ou resumos divergentes.')
+        self.stdout.write(self.style.SUCCESS('Todas as marcações corretas e resumos consistentes.'))
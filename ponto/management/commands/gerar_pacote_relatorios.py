@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ponto.models import Empresa
+from ponto.utils.pacote import gerar_pacote_zip
+
+class Command(BaseCommand):
+    help = 'Gera um ZIP com o relatório em PDF de cada funcionário de uma empresa, em paralelo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('empresa_id', type=int, help='ID da empresa')
+        parser.add_argument('--data-inicio', help='Data de início (YYYY-MM-DD)')
+        parser.add_argument('--data-fim', help='Data de fim (YYYY-MM-DD)')
+        parser.add_argument('--workers', type=int, help='Número de processos (padrão: RELATORIO_PACOTE_WORKERS)')
+        parser.add_argument('--saida', help='Arquivo de saída (padrão: relatorios_<empresa_id>.zip)')
+
+    def handle(self, *args, **options):
+        try:
+            empresa = Empresa.objects.get(pk=options['empresa_id'])
+        except Empresa.DoesNotExist:
+            raise CommandError(f'Empresa {options["empresa_id"]} não encontrada.')
+
+        funcionario_ids = list(empresa.funcionarios.order_by('pk').values_list('pk', flat=True))
+        saida = options['saida'] or f'relatorios_{empresa.pk}.zip'
+
+        inicio = time.perf_counter()
+        with open(saida, 'wb') as arquivo:
+            for parte in gerar_pacote_zip(funcionario_ids, options['data_inicio'], options['data_fim'], options['workers']):
+                arquivo.write(parte)
+        duracao = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(funcionario_ids)} relatórios gerados em {duracao:.1f}s ({saida}).'
+        ))
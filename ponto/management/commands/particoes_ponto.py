@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import localdate
+from ponto.utils.particoes import (
+    converter_tabela,
+    criar_particoes,
+    desanexar_particoes,
+    esta_particionada,
+    primeiro_dia,
+    somar_meses,
+)
+
+class Command(BaseCommand):
+    help = (
+        'Mantém o particionamento mensal da tabela de pontos no PostgreSQL: cria as partições dos próximos '
+        'meses e desanexa as antigas (rode periodicamente, por exemplo via cron). Use --converter uma vez '
+        'para transformar a tabela existente em particionada.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--converter', action='store_true', help='Converte a tabela atual em particionada, preservando os registros')
+        parser.add_argument(
+            '--meses-futuros', type=int, default=settings.PONTO_PARTICOES_MESES_FUTUROS,
+            help='Meses adiante com partição criada (padrão PONTO_PARTICOES_MESES_FUTUROS)',
+        )
+        parser.add_argument(
+            '--reter-meses', type=int, default=settings.PONTO_PARTICOES_RETER_MESES,
+            help='Desanexa as partições anteriores a este número de meses (padrão PONTO_PARTICOES_RETER_MESES; 0 = nunca)',
+        )
+        parser.add_argument(
+            '--esquema-arquivo', default=settings.PONTO_PARTICOES_ESQUEMA_ARQUIVO,
+            help='Esquema para onde as partições desanexadas são movidas (padrão PONTO_PARTICOES_ESQUEMA_ARQUIVO)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['converter']:
+                total = converter_tabela(options['meses_futuros'])
+                self.stdout.write(self.style.SUCCESS(f'Tabela de pontos convertida com {total} partições mensais!'))
+            elif not esta_particionada():
+                raise CommandError('A tabela de pontos não é particionada; use --converter (apenas PostgreSQL).')
+
+            hoje = localdate()
+            for nome in criar_particoes(somar_meses(hoje, options['meses_futuros'])):
+                self.stdout.write(f'Partição {nome} criada.')
+            if options['reter_meses'] > 0:
+                antes_de = somar_meses(primeiro_dia(hoje), -options['reter_meses'])
+                for nome in desanexar_particoes(antes_de, options['esquema_arquivo'] or None):
+                    self.stdout.write(f'Partição {nome} desanexada.')
+        except RuntimeError as erro:
+            raise CommandError(str(erro))
@@ -0,0 +1,46 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from ponto.models import RelatorioJob
+from ponto.utils.jobs import limpar_jobs_antigos, reivindicar_job, processar_job
+from ponto.utils.resumos import reconstruir_pendentes
+
+class Command(BaseCommand):
+    help = (
+        'Processa a fila de relatórios e as reconstruções de resumos pedidas ao alterar jornadas, '
+        'em segundo plano (vários workers podem rodar ao mesmo tempo), e apaga os relatórios mais '
+        'antigos que RELATORIO_JOB_RETENCAO_DIAS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Processa os jobs pendentes e encerra quando a fila esvaziar')
+        parser.add_argument('--intervalo', type=float, default=2.0, help='Segundos de espera quando a fila está vazia')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            reconstruidos = reconstruir_pendentes()
+            if reconstruidos is not None:
+                self.stdout.write(self.style.SUCCESS(f'Resumos de {reconstruidos} funcionário(s) reconstruídos.'))
+
+            job = reivindicar_job()
+            if job is None:
+                if reconstruidos is not None:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['intervalo'])
+                continue
+
+            if processar_job(job) is None:
+                self.stdout.write(self.style.WARNING(
+                    f'Relatório #{job.pk} reivindicado por outro worker; resultado descartado.'
+                ))
+            elif job.status == RelatorioJob.Status.CONCLUIDO:
+                self.stdout.write(self.style.SUCCESS(f'Relatório #{job.pk} gerado com sucesso!'))
+            else:
+                self.stdout.write(self.style.ERROR(f'Erro ao gerar o relatório #{job.pk}: {job.erro}'))
+
+            apagados = limpar_jobs_antigos()
+            if apagados:
+                self.stdout.write(f'{apagados} relatório(s) antigo(s) apagado(s).')
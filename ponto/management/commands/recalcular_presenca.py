@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from ponto.utils.presenca import recalcular_presenca
+
+class Command(BaseCommand):
+    help = 'Recalcula a presença de hoje em cache do painel da página inicial (agende a cada poucos minutos)'
+
+    def handle(self, *args, **options):
+        presencas = recalcular_presenca()
+        self.stdout.write(self.style.SUCCESS(f'Presença de {len(presencas)} empresas recalculada com sucesso!'))
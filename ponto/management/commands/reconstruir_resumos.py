@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from ponto.utils.resumos import reconstruir_resumos
+
+class Command(BaseCommand):
+    help = 'Reconstrói os resumos diários e mensais a partir dos registros de ponto (use após cargas em massa)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None, help='Registros lidos por lote (padrão RELATORIO_CHUNK_SIZE)')
+
+    def handle(self, *args, **options):
+        total = reconstruir_resumos(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'{total} resumos diários de funcionários reconstruídos com sucesso!'))
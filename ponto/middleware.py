@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+from ponto.utils.replicas import registrar_escrita
+
+class JanelaEscritaMiddleware(MiddlewareMixin):
+    """
+    Registra as requisições de escrita (métodos diferentes de GET, HEAD, OPTIONS e TRACE) quando há
+    réplicas de leitura configuradas.
+
+    Depois de uma escrita, as leituras do mesmo usuário ficam no banco principal por
+    `PONTO_REPLICAS_JANELA` segundos (veja `ponto.utils.replicas`). O usuário é lido depois da view,
+    para incluir os autenticados por HTTP Basic (Django REST framework e marcação em um toque).
+
+    Como os middlewares do Django, funciona nos dois modos: no ASGI, as views assíncronas não são
+    desviadas para uma thread por causa deste middleware.
+    """
+    def process_response(self, request, response):
+        if settings.PONTO_REPLICAS and request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            registrar_escrita(getattr(request, 'user', None))
+        return response
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0003_relatoriojob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minutos_trabalhados', models.IntegerField(default=0)),
+                ('atraso_segundos', models.IntegerField(default=0)),
+                ('extra_segundos', models.IntegerField(default=0)),
+                ('registros', models.IntegerField(default=0)),
+                ('marcacoes_faltantes', models.IntegerField(default=0)),
+                ('data', models.DateField()),
+                ('empresa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_diarios', to='ponto.empresa')),
+                ('funcionario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumos_diarios', to='ponto.funcionario')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('funcionario', 'data'), name='resumo_diario_funcionario_unico'), models.UniqueConstraint(condition=models.Q(('funcionario__isnull', True)), fields=('empresa', 'data'), name='resumo_diario_empresa_unico')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumoMensal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minutos_trabalhados', models.IntegerField(default=0)),
+                ('atraso_segundos', models.IntegerField(default=0)),
+                ('extra_segundos', models.IntegerField(default=0)),
+                ('registros', models.IntegerField(default=0)),
+                ('marcacoes_faltantes', models.IntegerField(default=0)),
+                ('mes', models.DateField()),
+                ('empresa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_mensais', to='ponto.empresa')),
+                ('funcionario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumos_mensais', to='ponto.funcionario')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('funcionario', 'mes'), name='resumo_mensal_funcionario_unico'), models.UniqueConstraint(condition=models.Q(('funcionario__isnull', True)), fields=('empresa', 'mes'), name='resumo_mensal_empresa_unico')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:47
+
+import datetime
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0004_resumos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Jornada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=100)),
+                ('inicio', models.TimeField(default=datetime.time(8, 0))),
+                ('fim', models.TimeField(default=datetime.time(17, 0))),
+                ('intervalo_minutos', models.PositiveIntegerField(default=60)),
+                ('dias_semana', models.CharField(default='12345', max_length=7, validators=[django.core.validators.RegexValidator('^[1-7]{1,7}$', 'Informe os dias como dígitos de 1 (segunda) a 7 (domingo).')])),
+                ('tolerancia_minutos', models.PositiveIntegerField(default=0)),
+                ('padrao', models.BooleanField(default=False)),
+                ('empresa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jornadas', to='ponto.empresa')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='funcionario',
+            name='jornada',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='funcionarios', to='ponto.jornada'),
+        ),
+        migrations.AddConstraint(
+            model_name='jornada',
+            constraint=models.UniqueConstraint(condition=models.Q(('padrao', True)), fields=('empresa',), name='jornada_padrao_unica_por_empresa'),
+        ),
+    ]
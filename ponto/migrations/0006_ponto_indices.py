@@ -0,0 +1,49 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def verificar_duplicados(apps, schema_editor):
+    """
+    Interrompe a migração se houver mais de um ponto por funcionário no mesmo dia.
+
+    Os registros duplicados não são removidos automaticamente: devem ser revisados e
+    unificados antes de aplicar a restrição de unicidade.
+    """
+    Ponto = apps.get_model('ponto', 'Ponto')
+    duplicados = (
+        Ponto.objects.values('funcionario_id', 'data')
+        .annotate(total=models.Count('id')).filter(total__gt=1).order_by('funcionario_id', 'data')
+    )
+    exemplos = [f"funcionário {d['funcionario_id']} em {d['data']}" for d in duplicados[:10]]
+    if exemplos:
+        raise RuntimeError(
+            f"Existem {duplicados.count()} dias com mais de um ponto para o mesmo funcionário "
+            f"(por exemplo: {'; '.join(exemplos)}). Unifique esses registros antes de migrar."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0005_jornadas'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_duplicados, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ponto',
+            index=models.Index(fields=['data', 'id'], name='ponto_data_id_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='ponto',
+            constraint=models.UniqueConstraint(fields=('funcionario', 'data'), name='ponto_unico_por_funcionario_dia'),
+        ),
+        # O índice simples de funcionario só é removido depois que o índice único existe
+        migrations.AlterField(
+            model_name='ponto',
+            name='funcionario',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='pontos', to='ponto.funcionario'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Índices das buscas de `ponto.utils.autocomplete`. O Django compila `istartswith`/`icontains` como
+# UPPER("coluna"::text) LIKE UPPER(...), então os índices são sobre a mesma expressão:
+# - text_pattern_ops atende aos prefixos (LIKE 'ABC%') de nome de usuário e e-mail;
+# - gin_trgm_ops (pg_trgm) atende a trechos em qualquer posição do nome da empresa.
+# Outros bancos não suportam essas classes de operadores e seguem sem os índices.
+CRIAR = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    'CREATE INDEX IF NOT EXISTS ponto_user_username_prefixo_idx ON auth_user (UPPER("username"::text) text_pattern_ops)',
+    'CREATE INDEX IF NOT EXISTS ponto_user_email_prefixo_idx ON auth_user (UPPER("email"::text) text_pattern_ops)',
+    'CREATE INDEX IF NOT EXISTS ponto_empresa_nome_trgm_idx ON ponto_empresa USING gin (UPPER("nome"::text) gin_trgm_ops)',
+]
+REMOVER = [
+    "DROP INDEX IF EXISTS ponto_user_username_prefixo_idx",
+    "DROP INDEX IF EXISTS ponto_user_email_prefixo_idx",
+    "DROP INDEX IF EXISTS ponto_empresa_nome_trgm_idx",
+]
+
+
+def criar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for comando in CRIAR:
+            schema_editor.execute(comando)
+
+
+def remover_indices(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for comando in REMOVER:
+            schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('ponto', '0006_ponto_indices'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
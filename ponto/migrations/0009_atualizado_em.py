@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0008_indices_autocomplete'),
+    ]
+
+    # Preenchimento dos registros existentes: para campos `auto_now`, o Django usa o momento da
+    # migração como valor padrão temporário da coluna, que o PostgreSQL (11+) aplica sem reescrever
+    # a tabela. Os registros antigos passam a ser considerados alterados agora, o que só faz os
+    # clientes revalidarem as páginas uma vez.
+    operations = [
+        migrations.AddField(
+            model_name='empresa',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='funcionario',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='ponto',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='ponto',
+            index=models.Index(fields=['atualizado_em'], name='ponto_atualizado_em_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0009_atualizado_em'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReconstrucaoResumos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('empresa_id', models.IntegerField()),
+                ('jornada_id', models.IntegerField()),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
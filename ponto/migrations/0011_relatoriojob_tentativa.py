@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0010_reconstrucao_resumos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='relatoriojob',
+            name='tentativa',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
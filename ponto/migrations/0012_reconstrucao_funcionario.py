@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0011_relatoriojob_tentativa'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reconstrucaoresumos',
+            name='funcionario_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='reconstrucaoresumos',
+            name='jornada_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,116 @@
+from django.db import migrations
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+METRICAS = ('minutos_trabalhados', 'atraso_segundos', 'extra_segundos', 'registros', 'marcacoes_faltantes')
+LOTE = 2000
+
+# Cópia congelada do cálculo de `ponto.engine` nesta versão: a migração não pode importar o código
+# atual, que muda com o tempo. 8h em todos os dias, sem tolerância, sem jornada cadastrada.
+JORNADA_PADRAO = ((8 * 3600,) * 7, 0)
+
+
+def _segundos(horario):
+    return horario.hour * 3600 + horario.minute * 60 + horario.second
+
+
+def _regra(jornada):
+    """
+    Retorna (segundos esperados de segunda a domingo, tolerância em segundos) de uma jornada.
+    """
+    minutos = (jornada.fim.hour * 60 + jornada.fim.minute) - (jornada.inicio.hour * 60 + jornada.inicio.minute)
+    if minutos <= 0:
+        minutos += 24 * 60
+    minutos -= jornada.intervalo_minutos
+    return tuple(minutos * 60 if str(dia + 1) in jornada.dias_semana else 0 for dia in range(7)), jornada.tolerancia_minutos * 60
+
+
+def _metricas(data, entrada, intervalo, saida, regra):
+    """
+    Minutos trabalhados, atraso e horas extras (em segundos) de um registro de ponto.
+    """
+    if entrada is None or saida is None:
+        return 0, 0, 0
+    entrada, saida = _segundos(entrada), _segundos(saida)
+    # O intervalo é contado em minutos inteiros
+    intervalo = _segundos(intervalo) // 60 * 60 if intervalo is not None else 0
+    minutos = saida // 60 - entrada // 60 - intervalo // 60
+    segundos_por_dia, tolerancia = regra
+    diferenca = saida - entrada - intervalo - segundos_por_dia[data.weekday()]
+    atraso = -diferenca if -diferenca > tolerancia else 0
+    extra = diferenca if diferenca > tolerancia else 0
+    return minutos, atraso, extra
+
+
+def preencher_resumos(apps, schema_editor):
+    """
+    Refaz os resumos diários e mensais a partir dos pontos existentes, como `reconstruir_resumos`.
+
+    A `0004_resumos` criou as tabelas vazias: em um banco com dados, a primeira edição de um ponto
+    criava os resumos da empresa e do mês apenas com a diferença daquele dia. Os resumos são
+    descartados e refeitos com a jornada de cada funcionário (a própria ou a padrão da empresa).
+    Os pontos são lidos um funcionário por vez, em ordem de data, em lotes de `LOTE`.
+    """
+    Ponto = apps.get_model('ponto', 'Ponto')
+    Funcionario = apps.get_model('ponto', 'Funcionario')
+    Jornada = apps.get_model('ponto', 'Jornada')
+    ResumoDiario = apps.get_model('ponto', 'ResumoDiario')
+    ResumoMensal = apps.get_model('ponto', 'ResumoMensal')
+
+    ResumoDiario.objects.all().delete()
+    ResumoMensal.objects.all().delete()
+
+    regras = {jornada.pk: _regra(jornada) for jornada in Jornada.objects.all()}
+    padrao_da_empresa = dict(Jornada.objects.filter(padrao=True).values_list('empresa_id', 'pk'))
+
+    for funcionario_id, empresa_id, jornada_id in Funcionario.objects.order_by('pk').values_list('pk', 'empresa_id', 'jornada_id'):
+        regra = regras.get(jornada_id) or regras.get(padrao_da_empresa.get(empresa_id)) or JORNADA_PADRAO
+        pontos = Ponto.objects.filter(funcionario_id=funcionario_id).order_by('data').values_list(
+            'data', 'entrada', 'intervalo', 'saida'
+        )
+
+        def resumos_diarios():
+            dia, metricas = None, None
+            for data, entrada, intervalo, saida in pontos.iterator(chunk_size=LOTE):
+                if data != dia:
+                    if dia:
+                        yield ResumoDiario(funcionario_id=funcionario_id, empresa_id=empresa_id, data=dia, **metricas)
+                    dia, metricas = data, dict.fromkeys(METRICAS, 0)
+                minutos, atraso, extra = _metricas(data, entrada, intervalo, saida, regra)
+                metricas['minutos_trabalhados'] += minutos
+                metricas['atraso_segundos'] += atraso
+                metricas['extra_segundos'] += extra
+                metricas['registros'] += 1
+                metricas['marcacoes_faltantes'] += sum(valor is None for valor in (entrada, intervalo, saida))
+            if dia:
+                yield ResumoDiario(funcionario_id=funcionario_id, empresa_id=empresa_id, data=dia, **metricas)
+
+        ResumoDiario.objects.bulk_create(resumos_diarios(), batch_size=LOTE)
+
+    somas = {campo: Sum(campo) for campo in METRICAS}
+    diarios = ResumoDiario.objects.filter(funcionario__isnull=False)
+    ResumoMensal.objects.bulk_create(
+        (ResumoMensal(**resumo) for resumo in
+         diarios.annotate(mes=TruncMonth('data')).values('empresa_id', 'funcionario_id', 'mes').annotate(**somas).order_by()),
+        batch_size=LOTE,
+    )
+    ResumoDiario.objects.bulk_create(
+        [ResumoDiario(**resumo) for resumo in diarios.values('empresa_id', 'data').annotate(**somas).order_by()],
+        batch_size=LOTE,
+    )
+    ResumoMensal.objects.bulk_create(
+        [ResumoMensal(**resumo) for resumo in
+         ResumoMensal.objects.filter(funcionario__isnull=False).values('empresa_id', 'mes').annotate(**somas).order_by()],
+        batch_size=LOTE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ponto', '0012_reconstrucao_funcionario'),
+    ]
+
+    operations = [
+        migrations.RunPython(preencher_resumos, migrations.RunPython.noop),
+    ]
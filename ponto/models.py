@@ -1,5 +1,11 @@
+from datetime import time
+from django.core.exceptions import ValidationError
+from django.core.validators import RegexValidator
 from django.db import models
-from django.utils.timezone import now, localtime
+from django.db.models import Case, F, FilteredRelation, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Coalesce, ExtractHour, ExtractIsoWeekDay, ExtractMinute, ExtractSecond, StrIndex
+from django.db.models.lookups import GreaterThan
+from django.utils.timezone import now
 from django.contrib.auth.models import User
 
 class Empresa(models.Model):
@@ -9,16 +15,57 @@ class Empresa(models.Model):
         nome (str): O nome da empresa.
         endereco (str): O endereço da empresa.
         telefone (str): O número de telefone da empresa.
+        atualizado_em (datetime): Momento da última gravação, mantido pelo Django (`auto_now`).
     Métodos:
         __str__(): Retorna o nome da empresa como sua representação em string.
     """
     nome = models.CharField(max_length=255)
     endereco = models.TextField()
     telefone = models.CharField(max_length=20)
+    atualizado_em = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.nome
 
+class Jornada(models.Model):
+    """
+    A classe Jornada representa o horário de trabalho esperado de uma empresa ou de um grupo de funcionários.
+
+    A jornada marcada como `padrao` vale para todos os funcionários da empresa que não têm uma
+    jornada própria (`Funcionario.jornada`). Sem nenhuma jornada cadastrada, vale a jornada
+    padrão de `ponto.engine.JORNADA_PADRAO` (8h às 17h, com 1h de intervalo, todos os dias).
+
+    Atributos:
+        nome (str): Nome da jornada (por exemplo, "Comercial" ou "Turno da noite").
+        empresa (ForeignKey): Empresa dona da jornada.
+        inicio (TimeField): Horário de entrada esperado.
+        fim (TimeField): Horário de saída esperado (antes do início para turnos que viram a noite).
+        intervalo_minutos (int): Duração do intervalo, em minutos.
+        dias_semana (str): Dias trabalhados, como dígitos de 1 (segunda) a 7 (domingo); "12345" é de segunda a sexta.
+        tolerancia_minutos (int): Diferença diária, para mais ou para menos, que não conta como atraso nem hora extra.
+        padrao (bool): Se é a jornada padrão da empresa (no máximo uma por empresa).
+    """
+    nome = models.CharField(max_length=100)
+    empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE, related_name='jornadas')
+    inicio = models.TimeField(default=time(8, 0))
+    fim = models.TimeField(default=time(17, 0))
+    intervalo_minutos = models.PositiveIntegerField(default=60)
+    dias_semana = models.CharField(
+        max_length=7,
+        default='12345',
+        validators=[RegexValidator(r'^[1-7]{1,7}$', "Informe os dias como dígitos de 1 (segunda) a 7 (domingo).")],
+    )
+    tolerancia_minutos = models.PositiveIntegerField(default=0)
+    padrao = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['empresa'], condition=models.Q(padrao=True), name='jornada_padrao_unica_por_empresa'),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} ({self.empresa})"
+
 class Funcionario(models.Model):
     """
         Uma classe usada para representar um Funcionário.
@@ -28,6 +75,8 @@ class Funcionario(models.Model):
             Um relacionamento um-para-um com o modelo User. Pode ser nulo ou em branco.
             Um relacionamento de chave estrangeira com o modelo Empresa. Não pode ser nulo ou em branco.
             Um campo de caracteres para armazenar o número de telefone do funcionário. Pode ser nulo ou em branco.
+            Uma jornada própria (Jornada), que substitui a jornada padrão da empresa. Pode ser nula.
+            O momento da última gravação (atualizado_em), mantido pelo Django.
 
         Métodos
             Retorna o nome de usuário do usuário associado, se existir, caso contrário, retorna "Funcionário sem usuário".
@@ -35,11 +84,116 @@ class Funcionario(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='funcionario', null=True, blank=True)
     empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE, related_name='funcionarios')
     telefone = models.CharField(max_length=15, blank=True, null=True)
+    jornada = models.ForeignKey(Jornada, on_delete=models.SET_NULL, related_name='funcionarios', null=True, blank=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Guarda empresa e jornada originais para que os resumos sejam refeitos se elas mudarem
+        instance._regra_original = (instance.__dict__.get('empresa_id'), instance.__dict__.get('jornada_id'))
+        return instance
 
     def __str__(self):
         return self.user.username if self.user else "Funcionário sem usuário"
 
 
+def _minutos_do_dia(horario):
+    return ExtractHour(horario) * 60 + ExtractMinute(horario)
+
+def _segundos_do_dia(horario):
+    return _minutos_do_dia(horario) * 60 + ExtractSecond(horario)
+
+class PontoQuerySet(models.QuerySet):
+    def com_horas(self):
+        """
+        Anota os minutos trabalhados, o atraso e as horas extras de cada ponto como expressões SQL.
+
+        Os valores são os mesmos de `ponto.engine` (e dos resumos), mas calculados pelo banco, então
+        podem ser usados em `filter`, `order_by` e `aggregate` sem carregar os registros:
+
+            Ponto.objects.com_horas().filter(minutos_trabalhados__gt=600).aggregate(Sum('extra_segundos'))
+
+        A jornada de cada ponto é a do funcionário ou, na falta dela, a jornada padrão da empresa,
+        lidas por junções; sem nenhuma das duas, vale `JORNADA_PADRAO`.
+
+        Anotações:
+            minutos_trabalhados (int): Minutos trabalhados (0 sem entrada ou saída).
+            atraso_segundos (int): Atraso em segundos, fora da tolerância da jornada.
+            extra_segundos (int): Horas extras em segundos, fora da tolerância da jornada.
+        """
+        # Importação tardia: ponto.engine importa este módulo
+        from ponto.engine.regras import JORNADA_PADRAO
+
+        def da_jornada(campo):
+            # Os campos da jornada nunca são nulos: a primeira jornada existente é a que vale
+            return Coalesce(F(f'funcionario__jornada__{campo}'), F(f'jornada_da_empresa__{campo}'))
+
+        entrada = _segundos_do_dia('entrada')
+        saida = _segundos_do_dia('saida')
+        # Como na engine, o intervalo é contado em minutos inteiros
+        intervalo = Coalesce(_minutos_do_dia('intervalo'), Value(0))
+        completo = Q(entrada__isnull=False, saida__isnull=False)
+        intervalo_jornada = da_jornada('intervalo_minutos')
+
+        pontos = self.alias(
+            jornada_da_empresa=FilteredRelation(
+                'funcionario__empresa__jornadas', condition=Q(funcionario__empresa__jornadas__padrao=True),
+            ),
+        ).alias(
+            trabalhado_segundos=saida - entrada - intervalo * 60,
+            dia_da_semana=Cast(ExtractIsoWeekDay('data'), models.CharField(max_length=1)),
+            duracao_jornada=_minutos_do_dia(da_jornada('fim')) - _minutos_do_dia(da_jornada('inicio')),
+        ).alias(
+            esperado_segundos=Case(
+                When(
+                    Q(funcionario__jornada__isnull=False) | Q(jornada_da_empresa__isnull=False),
+                    then=Case(
+                        When(
+                            GreaterThan(StrIndex(da_jornada('dias_semana'), F('dia_da_semana')), 0),
+                            then=Case(
+                                # Jornadas que atravessam a meia-noite terminam no dia seguinte
+                                When(duracao_jornada__lte=0, then=(F('duracao_jornada') + 24 * 60 - intervalo_jornada) * 60),
+                                default=(F('duracao_jornada') - intervalo_jornada) * 60,
+                            ),
+                        ),
+                        default=Value(0),
+                    ),
+                ),
+                *[
+                    When(data__iso_week_day=dia, then=Value(segundos))
+                    for dia, segundos in enumerate(JORNADA_PADRAO.segundos_por_dia, start=1)
+                ],
+                default=Value(0),
+            ),
+            tolerancia_segundos=Coalesce(
+                da_jornada('tolerancia_minutos') * 60, Value(JORNADA_PADRAO.tolerancia_segundos),
+            ),
+        ).alias(
+            diferenca_segundos=F('trabalhado_segundos') - F('esperado_segundos'),
+        )
+        # No PostgreSQL, EXTRACT devolve numeric; os resultados voltam a ser inteiros
+        return pontos.annotate(
+            minutos_trabalhados=Cast(
+                Case(When(completo, then=_minutos_do_dia('saida') - _minutos_do_dia('entrada') - intervalo), default=Value(0)),
+                IntegerField(),
+            ),
+            atraso_segundos=Cast(
+                Case(
+                    When(completo, diferenca_segundos__lt=-F('tolerancia_segundos'), then=-F('diferenca_segundos')),
+                    default=Value(0),
+                ),
+                IntegerField(),
+            ),
+            extra_segundos=Cast(
+                Case(
+                    When(completo, diferenca_segundos__gt=F('tolerancia_segundos'), then=F('diferenca_segundos')),
+                    default=Value(0),
+                ),
+                IntegerField(),
+            ),
+        )
+
 class Ponto(models.Model):
     """
     A classe Ponto representa o registro de ponto de um funcionário em um determinado dia.
@@ -50,27 +204,58 @@ class Ponto(models.Model):
         entrada (TimeField): Horário de entrada do funcionário.
         intervalo (TimeField): Horário de início do intervalo do funcionário.
         saida (TimeField): Horário de saída do funcionário.
+        atualizado_em (DateTimeField): Momento da última gravação, mantido pelo Django (`auto_now`) e
+            pelas gravações diretas no banco (`bater_ponto`, `ingerir_pontos`).
+
+    Cada funcionário tem no máximo um ponto por dia. O índice único de (funcionario, data) atende
+    também às consultas por funcionário e período; o índice de (data, id) atende aos períodos sem
+    filtro de funcionário e à paginação por cursor da listagem. O índice de `atualizado_em` responde
+    ao MAX das respostas condicionais (`ponto.utils.condicional`) sem percorrer a tabela.
+
+    `Ponto.objects.com_horas()` anota as horas, o atraso e as horas extras calculados pelo banco.
 
     Métodos:
         horas_trabalhadas():
             Calcula e retorna o total de horas trabalhadas no formato "Xh Ym".
             Se os horários de entrada ou saída não estiverem definidos, retorna "N/A".
     """
-    funcionario = models.ForeignKey(Funcionario, on_delete=models.CASCADE, related_name='pontos')
+    # Sem índice próprio: coberto pelo índice único de (funcionario, data)
+    funcionario = models.ForeignKey(Funcionario, on_delete=models.CASCADE, related_name='pontos', db_index=False)
     data = models.DateField(default=now)
     entrada = models.TimeField(null=True, blank=True)
     intervalo = models.TimeField(null=True, blank=True)
     saida = models.TimeField(null=True, blank=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    objects = PontoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['data', 'id'], name='ponto_data_id_idx'),
+            models.Index(fields=['atualizado_em'], name='ponto_atualizado_em_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['funcionario', 'data'], name='ponto_unico_por_funcionario_dia'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Guarda o dia original para que os resumos do dia antigo sejam corrigidos se ele mudar
+        instance._chave_resumo = (instance.__dict__.get('funcionario_id'), instance.__dict__.get('data'))
+        return instance
+
+    def unique_error_message(self, model_class, unique_check):
+        if model_class is Ponto and tuple(unique_check) == ('funcionario', 'data'):
+            return ValidationError("Já existe um ponto deste funcionário nesta data.", code='unique_together')
+        return super().unique_error_message(model_class, unique_check)
 
     def horas_trabalhadas(self):
+        # Para muitos registros de uma vez, prefira ponto.engine.calcular_jornadas
         if self.entrada and self.saida:
-            # Converte entrada e saída para o horário local
-            entrada_local = localtime().replace(hour=self.entrada.hour, minute=self.entrada.minute)
-            saida_local = localtime().replace(hour=self.saida.hour, minute=self.saida.minute)
-
             # Cálculo de horas trabalhadas
-            entrada_delta = entrada_local.hour * 60 + entrada_local.minute
-            saida_delta = saida_local.hour * 60 + saida_local.minute
+            entrada_delta = self.entrada.hour * 60 + self.entrada.minute
+            saida_delta = self.saida.hour * 60 + self.saida.minute
             intervalo_delta = (
                 self.intervalo.hour * 60 + self.intervalo.minute
                 if self.intervalo else 0
@@ -78,3 +263,162 @@ class Ponto(models.Model):
             total_trabalhado = saida_delta - entrada_delta - intervalo_delta
             return f"{total_trabalhado // 60}h {total_trabalhado % 60}m"
         return "N/A"
+
+
+class RelatorioJob(models.Model):
+    """
+    A classe RelatorioJob representa a solicitação de um relatório de pontos gerado em segundo plano.
+
+    Os jobs ficam na própria base de dados e são consumidos pelo comando `processar_relatorios`,
+    que reivindica cada job com `SELECT ... FOR UPDATE SKIP LOCKED`, então vários workers podem
+    rodar ao mesmo tempo sem processar o mesmo job duas vezes. Cada reivindicação incrementa
+    `tentativa`; o resultado só é gravado se o job ainda estiver na tentativa do worker que o gerou.
+
+    Atributos:
+        usuario (ForeignKey): Usuário que solicitou o relatório; apenas ele pode consultá-lo e baixá-lo.
+        funcionario (ForeignKey): Funcionário filtrado no relatório, se houver.
+        data_inicio (DateField): Data de início do filtro, se houver.
+        data_fim (DateField): Data de fim do filtro, se houver.
+        status (CharField): Situação do job (pendente, processando, concluído ou erro).
+        arquivo (FileField): PDF gerado, disponível quando o job é concluído.
+        erro (TextField): Mensagem de erro, quando o processamento falha.
+        tentativa (PositiveIntegerField): Número de vezes que o job foi reivindicado.
+        criado_em, iniciado_em, concluido_em (DateTimeField): Marcos do processamento.
+
+    Métodos:
+        parametros():
+            Retorna os filtros do job no formato aceito por `filtrar_pontos`.
+    """
+    class Status(models.TextChoices):
+        PENDENTE = 'pendente', 'Pendente'
+        PROCESSANDO = 'processando', 'Processando'
+        CONCLUIDO = 'concluido', 'Concluído'
+        ERRO = 'erro', 'Erro'
+
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='relatorio_jobs')
+    funcionario = models.ForeignKey(Funcionario, on_delete=models.CASCADE, related_name='relatorio_jobs', null=True, blank=True)
+    data_inicio = models.DateField(null=True, blank=True)
+    data_fim = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDENTE)
+    arquivo = models.FileField(upload_to='relatorios/', blank=True)
+    erro = models.TextField(blank=True)
+    tentativa = models.PositiveIntegerField(default=0)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'criado_em']),
+        ]
+
+    def __str__(self):
+        return f"Relatório #{self.pk} ({self.get_status_display()})"
+
+    def parametros(self):
+        return {
+            'funcionario': self.funcionario_id,
+            'data_inicio': self.data_inicio,
+            'data_fim': self.data_fim,
+        }
+
+
+class ResumoBase(models.Model):
+    """
+    Métricas agregadas de jornada compartilhadas pelos resumos diário e mensal.
+
+    Atributos:
+        minutos_trabalhados (int): Soma dos minutos trabalhados.
+        atraso_segundos (int): Soma dos atrasos, em segundos.
+        extra_segundos (int): Soma das horas extras, em segundos.
+        registros (int): Quantidade de registros de ponto.
+        marcacoes_faltantes (int): Quantidade de marcações (entrada, intervalo ou saída) não preenchidas.
+    """
+    minutos_trabalhados = models.IntegerField(default=0)
+    atraso_segundos = models.IntegerField(default=0)
+    extra_segundos = models.IntegerField(default=0)
+    registros = models.IntegerField(default=0)
+    marcacoes_faltantes = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class ResumoDiario(ResumoBase):
+    """
+    Totais de jornada de um dia, por funcionário ou por empresa.
+
+    Linhas com `funcionario` preenchido resumem um funcionário; linhas com `funcionario` nulo
+    resumem toda a empresa naquele dia. São mantidas incrementalmente pelos sinais de Ponto
+    (`ponto.signals`) e podem ser reconstruídas com o comando `reconstruir_resumos`.
+
+    Atributos:
+        empresa (ForeignKey): Empresa do resumo.
+        funcionario (ForeignKey): Funcionário do resumo, ou nulo para o total da empresa.
+        data (DateField): Dia resumido.
+    """
+    empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE, related_name='resumos_diarios')
+    funcionario = models.ForeignKey(Funcionario, on_delete=models.CASCADE, related_name='resumos_diarios', null=True, blank=True)
+    data = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['funcionario', 'data'], name='resumo_diario_funcionario_unico'),
+            models.UniqueConstraint(
+                fields=['empresa', 'data'], condition=models.Q(funcionario__isnull=True), name='resumo_diario_empresa_unico'
+            ),
+        ]
+
+
+class ResumoMensal(ResumoBase):
+    """
+    Totais de jornada de um mês, por funcionário ou por empresa.
+
+    Segue as mesmas regras de `ResumoDiario`; `mes` é sempre o primeiro dia do mês.
+
+    Atributos:
+        empresa (ForeignKey): Empresa do resumo.
+        funcionario (ForeignKey): Funcionário do resumo, ou nulo para o total da empresa.
+        mes (DateField): Primeiro dia do mês resumido.
+    """
+    empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE, related_name='resumos_mensais')
+    funcionario = models.ForeignKey(Funcionario, on_delete=models.CASCADE, related_name='resumos_mensais', null=True, blank=True)
+    mes = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['funcionario', 'mes'], name='resumo_mensal_funcionario_unico'),
+            models.UniqueConstraint(
+                fields=['empresa', 'mes'], condition=models.Q(funcionario__isnull=True), name='resumo_mensal_empresa_unico'
+            ),
+        ]
+
+
+class ReconstrucaoResumos(models.Model):
+    """
+    Pedido de reconstrução dos resumos dos funcionários afetados por uma jornada alterada, ou de
+    um funcionário que trocou de jornada ou de empresa.
+
+    Gravado pelos sinais de `Jornada` e `Funcionario` em vez de reconstruir os resumos durante o
+    salvamento, que refaria o histórico de toda a empresa (ou do funcionário) antes de responder. A
+    fila fica no próprio banco e é consumida pelo comando `processar_relatorios`
+    (`ponto.utils.resumos.reconstruir_pendentes`).
+
+    A empresa, a jornada e o funcionário são guardados pelo id, sem chave estrangeira: a fila também
+    recebe pedidos de jornadas excluídas, inclusive na exclusão em cascata de uma empresa.
+
+    Atributos:
+        empresa_id (int): Empresa da jornada ou do funcionário.
+        jornada_id (int): Jornada alterada ou excluída (None nos pedidos de um funcionário).
+        funcionario_id (int): Funcionário que trocou de jornada ou de empresa (None nos pedidos de uma jornada).
+        criado_em (DateTimeField): Momento do pedido.
+    """
+    empresa_id = models.IntegerField()
+    jornada_id = models.IntegerField(null=True, blank=True)
+    funcionario_id = models.IntegerField(null=True, blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        if self.funcionario_id is not None:
+            return f"Reconstrução dos resumos do funcionário #{self.funcionario_id}"
+        return f"Reconstrução dos resumos da jornada #{self.jornada_id}"
@@ -0,0 +1,36 @@
+from django.conf import settings
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from ponto.utils.paginacao import PaginadorCursor
+
+class PaginacaoCursor(BasePagination):
+    """
+    Paginação por cursor da API, com o mesmo `PaginadorCursor` da listagem de pontos.
+
+    A ordenação vem do atributo `ordenacao_cursor` da view (campo principal e desempate único).
+    O tamanho da página vem de `?por_pagina=` (padrão `PONTO_API_POR_PAGINA`, até
+    `PONTO_API_MAXIMO_POR_PAGINA`) e a resposta traz as URLs da próxima página e da anterior.
+    """
+    def get_por_pagina(self, request):
+        try:
+            por_pagina = int(request.query_params.get('por_pagina', settings.PONTO_API_POR_PAGINA))
+        except ValueError:
+            por_pagina = settings.PONTO_API_POR_PAGINA
+        return min(max(por_pagina, 1), settings.PONTO_API_MAXIMO_POR_PAGINA)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginador = PaginadorCursor(queryset, self.get_por_pagina(request), view.ordenacao_cursor)
+        self.pagina = paginador.pagina(request.query_params.get('cursor'))
+        return list(self.pagina.object_list)
+
+    def _url(self, cursor):
+        return replace_query_param(self.request.build_absolute_uri(), 'cursor', cursor) if cursor else None
+
+    def get_paginated_response(self, data):
+        return Response({
+            'proxima': self._url(self.pagina.cursor_proximo),
+            'anterior': self._url(self.pagina.cursor_anterior),
+            'resultados': data,
+        })
@@ -0,0 +1,41 @@
+import codecs
+import csv
+import io
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+# Colunas da exportação de pontos (`ponto.utils.exports.CABECALHO`) e os campos da ingestão
+# correspondentes; as colunas calculadas (horas trabalhadas, atrasos e extras) são ignoradas
+COLUNAS_EXPORTACAO = {
+    "Funcionário": 'usuario',
+    "Data": 'data',
+    "Entrada": 'entrada',
+    "Intervalo": 'intervalo',
+    "Saída": 'saida',
+}
+
+class CSVParser(BaseParser):
+    """
+    Lê um corpo `text/csv` com cabeçalho como uma lista de dicionários (um por linha).
+
+    As colunas são as da ingestão de pontos: `funcionario` (id) ou `usuario`, `data`, `entrada`,
+    `intervalo` e `saida`. O cabeçalho da exportação de pontos ("Funcionário", "Data", "Entrada",
+    "Intervalo", "Saída", ...) também é aceito, então um arquivo exportado pode ser reenviado.
+    Separado por vírgulas, em UTF-8 (com ou sem BOM); células vazias são tratadas como valores
+    não informados.
+    """
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name == 'utf-8':
+            encoding = 'utf-8-sig'
+        try:
+            texto = stream.read().decode(encoding) if stream is not None else ''
+            leitor = csv.DictReader(io.StringIO(texto, newline=''))
+            if leitor.fieldnames:
+                leitor.fieldnames = [COLUNAS_EXPORTACAO.get(nome.strip(), nome.strip()) for nome in leitor.fieldnames]
+            return list(leitor)
+        except (UnicodeDecodeError, csv.Error) as erro:
+            raise ParseError(f"CSV inválido: {erro}")
@@ -0,0 +1,56 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+# Réplica escolhida para as leituras do bloco `usando_replica` atual (None = banco principal)
+_replica_atual = ContextVar('ponto_replica_atual', default=None)
+
+@contextmanager
+def usando_replica():
+    """
+    Encaminha para uma réplica de leitura as consultas dos modelos de ponto feitas dentro do bloco.
+
+    A réplica é sorteada uma vez entre `PONTO_REPLICAS` e usada em todo o bloco, para que as
+    consultas de uma mesma requisição vejam o mesmo estado. Sem réplicas configuradas, nada muda.
+    """
+    replicas = settings.PONTO_REPLICAS
+    token = _replica_atual.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _replica_atual.reset(token)
+
+def lendo_da_replica():
+    return _replica_atual.get() is not None
+
+
+class RoteadorReplicas:
+    """
+    Roteador de banco de dados para réplicas de leitura (`DATABASE_ROUTERS`).
+
+    Por padrão, tudo vai para o banco principal ('default'). Apenas leituras dos modelos do app
+    `ponto` feitas dentro de `usando_replica` vão para a réplica escolhida; as do app `auth` (sessões
+    e usuários da autenticação) continuam no principal, para que um login recém-feito não seja
+    perdido por atraso da replicação. Escritas sempre vão para o principal, inclusive ao salvar
+    uma instância lida da réplica. As réplicas não recebem migrações: são cópias do principal.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'ponto':
+            return _replica_atual.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        bancos = {'default', *settings.PONTO_REPLICAS}
+        if obj1._state.db in bancos and obj2._state.db in bancos:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.PONTO_REPLICAS:
+            return False
+        return None
@@ -1,19 +1,60 @@
 from rest_framework import serializers
+from ponto.engine import calcular_jornadas
 from .models import Empresa, Funcionario, Ponto
 
-class EmpresaSerializer(serializers.ModelSerializer):
+class CamposEsparsosMixin:
+    """
+    Limita a representação aos campos pedidos em `?fields=campo1,campo2` (sparse fieldsets).
+
+    Vale apenas para leituras (GET, HEAD): nas escritas, a validação precisa de todos os campos.
+    Campos desconhecidos respondem 400.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD') or 'fields' not in request.query_params:
+            return
+        pedidos = {campo.strip() for campo in request.query_params['fields'].split(',') if campo.strip()}
+        desconhecidos = pedidos - set(self.fields)
+        if desconhecidos:
+            raise serializers.ValidationError({'fields': [f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}."]})
+        for campo in set(self.fields) - pedidos:
+            self.fields.pop(campo)
+
+class EmpresaSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     class Meta:
         model = Empresa
         fields = '__all__'
 
-class FuncionarioSerializer(serializers.ModelSerializer):
+class FuncionarioSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
+    usuario = serializers.CharField(source='user.username', read_only=True, default=None)
+    empresa_nome = serializers.CharField(source='empresa.nome', read_only=True)
+
     class Meta:
         model = Funcionario
         fields = '__all__'
 
-class PontoSerializer(serializers.ModelSerializer):
-    horas_trabalhadas = serializers.ReadOnlyField()
+class PontoListSerializer(serializers.ListSerializer):
+    """
+    Calcula as horas trabalhadas de todos os pontos da lista de uma vez, com `ponto.engine`.
+    """
+    def to_representation(self, data):
+        pontos = list(data.all() if hasattr(data, 'all') else data)
+        if 'horas_trabalhadas' in self.child.fields:
+            for ponto, jornada in zip(pontos, calcular_jornadas(pontos)):
+                ponto.jornada = jornada
+        return super().to_representation(pontos)
+
+class PontoSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
+    funcionario_nome = serializers.CharField(source='funcionario.user.username', read_only=True, default=None)
+    horas_trabalhadas = serializers.SerializerMethodField()
 
     class Meta:
         model = Ponto
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        list_serializer_class = PontoListSerializer
+
+    def get_horas_trabalhadas(self, ponto):
+        # Nas listas, calculado em lote por PontoListSerializer; em um registro isolado, pelo modelo
+        jornada = getattr(ponto, 'jornada', None)
+        return jornada.horas_trabalhadas if jornada is not None else ponto.horas_trabalhadas()
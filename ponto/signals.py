@@ -0,0 +1,125 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+from ponto.models import Empresa, Funcionario, Jornada, Ponto
+from ponto.utils.cache import incrementar_versao_dados, incrementar_versao_jornadas, registrar_alteracao_cadastros
+from ponto.utils.presenca import atualizar_presenca, invalidar_presenca
+from ponto.utils.resumos import agendar_reconstrucao, atualizar_resumo_dia, descontar_resumos_funcionario
+
+@receiver([post_save, post_delete], sender=Ponto)
+@receiver([post_save, post_delete], sender=Funcionario)
+@receiver([post_save, post_delete], sender=Empresa)
+@receiver([post_save, post_delete], sender=Jornada)
+def invalidar_relatorios(sender, **kwargs):
+    """
+    Incrementa a versão dos dados sempre que um registro usado nos relatórios é salvo ou removido.
+    Operações em massa (`bulk_create`, `update`) não disparam sinais e devem chamar
+    `incrementar_versao_dados()` diretamente.
+
+    O incremento é feito após o commit (`transaction.on_commit`): dentro de uma transação, uma
+    leitura concorrente feita entre o incremento e o commit ainda veria os dados antigos e os
+    guardaria no cache sob a nova versão. Fora de transações, ele é imediato.
+    """
+    transaction.on_commit(incrementar_versao_dados)
+
+@receiver(post_delete, sender=Ponto)
+@receiver([post_save, post_delete], sender=Funcionario)
+@receiver([post_save, post_delete], sender=Empresa)
+@receiver([post_save, post_delete], sender=Jornada)
+def registrar_cadastros(sender, **kwargs):
+    """
+    Registra a alteração de cadastros usada pelas respostas condicionais e pelos fragmentos em cache.
+
+    Pontos salvos não entram: a própria coluna `atualizado_em` registra a alteração. Registrada
+    após o commit, como em `invalidar_relatorios`.
+    """
+    transaction.on_commit(registrar_alteracao_cadastros)
+
+@receiver(post_save, sender=User)
+def registrar_usuario(sender, update_fields=None, **kwargs):
+    """
+    Registra a alteração de cadastros quando muda um usuário, cujo nome aparece nas listagens.
+    A gravação do último login, a cada login, não muda nada exibido e é ignorada.
+    """
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        transaction.on_commit(registrar_alteracao_cadastros)
+
+@receiver([post_save, post_delete], sender=Ponto)
+def atualizar_presenca_ponto(sender, instance, **kwargs):
+    """
+    Atualiza a presença de hoje em cache do funcionário do ponto salvo ou removido.
+
+    Registrado antes de `atualizar_resumos`, que guarda a nova chave do ponto em `_chave_resumo`.
+    """
+    chaves = {(instance.funcionario_id, instance.data)}
+    anterior = getattr(instance, '_chave_resumo', None)
+    if anterior and None not in anterior:
+        chaves.add(anterior)
+    for funcionario_id, data in chaves:
+        atualizar_presenca(funcionario_id, data)
+
+@receiver([post_save, post_delete], sender=Ponto)
+def atualizar_resumos(sender, instance, **kwargs):
+    """
+    Atualiza os resumos diários e mensais do dia do ponto salvo ou removido.
+
+    Se a edição mudou o funcionário ou a data, o dia anterior também é recalculado.
+    Operações em massa não disparam sinais; depois delas, use o comando `reconstruir_resumos`.
+    """
+    chaves = {(instance.funcionario_id, instance.data)}
+    anterior = getattr(instance, '_chave_resumo', None)
+    if anterior and None not in anterior:
+        chaves.add(anterior)
+    for funcionario_id, data in chaves:
+        atualizar_resumo_dia(funcionario_id, data)
+    instance._chave_resumo = (instance.funcionario_id, instance.data)
+
+@receiver(pre_delete, sender=Funcionario)
+def remover_resumos_funcionario(sender, instance, **kwargs):
+    """
+    Desconta dos resumos da empresa os valores de um funcionário que será excluído.
+    """
+    descontar_resumos_funcionario(instance)
+
+@receiver([post_save, post_delete], sender=Jornada)
+def recalcular_jornada(sender, instance, **kwargs):
+    """
+    Invalida as regras compiladas e enfileira a reconstrução dos resumos afetados por uma jornada.
+
+    A reconstrução pode abranger o histórico de toda a empresa, então não é feita aqui, durante o
+    salvamento (ou a exclusão em cascata da empresa): o worker `processar_relatorios` a executa
+    (`reconstruir_pendentes`).
+    """
+    transaction.on_commit(incrementar_versao_jornadas)
+    agendar_reconstrucao(instance)
+
+@receiver([post_save, post_delete], sender=Funcionario)
+@receiver([post_save, post_delete], sender=Empresa)
+def invalidar_presenca_empresa(sender, instance, **kwargs):
+    """
+    Descarta a presença em cache das empresas cujo quadro de funcionários ou nome mudou.
+
+    Registrado antes de `recalcular_funcionario`, que guarda a nova empresa em `_regra_original`.
+    """
+    if sender is Empresa:
+        invalidar_presenca([instance.pk])
+        return
+    anterior = getattr(instance, '_regra_original', None)
+    invalidar_presenca([instance.empresa_id, anterior[0] if anterior else None])
+
+@receiver(post_save, sender=Funcionario)
+def recalcular_funcionario(sender, instance, created, **kwargs):
+    """
+    Invalida as regras compiladas e enfileira a reconstrução dos resumos de um funcionário que
+    trocou de jornada ou de empresa.
+
+    Como na jornada (`recalcular_jornada`), a reconstrução percorre todo o histórico do funcionário
+    e é feita pelo worker `processar_relatorios`, não durante o salvamento.
+    """
+    atual = (instance.empresa_id, instance.jornada_id)
+    anterior = getattr(instance, '_regra_original', None)
+    if not created and anterior is not None and anterior != atual:
+        transaction.on_commit(incrementar_versao_jornadas)
+        agendar_reconstrucao(funcionario=instance)
+    instance._regra_original = atual
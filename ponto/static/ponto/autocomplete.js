@@ -0,0 +1,55 @@
+// Campos de seleção com opções carregadas sob demanda (widget AutocompleteSelect e filtro da
+// lista de pontos). Cada <select data-autocomplete-url="..."> ganha uma caixa de busca; as
+// opções são buscadas no endpoint ao focar e a cada digitação.
+(function () {
+    function iniciar(select) {
+        var busca = document.createElement('input');
+        busca.type = 'search';
+        busca.className = 'form-control form-control-sm mb-1';
+        busca.placeholder = 'Buscar...';
+        busca.setAttribute('aria-label', 'Buscar opções');
+        select.parentNode.insertBefore(busca, select);
+
+        var espera = null;
+        var ultimoTermo = null;
+
+        function carregar() {
+            var termo = busca.value.trim();
+            if (termo === ultimoTermo) {
+                return;
+            }
+            ultimoTermo = termo;
+            var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(termo);
+            fetch(url, {credentials: 'same-origin'})
+                .then(function (resposta) { return resposta.json(); })
+                .then(function (dados) {
+                    if (termo !== ultimoTermo) {
+                        return;  // Resposta de uma busca antiga
+                    }
+                    var atual = select.value;
+                    // Mantém a opção vazia e a selecionada; substitui as demais
+                    Array.prototype.slice.call(select.options).forEach(function (opcao) {
+                        if (opcao.value !== '' && opcao.value !== atual) {
+                            opcao.remove();
+                        }
+                    });
+                    dados.resultados.forEach(function (item) {
+                        if (String(item.id) !== atual) {
+                            select.add(new Option(item.texto, item.id));
+                        }
+                    });
+                });
+        }
+
+        busca.addEventListener('input', function () {
+            clearTimeout(espera);
+            espera = setTimeout(carregar, 250);
+        });
+        busca.addEventListener('focus', carregar);
+        select.addEventListener('focus', carregar);
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(iniciar);
+    });
+})();
@@ -0,0 +1,57 @@
+import re
+from collections import Counter
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _normalizar(sql):
+    # Agrupa as consultas que diferem só pelos valores (o padrão N+1)
+    sql = re.sub(r"'[^']*'|\b\d+\b", '?', sql)
+    return re.sub(r"IN \([?, ]+\)", 'IN (...)', sql)
+
+
+class OrcamentoConsultasMixin:
+    """
+    Asserções de orçamento de consultas SQL para os testes de views.
+
+    Use junto com `TestCase`. `assertConsultasConstantes` detecta consultas N+1: executa a
+    requisição, aumenta a quantidade de registros e executa de novo; a quantidade de consultas
+    não pode mudar.
+    """
+
+    def _contar_consultas(self, requisicao):
+        with CaptureQueriesContext(connection) as consultas:
+            response = requisicao()
+            if getattr(response, 'streaming', False):
+                b"".join(response.streaming_content)
+        return response, [consulta['sql'] for consulta in consultas.captured_queries]
+
+    def assertConsultasConstantes(self, requisicao, aumentar_dados, maximo=None):
+        """
+        Falha se a quantidade de consultas de `requisicao` depender da quantidade de registros.
+
+        Parâmetros:
+        requisicao (callable): Executa a requisição e retorna a resposta (por exemplo,
+            `lambda: self.client.get(url)`). Respostas streaming são consumidas por inteiro.
+        aumentar_dados (callable): Cria mais registros exibidos pela requisição.
+        maximo (int, opcional): Orçamento fixo: falha também se passar desta quantidade.
+
+        Retorna:
+        int: Quantidade de consultas de cada execução.
+        """
+        # Execução de aquecimento: sessões, caches e ContentTypes não entram na comparação
+        requisicao()
+        _, antes = self._contar_consultas(requisicao)
+        aumentar_dados()
+        response, depois = self._contar_consultas(requisicao)
+        self.assertLess(response.status_code, 400)
+
+        if len(depois) != len(antes):
+            repetidas = Counter(map(_normalizar, depois)) - Counter(map(_normalizar, antes))
+            self.fail(
+                f"A quantidade de consultas depende da quantidade de registros: {len(antes)} -> {len(depois)}.\n"
+                "Consultas a mais:\n" + "\n".join(f"{total}x {sql}" for sql, total in repetidas.most_common(5))
+            )
+        if maximo is not None:
+            self.assertLessEqual(len(depois), maximo, "Orçamento de consultas excedido:\n" + "\n".join(depois))
+        return len(depois)
@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Ponto
+from django.contrib.auth.models import User
+from datetime import date, time
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa, um usuário logado com funcionário e cinco pontos.
+        """
+        self.empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        for dia in range(1, 6):
+            Ponto.objects.create(
+                funcionario=self.funcionario, data=date(2024, 12, dia),
+                entrada=time(8, 0), intervalo=time(1, 0), saida=time(17, dia) if dia != 5 else None,
+            )
+        self.client.login(username='user_test', password='12345')
+
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def test_paginacao_por_cursor_e_horas_em_lote(self):
+        """
+        Testa se a listagem de pontos é paginada por cursor, com as horas trabalhadas iguais às do modelo.
+        """
+        response = self.client.get('/api/v1/pontos/', {'por_pagina': 3})
+        self.assertEqual(response.status_code, 200)
+        corpo = response.json()
+        self.assertEqual([p['data'] for p in corpo['resultados']], ['2024-12-01', '2024-12-02', '2024-12-03'])
+        self.assertEqual(corpo['resultados'][0]['horas_trabalhadas'], "8h 1m")
+        self.assertEqual(corpo['resultados'][0]['funcionario_nome'], 'user_test')
+        self.assertIsNone(corpo['anterior'])
+
+        corpo = self.client.get(corpo['proxima']).json()
+        self.assertEqual([p['horas_trabalhadas'] for p in corpo['resultados']], ["8h 4m", "N/A"])
+        self.assertIsNone(corpo['proxima'])
+
+        ponto = Ponto.objects.get(data=date(2024, 12, 2))
+        response = self.client.get(f'/api/v1/pontos/{ponto.pk}/')
+        self.assertEqual(response.json()['horas_trabalhadas'], ponto.horas_trabalhadas())
+
+    def test_consultas_nao_dependem_do_tamanho_da_pagina(self):
+        """
+        Testa se a listagem de pontos e de funcionários faz o mesmo número de consultas para 1 ou 5 registros.
+        """
+        for url in ('/api/v1/pontos/', '/api/v1/funcionarios/'):
+            self.client.get(url, {'por_pagina': 1})
+            consultas = []
+            for por_pagina in (1, 5):
+                with CaptureQueriesContext(connection) as contexto:
+                    self.assertEqual(self.client.get(url, {'por_pagina': por_pagina}).status_code, 200)
+                consultas.append(len(contexto))
+            self.assertEqual(consultas[0], consultas[1], url)
+
+    def test_campos_esparsos_e_filtros(self):
+        """
+        Testa se `?fields=` limita os campos, recusa campos desconhecidos e se os filtros da listagem valem na API.
+        """
+        response = self.client.get('/api/v1/pontos/', {'fields': 'id,data', 'data_inicio': '2024-12-04'})
+        self.assertEqual([sorted(p) for p in response.json()['resultados']], [['data', 'id'], ['data', 'id']])
+
+        response = self.client.get('/api/v1/funcionarios/', {'fields': 'usuario,empresa_nome'})
+        self.assertEqual(response.json()['resultados'], [{'usuario': 'user_test', 'empresa_nome': 'Empresa Teste'}])
+
+        self.assertEqual(self.client.get('/api/v1/empresas/', {'fields': 'nome,senha'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/pontos/', {'data_inicio': '2024-13-45'}).status_code, 400)
+
+    def test_escrita(self):
+        """
+        Testa se a API cria, atualiza e remove registros, validando o ponto único por funcionário e dia.
+        """
+        response = self.client.post('/api/v1/empresas/', {'nome': "Nova", 'endereco': "Rua 1", 'telefone': "(11) 1111-1111"})
+        self.assertEqual(response.status_code, 201)
+        empresa_id = response.json()['id']
+
+        dados = {'funcionario': self.funcionario.pk, 'data': '2024-12-09', 'entrada': '08:00', 'saida': '12:00'}
+        response = self.client.post('/api/v1/pontos/', dados, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['horas_trabalhadas'], "4h 0m")
+        self.assertEqual(self.client.post('/api/v1/pontos/', dados, content_type='application/json').status_code, 400)
+
+        ponto_id = response.json()['id']
+        response = self.client.patch(f'/api/v1/pontos/{ponto_id}/', {'saida': '17:00'}, content_type='application/json')
+        self.assertEqual(response.json()['horas_trabalhadas'], "9h 0m")
+        self.assertEqual(self.client.delete(f'/api/v1/empresas/{empresa_id}/').status_code, 204)
+
+    def test_etag(self):
+        """
+        Testa se leituras repetidas com If-None-Match recebem 304 sem consultas e se uma alteração muda o ETag.
+        """
+        response = self.client.get('/api/v1/pontos/')
+        etag = response['ETag']
+        with self.assertNumQueries(2):  # sessão e usuário da autenticação
+            response = self.client.get('/api/v1/pontos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotEqual(self.client.get('/api/v1/pontos/', {'por_pagina': 2})['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ponto.objects.filter(data=date(2024, 12, 5)).first().save()
+        response = self.client.get('/api/v1/pontos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_exige_autenticacao_e_versao(self):
+        """
+        Testa se a API exige autenticação e aceita apenas as versões conhecidas.
+        """
+        self.assertEqual(self.client.get('/api/v2/pontos/').status_code, 404)
+        self.client.logout()
+        self.assertIn(self.client.get('/api/v1/pontos/').status_code, (401, 403))
@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ponto.models import Empresa, Funcionario, Ponto
+from django.contrib.auth.models import User
+from datetime import date
+
+
+class AutocompleteTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria duas empresas e três funcionários com usuário e e-mail.
+        - Limpa o cache das buscas.
+        """
+        cache.clear()
+        self.empresa = Empresa.objects.create(nome="Padaria Central", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.outra = Empresa.objects.create(nome="Oficina Norte", endereco="Rua Teste, 456", telefone="(12) 3456-7890")
+        self.user = User.objects.create_user(username='user_test', password='12345', email='teste@empresa.com')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        self.maria = Funcionario.objects.create(
+            user=User.objects.create_user(username='maria', email='msilva@empresa.com'), empresa=self.empresa
+        )
+        self.marcos = Funcionario.objects.create(
+            user=User.objects.create_user(username='Marcos', email='marcos@oficina.com'), empresa=self.outra
+        )
+
+    def buscar(self, url, termo):
+        response = self.client.get(reverse(url), {'q': termo})
+        self.assertEqual(response.status_code, 200)
+        return [item['texto'] for item in response.json()['resultados']]
+
+    def test_busca_de_funcionarios(self):
+        """
+        Testa se a busca de funcionários encontra pelo início do nome de usuário ou do e-mail.
+        """
+        self.client.login(username='user_test', password='12345')
+        self.assertCountEqual(self.buscar('funcionario-autocomplete', 'mar'), ['maria', 'Marcos'])
+        self.assertEqual(self.buscar('funcionario-autocomplete', 'MSILVA'), ['maria'])
+        self.assertEqual(self.buscar('funcionario-autocomplete', 'aria'), [])
+        self.assertEqual(len(self.buscar('funcionario-autocomplete', '')), 3)
+
+    def test_busca_de_empresas(self):
+        """
+        Testa se a busca de empresas encontra qualquer trecho do nome, mesmo sem login (usada no registro).
+        """
+        self.assertEqual(self.buscar('empresa-autocomplete', 'central'), ['Padaria Central'])
+        self.assertEqual(self.buscar('empresa-autocomplete', 'a'), ['Oficina Norte', 'Padaria Central'])
+
+    def test_funcionarios_exige_login(self):
+        """
+        Testa se a busca de funcionários redireciona usuários não autenticados para o login.
+        """
+        response = self.client.get(reverse('funcionario-autocomplete'), {'q': 'mar'})
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(AUTOCOMPLETE_LIMITE=2)
+    def test_limite_e_cache(self):
+        """
+        Testa se a busca respeita o limite de resultados e se buscas repetidas vêm do cache.
+        """
+        self.client.login(username='user_test', password='12345')
+        self.assertEqual(len(self.buscar('funcionario-autocomplete', '')), 2)
+
+        self.buscar('empresa-autocomplete', 'Norte')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.buscar('empresa-autocomplete', 'norte'), ['Oficina Norte'])
+
+    def test_formularios_renderizam_apenas_a_selecao(self):
+        """
+        Testa se os formulários renderizam apenas a opção selecionada, com a URL de busca.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('ponto-create'))
+        self.assertContains(response, f'data-autocomplete-url="{reverse("funcionario-autocomplete")}"')
+        self.assertContains(response, 'ponto/autocomplete.js')
+        self.assertNotContains(response, 'maria')
+
+        ponto = Ponto.objects.create(funcionario=self.maria, data=date(2024, 12, 2))
+        response = self.client.get(reverse('ponto-update', args=[ponto.pk]))
+        self.assertContains(response, f'<option value="{self.maria.pk}" selected>maria</option>', html=True)
+        self.assertNotContains(response, 'Marcos')
+
+        response = self.client.get(reverse('registrar'))
+        self.assertContains(response, f'data-autocomplete-url="{reverse("empresa-autocomplete")}"')
+        self.assertNotContains(response, 'Oficina Norte')
+
+    def test_filtro_da_listagem(self):
+        """
+        Testa se o filtro da listagem de pontos mostra apenas o funcionário filtrado.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('ponto-list'), {'funcionario': self.marcos.pk})
+        self.assertContains(response, f'<option value="{self.marcos.pk}" selected>Marcos</option>', html=True)
+        self.assertNotContains(response, 'maria')
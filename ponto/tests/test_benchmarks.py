@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from ponto.benchmarks import (
+    CENARIOS, semear, executar_benchmarks, comparar_resultados, executar_requisicoes, comparar_servidores,
+)
+from ponto.models import Funcionario, Ponto, ResumoDiario
+
+
+class BenchmarkTestCase(TestCase):
+    def test_semear_acrescenta_ate_o_tamanho(self):
+        """
+        Testa se a carga sintética completa a base até o tamanho pedido, reaproveitando o que já existe.
+        """
+        self.assertEqual(semear(500)['pontos'], 500)
+        dados = semear(1000)
+        self.assertEqual(dados['pontos'], 1000)
+        self.assertEqual(dados['funcionarios'], Funcionario.objects.count())
+        self.assertEqual(ResumoDiario.objects.filter(funcionario__isnull=False).count(), Ponto.objects.count())
+
+    def test_executar_benchmarks_gera_resultados_para_todos_os_cenarios(self):
+        """
+        Testa se a execução mede latência, consultas e memória de cada cenário.
+        """
+        resultados = executar_benchmarks([250], repeticoes=1)
+        medicoes = resultados['tamanhos']['250']['cenarios']
+        self.assertEqual(set(medicoes), set(CENARIOS))
+        for medicao in medicoes.values():
+            self.assertGreater(medicao['latencia_ms']['mediana'], 0)
+            self.assertGreater(medicao['consultas'], 0)
+        self.assertEqual(comparar_resultados(resultados, resultados), [])
+
+    def test_comparar_resultados_aponta_regressoes(self):
+        """
+        Testa se pioras de latência, consultas ou memória acima da tolerância são apontadas.
+        """
+        def execucao(latencia, consultas, memoria):
+            return {'tamanhos': {'1000': {'cenarios': {'ponto_list': {
+                'latencia_ms': {'min': latencia, 'mediana': latencia, 'max': latencia},
+                'consultas': consultas,
+                'memoria_pico_kb': memoria,
+            }}}}}
+
+        base = execucao(100, 5, 1000)
+        self.assertEqual(comparar_resultados(execucao(110, 5, 1100), base), [])
+        regressoes = comparar_resultados(execucao(200, 6, 4000), base)
+        self.assertEqual(len(regressoes), 3)
+        self.assertIn('1000 / ponto_list: consultas 5 -> 6', regressoes)
+
+
+class BenchmarkConexoesTestCase(TransactionTestCase):
+    def test_executar_requisicoes_mede_o_perfil_atual(self):
+        """
+        Testa se a medição de conexões faz as requisições autenticadas em várias threads e remove o usuário temporário.
+        """
+        semear(50)
+        resultado = executar_requisicoes(reverse('ponto-list'), requisicoes=6, concorrencia=2)
+        self.assertEqual(resultado['perfil'], 'simples')
+        self.assertEqual(resultado['status'], {200: 6})
+        self.assertGreater(resultado['requisicoes_por_segundo'], 0)
+        self.assertFalse(User.objects.filter(username='benchmark_conexoes').exists())
+
+
+class BenchmarkServidoresTestCase(TransactionTestCase):
+    def test_comparar_servidores_mede_os_dois_modos(self):
+        """
+        Testa se a comparação entre ASGI e WSGI atende relatórios e páginas nos dois modos e remove o usuário temporário.
+        """
+        resultado = comparar_servidores(linhas=250, relatorios=1, paginas=2, workers=1)
+        for modo in ('wsgi', 'asgi'):
+            self.assertEqual(resultado[modo]['status'], {200: 3})
+            self.assertGreater(resultado[modo]['paginas_latencia_ms']['p50'], 0)
+        self.assertFalse(User.objects.filter(username='benchmark_servidores').exists())
@@ -0,0 +1,162 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.ingestao import ingerir_pontos
+from ponto.utils.marcacao import bater_ponto
+from django.contrib.auth.models import User
+from datetime import date, datetime, time
+
+
+class RespostasCondicionaisTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa, um usuário, um funcionário e dois registros de ponto.
+        - Faz login com o usuário.
+        """
+        self.empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        self.ponto = Ponto.objects.create(
+            funcionario=self.funcionario, data=date(2024, 12, 2), entrada=time(8, 0), saida=time(17, 0)
+        )
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 3), entrada=time(8, 0), saida=time(17, 0))
+        self.client.login(username='user_test', password='12345')
+
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def revalidar(self, url, etag, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    def test_lista_inalterada_responde_304_com_uma_consulta(self):
+        """
+        Testa se a lista de pontos repetida com If-None-Match responde 304 sem montar a página:
+        apenas sessão, usuário e o maior `atualizado_em` dos registros filtrados.
+        """
+        url = reverse('ponto-list')
+        primeira = self.client.get(url, {'funcionario': self.funcionario.pk})
+        self.assertEqual(primeira.status_code, 200)
+        self.assertIn('ETag', primeira)
+        self.assertIn('Last-Modified', primeira)
+
+        with self.assertNumQueries(3):
+            segunda = self.revalidar(url, primeira['ETag'], funcionario=self.funcionario.pk)
+        self.assertEqual(segunda.status_code, 304)
+        self.assertEqual(segunda['ETag'], primeira['ETag'])
+        self.assertEqual(segunda.content, b'')
+
+    def test_last_modified(self):
+        """
+        Testa se If-Modified-Since com o Last-Modified recebido também responde 304.
+        """
+        url = reverse('ponto-list')
+        primeira = self.client.get(url)
+        segunda = self.client.get(url, HTTP_IF_MODIFIED_SINCE=primeira['Last-Modified'])
+        self.assertEqual(segunda.status_code, 304)
+
+    def test_alteracoes_mudam_o_etag(self):
+        """
+        Testa se salvar, excluir, marcar e ingerir pontos geram uma nova versão da lista.
+        """
+        url = reverse('ponto-list')
+        alteracoes = [
+            lambda: Ponto.objects.filter(pk=self.ponto.pk).first().save(),
+            lambda: Ponto.objects.filter(data=date(2024, 12, 3)).delete(),
+            lambda: bater_ponto(self.funcionario.pk, make_aware(datetime(2024, 12, 4, 8, 0))),
+            lambda: ingerir_pontos([{'funcionario': self.funcionario.pk, 'data': '2024-12-04', 'saida': '18:00'}]),
+        ]
+        etag = self.client.get(url)['ETag']
+        for alterar in alteracoes:
+            with self.captureOnCommitCallbacks(execute=True):
+                alterar()
+            response = self.revalidar(url, etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_etag_depende_da_url_e_da_sessao(self):
+        """
+        Testa se filtros diferentes e outra sessão não reaproveitam a versão de outra resposta.
+        """
+        url = reverse('ponto-list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.revalidar(url, etag, funcionario=self.funcionario.pk).status_code, 200)
+
+        User.objects.create_user(username='outro', password='12345')
+        self.client.logout()
+        self.client.login(username='outro', password='12345')
+        self.assertEqual(self.revalidar(url, etag).status_code, 200)
+
+    def test_mensagens_pendentes_nao_geram_304(self):
+        """
+        Testa se a página exibida após uma mensagem (por exemplo, depois de salvar) não é validada.
+        """
+        url = reverse('ponto-list')
+        etag = self.client.get(url)['ETag']
+        self.client.post(reverse('ponto-update', args=[self.ponto.pk]), {
+            'funcionario': self.funcionario.pk, 'data': '2024-12-02', 'entrada': '08:30', 'intervalo': '01:00', 'saida': '17:00',
+        })
+        response = self.revalidar(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+    def test_fragmentos_das_linhas(self):
+        """
+        Testa se as linhas vêm do cache de fragmentos e se a alteração de um cadastro exibido
+        nelas (o nome do usuário) gera linhas novas.
+        """
+        url = reverse('funcionario-list')
+        self.assertContains(self.client.get(url), 'user_test')
+        chaves = [chave for chave in cache._cache if 'funcionario_linha' in chave]
+        self.assertTrue(chaves)
+
+        self.user.username = 'renomeado'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'renomeado')
+        self.assertNotContains(response, 'user_test')
+
+    def test_empresa_renomeada_invalida_lista_de_funcionarios(self):
+        """
+        Testa se renomear a empresa muda a versão da lista de funcionários, que exibe o nome dela.
+        """
+        url = reverse('funcionario-list')
+        etag = self.client.get(url)['ETag']
+        self.empresa.nome = "Empresa Renomeada"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.empresa.save()
+        response = self.revalidar(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Empresa Renomeada")
+
+    def test_lista_de_empresas(self):
+        """
+        Testa se a lista de empresas também responde 304 quando inalterada.
+        """
+        url = reverse('empresa-list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.revalidar(url, etag).status_code, 304)
+
+    def test_relatorio_responde_304(self):
+        """
+        Testa se o relatório repetido com If-None-Match responde 304 sem gerar nem ler o PDF, e se
+        um novo registro no período gera outra versão.
+        """
+        url = reverse('relatorio')
+        filtros = {'funcionario': self.funcionario.pk, 'data_inicio': '2024-12-01'}
+        primeira = self.client.get(url, filtros)
+        self.assertEqual(primeira.status_code, 200)
+
+        segunda = self.revalidar(url, primeira['ETag'], **filtros)
+        self.assertEqual(segunda.status_code, 304)
+        self.assertNotIn('X-Cache', segunda)
+
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 5), entrada=time(8, 0))
+        terceira = self.revalidar(url, primeira['ETag'], **filtros)
+        self.assertEqual(terceira.status_code, 200)
+        self.assertNotEqual(terceira['ETag'], primeira['ETag'])
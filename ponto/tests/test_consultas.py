@@ -0,0 +1,89 @@
+from django.test import TestCase
+from django.urls import reverse
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Jornada, Ponto
+from ponto.tests.consultas import OrcamentoConsultasMixin
+from ponto.utils.cache import incrementar_versao_dados
+from django.contrib.auth.models import User
+from datetime import date, time, timedelta
+
+
+class ConsultasTestCase(OrcamentoConsultasMixin, TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria um superusuário autenticado e uma empresa com funcionários e pontos.
+        """
+        self.user = User.objects.create_superuser(username='admin_test', password='12345')
+        self.client.login(username='admin_test', password='12345')
+        self.total = 0
+        self.criar_dados()
+
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def criar_dados(self, funcionarios=2, dias=3):
+        """
+        Acrescenta uma empresa com jornada, funcionários (com usuário) e pontos.
+        """
+        self.total += 1
+        empresa = Empresa.objects.create(nome=f"Empresa {self.total}", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        Jornada.objects.create(nome="Comercial", empresa=empresa, padrao=True)
+        for indice in range(funcionarios):
+            usuario = User.objects.create_user(username=f'funcionario_{self.total}_{indice}', email='f@teste.com')
+            funcionario = Funcionario.objects.create(user=usuario, empresa=empresa)
+            Ponto.objects.bulk_create([
+                Ponto(funcionario=funcionario, data=date(2024, 1, 1) + timedelta(days=dia), entrada=time(8, 0), saida=time(17, 0))
+                for dia in range(dias)
+            ])
+        self.funcionario = funcionario
+
+    def get(self, url, params=None):
+        """
+        Requisição sem os caches de relatórios e de regras, que esconderiam as consultas.
+        """
+        def requisicao():
+            incrementar_versao_dados()
+            cache_regras.limpar()
+            return self.client.get(url, params or {})
+        return requisicao
+
+    def test_listagens(self):
+        """
+        Testa se as listagens de pontos, funcionários e empresas têm um número fixo de consultas.
+        """
+        for url in ('ponto-list', 'funcionario-list', 'empresa-list'):
+            with self.subTest(url=url):
+                self.assertConsultasConstantes(self.get(reverse(url)), self.criar_dados)
+
+    def test_formularios(self):
+        """
+        Testa se os formulários de ponto e de funcionário carregam as opções em um número fixo de consultas.
+        """
+        ponto = Ponto.objects.first()
+        for url in (reverse('ponto-create'), reverse('ponto-update', args=[ponto.pk]),
+                    reverse('funcionario-create'), reverse('funcionario-update', args=[self.funcionario.pk])):
+            with self.subTest(url=url):
+                self.assertConsultasConstantes(self.get(url), self.criar_dados)
+
+    def test_relatorios_e_exportacoes(self):
+        """
+        Testa se relatórios e exportações têm um número fixo de consultas, para um funcionário ou para todos.
+        """
+        funcionario = self.funcionario.pk
+        for url, params in (
+            (reverse('relatorio'), {}),
+            (reverse('relatorio'), {'funcionario': funcionario}),
+            (reverse('relatorio-stream'), {}),
+            (reverse('funcionario-relatorio', args=[funcionario]), {}),
+            (reverse('ponto-exportar', args=['csv']), {}),
+            (reverse('ponto-exportar', args=['xlsx']), {}),
+        ):
+            with self.subTest(url=url, params=params):
+                self.assertConsultasConstantes(self.get(url, params), lambda: self.criar_dados(dias=40))
+
+    def test_admin_jornadas(self):
+        """
+        Testa se a listagem de jornadas no admin tem um número fixo de consultas.
+        """
+        self.assertConsultasConstantes(self.get(reverse('admin:ponto_jornada_changelist')), self.criar_dados)
@@ -0,0 +1,74 @@
+import random
+from django.test import TestCase
+from ponto.engine import calcular_jornadas, calcular_em_lotes
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.reports import calcular_atrasos_e_extras
+from django.contrib.auth.models import User
+from datetime import date, time, timedelta
+
+
+class EngineTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria um funcionário com registros de ponto variados, incluindo registros incompletos.
+        """
+        empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=user, empresa=empresa)
+
+        aleatorio = random.Random(7)
+        pontos = []
+        for dia in range(60):
+            pontos.append(Ponto(
+                funcionario=self.funcionario,
+                data=date(2024, 1, 1) + timedelta(days=dia),
+                entrada=time(aleatorio.randint(6, 10), aleatorio.randint(0, 59)) if dia % 10 else None,
+                intervalo=time(1, aleatorio.choice([0, 30])) if dia % 7 else None,
+                saida=time(aleatorio.randint(15, 20), aleatorio.randint(0, 59), aleatorio.randint(0, 59)) if dia % 9 else None,
+            ))
+        Ponto.objects.bulk_create(pontos)
+
+    def test_resultados_iguais_ao_calculo_por_linha(self):
+        """
+        Testa se o motor vetorizado produz os mesmos valores que o cálculo linha a linha.
+        """
+        pontos = Ponto.objects.order_by('data')
+        resultado = calcular_jornadas(pontos)
+        total_atrasos = total_extras = timedelta(0)
+        for ponto, linha in zip(pontos, resultado):
+            atraso, extra = calcular_atrasos_e_extras(ponto)
+            self.assertEqual(linha.id, ponto.id)
+            self.assertEqual(linha.horas_trabalhadas, ponto.horas_trabalhadas())
+            self.assertEqual((linha.atraso, linha.extra), (atraso, extra))
+            total_atrasos += atraso
+            total_extras += extra
+
+        self.assertEqual(len(resultado), 60)
+        self.assertEqual(resultado.total_atraso, total_atrasos)
+        self.assertEqual(resultado.total_extra, total_extras)
+
+    def test_calculo_em_lotes(self):
+        """
+        Testa se o cálculo em lotes preserva a ordem e os valores do cálculo em uma única passada.
+        """
+        pontos = Ponto.objects.order_by('data')
+        self.assertEqual(list(calcular_em_lotes(pontos, chunk_size=7)), list(calcular_jornadas(pontos)))
+
+    def test_calculo_com_instancias(self):
+        """
+        Testa se o motor aceita instâncias já carregadas, como na listagem de pontos.
+        """
+        pontos = list(Ponto.objects.order_by('data'))
+        self.assertEqual(list(calcular_jornadas(pontos)), list(calcular_jornadas(Ponto.objects.order_by('data'))))
+        self.assertEqual(len(calcular_jornadas([])), 0)
+
+    def test_erro_no_calculo_por_linha_vai_para_o_log(self):
+        """
+        Testa se um erro no cálculo linha a linha é registrado no log, com o ponto, e zera os valores.
+        """
+        ponto = Ponto(pk=123, funcionario=self.funcionario, data=date(2024, 1, 2), entrada=time(8, 0), intervalo="1:00", saida=time(17, 0))
+        with self.assertLogs('ponto.utils.reports', level='ERROR') as logs:
+            self.assertEqual(calcular_atrasos_e_extras(ponto), (timedelta(0), timedelta(0)))
+        self.assertIn("ponto 123", logs.output[0])
+        self.assertIn("AttributeError", logs.output[0])
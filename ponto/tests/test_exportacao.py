@@ -0,0 +1,95 @@
+import csv
+import io
+import zipfile
+from xml.etree import ElementTree
+from django.test import TestCase
+from django.urls import reverse
+from ponto.models import Empresa, Funcionario, Ponto
+from django.contrib.auth.models import User
+from datetime import date, time
+
+NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+class ExportacaoTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa e dois funcionários com registros de ponto.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        self.outro = Funcionario.objects.create(user=User.objects.create_user(username='outro'), empresa=self.empresa)
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 2), entrada=time(8, 0), intervalo=time(1, 0), saida=time(18, 0))
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 3), entrada=time(8, 0), intervalo=time(1, 0), saida=time(16, 30))
+        Ponto.objects.create(funcionario=self.outro, data=date(2024, 12, 2), entrada=time(9, 0))
+
+    def test_exportar_csv(self):
+        """
+        Testa se o CSV traz o cabeçalho e as colunas calculadas de cada registro.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('ponto-exportar', args=['csv']))
+        self.assertEqual(response.status_code, 200)
+        linhas = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+        self.assertEqual(linhas[0][0], "Funcionário")
+        self.assertEqual(len(linhas), 4)
+        self.assertIn(["user_test", "2024-12-02", "08:00", "01:00", "18:00", "9h 0m", "", "1:00:00"], linhas)
+        self.assertIn(["user_test", "2024-12-03", "08:00", "01:00", "16:30", "7h 30m", "0:30:00", ""], linhas)
+        self.assertIn(["outro", "2024-12-02", "09:00", "", "", "", "", ""], linhas)
+
+    def test_exportar_csv_com_filtros(self):
+        """
+        Testa se a exportação respeita os mesmos filtros da listagem de pontos.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('ponto-exportar', args=['csv']), {
+            'funcionario': self.funcionario.id,
+            'data_inicio': '2024-12-03',
+        })
+        linhas = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([linha[1] for linha in linhas[1:]], ["2024-12-03"])
+
+    def test_exportar_csv_com_filtro_de_horas(self):
+        """
+        Testa se o filtro de horas repassado pela listagem exporta os mesmos registros que ela mostra.
+        """
+        self.client.login(username='user_test', password='12345')
+        filtros = {'horas_min': '8', 'horas_max': '9,5'}
+        listagem = self.client.get(reverse('ponto-list'), filtros)
+        response = self.client.get(reverse('ponto-exportar', args=['csv']), filtros)
+        linhas = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+        self.assertEqual(linhas[1:], [["user_test", "2024-12-02", "08:00", "01:00", "18:00", "9h 0m", "", "1:00:00"]])
+        self.assertEqual(
+            [(linha[0], linha[1]) for linha in linhas[1:]],
+            [(ponto.funcionario.user.username, str(ponto.data)) for ponto in listagem.context['object_list']],
+        )
+
+    def test_exportar_xlsx(self):
+        """
+        Testa se o XLSX é um pacote válido com uma linha por registro, além do cabeçalho.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('ponto-exportar', args=['xlsx']))
+        self.assertEqual(response.status_code, 200)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as xlsx:
+            self.assertIsNone(xlsx.testzip())
+            planilha = ElementTree.fromstring(xlsx.read('xl/worksheets/sheet1.xml'))
+        linhas = planilha.findall('s:sheetData/s:row', NS)
+        self.assertEqual(len(linhas), 4)
+        self.assertEqual(linhas[0].find('s:c/s:is/s:t', NS).text, "Funcionário")
+
+    def test_formato_desconhecido(self):
+        """
+        Testa se um formato não suportado retorna 404.
+        """
+        self.client.login(username='user_test', password='12345')
+        self.assertEqual(self.client.get(reverse('ponto-exportar', args=['pdf'])).status_code, 404)
@@ -0,0 +1,72 @@
+import unittest
+from django.db import connection
+from django.test import TestCase
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.filtros import filtrar_pontos_por_parametros
+from ponto.utils.paginacao import PaginadorCursor
+from ponto.utils.reports import filtrar_pontos
+
+FUNCIONARIOS = 1000
+DIAS = 1000
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'EXPLAIN verificado apenas no PostgreSQL')
+class IndicesPontoTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuração inicial para os testes:
+        - Cria 1000 funcionários com 1000 dias de ponto cada (1 milhão de registros),
+          gerados no próprio banco com generate_series, e atualiza as estatísticas da tabela.
+        """
+        empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        Funcionario.objects.bulk_create([Funcionario(empresa=empresa) for _ in range(FUNCIONARIOS)])
+        cls.funcionario = Funcionario.objects.order_by('pk')[FUNCIONARIOS // 2]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Ponto._meta.db_table} (funcionario_id, data, entrada, intervalo, saida)
+                SELECT f.id, DATE '2022-01-01' + d, TIME '08:00', TIME '01:00', TIME '17:00'
+                FROM {Funcionario._meta.db_table} f CROSS JOIN generate_series(0, %s) AS d
+                """,
+                [DIAS - 1],
+            )
+            cursor.execute(f"ANALYZE {Ponto._meta.db_table}")
+
+    def assertUsaIndice(self, queryset, indice):
+        plano = queryset.explain()
+        self.assertNotIn('Seq Scan', plano)
+        self.assertIn(indice, plano)
+
+    def test_listagem_por_funcionario_e_periodo(self):
+        """
+        Testa se a listagem filtrada por funcionário e período usa o índice único (funcionario, data).
+        """
+        pontos = filtrar_pontos_por_parametros(Ponto.objects.all(), {
+            'funcionario': self.funcionario.pk, 'data_inicio': '2023-01-01', 'data_fim': '2023-03-31',
+        }).order_by('data')
+        self.assertUsaIndice(pontos, 'ponto_unico_por_funcionario_dia')
+
+    def test_relatorio_por_funcionario(self):
+        """
+        Testa se a consulta do relatório de um funcionário usa o índice único (funcionario, data).
+        """
+        _, pontos = filtrar_pontos({'data_inicio': '2022-06-01', 'data_fim': '2022-12-31'}, self.funcionario.pk)
+        self.assertUsaIndice(pontos, 'ponto_unico_por_funcionario_dia')
+
+    def test_periodo_de_todas_as_empresas(self):
+        """
+        Testa se a consulta de um período curto, sem filtro de funcionário, usa o índice de (data, id).
+        """
+        _, pontos = filtrar_pontos({'data_inicio': '2023-05-01', 'data_fim': '2023-05-02'})
+        self.assertUsaIndice(pontos, 'ponto_data_id_idx')
+
+    def test_pagina_profunda_da_listagem(self):
+        """
+        Testa se uma página no fim da listagem é buscada pelo índice de (data, id), sem OFFSET.
+        """
+        # O cursor guarda apenas a chave do último registro: vale para a listagem completa
+        cursor = PaginadorCursor(Ponto.objects.filter(data__gte='2024-09-01'), 50).pagina().cursor_proximo
+        pontos = PaginadorCursor(Ponto.objects.all(), 50).pagina(cursor).object_list
+        self.assertNotIn('OFFSET', str(pontos.query))
+        self.assertUsaIndice(pontos, 'ponto_data_id_idx')
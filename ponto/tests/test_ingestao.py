@@ -0,0 +1,147 @@
+import base64
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Jornada, Ponto, ResumoDiario, ResumoMensal
+from ponto.utils.resumos import METRICAS, reconstruir_resumos
+from django.contrib.auth.models import User
+from datetime import date, time
+
+
+class IngestaoTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa com jornada padrão, um usuário de dispositivo e três funcionários.
+        """
+        self.empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        Jornada.objects.create(nome="Comercial", empresa=self.empresa, dias_semana='12345', padrao=True)
+        User.objects.create_user(username='relogio', password='12345')
+        self.funcionarios = [
+            Funcionario.objects.create(user=User.objects.create_user(username=f'funcionario_{indice}'), empresa=self.empresa)
+            for indice in range(3)
+        ]
+        self.url = reverse('ponto-ingestao')
+        self.autorizacao = 'Basic ' + base64.b64encode(b'relogio:12345').decode()
+
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def enviar(self, corpo, content_type='application/json'):
+        return self.client.post(self.url, corpo, content_type=content_type, HTTP_AUTHORIZATION=self.autorizacao)
+
+    def resumos(self):
+        return [
+            set(modelo.objects.values_list('empresa_id', 'funcionario_id', campo, *METRICAS))
+            for modelo, campo in ((ResumoDiario, 'data'), (ResumoMensal, 'mes'))
+        ]
+
+    def test_lote_json_cria_e_atualiza_com_resumos(self):
+        """
+        Testa se um lote JSON cria os pontos, atualiza apenas os horários informados dos existentes
+        e deixa os resumos iguais aos de uma reconstrução completa.
+        """
+        Ponto.objects.create(funcionario=self.funcionarios[0], data=date(2024, 12, 2), entrada=time(8, 0))
+        itens = [
+            {'funcionario': self.funcionarios[0].pk, 'data': '2024-12-02', 'saida': '17:05'},
+            {'funcionario': self.funcionarios[1].pk, 'data': '2024-12-02', 'entrada': '08:10', 'intervalo': '01:00', 'saida': '17:00'},
+            {'usuario': 'funcionario_2', 'data': '2024-12-31', 'entrada': '07:55'},
+        ]
+        response = self.enviar({'pontos': itens})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['criados'], response.json()['atualizados']), (2, 1))
+        self.assertEqual([r['status'] for r in response.json()['resultados']], ['atualizado', 'criado', 'criado'])
+
+        ponto = Ponto.objects.get(funcionario=self.funcionarios[0], data=date(2024, 12, 2))
+        self.assertEqual((ponto.entrada, ponto.saida), (time(8, 0), time(17, 5)))
+        self.assertEqual(Ponto.objects.count(), 3)
+
+        incrementais = self.resumos()
+        reconstruir_resumos()
+        self.assertEqual(incrementais, self.resumos())
+
+    def test_lote_csv(self):
+        """
+        Testa se um lote CSV (com BOM, como o gerado por planilhas) é aceito.
+        """
+        corpo = "﻿usuario,data,entrada,intervalo,saida\nfuncionario_0,2024-12-02,08:00,,\nfuncionario_1,2024-12-02,08:00,01:00,17:00\n"
+        response = self.enviar(corpo.encode(), content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['criados'], 2)
+        self.assertIsNone(Ponto.objects.get(funcionario=self.funcionarios[0]).saida)
+
+    def test_reenvio_do_csv_exportado(self):
+        """
+        Testa se um CSV da exportação de pontos, com o seu cabeçalho e as colunas calculadas, é
+        aceito pela ingestão, inclusive com células entre aspas que contêm quebras de linha.
+        """
+        Ponto.objects.create(funcionario=self.funcionarios[0], data=date(2024, 12, 2), entrada=time(8, 0), saida=time(17, 0))
+        Ponto.objects.create(funcionario=self.funcionarios[1], data=date(2024, 12, 2), entrada=time(8, 10), intervalo=time(1, 0))
+        self.client.login(username='relogio', password='12345')
+        exportado = b"".join(self.client.get(reverse('ponto-exportar', args=['csv'])).streaming_content)
+        Ponto.objects.all().delete()
+
+        response = self.enviar(exportado, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['criados'], 2)
+        ponto = Ponto.objects.get(funcionario=self.funcionarios[1])
+        self.assertEqual((ponto.entrada, ponto.intervalo, ponto.saida), (time(8, 10), time(1, 0), None))
+
+        corpo = 'usuario,data,entrada,observacao\r\nfuncionario_2,2024-12-03,08:00,"linha 1\r\nlinha 2"\r\n'
+        response = self.enviar(corpo.encode(), content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['criados'], 1)
+
+    def test_erros_por_item(self):
+        """
+        Testa se itens inválidos são recusados com o motivo, sem impedir a gravação dos válidos.
+        """
+        itens = [
+            {'funcionario': self.funcionarios[0].pk, 'data': '2024-12-02', 'entrada': '08:00'},
+            {'funcionario': self.funcionarios[0].pk, 'data': '2024-12-02', 'saida': '17:00'},
+            {'funcionario': 999999, 'data': '2024-12-02', 'entrada': '08:00'},
+            {'funcionario': self.funcionarios[1].pk, 'data': '2024-13-40', 'entrada': '25:00'},
+            {'usuario': 'funcionario_2', 'data': '2024-12-02'},
+            'texto',
+        ]
+        response = self.enviar(itens)
+        self.assertEqual(response.status_code, 207)
+        resultados = response.json()['resultados']
+        self.assertEqual([r['status'] for r in resultados], ['criado'] + ['erro'] * 5)
+        self.assertIn('data', resultados[1]['erros'])
+        self.assertEqual(resultados[2]['erros']['funcionario'], ["Funcionário não encontrado."])
+        self.assertEqual(set(resultados[3]['erros']), {'data', 'entrada'})
+        self.assertIn('horarios', resultados[4]['erros'])
+        self.assertEqual(Ponto.objects.count(), 1)
+
+        self.assertEqual(self.enviar(itens[2:]).status_code, 400)
+        self.assertEqual(self.enviar({'pontos': []}).status_code, 400)
+
+    def test_exige_autenticacao(self):
+        """
+        Testa se a ingestão recusa requisições sem autenticação.
+        """
+        response = self.client.post(self.url, [], content_type='application/json')
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_consultas_nao_dependem_do_tamanho_do_lote(self):
+        """
+        Testa se o número de consultas do lote não cresce com o número de itens e de funcionários.
+        """
+        def enviar(funcionarios, dia):
+            itens = [
+                {'funcionario': funcionario.pk, 'data': str(dia), 'entrada': '08:00', 'saida': '17:00'}
+                for funcionario in funcionarios
+            ]
+            cache_regras.limpar()
+            with CaptureQueriesContext(connection) as consultas:
+                self.assertEqual(self.enviar(itens).status_code, 200)
+            return len(consultas)
+
+        enviar(self.funcionarios, date(2024, 12, 1))
+        pequeno = enviar(self.funcionarios, date(2024, 12, 2))
+        novos = [Funcionario(empresa=self.empresa) for _ in range(100)]
+        Funcionario.objects.bulk_create(novos)
+        self.assertEqual(enviar(Funcionario.objects.all(), date(2024, 12, 3)), pequeno)
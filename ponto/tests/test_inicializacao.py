@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.test import SimpleTestCase
+from ponto.utils.carregamento import ModuloSobDemanda
+
+# Bibliotecas pesadas que só podem ser importadas no primeiro uso (`ModuloSobDemanda`)
+MODULOS_SOB_DEMANDA = ('fitz', 'pymupdf', 'numpy')
+
+# Tempo máximo, em ms, dos imports feitos pelos módulos do projeto na inicialização (a melhor de
+# algumas medições). Em máquinas mais lentas, ajuste com PONTO_ORCAMENTO_IMPORTACAO_MS
+ORCAMENTO_MS = int(os.environ.get('PONTO_ORCAMENTO_IMPORTACAO_MS', 200))
+MEDICOES = 3
+
+
+def medir_inicializacao():
+    """
+    Executa `python -X importtime manage.py check` e retorna os módulos importados e o tempo, em
+    ms, dos imports feitos a partir dos módulos do projeto (`ponto` e `controle_ponto`), incluindo
+    as bibliotecas que eles importam. O Django e o próprio interpretador não entram na conta.
+    """
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(settings.BASE_DIR / 'manage.py'), 'check'],
+        capture_output=True, text=True, env=os.environ,
+    )
+    assert processo.returncode == 0, processo.stderr
+    linhas = [linha.split('|') for linha in processo.stderr.splitlines() if linha.startswith('import time:')][1:]
+
+    # O -X importtime escreve cada módulo depois dos que ele importou, com a profundidade na indentação
+    modulos, projeto, pilha = set(), 0, []
+    for _, acumulado, nome in reversed(linhas):
+        profundidade = len(nome) - len(nome.lstrip())
+        nome = nome.strip()
+        modulos.add(nome)
+        while pilha and pilha[-1][0] >= profundidade:
+            pilha.pop()
+        dentro_do_projeto = bool(pilha) and pilha[-1][1]
+        do_projeto = nome.split('.')[0] in ('ponto', 'controle_ponto')
+        if do_projeto and not dentro_do_projeto:
+            projeto += int(acumulado)
+        pilha.append((profundidade, dentro_do_projeto or do_projeto))
+    return modulos, projeto / 1000
+
+
+class InicializacaoTestCase(SimpleTestCase):
+    def test_bibliotecas_pesadas_sob_demanda(self):
+        """
+        Testa se a inicialização (`manage.py check`, que carrega as URLs, views e sinais) não importa
+        o PyMuPDF nem o NumPy.
+        """
+        modulos, _ = medir_inicializacao()
+        self.assertFalse(modulos & set(MODULOS_SOB_DEMANDA))
+
+    def test_orcamento_de_importacao(self):
+        """
+        Testa se os imports do projeto na inicialização cabem no orçamento (`ORCAMENTO_MS`).
+        """
+        tempo = min(medir_inicializacao()[1] for _ in range(MEDICOES))
+        self.assertLessEqual(
+            tempo, ORCAMENTO_MS,
+            f"Os imports do projeto na inicialização levaram {tempo:.0f} ms (orçamento: {ORCAMENTO_MS} ms). "
+            "Confira `python -X importtime manage.py check` e use `ModuloSobDemanda` para bibliotecas pesadas.",
+        )
+
+    def test_modulo_sob_demanda(self):
+        """
+        Testa se o módulo só é importado no primeiro acesso a um atributo.
+        """
+        sys.modules.pop('colorsys', None)
+        colorsys = ModuloSobDemanda('colorsys')
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertIn('colorsys', sys.modules)
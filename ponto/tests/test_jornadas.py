@@ -0,0 +1,248 @@
+import fitz
+import random
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ponto.engine import JORNADA_PADRAO, calcular_jornadas, regra_do_funcionario
+from ponto.engine.regras import cache_regras
+from ponto.forms import FuncionarioUpdateForm
+from ponto.models import Empresa, Funcionario, Jornada, Ponto, ReconstrucaoResumos, ResumoMensal
+from ponto.utils.reports import calcular_atrasos_e_extras
+from ponto.utils.resumos import reconstruir_pendentes
+from django.contrib.auth.models import User
+from datetime import date, time, timedelta
+
+
+class JornadaTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa com jornada padrão de segunda a sexta (8h às 17h, 1h de intervalo, 10 min de tolerância).
+        - Cria dois funcionários, um deles com uma jornada própria de 6h.
+        """
+        # As jornadas criadas aqui só mudam a versão das jornadas após o commit, que não ocorre nos
+        # testes: descarta as regras que outros testes carregaram para os mesmos ids
+        cache_regras.limpar()
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.comercial = Jornada.objects.create(
+            nome="Comercial", empresa=self.empresa, dias_semana='12345', tolerancia_minutos=10, padrao=True
+        )
+        self.meio_periodo = Jornada.objects.create(
+            nome="Meio período", empresa=self.empresa, inicio=time(8, 0), fim=time(14, 0), intervalo_minutos=0
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        self.parcial = Funcionario.objects.create(
+            user=User.objects.create_user(username='parcial'), empresa=self.empresa, jornada=self.meio_periodo
+        )
+
+    def tearDown(self):
+        # O rollback do teste não muda a versão das jornadas: descarta as regras carregadas
+        cache_regras.limpar()
+
+    def test_regras_por_empresa_e_por_funcionario(self):
+        """
+        Testa se o funcionário usa a jornada padrão da empresa, a não ser que tenha uma jornada própria.
+        """
+        self.assertEqual(regra_do_funcionario(self.funcionario.pk).segundos_por_dia, (8 * 3600,) * 5 + (0, 0))
+        self.assertEqual(regra_do_funcionario(self.parcial.pk).segundos_por_dia[0], 6 * 3600)
+
+        outra = Empresa.objects.create(nome="Outra", endereco="Rua 2", telefone="(12) 3456-7890")
+        sem_jornada = Funcionario.objects.create(empresa=outra)
+        self.assertEqual(regra_do_funcionario(sem_jornada.pk), JORNADA_PADRAO)
+
+    def test_tolerancia_dias_de_folga_e_jornada_propria(self):
+        """
+        Testa se diferenças dentro da tolerância são ignoradas, se o trabalho na folga é hora extra
+        e se a jornada própria do funcionário é aplicada.
+        """
+        segunda, sabado = date(2024, 12, 2), date(2024, 12, 7)
+        pontos = [
+            Ponto.objects.create(funcionario=self.funcionario, data=segunda, entrada=time(8, 5), intervalo=time(1, 0), saida=time(17, 0)),
+            Ponto.objects.create(funcionario=self.funcionario, data=segunda + timedelta(days=1), entrada=time(8, 30), intervalo=time(1, 0), saida=time(17, 0)),
+            Ponto.objects.create(funcionario=self.funcionario, data=sabado, entrada=time(8, 0), saida=time(12, 0)),
+            Ponto.objects.create(funcionario=self.parcial, data=segunda, entrada=time(8, 0), saida=time(15, 0)),
+        ]
+        linhas = list(calcular_jornadas(Ponto.objects.order_by('id')))
+
+        self.assertEqual((linhas[0].atraso, linhas[0].extra), (timedelta(0), timedelta(0)))
+        self.assertEqual(linhas[1].atraso, timedelta(minutes=30))
+        self.assertEqual((linhas[2].atraso, linhas[2].extra), (timedelta(0), timedelta(hours=4)))
+        self.assertEqual(linhas[3].extra, timedelta(hours=1))
+        for ponto, linha in zip(pontos, linhas):
+            self.assertEqual(calcular_atrasos_e_extras(ponto), (linha.atraso, linha.extra))
+
+    def test_anotacoes_sql_iguais_a_engine(self):
+        """
+        Testa se as horas, atrasos e extras calculados pelo banco (`com_horas`) são iguais aos da engine,
+        com jornada da empresa, jornada própria, turno noturno, sem jornada e registros incompletos.
+        """
+        noturna = Jornada.objects.create(
+            nome="Noturna", empresa=self.empresa, inicio=time(22, 0), fim=time(6, 0), intervalo_minutos=30,
+            dias_semana='1234567', tolerancia_minutos=5,
+        )
+        outra = Empresa.objects.create(nome="Outra", endereco="Rua 2", telefone="(12) 3456-7890")
+        funcionarios = [
+            self.funcionario,
+            self.parcial,
+            Funcionario.objects.create(empresa=self.empresa, jornada=noturna),
+            Funcionario.objects.create(empresa=outra),
+        ]
+
+        aleatorio = random.Random(15)
+        def horario(chance_nulo=0.1):
+            if aleatorio.random() < chance_nulo:
+                return None
+            return time(aleatorio.randrange(24), aleatorio.randrange(60), aleatorio.randrange(60))
+
+        Ponto.objects.bulk_create([
+            Ponto(
+                funcionario=funcionario, data=date(2024, 1, 1) + timedelta(days=dia),
+                entrada=horario(), intervalo=horario(0.3), saida=horario(),
+            )
+            for funcionario in funcionarios
+            for dia in range(60)
+        ])
+
+        pontos = Ponto.objects.com_horas().order_by('id')
+        linhas = calcular_jornadas(Ponto.objects.order_by('id'))
+        self.assertEqual(
+            list(pontos.values_list('minutos_trabalhados', 'atraso_segundos', 'extra_segundos')),
+            list(zip(linhas.minutos_trabalhados.tolist(), linhas.atraso_segundos.tolist(), linhas.extra_segundos.tolist())),
+        )
+
+    def test_uma_busca_por_funcionario(self):
+        """
+        Testa se as regras são carregadas uma vez por lote, e não uma vez por registro.
+        """
+        Ponto.objects.bulk_create([
+            Ponto(funcionario=funcionario, data=date(2024, 1, 1) + timedelta(days=dia), entrada=time(8, 0), saida=time(17, 0))
+            for funcionario in (self.funcionario, self.parcial)
+            for dia in range(200)
+        ])
+        cache_regras.limpar()
+        # Pontos, funcionários e jornadas
+        with self.assertNumQueries(3):
+            self.assertEqual(len(calcular_jornadas(Ponto.objects.all())), 400)
+        with self.assertNumQueries(1):
+            calcular_jornadas(Ponto.objects.all())
+
+    def test_salvar_jornada_invalida_regras_e_resumos(self):
+        """
+        Testa se alterar uma jornada atualiza as regras compiladas e os resumos já gravados.
+        """
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 2), entrada=time(8, 0), intervalo=time(1, 0), saida=time(17, 0))
+        self.assertEqual(ResumoMensal.objects.get(funcionario=self.funcionario).extra_segundos, 0)
+
+        self.comercial.fim = time(16, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.comercial.save()
+        self.assertEqual(regra_do_funcionario(self.funcionario.pk).segundos_por_dia[0], 7 * 3600)
+        # Os resumos são reconstruídos pelo worker, não durante o salvamento
+        self.assertEqual(ResumoMensal.objects.get(funcionario=self.funcionario).extra_segundos, 0)
+        call_command('processar_relatorios', '--once', stdout=StringIO())
+        self.assertFalse(ReconstrucaoResumos.objects.exists())
+        self.assertEqual(ResumoMensal.objects.get(funcionario=self.funcionario).extra_segundos, 3600)
+        self.assertEqual(ResumoMensal.objects.get(funcionario=None).extra_segundos, 3600)
+
+        self.funcionario.jornada = self.meio_periodo
+        with self.captureOnCommitCallbacks(execute=True):
+            self.funcionario.save()
+        self.assertEqual(ReconstrucaoResumos.objects.get().funcionario_id, self.funcionario.pk)
+        self.assertEqual(ResumoMensal.objects.get(funcionario=self.funcionario).extra_segundos, 3600)
+        call_command('processar_relatorios', '--once', stdout=StringIO())
+        self.assertEqual(ResumoMensal.objects.get(funcionario=self.funcionario).extra_segundos, 2 * 3600)
+
+    def test_trocar_de_empresa_reconstroi_pelo_worker(self):
+        """
+        Testa se a troca de empresa de um funcionário enfileira a reconstrução, que move os seus
+        valores dos resumos da empresa anterior para os da nova.
+        """
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 2), entrada=time(8, 0), intervalo=time(1, 0), saida=time(17, 0))
+        outra = Empresa.objects.create(nome="Outra", endereco="Rua Teste, 456", telefone="(12) 3456-7890")
+        # Pedidos das jornadas criadas no setUp
+        while reconstruir_pendentes() is not None:
+            pass
+
+        self.funcionario.empresa = outra
+        self.funcionario.jornada = None
+        with self.assertNumQueries(2):  # o próprio UPDATE e o pedido na fila
+            self.funcionario.save()
+        self.assertEqual(ResumoMensal.objects.get(funcionario=None, empresa=self.empresa).registros, 1)
+
+        self.assertEqual(reconstruir_pendentes(), 1)
+        self.assertFalse(ResumoMensal.objects.filter(funcionario=None, empresa=self.empresa).exists())
+        self.assertEqual(ResumoMensal.objects.get(funcionario=None, empresa=outra).registros, 1)
+        self.assertIsNone(reconstruir_pendentes())
+
+    def test_salvar_jornada_nao_reconstroi_resumos(self):
+        """
+        Testa se salvar e excluir uma jornada apenas enfileiram a reconstrução, com a mesma quantidade
+        de consultas para qualquer número de funcionários e de pontos, e se o worker atende os
+        pedidos repetidos da mesma jornada de uma vez.
+        """
+        def salvar():
+            with CaptureQueriesContext(connection) as consultas:
+                self.comercial.save()
+            return [consulta['sql'] for consulta in consultas.captured_queries]
+
+        antes = salvar()
+        for indice in range(20):
+            funcionario = Funcionario.objects.create(user=User.objects.create_user(username=f'f{indice}'), empresa=self.empresa)
+            Ponto.objects.bulk_create(
+                Ponto(funcionario=funcionario, data=date(2024, 12, 1) + timedelta(days=dia), entrada=time(8, 0), saida=time(17, 0))
+                for dia in range(10)
+            )
+        depois = salvar()
+        self.assertEqual(len(depois), len(antes))
+        self.assertFalse([sql for sql in depois if 'resumo' in sql.lower() and 'reconstrucao' not in sql.lower()])
+        # Criação no setUp e dois salvamentos
+        self.assertEqual(ReconstrucaoResumos.objects.filter(jornada_id=self.comercial.pk).count(), 3)
+
+        self.assertEqual(reconstruir_pendentes(), 21)  # os funcionários sem jornada própria
+        self.assertFalse(ReconstrucaoResumos.objects.filter(jornada_id=self.comercial.pk).exists())
+        self.assertEqual(ResumoMensal.objects.get(funcionario=None).registros, 200)
+        self.assertEqual(reconstruir_pendentes(), 22)  # pedido do meio período: os mesmos e o funcionário parcial
+        self.assertIsNone(reconstruir_pendentes())
+
+        empresa_id = self.empresa.pk
+        self.empresa.delete()
+        self.assertTrue(ReconstrucaoResumos.objects.filter(empresa_id=empresa_id).exists())
+        while reconstruir_pendentes() is not None:
+            pass
+        self.assertFalse(ResumoMensal.objects.exists())
+
+    def test_relatorio_descreve_a_jornada(self):
+        """
+        Testa se o cabeçalho do relatório descreve a jornada do funcionário.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('relatorio'), {'funcionario': self.funcionario.id})
+
+        with fitz.open(stream=response.content, filetype='pdf') as pdf:
+            texto = pdf[0].get_text()
+        self.assertIn("Jornada Comercial: 8h às 17h, com 1h de intervalo, de segunda a sexta", texto)
+        self.assertIn("(40h semanais, tolerância de 10 min)", texto)
+
+    def test_jornada_de_outra_empresa(self):
+        """
+        Testa se o formulário recusa uma jornada que não pertence à empresa do funcionário.
+        """
+        outra = Empresa.objects.create(nome="Outra", endereco="Rua 2", telefone="(12) 3456-7890")
+        jornada = Jornada.objects.create(nome="Noturna", empresa=outra)
+        form = FuncionarioUpdateForm(instance=self.funcionario, data={
+            'username': 'user_test',
+            'email': 'user@test.com',
+            'empresa': self.empresa.id,
+            'telefone': '(11) 99999-9999',
+            'jornada': jornada.id,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('jornada', form.errors)
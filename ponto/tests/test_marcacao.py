@@ -0,0 +1,157 @@
+import base64
+import threading
+from unittest import skipUnless
+from django.core.exceptions import ValidationError
+from django.db import connection, connections
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Ponto, ResumoDiario, ResumoMensal
+from ponto.utils.marcacao import bater_ponto
+from ponto.utils.resumos import METRICAS, reconstruir_resumos
+from django.contrib.auth.models import User
+from datetime import date, datetime, time
+
+
+def resumos():
+    return [
+        set(modelo.objects.values_list('empresa_id', 'funcionario_id', campo, *METRICAS))
+        for modelo, campo in ((ResumoDiario, 'data'), (ResumoMensal, 'mes'))
+    ]
+
+
+class MarcacaoTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa, um usuário com funcionário vinculado e um usuário sem funcionário.
+        """
+        self.empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        User.objects.create_user(username='gestor', password='12345')
+
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def bater(self, hora, minuto, segundo=0):
+        return bater_ponto(self.funcionario.pk, make_aware(datetime(2024, 12, 2, hora, minuto, segundo)))
+
+    def test_entrada_e_saida(self):
+        """
+        Testa se as marcações preenchem a entrada e depois a saída, mantendo os resumos iguais aos de
+        uma reconstrução completa, e se marcações extras são recusadas.
+        """
+        marcacao = self.bater(8, 0)
+        self.assertEqual((marcacao['campo'], marcacao['horario'], marcacao['data']), ('entrada', time(8, 0), date(2024, 12, 2)))
+        marcacao = self.bater(17, 30)
+        self.assertEqual((marcacao['campo'], marcacao['horario']), ('saida', time(17, 30)))
+
+        ponto = Ponto.objects.get(pk=marcacao['id'])
+        self.assertEqual((ponto.entrada, ponto.intervalo, ponto.saida), (time(8, 0), None, time(17, 30)))
+        incrementais = resumos()
+        reconstruir_resumos()
+        self.assertEqual(incrementais, resumos())
+
+        with self.assertRaises(ValidationError) as contexto:
+            self.bater(18, 0)
+        self.assertEqual(contexto.exception.code, 'completo')
+        self.assertEqual(Ponto.objects.get(pk=ponto.pk).saida, time(17, 30))
+
+    def test_toque_duplo_e_registro_existente(self):
+        """
+        Testa se uma marcação logo após a entrada é recusada e se um ponto existente sem entrada é
+        completado sem perder os demais horários.
+        """
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 2), intervalo=time(1, 0))
+        self.assertEqual(self.bater(8, 0)['campo'], 'entrada')
+        with self.assertRaises(ValidationError) as contexto:
+            self.bater(8, 0, 30)
+        self.assertEqual(contexto.exception.code, 'intervalo_minimo')
+        self.assertEqual(self.bater(8, 1)['campo'], 'saida')
+
+        ponto = Ponto.objects.get()
+        self.assertEqual((ponto.entrada, ponto.intervalo, ponto.saida), (time(8, 0), time(1, 0), time(8, 1)))
+
+    def test_endpoint(self):
+        """
+        Testa se o endpoint marca o ponto do funcionário logado e responde 409 na marcação repetida,
+        403 para usuários sem funcionário e exige autenticação.
+        """
+        url = reverse('ponto-bater')
+        self.assertIn(self.client.post(url).status_code, (401, 403))
+
+        self.client.login(username='user_test', password='12345')
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['campo'], 'entrada')
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['codigo'], 'intervalo_minimo')
+        self.assertEqual(Ponto.objects.filter(funcionario=self.funcionario).count(), 1)
+
+        self.client.login(username='gestor', password='12345')
+        self.assertEqual(self.client.post(url).status_code, 403)
+
+    def test_endpoint_basic_e_csrf(self):
+        """
+        Testa se o endpoint aceita HTTP Basic sem token CSRF, recusa credenciais inválidas com 401 e
+        exige o token CSRF de quem está logado pela sessão.
+        """
+        url = reverse('ponto-bater')
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(url, HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'user_test:errada').decode())
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Basic', response['WWW-Authenticate'])
+        response = client.post(url, HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'user_test:12345').decode())
+        self.assertEqual(response.status_code, 201)
+
+        client.login(username='user_test', password='12345')
+        self.assertEqual(client.post(url).status_code, 403)
+        self.assertEqual(Ponto.objects.get(funcionario=self.funcionario).saida, None)
+
+    async def test_endpoint_pelo_cliente_assincrono(self):
+        """
+        Testa se o endpoint marca o ponto pelo caminho ASGI.
+        """
+        await self.async_client.alogin(username='user_test', password='12345')
+        response = await self.async_client.post(reverse('ponto-bater'))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['campo'], 'entrada')
+        self.assertTrue(await Ponto.objects.filter(funcionario_id=self.funcionario.pk, entrada__isnull=False).aexists())
+
+
+@skipUnless(connection.vendor == 'postgresql', "Marcações simultâneas exigem conexões concorrentes do PostgreSQL")
+class MarcacaoConcorrenteTestCase(TransactionTestCase):
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def test_marcacoes_simultaneas(self):
+        """
+        Testa se marcações simultâneas do mesmo funcionário preenchem cada horário uma única vez.
+        """
+        empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        funcionario = Funcionario.objects.create(user=User.objects.create_user(username='user_test'), empresa=empresa)
+        agora = make_aware(datetime(2024, 12, 2, 8, 0))
+        inicio, campos, recusas = threading.Barrier(10), [], []
+
+        def marcar():
+            try:
+                inicio.wait()
+                campos.append(bater_ponto(funcionario.pk, agora)['campo'])
+            except ValidationError as erro:
+                recusas.append(erro.code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=marcar) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(campos, ['entrada'])
+        self.assertEqual(recusas, ['intervalo_minimo'] * 9)
+        self.assertEqual(ResumoDiario.objects.get(funcionario=funcionario).registros, 1)
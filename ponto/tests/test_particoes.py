@@ -0,0 +1,92 @@
+import unittest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.utils.timezone import localdate
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.filtros import filtrar_pontos_por_parametros
+from ponto.utils.particoes import (
+    PADRAO,
+    converter_tabela,
+    criar_particoes,
+    desanexar_particoes,
+    meses,
+    particoes,
+    somar_meses,
+)
+from datetime import date, time, timedelta
+
+
+class MesesTestCase(TestCase):
+    def test_meses_e_comando_sem_particionamento(self):
+        """
+        Testa o cálculo dos meses das partições e se o comando recusa uma tabela que não foi convertida.
+        """
+        self.assertEqual(meses(date(2023, 11, 15), date(2024, 2, 1)), [
+            date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1),
+        ])
+        self.assertEqual(somar_meses(date(2024, 1, 1), -13), date(2022, 12, 1))
+        with self.assertRaises(CommandError):
+            call_command('particoes_ponto')
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Particionamento disponível apenas no PostgreSQL')
+class ParticoesTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria um funcionário com um ponto por dia de janeiro a março de 2024.
+        - Converte a tabela de pontos em particionada (desfeito pelo rollback do teste).
+        """
+        empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.funcionario = Funcionario.objects.create(empresa=empresa)
+        Ponto.objects.bulk_create([
+            Ponto(funcionario=self.funcionario, data=date(2024, 1, 1) + timedelta(days=dia), entrada=time(8, 0), saida=time(17, 0))
+            for dia in range(91)
+        ])
+        self.ultimo_id = Ponto.objects.order_by('-id').values_list('id', flat=True)[0]
+        converter_tabela(meses_futuros=1)
+
+    def test_conversao_preserva_registros_e_restricoes(self):
+        """
+        Testa se a conversão mantém os registros, continua a sequência dos ids e a restrição de um ponto por dia.
+        """
+        self.assertEqual(Ponto.objects.count(), 91)
+        self.assertIn(date(2024, 2, 1), particoes())
+        novo = Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 4, 1))
+        self.assertGreater(novo.pk, self.ultimo_id)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 4, 1))
+
+    def test_consulta_por_periodo_le_apenas_as_particoes_do_periodo(self):
+        """
+        Testa se a listagem filtrada por período lê apenas a partição do mês (partition pruning).
+        """
+        pontos = filtrar_pontos_por_parametros(Ponto.objects.all(), {'data_inicio': '2024-02-05', 'data_fim': '2024-02-20'})
+        plano = pontos.order_by('data', 'id').explain()
+        self.assertIn('ponto_ponto_p2024_02', plano)
+        self.assertNotIn('ponto_ponto_p2024_01', plano)
+        self.assertNotIn('ponto_ponto_p2024_03', plano)
+
+    def test_criar_e_desanexar_particoes(self):
+        """
+        Testa se novas partições recebem os registros da partição padrão e se as antigas são desanexadas.
+        """
+        futuro = somar_meses(localdate().replace(day=1), 6)
+        Ponto.objects.create(funcionario=self.funcionario, data=futuro + timedelta(days=3))
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {PADRAO}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+        criar_particoes(futuro)
+        self.assertIn(futuro, particoes())
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {PADRAO}")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+        self.assertEqual(desanexar_particoes(date(2024, 2, 1), esquema='arquivo_ponto'), ['ponto_ponto_p2024_01'])
+        self.assertFalse(Ponto.objects.filter(data__lt=date(2024, 2, 1)).exists())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM arquivo_ponto.ponto_ponto_p2024_01")
+            self.assertEqual(cursor.fetchone()[0], 31)
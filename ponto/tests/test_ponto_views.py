@@ -1,8 +1,13 @@
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from ponto.engine import formatar_minutos
 from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.filtros import filtrar_pontos_por_parametros
 from django.contrib.auth.models import User
-from datetime import date, time
+from datetime import date, time, timedelta
 
 
 class PontoTestCase(TestCase):
@@ -62,6 +67,141 @@ class PontoTestCase(TestCase):
         self.assertEqual(response.status_code, 200)  # A página deve carregar
         self.assertContains(response, "Dec. 29, 2024")
 
+    async def test_listar_pontos_pelo_cliente_assincrono(self):
+        """
+        Testa se a listagem de pontos funciona pelo caminho ASGI e exige autenticação.
+        """
+        response = await self.async_client.get(reverse('ponto-list'))
+        self.assertEqual(response.status_code, 302)
+
+        await self.async_client.alogin(username='user_test', password='12345')
+        response = await self.async_client.get(reverse('ponto-list'), {'funcionario': self.funcionario.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Dec. 29, 2024")
+        self.assertEqual(response.context['totais']['registros'], 2)
+
+    def criar_pontos(self, quantidade):
+        outro = Funcionario.objects.create(user=User.objects.create_user(username='outro'), empresa=self.empresa)
+        Ponto.objects.bulk_create([
+            Ponto(funcionario=funcionario, data=date(2024, 1, 1) + timedelta(days=dia), entrada=time(8, 0), saida=time(17, 0))
+            for dia in range(quantidade // 2)
+            for funcionario in (self.funcionario, outro)
+        ])
+
+    def test_paginacao_por_cursor(self):
+        """
+        Testa se os links de próxima e anterior percorrem todos os pontos em ordem de data, sem repetições.
+        """
+        self.criar_pontos(24)
+        self.client.login(username='user_test', password='12345')  # Faz login
+        url = reverse('ponto-list')
+        response = self.client.get(url, {'por_pagina': 10})
+        paginas = []
+        while True:
+            paginas.append([ponto.pk for ponto in response.context['object_list']])
+            if not response.context['url_proxima']:
+                break
+            response = self.client.get(url + response.context['url_proxima'])
+
+        esperado = list(Ponto.objects.order_by('data', 'id').values_list('pk', flat=True))
+        self.assertEqual([len(pagina) for pagina in paginas], [10, 10, 6])
+        self.assertEqual(sum(paginas, []), esperado)
+
+        response = self.client.get(url + response.context['url_anterior'])
+        self.assertEqual([ponto.pk for ponto in response.context['object_list']], paginas[1])
+        self.assertIn('por_pagina=10', response.context['url_anterior'])
+
+    def test_paginacao_mantem_filtros_e_ignora_cursor_invalido(self):
+        """
+        Testa se a paginação respeita os filtros e se um cursor adulterado volta para a primeira página.
+        """
+        self.criar_pontos(24)
+        self.client.login(username='user_test', password='12345')  # Faz login
+        filtros = {'funcionario': self.funcionario.id, 'data_inicio': '2024-01-03', 'por_pagina': 5}
+        response = self.client.get(reverse('ponto-list'), filtros)
+        self.assertEqual([ponto.data for ponto in response.context['object_list']], [date(2024, 1, d) for d in range(3, 8)])
+
+        response = self.client.get(reverse('ponto-list') + response.context['url_proxima'])
+        self.assertTrue(all(ponto.funcionario_id == self.funcionario.id for ponto in response.context['object_list']))
+        self.assertEqual(response.context['object_list'][0].data, date(2024, 1, 8))
+
+        response = self.client.get(reverse('ponto-list'), {**filtros, 'cursor': 'adulterado'})
+        self.assertEqual(response.context['object_list'][0].data, date(2024, 1, 3))
+
+    def test_paginacao_custo_constante(self):
+        """
+        Testa se páginas profundas executam as mesmas consultas da primeira, sem OFFSET.
+        """
+        self.criar_pontos(60)
+        self.client.login(username='user_test', password='12345')  # Faz login
+        url = reverse('ponto-list')
+        with CaptureQueriesContext(connection) as primeira:
+            response = self.client.get(url, {'por_pagina': 10})
+        for _ in range(3):
+            response = self.client.get(url + response.context['url_proxima'])
+        with CaptureQueriesContext(connection) as profunda:
+            self.client.get(url + response.context['url_proxima'])
+
+        self.assertEqual(len(profunda), len(primeira))
+        self.assertFalse(any('OFFSET' in consulta['sql'] for consulta in profunda.captured_queries))
+
+    def test_filtro_ordenacao_e_totais_por_horas(self):
+        """
+        Testa se a listagem filtra e ordena pelas horas trabalhadas e soma os totais de todos os pontos filtrados.
+        """
+        # ponto1 e ponto2: 9h menos 12h e 13h de intervalo (negativo, como no cálculo original)
+        dias = {date(2024, 1, 1): time(17, 0), date(2024, 1, 2): time(19, 30), date(2024, 1, 3): time(12, 0)}
+        for data, saida in dias.items():
+            Ponto.objects.create(funcionario=self.funcionario, data=data, entrada=time(8, 0), intervalo=time(1, 0), saida=saida)
+        self.client.login(username='user_test', password='12345')  # Faz login
+        url = reverse('ponto-list')
+
+        response = self.client.get(url, {'horas_min': '8', 'ordenar': '-horas', 'funcionario': self.funcionario.id})
+        self.assertEqual([ponto.data for ponto in response.context['object_list']], [date(2024, 1, 2), date(2024, 1, 1)])
+        self.assertEqual(response.context['totais']['horas_trabalhadas'], "18h 30m")
+        # Sem jornada cadastrada vale a original (8h): 1h30 extra em 02/01 e 1h extra em 01/01
+        self.assertEqual(response.context['totais']['extra'], "2h 30m")
+
+        response = self.client.get(url, {'horas_max': '3,5', 'horas_min': 'x'})
+        self.assertEqual([ponto.data for ponto in response.context['object_list']], [date(2024, 1, 3), date(2024, 12, 29), date(2024, 12, 30)])
+        # Sem funcionário nem período, o filtro de horas não soma a tabela inteira
+        self.assertIsNone(response.context['totais'])
+        response = self.client.get(url, {'horas_max': '3,5', 'data_inicio': '2024-01-01'})
+        self.assertEqual(response.context['totais']['registros'], 3)
+
+        # Atrasos: 12h em 30/12 (-4h trabalhadas), 11h em 29/12 (-3h) e 4h em 03/01 (4h)
+        response = self.client.get(url, {'ordenar': '-atraso', 'por_pagina': 1})
+        self.assertEqual(response.context['object_list'][0].data, date(2024, 12, 30))
+        response = self.client.get(url + response.context['url_proxima'])
+        self.assertEqual(response.context['object_list'][0].data, date(2024, 12, 29))
+        response = self.client.get(url + response.context['url_proxima'])
+        self.assertEqual(response.context['object_list'][0].data, date(2024, 1, 3))
+        response = self.client.get(url + response.context['url_anterior'])
+        self.assertEqual(response.context['object_list'][0].data, date(2024, 12, 29))
+        self.assertEqual(response.context['totais']['registros'], 5)
+
+    def test_totais_vem_dos_resumos(self):
+        """
+        Testa se, sem o filtro de horas, os totais da listagem vêm dos resumos, sem somar os
+        pontos, e são iguais aos da soma dos pontos filtrados.
+        """
+        self.client.login(username='user_test', password='12345')  # Faz login
+        url = reverse('ponto-list')
+        for filtros in ({}, {'funcionario': self.funcionario.id, 'data_inicio': '2024-12-30'}):
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.get(url, filtros)
+            self.assertFalse([
+                consulta['sql'] for consulta in consultas.captured_queries
+                if 'SUM(' in consulta['sql'].upper() and 'resumo' not in consulta['sql'].lower()
+            ])
+            totais = response.context['totais']
+            pontos = filtrar_pontos_por_parametros(Ponto.objects.com_horas(), filtros)
+            self.assertEqual(totais['registros'], pontos.count())
+            self.assertEqual(
+                totais['horas_trabalhadas'],
+                formatar_minutos(pontos.aggregate(total=Sum('minutos_trabalhados'))['total']),
+            )
+
     def test_criar_ponto(self):
         """
         Testa se um novo registro de ponto pode ser criado.
@@ -77,6 +217,22 @@ class PontoTestCase(TestCase):
         self.assertEqual(response.status_code, 302)  # Verifica redirecionamento
         self.assertTrue(Ponto.objects.filter(data='2024-12-31').exists())  # Verifica se o ponto foi criado
 
+    def test_criar_ponto_duplicado(self):
+        """
+        Testa se o formulário recusa um segundo ponto do mesmo funcionário no mesmo dia.
+        """
+        self.client.login(username='user_test', password='12345')  # Faz login
+        response = self.client.post(reverse('ponto-create'), {
+            'funcionario': self.funcionario.id,
+            'data': '2024-12-29',
+            'entrada': '08:00',
+            'intervalo': '01:00',
+            'saida': '17:00'
+        })
+        self.assertEqual(response.status_code, 200)  # O formulário é exibido novamente com o erro
+        self.assertContains(response, "Já existe um ponto deste funcionário nesta data.")
+        self.assertEqual(Ponto.objects.filter(funcionario=self.funcionario, data='2024-12-29').count(), 1)
+
     def test_atualizar_ponto(self):
         """
         Testa se um registro de ponto existente pode ser atualizado.
@@ -0,0 +1,119 @@
+from datetime import time, timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils.timezone import localdate
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.ingestao import ingerir_pontos
+from ponto.utils.presenca import painel_presenca
+from django.contrib.auth.models import User
+
+
+class PresencaTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Limpa o cache e cria duas empresas, a primeira com três funcionários e um usuário logado.
+        """
+        cache.clear()
+        self.hoje = localdate()
+        self.empresa = Empresa.objects.create(nome="Empresa A", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.outra = Empresa.objects.create(nome="Empresa B", endereco="Rua Teste, 456", telefone="(12) 3456-7891")
+        self.funcionarios = [
+            Funcionario.objects.create(user=User.objects.create_user(username=f'func_{i}', password='12345'), empresa=self.empresa)
+            for i in range(3)
+        ]
+        User.objects.create_user(username='gestor', password='12345')
+        self.client.login(username='gestor', password='12345')
+
+    def tearDown(self):
+        cache_regras.limpar()
+
+    def resumo(self, empresa):
+        return next(item for item in painel_presenca() if item['id'] == empresa.pk)
+
+    def test_painel_acompanha_as_marcacoes(self):
+        """
+        Testa se o painel mostra presentes, encerrados e ausentes e se acompanha as marcações sem recálculo.
+        """
+        resumo = self.resumo(self.empresa)
+        self.assertEqual((resumo['total'], resumo['ausentes']['quantidade']), (3, 3))
+
+        ponto = Ponto.objects.create(funcionario=self.funcionarios[0], data=self.hoje, entrada=time(8, 0))
+        Ponto.objects.create(funcionario=self.funcionarios[1], data=self.hoje, entrada=time(8, 0), saida=time(12, 0))
+        Ponto.objects.create(funcionario=self.funcionarios[2], data=self.hoje - timedelta(days=1), entrada=time(8, 0))
+        with self.assertNumQueries(1):  # apenas a lista de empresas; a presença vem do cache
+            resumo = self.resumo(self.empresa)
+        self.assertEqual(resumo['presentes']['nomes'], ['func_0'])
+        self.assertEqual(resumo['encerrados']['nomes'], ['func_1'])
+        self.assertEqual(resumo['ausentes']['nomes'], ['func_2'])
+
+        ponto.delete()
+        self.assertEqual(self.resumo(self.empresa)['ausentes']['nomes'], ['func_0', 'func_2'])
+
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, '0 de 3 trabalhando agora')
+        self.assertContains(response, 'Empresa B')
+
+    def test_consultas_nao_dependem_do_tamanho_da_empresa(self):
+        """
+        Testa se a página inicial faz o mesmo número de consultas e limita os nomes para empresas de tamanhos diferentes.
+        """
+        self.client.get(reverse('home'))
+        consultas = []
+        for quantidade in (3, 30):
+            for i in range(len(self.funcionarios), quantidade):
+                funcionario = Funcionario.objects.create(
+                    user=User.objects.create_user(username=f'func_{i}', password='12345'), empresa=self.empresa
+                )
+                self.funcionarios.append(funcionario)
+                Ponto.objects.create(funcionario=funcionario, data=self.hoje, entrada=time(8, 0))
+            self.client.get(reverse('home'))
+            with CaptureQueriesContext(connection) as contexto:
+                response = self.client.get(reverse('home'))
+            consultas.append(len(contexto))
+        self.assertEqual(consultas[0], consultas[1])
+        self.assertContains(response, 'e mais 17')
+
+    def test_recalculo_corrige_escritas_sem_sinais(self):
+        """
+        Testa se escritas sem sinais são corrigidas pelo recálculo periódico e se a ingestão em lote invalida a presença.
+        """
+        self.resumo(self.empresa)
+        Ponto.objects.bulk_create([Ponto(funcionario=self.funcionarios[0], data=self.hoje, entrada=time(8, 0))])
+        self.assertEqual(self.resumo(self.empresa)['presentes']['quantidade'], 0)
+        with override_settings(PONTO_PRESENCA_RECALCULO=0):
+            self.assertEqual(self.resumo(self.empresa)['presentes']['quantidade'], 1)
+
+        Ponto.objects.filter(funcionario=self.funcionarios[0]).update(saida=time(12, 0))
+        call_command('recalcular_presenca', stdout=StringIO())
+        self.assertEqual(self.resumo(self.empresa)['encerrados']['nomes'], ['func_0'])
+
+        ingerir_pontos([{'funcionario': self.funcionarios[1].pk, 'data': self.hoje.isoformat(), 'entrada': '09:00'}])
+        self.assertEqual(self.resumo(self.empresa)['presentes']['nomes'], ['func_1'])
+
+    def test_mudanca_de_empresa(self):
+        """
+        Testa se a troca de empresa de um funcionário move a sua presença entre as empresas.
+        """
+        Ponto.objects.create(funcionario=self.funcionarios[0], data=self.hoje, entrada=time(8, 0))
+        self.resumo(self.empresa)
+        self.funcionarios[0].empresa = self.outra
+        self.funcionarios[0].save()
+        self.assertEqual(self.resumo(self.empresa)['total'], 2)
+        self.assertEqual(self.resumo(self.outra)['presentes']['nomes'], ['func_0'])
+
+    def test_visitante_ve_apenas_a_pagina_estatica(self):
+        """
+        Testa se a página inicial não exibe nem calcula a presença para usuários não autenticados.
+        """
+        self.client.logout()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Bem-vindo ao Controle de Ponto')
+        self.assertNotContains(response, 'Presença de hoje')
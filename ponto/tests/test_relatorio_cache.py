@@ -0,0 +1,123 @@
+import tempfile
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.cache import MemoriaBackend, ArquivoBackend, RelatorioCache, obter_relatorio_cache, versao_dados
+from django.contrib.auth.models import User
+from datetime import date, time
+
+
+class RelatorioCacheTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa, um usuário, um funcionário e um registro de ponto.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        self.ponto = Ponto.objects.create(
+            funcionario=self.funcionario,
+            data=date(2024, 12, 29),
+            entrada=time(8, 0),
+            intervalo=time(1, 0),
+            saida=time(17, 0)
+        )
+
+    def test_relatorio_repetido_vem_do_cache(self):
+        """
+        Testa se o segundo pedido com os mesmos filtros é servido pelo cache.
+        """
+        filtros = {'funcionario': self.funcionario.id, 'data_inicio': '2024-12-01'}
+        cache = obter_relatorio_cache()
+        hits = cache.hits
+
+        primeira = self.client.get(reverse('relatorio'), filtros)
+        segunda = self.client.get(reverse('relatorio'), filtros)
+        self.assertEqual(primeira['X-Cache'], 'MISS')
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(primeira.content, segunda.content)
+        self.assertEqual(cache.hits, hits + 1)
+
+    def test_filtro_de_horas_gera_outro_relatorio(self):
+        """
+        Testa se o filtro de horas faz parte da chave, em vez de reaproveitar o relatório sem ele.
+        """
+        filtros = {'funcionario': self.funcionario.id}
+        self.client.get(reverse('relatorio'), filtros)
+
+        response = self.client.get(reverse('relatorio'), {**filtros, 'horas_min': '10'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reverse('relatorio'), {**filtros, 'horas_min': '10,0'})['X-Cache'], 'HIT')
+
+    def test_alteracao_de_ponto_invalida_cache(self):
+        """
+        Testa se salvar ou remover um Ponto faz o relatório ser gerado novamente.
+        """
+        filtros = {'funcionario': self.funcionario.id}
+        self.client.get(reverse('relatorio'), filtros)
+
+        self.ponto.saida = time(18, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ponto.save()
+        self.assertEqual(self.client.get(reverse('relatorio'), filtros)['X-Cache'], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ponto.delete()
+        self.assertEqual(self.client.get(reverse('relatorio'), filtros)['X-Cache'], 'MISS')
+
+    def test_versao_muda_apenas_apos_o_commit(self):
+        """
+        Testa se a versão dos dados só muda quando a transação que alterou o Ponto é confirmada,
+        para que um relatório gerado antes do commit não fique no cache sob a nova versão.
+        """
+        versao = versao_dados()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.ponto.saida = time(18, 0)
+            self.ponto.save()
+            self.assertEqual(versao_dados(), versao)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(versao_dados(), versao)
+
+
+class RelatorioCacheBackendTestCase(SimpleTestCase):
+    def test_memoria_despeja_menos_recente(self):
+        """
+        Testa se o backend em memória remove o item menos usado ao passar do limite de bytes.
+        """
+        backend = MemoriaBackend(max_bytes=10)
+        backend.set('a', b'12345')
+        backend.set('b', b'12345')
+        backend.get('a')
+        backend.set('c', b'12345')
+        self.assertEqual(backend.get('a'), b'12345')
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('c'), b'12345')
+
+    def test_arquivo_respeita_limite_de_bytes(self):
+        """
+        Testa se o backend em disco mantém o diretório dentro do limite de bytes.
+        """
+        with tempfile.TemporaryDirectory() as diretorio:
+            backend = ArquivoBackend(max_bytes=10, location=diretorio)
+            backend.set('a', b'12345')
+            backend.set('b', b'12345')
+            backend.set('c', b'12345')
+            guardados = [chave for chave in 'abc' if backend.get(chave) is not None]
+            self.assertEqual(len(guardados), 2)
+            self.assertIn('c', guardados)
+
+    def test_contadores(self):
+        """
+        Testa os contadores de acertos e falhas.
+        """
+        cache = RelatorioCache(MemoriaBackend(max_bytes=100))
+        cache.get('x')
+        cache.set('x', b'pdf')
+        cache.get('x')
+        self.assertEqual(cache.estatisticas(), {'hits': 1, 'misses': 1, 'taxa_acerto': 0.5})
@@ -0,0 +1,230 @@
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO, StringIO
+from django.core.management import call_command
+from unittest import SkipTest
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from ponto.models import Empresa, Funcionario, Ponto, RelatorioJob
+from ponto.utils.jobs import processar_job, reivindicar_job
+from ponto.utils.pacote import executor_pacotes, gerar_pacote_zip
+from django.contrib.auth.models import User
+from datetime import date, time, timedelta
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RelatorioJobTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa, um usuário e um funcionário com um registro de ponto.
+        - Cria um segundo usuário, que não deve ver os jobs do primeiro.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.outro = User.objects.create_user(username='outro', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        Ponto.objects.create(
+            funcionario=self.funcionario,
+            data=date(2024, 12, 29),
+            entrada=time(8, 0),
+            intervalo=time(1, 0),
+            saida=time(17, 0)
+        )
+
+    def test_solicitar_relatorio_enfileira_job(self):
+        """
+        Testa se o botão "Gerar Relatório" cria um job pendente e redireciona para o status.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.post(reverse('relatorio-solicitar'), {
+            'funcionario': self.funcionario.id,
+            'data_inicio': '2024-12-01',
+            'data_fim': '',
+        })
+        job = RelatorioJob.objects.get()
+        self.assertRedirects(response, reverse('relatorio-status', args=[job.pk]))
+        self.assertEqual(job.status, RelatorioJob.Status.PENDENTE)
+        self.assertEqual(job.funcionario, self.funcionario)
+        self.assertEqual(job.data_inicio, date(2024, 12, 1))
+        self.assertIsNone(job.data_fim)
+
+    def test_worker_processa_job_e_download(self):
+        """
+        Testa o ciclo completo: o worker gera o PDF, o status muda para concluído e o download funciona.
+        """
+        job = RelatorioJob.objects.create(usuario=self.user, funcionario=self.funcionario)
+        call_command('processar_relatorios', '--once', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RelatorioJob.Status.CONCLUIDO)
+
+        self.client.login(username='user_test', password='12345')
+        status = self.client.get(reverse('relatorio-status', args=[job.pk]), {'format': 'json'}).json()
+        self.assertEqual(status['status'], 'concluido')
+        self.assertEqual(status['download'], reverse('relatorio-download', args=[job.pk]))
+
+        response = self.client.get(reverse('relatorio-download', args=[job.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+
+    def test_reivindicar_job_pula_jobs_em_processamento(self):
+        """
+        Testa se um job já reivindicado não é entregue a outro worker.
+        """
+        RelatorioJob.objects.create(usuario=self.user)
+        primeiro = reivindicar_job()
+        self.assertEqual(primeiro.status, RelatorioJob.Status.PROCESSANDO)
+        self.assertIsNone(reivindicar_job())
+
+    def test_resultado_de_tentativa_abandonada_e_descartado(self):
+        """
+        Testa se, quando um job passa do timeout e é reivindicado por outro worker, o resultado do
+        primeiro worker é descartado e apenas o da nova tentativa é gravado.
+        """
+        RelatorioJob.objects.create(usuario=self.user, funcionario=self.funcionario)
+        primeiro = reivindicar_job()
+        RelatorioJob.objects.filter(pk=primeiro.pk).update(iniciado_em=timezone.now() - timedelta(hours=1))
+        segundo = reivindicar_job()
+        self.assertEqual(segundo.pk, primeiro.pk)
+        self.assertEqual((primeiro.tentativa, segundo.tentativa), (1, 2))
+
+        self.assertIsNone(processar_job(primeiro))
+        self.assertFalse(primeiro.arquivo.storage.exists(f'relatorios/relatorio_{primeiro.pk}_1.pdf'))
+        job = RelatorioJob.objects.get(pk=primeiro.pk)
+        self.assertEqual(job.status, RelatorioJob.Status.PROCESSANDO)
+        self.assertFalse(job.arquivo)
+
+        self.assertEqual(processar_job(segundo).status, RelatorioJob.Status.CONCLUIDO)
+        job.refresh_from_db()
+        self.assertEqual(job.status, RelatorioJob.Status.CONCLUIDO)
+        self.assertEqual(job.arquivo.name, f'relatorios/relatorio_{job.pk}_2.pdf')
+        self.assertTrue(job.arquivo.storage.exists(job.arquivo.name))
+
+    def test_worker_apaga_jobs_antigos(self):
+        """
+        Testa se o worker apaga os jobs concluídos há mais de `RELATORIO_JOB_RETENCAO_DIAS` dias,
+        com os PDFs, e mantém os recentes.
+        """
+        antigo = RelatorioJob.objects.create(usuario=self.user, funcionario=self.funcionario)
+        call_command('processar_relatorios', '--once', stdout=StringIO())
+        antigo.refresh_from_db()
+        arquivo = antigo.arquivo.name
+        self.assertTrue(antigo.arquivo.storage.exists(arquivo))
+        RelatorioJob.objects.filter(pk=antigo.pk).update(concluido_em=timezone.now() - timedelta(days=8))
+
+        recente = RelatorioJob.objects.create(usuario=self.user, funcionario=self.funcionario)
+        saida = StringIO()
+        call_command('processar_relatorios', '--once', stdout=saida)
+        self.assertIn('1 relatório(s) antigo(s) apagado(s).', saida.getvalue())
+        self.assertFalse(RelatorioJob.objects.filter(pk=antigo.pk).exists())
+        self.assertFalse(antigo.arquivo.storage.exists(arquivo))
+        recente.refresh_from_db()
+        self.assertEqual(recente.status, RelatorioJob.Status.CONCLUIDO)
+        self.assertTrue(recente.arquivo.storage.exists(recente.arquivo.name))
+
+    def test_job_de_outro_usuario(self):
+        """
+        Testa se um usuário não consegue consultar nem baixar o relatório de outro usuário.
+        """
+        job = RelatorioJob.objects.create(usuario=self.user, status=RelatorioJob.Status.CONCLUIDO)
+        self.client.login(username='outro', password='12345')
+        self.assertEqual(self.client.get(reverse('relatorio-status', args=[job.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('relatorio-download', args=[job.pk])).status_code, 404)
+
+
+@override_settings(RELATORIO_PACOTE_WORKERS=1)
+class PacoteRelatoriosTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa com dois funcionários, cada um com um registro de ponto.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        for username in ('ana', 'bruno'):
+            funcionario = Funcionario.objects.create(user=User.objects.create_user(username=username), empresa=self.empresa)
+            Ponto.objects.create(funcionario=funcionario, data=date(2024, 12, 2), entrada=time(8, 0), saida=time(17, 0))
+
+    def test_pacote_zip_com_um_pdf_por_funcionario(self):
+        """
+        Testa se o pacote da empresa contém um PDF para cada funcionário.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('empresa-relatorios', args=[self.empresa.id]), {'data_inicio': '2024-12-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        with zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))) as pacote:
+            nomes = sorted(pacote.namelist())
+            self.assertEqual(len(nomes), 2)
+            self.assertTrue(nomes[0].endswith('_ana.pdf'))
+            self.assertTrue(pacote.read(nomes[1]).startswith(b"%PDF"))
+
+    def test_pacote_com_datas_invalidas(self):
+        """
+        Testa se datas inválidas são rejeitadas antes de gerar os relatórios.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('empresa-relatorios', args=[self.empresa.id]), {'data_fim': '31/31/2024'})
+        self.assertEqual(response.status_code, 400)
+
+
+class PacoteRelatoriosProcessosTestCase(TransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Só é possível conferir depois que o banco de teste foi criado
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise SkipTest("Os processos do pool não enxergam o banco SQLite em memória dos testes")
+        super().setUpClass()
+
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa com três funcionários, cada um com registros de ponto, fora de uma
+          transação, para que os processos do pool os enxerguem.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        for username in ('ana', 'bruno', 'carla'):
+            funcionario = Funcionario.objects.create(user=User.objects.create_user(username=username), empresa=self.empresa)
+            Ponto.objects.create(funcionario=funcionario, data=date(2024, 12, 2), entrada=time(8, 0), saida=time(17, 0))
+            Ponto.objects.create(funcionario=funcionario, data=date(2024, 12, 3), entrada=time(9, 0), saida=time(17, 0))
+
+    def test_pacote_com_varios_workers(self):
+        """
+        Testa se, gerados nos processos do pool, os relatórios de todos os funcionários entram no
+        pacote, os mesmos da geração no próprio processo, e se o pool é reaproveitado.
+        """
+        funcionario_ids = list(self.empresa.funcionarios.order_by('pk').values_list('id', flat=True))
+        esperado = zipfile.ZipFile(BytesIO(b"".join(gerar_pacote_zip(funcionario_ids, '2024-12-01', workers=1))))
+        for _ in range(2):
+            conteudo = b"".join(gerar_pacote_zip(funcionario_ids + [999999], '2024-12-01', workers=2))
+            with zipfile.ZipFile(BytesIO(conteudo)) as pacote:
+                nomes = sorted(pacote.namelist())
+                self.assertEqual(nomes, sorted(esperado.namelist()) + ['erros.txt'])
+                self.assertIn('Funcionário 999999', pacote.read('erros.txt').decode())
+                for nome in esperado.namelist():
+                    self.assertTrue(pacote.read(nome).startswith(b"%PDF"))
+        self.assertIs(executor_pacotes(2), executor_pacotes(2))
@@ -0,0 +1,138 @@
+import re
+import fitz
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.http import StreamingHttpResponse
+from ponto.engine import ResultadoJornadas
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.utils.reports import montar_relatorio, renderizar_pdf, renderizar_pdf_por_celula
+from django.contrib.auth.models import User
+from datetime import date, time, timedelta
+
+
+class RelatorioTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa, um usuário e um funcionário.
+        - Cria registros de ponto suficientes para ocupar mais de uma página.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(
+            user=self.user,
+            empresa=self.empresa,
+            telefone="(11) 9988-7766"
+        )
+        inicio = date(2024, 1, 1)
+        Ponto.objects.bulk_create([
+            Ponto(
+                funcionario=self.funcionario,
+                data=inicio + timedelta(days=dia),
+                entrada=time(8, 0),
+                intervalo=time(1, 0),
+                saida=time(18, 0) if dia % 2 else time(16, 30)
+            )
+            for dia in range(120)
+        ])
+
+    def _texto_pdf(self, conteudo):
+        # As palavras são ordenadas pela posição na página (linha a linha), independentemente
+        # da ordem em que foram desenhadas
+        with fitz.open(stream=conteudo, filetype='pdf') as pdf:
+            return pdf.page_count, "\n".join(
+                " ".join(palavra[4] for palavra in sorted(page.get_text("words"), key=lambda p: (round(p[3]), p[0])))
+                for page in pdf
+            )
+
+    def test_relatorio_pdf(self):
+        """
+        Testa se o relatório em memória retorna um PDF com os registros e os totais.
+        """
+        response = self.client.get(reverse('relatorio'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        paginas, texto = self._texto_pdf(response.content)
+        self.assertGreater(paginas, 1)
+        self.assertIn("01/01/2024", texto)
+        self.assertIn("Total de Atrasos: 1 day, 6:00:00", texto)
+
+    def test_relatorio_por_funcionario(self):
+        """
+        Testa se a rota /funcionarios/<id>/relatorio/ filtra pelo funcionário da URL.
+        """
+        response = self.client.get(reverse('funcionario-relatorio', args=[self.funcionario.id]))
+        self.assertEqual(response.status_code, 200)
+        _, texto = self._texto_pdf(response.content)
+        self.assertIn("Funcionário: user_test | Empresa: Empresa Teste", texto)
+
+    async def test_relatorio_pelo_cliente_assincrono(self):
+        """
+        Testa se o relatório é gerado pelo caminho ASGI e se um funcionário inexistente retorna 404.
+        """
+        response = await self.async_client.get(reverse('funcionario-relatorio', args=[self.funcionario.id]))
+        self.assertEqual(response.status_code, 200)
+        _, texto = self._texto_pdf(response.content)
+        self.assertIn("Funcionário: user_test | Empresa: Empresa Teste", texto)
+
+        response = await self.async_client.get(reverse('relatorio'), {'funcionario': 9999})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_relatorio_assincrono_em_lotes(self):
+        """
+        Testa se o relatório assíncrono calcula os registros em lotes de `RELATORIO_CHUNK_SIZE`,
+        em vez de carregar todos de uma vez, com os mesmos totais.
+        """
+        lotes = []
+
+        def resultado(linhas, regra=None):
+            lotes.append(len(linhas))
+            return ResultadoJornadas(linhas, regra)
+
+        with override_settings(RELATORIO_CHUNK_SIZE=50), patch('ponto.utils.reports.ResultadoJornadas', resultado):
+            response = await self.async_client.get(reverse('relatorio'), {'data_inicio': '2023-12-31'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(lotes, [50, 50, 20])
+        _, texto = self._texto_pdf(response.content)
+        self.assertIn("Total de Atrasos: 1 day, 6:00:00", texto)
+
+    def test_relatorio_streaming(self):
+        """
+        Testa se o modo streaming envia um PDF válido, em blocos, com o mesmo conteúdo do relatório em memória.
+        """
+        response = self.client.get(reverse('relatorio-stream'), {'data_fim': '2024-03-31'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        conteudo = b"".join(response.streaming_content)
+
+        esperado = self.client.get(reverse('relatorio'), {'data_fim': '2024-03-31'})
+        paginas_stream, texto_stream = self._texto_pdf(conteudo)
+        paginas, texto = self._texto_pdf(esperado.content)
+        self.assertEqual(paginas_stream, paginas)
+        emissao = re.compile(r"Emitido em: .*")
+        self.assertEqual(emissao.sub("", texto_stream), emissao.sub("", texto))
+
+    def test_relatorio_streaming_por_funcionario_inexistente(self):
+        """
+        Testa se o modo streaming retorna 404 para um funcionário inexistente.
+        """
+        response = self.client.get(reverse('funcionario-relatorio-stream', args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_renderizacao_por_colunas_igual_por_celula(self):
+        """
+        Testa se o desenho por colunas gera páginas idênticas, pixel a pixel, ao desenho célula a célula.
+        """
+        _, paginas = montar_relatorio({'data_fim': '2024-03-31'}, self.funcionario.id)
+        paginas = list(paginas)
+        with fitz.open(stream=renderizar_pdf(paginas), filetype='pdf') as novo, \
+                fitz.open(stream=renderizar_pdf_por_celula(paginas), filetype='pdf') as original:
+            self.assertEqual(novo.page_count, original.page_count)
+            for pagina_nova, pagina_original in zip(novo, original):
+                self.assertEqual(pagina_nova.get_pixmap().samples, pagina_original.get_pixmap().samples)
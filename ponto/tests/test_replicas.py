@@ -0,0 +1,106 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.routers import RoteadorReplicas, usando_replica
+from ponto.utils.replicas import CHAVE_ESCRITA, registrar_escrita
+from django.contrib.auth.models import User
+from datetime import date, time
+
+
+@override_settings(PONTO_REPLICAS=['replica_teste'])
+class ReplicasTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Usa a própria conexão principal como a réplica `replica_teste`, para que ela enxergue os
+          dados da transação do teste; o roteamento é conferido pelos bancos escolhidos pelo roteador.
+          O alias também é registrado nas configurações, para as views assíncronas, que o consultam
+          a partir da thread do laço de eventos.
+        - Cria uma empresa, um usuário logado com funcionário e um ponto.
+        """
+        cache.clear()
+        connections.settings['replica_teste'] = connections.settings['default']
+        connections['replica_teste'] = connections['default']
+        self.empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 2), entrada=time(8, 0), saida=time(17, 0))
+        self.client.login(username='user_test', password='12345')
+
+    def tearDown(self):
+        del connections['replica_teste']
+        del connections.settings['replica_teste']
+        cache_regras.limpar()
+
+    def bancos_lidos(self, *args, **kwargs):
+        """
+        Faz um GET e retorna o conjunto de bancos escolhidos pelo roteador para as leituras de ponto.
+        """
+        escolhidos = []
+        original = RoteadorReplicas.db_for_read
+
+        def espiar(roteador, model, **hints):
+            escolhidos.append(original(roteador, model, **hints))
+            return escolhidos[-1]
+
+        with mock.patch.object(RoteadorReplicas, 'db_for_read', espiar):
+            self.response = self.client.get(*args, **kwargs)
+        self.assertEqual(self.response.status_code, 200)
+        return set(escolhidos) - {None}
+
+    def test_roteamento(self):
+        """
+        Testa se apenas as leituras dos modelos de ponto dentro de `usando_replica` vão para a réplica.
+        """
+        self.assertEqual(Ponto.objects.all().db, 'default')
+        with usando_replica():
+            self.assertEqual(Ponto.objects.all().db, 'replica_teste')
+            self.assertEqual(User.objects.all().db, 'default')
+            ponto = Ponto.objects.get()
+            self.assertEqual(ponto._state.db, 'replica_teste')
+            ponto.funcionario = self.funcionario
+            ponto.save()
+        self.assertEqual(Ponto.objects.get().funcionario_id, self.funcionario.pk)
+        with override_settings(PONTO_REPLICAS=[]), usando_replica():
+            self.assertEqual(Ponto.objects.all().db, 'default')
+
+    def test_listagens_e_janela_apos_escrita(self):
+        """
+        Testa se as listagens leem da réplica, exceto logo após uma escrita do próprio usuário.
+        """
+        for url in ('ponto-list', 'funcionario-list', 'empresa-list'):
+            self.assertEqual(self.bancos_lidos(reverse(url)), {'replica_teste'}, url)
+
+        response = self.client.post(reverse('ponto-create'), {
+            'funcionario': self.funcionario.pk, 'data': '2024-12-03', 'entrada': '08:00', 'saida': '17:00',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.bancos_lidos(reverse('ponto-list')), set())
+        self.assertContains(self.response, 'Dec. 3, 2024')
+
+        # Fim da janela: a marca da escrita expirou no cache
+        cache.delete(f'{CHAVE_ESCRITA}:{self.user.pk}')
+        self.assertEqual(self.bancos_lidos(reverse('ponto-list')), {'replica_teste'})
+
+    def test_relatorio_e_api_nao_guardam_leituras_possivelmente_atrasadas(self):
+        """
+        Testa se, logo após a escrita de outro usuário, o relatório e a API leem da réplica sem
+        guardar o PDF em cache nem enviar ETag, e se voltam a fazê-lo depois da janela.
+        """
+        registrar_escrita()
+        self.assertEqual(self.bancos_lidos(reverse('relatorio'), {'funcionario': self.funcionario.pk}), {'replica_teste'})
+        self.assertEqual(self.bancos_lidos(reverse('relatorio'), {'funcionario': self.funcionario.pk}), {'replica_teste'})
+        self.assertEqual(self.response['X-Cache'], 'MISS')
+        self.assertEqual(self.bancos_lidos('/api/v1/pontos/'), {'replica_teste'})
+        self.assertFalse(self.response.has_header('ETag'))
+
+        cache.delete(CHAVE_ESCRITA)
+        self.bancos_lidos(reverse('relatorio'), {'funcionario': self.funcionario.pk})
+        self.bancos_lidos(reverse('relatorio'), {'funcionario': self.funcionario.pk})
+        self.assertEqual(self.response['X-Cache'], 'HIT')
+        self.bancos_lidos('/api/v1/pontos/')
+        self.assertTrue(self.response.has_header('ETag'))
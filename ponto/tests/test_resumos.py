@@ -0,0 +1,207 @@
+import fitz
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from ponto.engine.regras import cache_regras
+from ponto.models import Empresa, Funcionario, Ponto, ResumoDiario, ResumoMensal
+from ponto.utils.resumos import METRICAS, reconstruir_resumos, totais_mensais
+from django.contrib.auth.models import User
+from datetime import date, time, timedelta
+
+
+class ResumosTestCase(TestCase):
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Cria uma empresa com dois funcionários e registros de ponto em dois meses.
+        """
+        self.empresa = Empresa.objects.create(
+            nome="Empresa Teste",
+            endereco="Rua Teste, 123",
+            telefone="(12) 3456-7890"
+        )
+        self.user = User.objects.create_user(username='user_test', password='12345')
+        self.funcionario = Funcionario.objects.create(user=self.user, empresa=self.empresa)
+        self.outro = Funcionario.objects.create(user=User.objects.create_user(username='outro'), empresa=self.empresa)
+
+        # 9h trabalhadas (1h extra), 7h30 trabalhadas (30min de atraso) e um registro sem saída
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 11, 29), entrada=time(8, 0), intervalo=time(1, 0), saida=time(18, 0))
+        Ponto.objects.create(funcionario=self.funcionario, data=date(2024, 12, 2), entrada=time(8, 0), intervalo=time(1, 0), saida=time(16, 30))
+        Ponto.objects.create(funcionario=self.outro, data=date(2024, 12, 2), entrada=time(9, 0))
+
+    def resumos(self):
+        return {
+            'diarios': sorted(ResumoDiario.objects.values_list('empresa_id', 'funcionario_id', 'data', *METRICAS), key=str),
+            'mensais': sorted(ResumoMensal.objects.values_list('empresa_id', 'funcionario_id', 'mes', *METRICAS), key=str),
+        }
+
+    def test_resumos_criados_ao_salvar(self):
+        """
+        Testa se os resumos do funcionário e da empresa são atualizados a cada ponto salvo.
+        """
+        diario = ResumoDiario.objects.get(funcionario=self.funcionario, data=date(2024, 12, 2))
+        self.assertEqual(diario.minutos_trabalhados, 450)
+        self.assertEqual(diario.atraso_segundos, 1800)
+        self.assertEqual(diario.registros, 1)
+
+        empresa = ResumoDiario.objects.get(empresa=self.empresa, funcionario=None, data=date(2024, 12, 2))
+        self.assertEqual(empresa.registros, 2)
+        self.assertEqual(empresa.marcacoes_faltantes, 2)
+        self.assertEqual(empresa.minutos_trabalhados, 450)
+
+        novembro = ResumoMensal.objects.get(funcionario=self.funcionario, mes=date(2024, 11, 1))
+        self.assertEqual(novembro.extra_segundos, 3600)
+        self.assertEqual(ResumoMensal.objects.get(funcionario=None, mes=date(2024, 12, 1)).registros, 2)
+
+    def test_edicao_pela_view_move_o_resumo(self):
+        """
+        Testa se editar a data de um ponto pela view corrige os resumos do dia antigo e do novo.
+        """
+        ponto = Ponto.objects.get(funcionario=self.funcionario, data=date(2024, 11, 29))
+        self.client.login(username='user_test', password='12345')
+        self.client.post(reverse('ponto-update', args=[ponto.id]), {
+            'funcionario': self.funcionario.id,
+            'data': '2024-12-03',
+            'entrada': '08:00',
+            'intervalo': '01:00',
+            'saida': '18:00',
+        })
+
+        self.assertFalse(ResumoDiario.objects.filter(data=date(2024, 11, 29)).exists())
+        self.assertFalse(ResumoMensal.objects.filter(mes=date(2024, 11, 1)).exists())
+        self.assertEqual(ResumoMensal.objects.get(funcionario=self.funcionario, mes=date(2024, 12, 1)).minutos_trabalhados, 990)
+
+    def test_exclusao_desconta_resumos(self):
+        """
+        Testa se excluir um ponto ou um funcionário desconta os valores dos resumos da empresa.
+        """
+        Ponto.objects.get(funcionario=self.funcionario, data=date(2024, 12, 2)).delete()
+        empresa = ResumoDiario.objects.get(funcionario=None, data=date(2024, 12, 2))
+        self.assertEqual((empresa.registros, empresa.minutos_trabalhados), (1, 0))
+
+        self.outro.delete()
+        self.assertFalse(ResumoDiario.objects.filter(data=date(2024, 12, 2)).exists())
+        self.assertFalse(ResumoMensal.objects.filter(mes=date(2024, 12, 1)).exists())
+
+    def test_reconstruir_resumos_igual_ao_incremental(self):
+        """
+        Testa se o comando de reconstrução gera os mesmos resumos que a atualização incremental,
+        inclusive para pontos gravados com bulk_create (que não disparam sinais).
+        """
+        Ponto.objects.bulk_create([
+            Ponto(funcionario=self.outro, data=date(2024, 12, 3) + timedelta(days=dia), entrada=time(8, 0), saida=time(17, 0))
+            for dia in range(3)
+        ])
+        for ponto in Ponto.objects.filter(funcionario=self.outro, data__gt=date(2024, 12, 2)):
+            ponto.save()
+        incrementais = self.resumos()
+
+        call_command('reconstruir_resumos', stdout=StringIO())
+        self.assertEqual(self.resumos(), incrementais)
+
+    def test_totais_mensais_com_meses_parciais(self):
+        """
+        Testa se os totais por mês combinam meses completos e dias das bordas do período.
+        """
+        totais = totais_mensais(self.funcionario.id)
+        self.assertEqual([t['mes'] for t in totais], [date(2024, 11, 1), date(2024, 12, 1)])
+        self.assertEqual(totais[0]['minutos_trabalhados'], 540)
+
+        totais = totais_mensais(self.funcionario.id, '2024-11-30', '2024-12-15')
+        self.assertEqual([t['mes'] for t in totais], [date(2024, 12, 1)])
+
+        totais = totais_mensais(None, '2024-12-01', '2024-12-31')
+        self.assertEqual(totais[0]['registros'], 2)
+
+    def test_relatorio_com_totais_por_mes(self):
+        """
+        Testa se o relatório em PDF lista os totais por mês.
+        """
+        self.client.login(username='user_test', password='12345')
+        response = self.client.get(reverse('relatorio'), {'funcionario': self.funcionario.id})
+        self.assertEqual(response.status_code, 200)
+
+        with fitz.open(stream=response.content, filetype='pdf') as pdf:
+            texto = "".join(pagina.get_text() for pagina in pdf)
+        self.assertIn("Totais por Mês:", texto)
+        self.assertIn("11/2024", texto)
+        self.assertIn("7h 30m", texto)
+
+
+class MigracaoResumosTestCase(TransactionTestCase):
+    migrar_de = [('ponto', '0003_relatoriojob')]
+    migrar_para = [('ponto', '0013_preencher_resumos')]
+
+    def setUp(self):
+        """
+        Configuração inicial para os testes:
+        - Volta o banco para antes dos resumos e cria, com os modelos daquela versão, uma empresa,
+          um funcionário e registros de ponto em dois meses.
+        """
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.migrar_de)
+        apps = self.executor.loader.project_state(self.migrar_de).apps
+        Empresa = apps.get_model('ponto', 'Empresa')
+        Funcionario = apps.get_model('ponto', 'Funcionario')
+        Ponto = apps.get_model('ponto', 'Ponto')
+        User = apps.get_model('auth', 'User')
+
+        empresa = Empresa.objects.create(nome="Empresa Teste", endereco="Rua Teste, 123", telefone="(12) 3456-7890")
+        self.empresa_id = empresa.pk
+        self.funcionario_id = Funcionario.objects.create(user=User.objects.create(username='user_test'), empresa=empresa).pk
+        # 9h trabalhadas (1h extra), 7h30 trabalhadas (30min de atraso) e um registro sem saída
+        Ponto.objects.create(funcionario_id=self.funcionario_id, data=date(2024, 11, 29), entrada=time(8, 0), intervalo=time(1, 0), saida=time(18, 0))
+        Ponto.objects.create(funcionario_id=self.funcionario_id, data=date(2024, 12, 2), entrada=time(8, 0), intervalo=time(1, 0), saida=time(16, 30))
+        Ponto.objects.create(funcionario_id=self.funcionario_id, data=date(2024, 12, 3), entrada=time(9, 0))
+
+    def tearDown(self):
+        # Volta o banco para a versão atual, para os demais testes
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_migracao_preenche_resumos(self):
+        """
+        Testa se a migração dos resumos os preenche a partir dos pontos existentes, com os mesmos
+        totais por mês de uma reconstrução completa.
+        """
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.migrar_para)
+        call_command('migrate', verbosity=0)
+
+        migrados = totais_mensais(self.funcionario_id)
+        self.assertEqual([(total['mes'], total['registros']) for total in migrados], [(date(2024, 11, 1), 1), (date(2024, 12, 1), 2)])
+        self.assertEqual(migrados[0]['extra_segundos'], 3600)
+        self.assertEqual(migrados[1]['atraso_segundos'], 1800)
+        self.assertEqual(migrados[1]['marcacoes_faltantes'], 2)
+        empresa = totais_mensais()
+
+        reconstruir_resumos()
+        self.assertEqual(totais_mensais(self.funcionario_id), migrados)
+        self.assertEqual(totais_mensais(), empresa)
+
+    def test_migracao_usa_a_jornada_da_empresa(self):
+        """
+        Testa se a migração refaz os resumos já existentes com a jornada padrão da empresa,
+        como a reconstrução completa.
+        """
+        anterior = [('ponto', '0012_reconstrucao_funcionario')]
+        self.executor.loader.build_graph()
+        self.executor.migrate(anterior)
+        apps = self.executor.loader.project_state(anterior).apps
+        # Jornada de 7h, de segunda a sexta, e um resumo desatualizado que deve ser descartado
+        apps.get_model('ponto', 'Jornada').objects.create(nome="Comercial", empresa_id=self.empresa_id, fim=time(16, 0), padrao=True)
+        apps.get_model('ponto', 'ResumoMensal').objects.create(empresa_id=self.empresa_id, mes=date(2024, 12, 1), registros=99)
+
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.migrar_para)
+        call_command('migrate', verbosity=0)
+
+        migrados = totais_mensais(self.funcionario_id)
+        self.assertEqual([total['extra_segundos'] for total in migrados], [2 * 3600, 1800])
+        self.assertEqual(totais_mensais()[1]['registros'], 2)
+        cache_regras.limpar()
+        reconstruir_resumos()
+        self.assertEqual(totais_mensais(self.funcionario_id), migrados)
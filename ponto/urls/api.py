@@ -0,0 +1,9 @@
+from rest_framework.routers import DefaultRouter
+from ponto.views.api_views import EmpresaViewSet, FuncionarioViewSet, PontoViewSet
+
+router = DefaultRouter()
+router.register('empresas', EmpresaViewSet, basename='api-empresa')
+router.register('funcionarios', FuncionarioViewSet, basename='api-funcionario')
+router.register('pontos', PontoViewSet, basename='api-ponto')
+
+urlpatterns = router.urls
@@ -1,8 +1,11 @@
 from django.urls import path
-from ponto.views.empresa_views import EmpresaListView, EmpresaCreateView, EmpresaUpdateView
+from ponto.views.empresa_views import EmpresaListView, EmpresaCreateView, EmpresaUpdateView, empresa_autocomplete
+from ponto.views.relatorio_views import gerar_pacote_relatorios
 
 urlpatterns = [
     path('', EmpresaListView.as_view(), name='empresa-list'),
     path('nova/', EmpresaCreateView.as_view(), name='empresa-create'),
+    path('autocomplete/', empresa_autocomplete, name='empresa-autocomplete'),
     path('<int:pk>/editar/', EmpresaUpdateView.as_view(), name='empresa-update'),
+    path('<int:pk>/relatorios/', gerar_pacote_relatorios, name='empresa-relatorios'),
 ]
@@ -1,10 +1,12 @@
 from django.urls import path
-from ponto.views.funcionario_views import FuncionarioListView, FuncionarioCreateView, FuncionarioUpdateView
-from ponto.utils.reports import gerar_relatorio
+from ponto.views.funcionario_views import FuncionarioListView, FuncionarioCreateView, FuncionarioUpdateView, funcionario_autocomplete
+from ponto.utils.reports import gerar_relatorio, gerar_relatorio_streaming
 
 urlpatterns = [
     path('', FuncionarioListView.as_view(), name='funcionario-list'),
     path('novo/', FuncionarioCreateView.as_view(), name='funcionario-create'),
+    path('autocomplete/', funcionario_autocomplete, name='funcionario-autocomplete'),
     path('<int:pk>/editar/', FuncionarioUpdateView.as_view(), name='funcionario-update'),
     path('<int:funcionario_id>/relatorio/', gerar_relatorio, name='funcionario-relatorio'),
+    path('<int:funcionario_id>/relatorio/stream/', gerar_relatorio_streaming, name='funcionario-relatorio-stream'),
 ]
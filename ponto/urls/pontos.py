@@ -1,11 +1,16 @@
 from django.urls import path
-from ponto.views.ponto_views import PontoListView, PontoCreateView, PontoUpdateView
-from ponto.utils.reports import gerar_relatorio
+from ponto.views.ponto_views import PontoListView, PontoCreateView, PontoUpdateView, IngestaoPontosView, BaterPontoView
+from ponto.utils.reports import gerar_relatorio, gerar_relatorio_streaming
+from ponto.utils.exports import exportar_pontos
 
 urlpatterns = [
     path('', PontoListView.as_view(), name='ponto-list'),
     path('novo/', PontoCreateView.as_view(), name='ponto-create'),
     path('<int:pk>/editar/', PontoUpdateView.as_view(), name='ponto-update'),
+    path('ingestao/', IngestaoPontosView.as_view(), name='ponto-ingestao'),
+    path('bater/', BaterPontoView.as_view(), name='ponto-bater'),
     path('relatorio/', gerar_relatorio, name='relatorio'),
+    path('relatorio/stream/', gerar_relatorio_streaming, name='relatorio-stream'),
+    path('exportar/<str:formato>/', exportar_pontos, name='ponto-exportar'),
 
 ]
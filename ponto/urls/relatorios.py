@@ -0,0 +1,8 @@
+from django.urls import path
+from ponto.views.relatorio_views import solicitar_relatorio, status_relatorio, baixar_relatorio
+
+urlpatterns = [
+    path('solicitar/', solicitar_relatorio, name='relatorio-solicitar'),
+    path('<int:pk>/', status_relatorio, name='relatorio-status'),
+    path('<int:pk>/download/', baixar_relatorio, name='relatorio-download'),
+]
@@ -0,0 +1,73 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from ponto.models import Empresa, Funcionario
+
+TAMANHO_MAXIMO_TERMO = 100
+
+def _em_cache(tipo, termo, buscar):
+    """
+    Retorna o resultado de `buscar()` guardado por `AUTOCOMPLETE_CACHE_TTL` segundos.
+
+    O cache é curto e não é invalidado quando os cadastros mudam: um funcionário ou empresa
+    novo pode levar até o TTL para aparecer nas buscas.
+    """
+    chave = f"ponto:autocomplete:{tipo}:{settings.AUTOCOMPLETE_LIMITE}:{hashlib.md5(termo.encode()).hexdigest()}"
+    resultados = cache.get(chave)
+    if resultados is None:
+        resultados = buscar()
+        cache.set(chave, resultados, settings.AUTOCOMPLETE_CACHE_TTL)
+    return resultados
+
+def _normalizar(termo):
+    return (termo or '').strip()[:TAMANHO_MAXIMO_TERMO].lower()
+
+def buscar_funcionarios(termo):
+    """
+    Busca funcionários pelo início do nome de usuário ou do e-mail, sem diferenciar maiúsculas.
+
+    No PostgreSQL, a busca usa os índices de prefixo de UPPER(username) e UPPER(email)
+    criados pela migração 0008.
+
+    Parâmetros:
+    termo (str): Texto digitado; vazio retorna os primeiros funcionários em ordem alfabética.
+
+    Retorna:
+    list[dict]: Até `AUTOCOMPLETE_LIMITE` resultados, com `id` e `texto`.
+    """
+    termo = _normalizar(termo)
+
+    def buscar():
+        funcionarios = Funcionario.objects.all()
+        if termo:
+            funcionarios = funcionarios.filter(Q(user__username__istartswith=termo) | Q(user__email__istartswith=termo))
+        linhas = funcionarios.order_by('user__username', 'pk').values_list('pk', 'user__username')
+        return [
+            {'id': pk, 'texto': username or "Funcionário sem usuário"}
+            for pk, username in linhas[:settings.AUTOCOMPLETE_LIMITE]
+        ]
+    return _em_cache('funcionario', termo, buscar)
+
+def buscar_empresas(termo):
+    """
+    Busca empresas por qualquer trecho do nome, sem diferenciar maiúsculas.
+
+    No PostgreSQL, a busca usa o índice de trigramas (pg_trgm) de UPPER(nome) criado pela
+    migração 0008, que atende tanto a prefixos quanto a trechos no meio do nome.
+
+    Parâmetros:
+    termo (str): Texto digitado; vazio retorna as primeiras empresas em ordem alfabética.
+
+    Retorna:
+    list[dict]: Até `AUTOCOMPLETE_LIMITE` resultados, com `id` e `texto`.
+    """
+    termo = _normalizar(termo)
+
+    def buscar():
+        empresas = Empresa.objects.all()
+        if termo:
+            empresas = empresas.filter(nome__icontains=termo)
+        linhas = empresas.order_by('nome', 'pk').values_list('pk', 'nome')
+        return [{'id': pk, 'texto': nome} for pk, nome in linhas[:settings.AUTOCOMPLETE_LIMITE]]
+    return _em_cache('empresa', termo, buscar)
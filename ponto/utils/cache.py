@@ -0,0 +1,254 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+CHAVE_VERSAO = 'ponto:dados:versao'
+CHAVE_VERSAO_JORNADAS = 'ponto:jornadas:versao'
+CHAVE_CADASTROS = 'ponto:cadastros:alterado_em'
+
+def _versao(chave):
+    # A versão começa em um valor baseado no relógio (e não em 1) para que, se a chave for
+    # descartada pelo cache, um valor antigo nunca volte a ser considerado válido
+    versao = cache.get(chave)
+    if versao is None:
+        cache.add(chave, time.time_ns(), timeout=None)
+        versao = cache.get(chave)
+    return versao
+
+def _incrementar_versao(chave):
+    try:
+        cache.incr(chave)
+    except ValueError:
+        cache.set(chave, time.time_ns(), timeout=None)
+
+def versao_dados():
+    """
+    Retorna a versão atual dos dados de ponto, guardada no cache padrão do Django.
+    """
+    return _versao(CHAVE_VERSAO)
+
+def incrementar_versao_dados():
+    """
+    Invalida todos os relatórios em cache incrementando a versão dos dados.
+    Chamada pelos sinais de `ponto.signals` sempre que um Ponto, Funcionario, Empresa ou Jornada muda.
+    """
+    _incrementar_versao(CHAVE_VERSAO)
+
+def versao_jornadas():
+    """
+    Retorna a versão atual das jornadas, usada para invalidar as regras compiladas de cada processo.
+    """
+    return _versao(CHAVE_VERSAO_JORNADAS)
+
+def incrementar_versao_jornadas():
+    """
+    Invalida as regras de jornada compiladas em todos os processos.
+    Chamada pelos sinais de `ponto.signals` quando uma Jornada muda ou um funcionário troca de jornada ou empresa.
+    """
+    _incrementar_versao(CHAVE_VERSAO_JORNADAS)
+
+def alteracao_cadastros():
+    """
+    Retorna o momento da última alteração que a coluna `atualizado_em` dos pontos não mostra:
+    exclusões e mudanças de empresas, funcionários, usuários e jornadas, que aparecem nas listagens
+    e relatórios (nomes, atrasos e extras) e são raras. Se a chave foi descartada pelo cache, vale o
+    momento atual, para que nenhuma resposta antiga volte a ser considerada atual.
+    """
+    alterado_em = cache.get(CHAVE_CADASTROS)
+    if alterado_em is None:
+        cache.add(CHAVE_CADASTROS, now(), timeout=None)
+        alterado_em = cache.get(CHAVE_CADASTROS)
+    return alterado_em
+
+def registrar_alteracao_cadastros():
+    """
+    Registra agora como o momento da última alteração de cadastros (veja `alteracao_cadastros`).
+    Chamada pelos sinais de `ponto.signals`.
+    """
+    cache.set(CHAVE_CADASTROS, now(), timeout=None)
+
+
+class MemoriaBackend:
+    """
+    Backend em memória local com despejo LRU por tamanho total em bytes.
+    Cada processo tem o seu próprio cache.
+    """
+
+    def __init__(self, max_bytes, location=None):
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()
+        self._tamanho = 0
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            valor = self._itens.get(chave)
+            if valor is not None:
+                self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor):
+        if len(valor) > self.max_bytes:
+            return
+        with self._lock:
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self._tamanho -= len(antigo)
+            self._itens[chave] = valor
+            self._tamanho += len(valor)
+            while self._tamanho > self.max_bytes:
+                _, removido = self._itens.popitem(last=False)
+                self._tamanho -= len(removido)
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+            self._tamanho = 0
+
+
+class ArquivoBackend:
+    """
+    Backend em disco, compartilhado entre processos da mesma máquina.
+
+    A data de modificação de cada arquivo é atualizada a cada leitura e usada como ordem LRU
+    quando o tamanho do diretório passa de `max_bytes`.
+    """
+
+    def __init__(self, max_bytes, location=None):
+        self.max_bytes = max_bytes
+        self.diretorio = Path(location or Path(tempfile.gettempdir()) / 'ponto_relatorios')
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+    def _caminho(self, chave):
+        return self.diretorio / f'{chave}.pdf'
+
+    def get(self, chave):
+        caminho = self._caminho(chave)
+        try:
+            valor = caminho.read_bytes()
+            os.utime(caminho)
+        except FileNotFoundError:
+            return None
+        return valor
+
+    def set(self, chave, valor):
+        if len(valor) > self.max_bytes:
+            return
+        # Escreve em um arquivo temporário e renomeia, para que leitores nunca vejam um PDF pela metade
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(valor)
+        os.replace(temporario, self._caminho(chave))
+        self._despejar()
+
+    def _despejar(self):
+        arquivos = []
+        for caminho in self.diretorio.glob('*.pdf'):
+            try:
+                estado = caminho.stat()
+            except FileNotFoundError:
+                continue
+            arquivos.append((estado.st_mtime, estado.st_size, caminho))
+        tamanho = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho_arquivo, caminho in sorted(arquivos):
+            if tamanho <= self.max_bytes:
+                break
+            caminho.unlink(missing_ok=True)
+            tamanho -= tamanho_arquivo
+
+    def clear(self):
+        for caminho in self.diretorio.glob('*.pdf'):
+            caminho.unlink(missing_ok=True)
+
+
+class DjangoCacheBackend:
+    """
+    Backend que delega para um cache configurado em `CACHES` (por exemplo, Redis ou Memcached).
+    O despejo fica a cargo do próprio cache; `max_bytes` apenas limita o tamanho de cada relatório.
+    """
+
+    def __init__(self, max_bytes, location=None):
+        self.max_bytes = max_bytes
+        self.cache = caches[location or 'default']
+
+    def get(self, chave):
+        return self.cache.get(f'ponto:relatorio:{chave}')
+
+    def set(self, chave, valor):
+        if len(valor) <= self.max_bytes:
+            self.cache.set(f'ponto:relatorio:{chave}', valor)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class RelatorioCache:
+    """
+    Cache de relatórios PDF gerados, com contadores de acertos e falhas.
+
+    A chave combina os filtros do relatório com a versão dos dados (`versao_dados()`), então
+    qualquer alteração em Ponto, Funcionario ou Empresa faz os relatórios antigos deixarem de ser
+    encontrados, sem precisar apagá-los: o despejo LRU do backend os remove com o tempo.
+
+    Atributos:
+        backend: Objeto com os métodos get(chave), set(chave, valor) e clear().
+        hits (int): Número de relatórios servidos pelo cache neste processo.
+        misses (int): Número de relatórios que precisaram ser gerados neste processo.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def chave(self, funcionario_id=None, data_inicio=None, data_fim=None, minutos_min=None, minutos_max=None):
+        filtros = (
+            str(funcionario_id or ''), str(data_inicio or ''), str(data_fim or ''),
+            '' if minutos_min is None else str(minutos_min), '' if minutos_max is None else str(minutos_max),
+            versao_dados(),
+        )
+        return hashlib.sha256(repr(filtros).encode()).hexdigest()
+
+    def get(self, chave):
+        valor = self.backend.get(chave)
+        if valor is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return valor
+
+    def set(self, chave, valor):
+        self.backend.set(chave, valor)
+
+    def estatisticas(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'taxa_acerto': self.hits / total if total else 0.0,
+        }
+
+
+_relatorio_cache = None
+
+def obter_relatorio_cache():
+    """
+    Retorna o cache de relatórios do processo, criado a partir de `settings.RELATORIO_CACHE`.
+    """
+    global _relatorio_cache
+    if _relatorio_cache is None:
+        configuracao = settings.RELATORIO_CACHE
+        backend = import_string(configuracao['BACKEND'])(
+            max_bytes=configuracao['MAX_BYTES'],
+            location=configuracao.get('LOCATION') or None,
+        )
+        _relatorio_cache = RelatorioCache(backend)
+    return _relatorio_cache
@@ -0,0 +1,30 @@
+import importlib
+
+
+class ModuloSobDemanda:
+    """
+    Referência a um módulo que só é importado no primeiro acesso a um de seus atributos.
+
+    Usada para bibliotecas pesadas (o PyMuPDF dos relatórios, o NumPy do cálculo de jornadas):
+    importar os módulos que as usam, como as URLs e os sinais fazem na inicialização, não as
+    carrega. Assim, os workers, os comandos de gerenciamento e os testes só pagam por elas quando
+    um relatório ou um cálculo de jornadas é de fato executado.
+
+    O import usa o mecanismo padrão (`importlib.import_module`), seguro entre threads. Cada
+    atributo lido fica guardado na referência, então os acessos seguintes não passam por aqui.
+
+    Exemplo:
+        np = ModuloSobDemanda('numpy')
+        np.zeros(3)  # importa o numpy neste momento
+    """
+
+    def __init__(self, nome):
+        self._nome = nome
+
+    def __getattr__(self, atributo):
+        valor = getattr(importlib.import_module(self._nome), atributo)
+        setattr(self, atributo, valor)
+        return valor
+
+    def __repr__(self):
+        return f'<ModuloSobDemanda {self._nome!r}>'
@@ -0,0 +1,107 @@
+import hashlib
+from collections import namedtuple
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Max
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from ponto.utils.cache import alteracao_cadastros
+from ponto.utils.replicas import leitura_pode_estar_atrasada
+
+Validadores = namedtuple('Validadores', ['etag', 'alterado_em'])
+
+def ultima_alteracao(queryset):
+    """
+    Retorna o maior `atualizado_em` dos registros do queryset (None se não houver registros),
+    em uma única consulta (`SELECT MAX(atualizado_em) ... WHERE <filtros>`).
+    """
+    return queryset.order_by().aggregate(ultima=Max('atualizado_em'))['ultima']
+
+async def aultima_alteracao(queryset):
+    """
+    Versão assíncrona de `ultima_alteracao`.
+    """
+    return (await queryset.order_by().aaggregate(ultima=Max('atualizado_em')))['ultima']
+
+def validadores(request, ultima, por_sessao=True):
+    """
+    Calcula o ETag e o Last-Modified de uma resposta de leitura.
+
+    A resposta muda quando muda um dos registros (`ultima`, de `ultima_alteracao`) ou um cadastro
+    exibido junto com eles (`alteracao_cadastros`: exclusões, empresas, funcionários, usuários e
+    jornadas). O ETag também depende da URL e, nas páginas HTML (`por_sessao`), da sessão e do
+    token CSRF embutidos nelas. O Last-Modified tem precisão de segundos; o ETag, não.
+
+    Parâmetros:
+    request (HttpRequest): Requisição atendida.
+    ultima (datetime | None): Última alteração dos registros da resposta.
+    por_sessao (bool): Se a resposta depende da sessão (páginas HTML com usuário e formulários).
+
+    Retorna:
+    Validadores | None: ETag e momento da alteração, ou None se a resposta não deve ser validada:
+        leitura de uma réplica possivelmente atrasada ou página com mensagens pendentes, que
+        seriam exibidas apenas uma vez.
+    """
+    if leitura_pode_estar_atrasada() or (por_sessao and len(get_messages(request))):
+        return None
+    alterado_em = max(filter(None, (ultima, alteracao_cadastros())))
+    partes = [alterado_em.isoformat(), request.get_full_path()]
+    if por_sessao:
+        # Garante o segredo CSRF já na primeira resposta, como o `{% csrf_token %}` da página faria
+        get_token(request)
+        partes += [request.session.session_key or '', request.META['CSRF_COOKIE']]
+    etag = quote_etag(hashlib.sha256(':'.join(partes).encode()).hexdigest()[:32])
+    return Validadores(etag, alterado_em)
+
+def resposta_nao_modificada(request, atuais):
+    """
+    Retorna a resposta 304 se o cliente já tem a versão atual (If-None-Match ou If-Modified-Since),
+    ou None se a resposta deve ser gerada.
+    """
+    if atuais is None:
+        return None
+    return get_conditional_response(request, etag=atuais.etag, last_modified=int(atuais.alterado_em.timestamp()))
+
+def aplicar_validadores(response, atuais):
+    """
+    Acrescenta o ETag e o Last-Modified às respostas 200 e 304. Clientes e proxies revalidam a cada
+    uso, e a resposta depende da sessão.
+    """
+    if atuais is not None and response.status_code in (200, 304):
+        response['ETag'] = atuais.etag
+        response['Last-Modified'] = http_date(atuais.alterado_em.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Cookie',))
+    return response
+
+def contexto_fragmentos():
+    """
+    Variáveis de template das chaves dos fragmentos de linha em cache: a alteração de cadastros
+    (nomes, empresas e jornadas exibidos em cada linha) e a validade, em segundos.
+    """
+    return {
+        'cadastros_alterados_em': alteracao_cadastros(),
+        'validade_fragmentos': settings.PONTO_FRAGMENTOS_VALIDADE,
+    }
+
+class ListaCondicionalMixin:
+    """
+    Listagens com respostas condicionais: antes de montar a página, uma consulta ao maior
+    `atualizado_em` dos registros filtrados (`get_queryset`) decide se o cliente já tem a versão
+    atual (304). As páginas geradas saem com ETag e Last-Modified.
+
+    O contexto recebe `cadastros_alterados_em` e `validade_fragmentos`, usados nas chaves dos
+    fragmentos de cada linha em cache (`{% cache %}`).
+    """
+    def get(self, request, *args, **kwargs):
+        atuais = validadores(request, ultima_alteracao(self.get_queryset()))
+        response = resposta_nao_modificada(request, atuais)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return aplicar_validadores(response, atuais)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(contexto_fragmentos())
+        return context
@@ -0,0 +1,87 @@
+import csv
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
+from ponto.engine import anotar_em_lotes
+from ponto.models import Ponto
+from ponto.utils.filtros import filtrar_pontos_por_parametros
+from ponto.utils.xlsx_stream import gerar_xlsx
+
+CABECALHO = [
+    "Funcionário", "Data", "Entrada", "Intervalo", "Saída", "Horas Trabalhadas", "Atrasos", "Horas Extras"
+]
+
+class _Eco:
+    """
+    Pseudo-arquivo que devolve o que é escrito, para o `csv.writer` gerar uma linha por vez.
+    """
+    def write(self, valor):
+        return valor
+
+def linhas_exportacao(pontos):
+    """
+    Gera as linhas exportadas, com as mesmas colunas calculadas do relatório em PDF.
+
+    Os pontos são lidos com `.iterator()` e `select_related('funcionario__user')`, e as horas
+    são calculadas em lotes de `RELATORIO_CHUNK_SIZE` por `ponto.engine`.
+
+    Parâmetros:
+    pontos (QuerySet): Pontos já filtrados.
+
+    Gera:
+    list: Valores de cada linha, na ordem de `CABECALHO`.
+    """
+    pontos = pontos.select_related('funcionario__user').order_by('data', 'id').iterator(
+        chunk_size=settings.RELATORIO_CHUNK_SIZE
+    )
+    for ponto, linha in anotar_em_lotes(pontos, settings.RELATORIO_CHUNK_SIZE):
+        yield [
+            str(ponto.funcionario),
+            linha.data.isoformat(),
+            linha.entrada.strftime('%H:%M') if linha.entrada else "",
+            linha.intervalo.strftime('%H:%M') if linha.intervalo else "",
+            linha.saida.strftime('%H:%M') if linha.saida else "",
+            linha.horas_trabalhadas if linha.horas_trabalhadas != "N/A" else "",
+            str(linha.atraso) if linha.atraso else "",
+            str(linha.extra) if linha.extra else "",
+        ]
+
+def gerar_csv(cabecalho, linhas):
+    """
+    Gera um CSV linha a linha.
+    """
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(cabecalho)
+    for linha in linhas:
+        yield escritor.writerow(linha)
+
+@login_required
+def exportar_pontos(request, formato):
+    """
+    Exporta os registros de ponto em CSV ou XLSX, com os mesmos filtros da listagem de pontos.
+
+    O arquivo é produzido por um gerador e enviado com `StreamingHttpResponse`, então o download
+    começa imediatamente e a memória usada não depende da quantidade de registros.
+
+    Parâmetros:
+    request (HttpRequest): Requisição com os filtros de `filtrar_pontos_por_parametros`.
+    formato (str): "csv" ou "xlsx".
+
+    Retorna:
+    StreamingHttpResponse: O arquivo exportado como anexo (404 para formatos desconhecidos).
+    """
+    pontos = filtrar_pontos_por_parametros(Ponto.objects.all(), request.GET)
+    linhas = linhas_exportacao(pontos)
+
+    if formato == 'csv':
+        response = StreamingHttpResponse(gerar_csv(CABECALHO, linhas), content_type='text/csv; charset=utf-8')
+    elif formato == 'xlsx':
+        response = StreamingHttpResponse(
+            gerar_xlsx(CABECALHO, linhas, nome_planilha='Pontos'),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    else:
+        raise Http404("Formato de exportação não suportado.")
+
+    response['Content-Disposition'] = f'attachment; filename="pontos.{formato}"'
+    return response
@@ -0,0 +1,51 @@
+def minutos_do_parametro(valor):
+    """
+    Converte um limite em horas ("10", "7.5" ou "7,5") em minutos, ou None se faltar ou for inválido.
+    """
+    try:
+        return round(float((valor or '').replace(',', '.')) * 60)
+    except (ValueError, OverflowError):
+        return None
+
+def limites_de_horas(params):
+    """
+    Retorna os limites `horas_min` e `horas_max` dos parâmetros, em minutos (None se ausentes).
+    """
+    return minutos_do_parametro(params.get('horas_min')), minutos_do_parametro(params.get('horas_max'))
+
+def filtrar_pontos_por_parametros(queryset, params):
+    """
+    Aplica aos pontos os filtros da listagem: funcionário, intervalo de datas e horas trabalhadas.
+
+    Compartilhado pela listagem (`PontoListView`), pelos relatórios e pelas exportações,
+    para que todos mostrem exatamente os mesmos registros para os mesmos parâmetros.
+
+    O filtro de horas usa a anotação `minutos_trabalhados` de `Ponto.objects.com_horas()`; o
+    QuerySet é anotado aqui apenas se o filtro for usado e ele ainda não tiver as anotações.
+
+    Parâmetros:
+    queryset (QuerySet): Pontos a serem filtrados.
+    params (QueryDict | dict): Parâmetros `funcionario`, `data_inicio`, `data_fim`, `horas_min`
+        e `horas_max` (opcionais; as horas aceitam "7.5" ou "7,5").
+
+    Retorna:
+    QuerySet: Os pontos filtrados.
+    """
+    funcionario_id = params.get('funcionario')
+    data_inicio = params.get('data_inicio')
+    data_fim = params.get('data_fim')
+    minimo, maximo = limites_de_horas(params)
+
+    if funcionario_id:
+        queryset = queryset.filter(funcionario_id=funcionario_id)
+    if data_inicio:
+        queryset = queryset.filter(data__gte=data_inicio)
+    if data_fim:
+        queryset = queryset.filter(data__lte=data_fim)
+    if (minimo is not None or maximo is not None) and 'minutos_trabalhados' not in queryset.query.annotations:
+        queryset = queryset.com_horas()
+    if minimo is not None:
+        queryset = queryset.filter(minutos_trabalhados__gte=minimo)
+    if maximo is not None:
+        queryset = queryset.filter(minutos_trabalhados__lte=maximo)
+    return queryset
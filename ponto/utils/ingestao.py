@@ -0,0 +1,163 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import localdate, now
+from ponto.models import Funcionario, Ponto
+from ponto.utils.cache import incrementar_versao_dados
+from ponto.utils.presenca import invalidar_presenca
+from ponto.utils.resumos import atualizar_resumos_dias
+from ponto.utils.upsert import upsert
+
+def _como_data(valor):
+    return Ponto._meta.get_field('data').to_python(valor)
+
+HORARIOS = ('entrada', 'intervalo', 'saida')
+
+def _vazio(valor):
+    return valor is None or (isinstance(valor, str) and not valor.strip())
+
+def _converter(campo, valor, erros):
+    """
+    Converte `valor` com o campo de Ponto, acumulando as mensagens de erro em `erros[campo]`.
+    """
+    try:
+        return Ponto._meta.get_field(campo).to_python(valor.strip() if isinstance(valor, str) else valor)
+    except ValidationError as erro:
+        erros[campo] = erro.messages
+    except (TypeError, ValueError):
+        erros[campo] = ["Valor inválido."]
+    return None
+
+def _validar_item(item):
+    """
+    Valida um item isolado e retorna (identificação do funcionário, data, horários informados, erros).
+
+    O funcionário é identificado pelo id (`funcionario`) ou pelo nome de usuário (`usuario`).
+    Horários ausentes ou vazios não são alterados no registro existente.
+    """
+    if not isinstance(item, dict):
+        return None, None, {}, {'item': ["Cada item deve ser um objeto com funcionário, data e horários."]}
+
+    erros = {}
+    funcionario, usuario = item.get('funcionario'), item.get('usuario')
+    if not _vazio(funcionario):
+        try:
+            identificacao = ('id', int(funcionario))
+            if not 0 < identificacao[1] < 2 ** 63:
+                raise ValueError
+        except (TypeError, ValueError):
+            identificacao = None
+            erros['funcionario'] = ["Informe o id numérico do funcionário."]
+    elif not _vazio(usuario):
+        identificacao = ('usuario', str(usuario).strip())
+    else:
+        identificacao = None
+        erros['funcionario'] = ["Informe o funcionário (id) ou o usuário."]
+
+    data = None
+    if _vazio(item.get('data')):
+        erros['data'] = ["Informe a data."]
+    else:
+        data = _converter('data', item['data'], erros)
+
+    horarios = {campo: _converter(campo, item[campo], erros) for campo in HORARIOS if not _vazio(item.get(campo))}
+    if not horarios and not erros.keys() & set(HORARIOS):
+        erros['horarios'] = ["Informe ao menos um horário (entrada, intervalo ou saída)."]
+    return identificacao, data, horarios, erros
+
+def ingerir_pontos(itens):
+    """
+    Valida e grava um lote de registros de ponto vindos de relógios de ponto ou do aplicativo.
+
+    O lote é validado como um conjunto: cada item isoladamente, os funcionários de todos os itens
+    em uma única consulta e, entre os itens, apenas um registro por funcionário e dia. Os itens
+    válidos são gravados com INSERT ... ON CONFLICT em lotes (`upsert`) sobre (funcionario, data):
+    criam o registro do dia ou atualizam apenas os horários informados. Itens inválidos não
+    impedem a gravação dos demais.
+
+    Como a gravação em massa não dispara sinais, a versão dos dados é incrementada e os resumos
+    dos dias gravados são atualizados em lote ao final (`atualizar_resumos_dias`).
+
+    Parâmetros:
+    itens (list[dict]): Itens com `funcionario` (id) ou `usuario`, `data` (AAAA-MM-DD) e ao menos
+        um de `entrada`, `intervalo` e `saida` (HH:MM[:SS]).
+
+    Retorna:
+    dict: `criados`, `atualizados` e `erros` (contagens) e `resultados`, um por item, na ordem
+        do lote, com `indice`, `status` ('criado', 'atualizado' ou 'erro'), o `id` do registro
+        gravado e `erros` quando houver.
+    """
+    validados = [_validar_item(item) for item in itens]
+
+    # Funcionários de todo o lote em uma consulta, por id ou nome de usuário
+    identificacoes = {identificacao for identificacao, *_ in validados if identificacao}
+    ids = {valor for tipo, valor in identificacoes if tipo == 'id'}
+    usuarios = {valor for tipo, valor in identificacoes if tipo == 'usuario'}
+    encontrados = Funcionario.objects.filter(Q(pk__in=ids) | Q(user__username__in=usuarios)).values_list('pk', 'user__username')
+    por_identificacao = {}
+    for pk, username in encontrados:
+        por_identificacao[('id', pk)] = pk
+        if username:
+            por_identificacao[('usuario', username)] = pk
+
+    resultados = []
+    registros = {}
+    for indice, (identificacao, data, horarios, erros) in enumerate(validados):
+        funcionario_id = por_identificacao.get(identificacao)
+        if identificacao and funcionario_id is None:
+            erros['funcionario'] = ["Funcionário não encontrado."]
+        if not erros and (funcionario_id, data) in registros:
+            erros['data'] = ["Registro repetido no lote para este funcionário e data."]
+        if erros:
+            resultados.append({'indice': indice, 'status': 'erro', 'erros': erros})
+            continue
+        registros[(funcionario_id, data)] = (funcionario_id, data, *(horarios.get(campo) for campo in HORARIOS))
+        resultados.append({'indice': indice, 'status': None})
+
+    existentes, ids_gravados = set(), {}
+    if registros:
+        with transaction.atomic():
+            existentes = set(
+                Ponto.objects.filter(
+                    funcionario_id__in={funcionario_id for funcionario_id, _ in registros},
+                    data__in={data for _, data in registros},
+                ).values_list('funcionario_id', 'data')
+            )
+            # Horários não informados (nulos) mantêm o valor do registro existente; sem `auto_now`,
+            # a data de alteração é gravada junto
+            gravado_em = now()
+            gravados = upsert(
+                Ponto, ('funcionario_id', 'data', *HORARIOS, 'atualizado_em'),
+                [(*registro, gravado_em) for registro in registros.values()],
+                unicos=('funcionario_id', 'data'), atualizar=(*HORARIOS, 'atualizado_em'), preservar=HORARIOS,
+                retornar=('funcionario_id', 'data', 'id'), tamanho_lote=settings.PONTO_INGESTAO_LOTE,
+            )
+            ids_gravados = {(funcionario_id, _como_data(data)): pk for funcionario_id, data, pk in gravados}
+            atualizar_resumos_dias(registros)
+        # Após o commit, inclusive quando o lote roda dentro de uma transação maior (veja
+        # `ponto.signals.invalidar_relatorios`)
+        transaction.on_commit(incrementar_versao_dados)
+        # A presença em cache só muda com pontos de hoje; as empresas afetadas são recalculadas na leitura
+        hoje = localdate()
+        afetados = {funcionario_id for funcionario_id, data in registros if data == hoje}
+        if afetados:
+            invalidar_presenca(
+                Funcionario.objects.filter(pk__in=afetados).values_list('empresa_id', flat=True).distinct()
+            )
+
+    contagens = {'criado': 0, 'atualizado': 0, 'erro': 0}
+    chaves = iter(registros)
+    for resultado in resultados:
+        if resultado['status'] is None:
+            chave = next(chaves)
+            resultado['status'] = 'atualizado' if chave in existentes else 'criado'
+            if chave in ids_gravados:
+                resultado['id'] = ids_gravados[chave]
+        contagens[resultado['status']] += 1
+    return {
+        'criados': contagens['criado'],
+        'atualizados': contagens['atualizado'],
+        'erros': contagens['erro'],
+        'resultados': resultados,
+    }
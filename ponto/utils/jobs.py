@@ -0,0 +1,103 @@
+import tempfile
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+from ponto.models import RelatorioJob
+from ponto.utils.reports import montar_relatorio, stream_pdf
+
+def reivindicar_job():
+    """
+    Reivindica o próximo job de relatório da fila.
+
+    O job é bloqueado com `SELECT ... FOR UPDATE SKIP LOCKED`, de modo que workers concorrentes
+    pulam as linhas já reivindicadas em vez de esperar por elas. Jobs em processamento há mais de
+    `RELATORIO_JOB_TIMEOUT` segundos (por exemplo, de um worker que morreu) voltam a ser elegíveis.
+    Cada reivindicação incrementa `tentativa`, que `processar_job` confere antes de gravar o resultado.
+
+    Retorna:
+    RelatorioJob | None: O job marcado como "processando", ou None se a fila estiver vazia.
+    """
+    limite = now() - timedelta(seconds=settings.RELATORIO_JOB_TIMEOUT)
+    with transaction.atomic():
+        job = (
+            RelatorioJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=RelatorioJob.Status.PENDENTE) |
+                Q(status=RelatorioJob.Status.PROCESSANDO, iniciado_em__lt=limite)
+            )
+            .order_by('criado_em')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = RelatorioJob.Status.PROCESSANDO
+        job.iniciado_em = now()
+        job.tentativa += 1
+        job.save(update_fields=['status', 'iniciado_em', 'tentativa'])
+    return job
+
+def processar_job(job):
+    """
+    Gera o PDF de um job reivindicado e registra o resultado.
+
+    O relatório é escrito em um arquivo temporário com o mesmo pipeline do modo streaming
+    (`paginar_relatorio` + `stream_pdf`), então a memória do worker não cresce com o relatório.
+
+    Um job que passou de `RELATORIO_JOB_TIMEOUT` pode ser reivindicado por outro worker enquanto
+    este ainda o processa. Por isso cada tentativa grava o seu próprio arquivo, e o resultado só é
+    registrado se o job continuar na tentativa recebida; caso contrário, o PDF gerado é apagado.
+
+    Parâmetros:
+    job (RelatorioJob): Job retornado por `reivindicar_job`.
+
+    Retorna:
+    RelatorioJob | None: O job atualizado, com status "concluido" ou "erro", ou None se o job foi
+    reivindicado de novo (ou apagado) e o resultado foi descartado.
+    """
+    try:
+        _, paginas = montar_relatorio(job.parametros())
+        with tempfile.TemporaryFile() as temporario:
+            for bloco in stream_pdf(paginas):
+                temporario.write(bloco)
+            temporario.seek(0)
+            job.arquivo.save(f'relatorio_{job.pk}_{job.tentativa}.pdf', File(temporario), save=False)
+        job.status = RelatorioJob.Status.CONCLUIDO
+    except Exception as e:
+        job.status = RelatorioJob.Status.ERRO
+        job.erro = str(e)
+    job.concluido_em = now()
+
+    gravado = RelatorioJob.objects.filter(
+        pk=job.pk, status=RelatorioJob.Status.PROCESSANDO, tentativa=job.tentativa
+    ).update(status=job.status, arquivo=job.arquivo.name, erro=job.erro, concluido_em=job.concluido_em)
+    if not gravado:
+        if job.arquivo:
+            job.arquivo.delete(save=False)
+        return None
+    return job
+
+def limpar_jobs_antigos():
+    """
+    Apaga os jobs concluídos há mais de `RELATORIO_JOB_RETENCAO_DIAS` dias, com os PDFs gerados.
+
+    Chamada pelo worker após cada job processado, para que os arquivos em `MEDIA_ROOT` não se
+    acumulem. Com `RELATORIO_JOB_RETENCAO_DIAS = 0`, os jobs são mantidos.
+
+    Retorna:
+    int: Número de jobs apagados.
+    """
+    if not settings.RELATORIO_JOB_RETENCAO_DIAS:
+        return 0
+    antigos = RelatorioJob.objects.filter(
+        status__in=[RelatorioJob.Status.CONCLUIDO, RelatorioJob.Status.ERRO],
+        concluido_em__lt=now() - timedelta(days=settings.RELATORIO_JOB_RETENCAO_DIAS),
+    )
+    for job in antigos.only('pk', 'arquivo').iterator():
+        if job.arquivo:
+            job.arquivo.delete(save=False)
+    apagados, _ = antigos.delete()
+    return apagados
@@ -0,0 +1,16 @@
+from django.core.exceptions import ValidationError
+
+def validar_jornada(jornada, empresa):
+    """
+    Valida se a jornada escolhida para um funcionário pertence à empresa dele.
+
+    Args:
+        jornada (Jornada | None): A jornada escolhida (opcional).
+        empresa (Empresa | None): A empresa do funcionário.
+
+    Raises:
+        ValidationError: Se a jornada for de outra empresa.
+    """
+    if jornada and empresa and jornada.empresa_id != empresa.pk:
+        raise ValidationError('A jornada deve pertencer à empresa do funcionário.')
+    return jornada
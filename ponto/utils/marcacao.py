@@ -0,0 +1,109 @@
+from asgiref.sync import sync_to_async
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils.timezone import localtime, now
+from ponto.models import Ponto
+from ponto.utils.cache import incrementar_versao_dados
+from ponto.utils.presenca import atualizar_presenca
+from ponto.utils.resumos import atualizar_resumo_dia
+
+def _sql_bater():
+    """
+    INSERT ... ON CONFLICT que preenche o próximo horário vazio do dia em uma única instrução.
+
+    Sem registro no dia, cria o ponto com a entrada. Com registro, preenche a entrada se ela estiver
+    vazia ou, senão, a saída, desde que a entrada tenha sido marcada até o horário limite (o
+    intervalo mínimo entre marcações). Se nenhum horário puder ser preenchido, a condição do
+    DO UPDATE falha e nenhuma linha é devolvida. Os valores à direita do SET são os da linha
+    anterior, então a decisão e a gravação acontecem sob o mesmo bloqueio da linha. Como não passa
+    pelo `auto_now`, a instrução também grava `atualizado_em`.
+    """
+    nome = connection.ops.quote_name
+    tabela = nome(Ponto._meta.db_table)
+    entrada, saida = f"{tabela}.{nome('entrada')}", f"{tabela}.{nome('saida')}"
+    return (
+        f"INSERT INTO {tabela} ({nome('funcionario_id')}, {nome('data')}, {nome('entrada')}, {nome('atualizado_em')}) "
+        f"VALUES (%s, %s, %s, %s) "
+        f"ON CONFLICT ({nome('funcionario_id')}, {nome('data')}) DO UPDATE SET "
+        f"{nome('entrada')} = COALESCE({entrada}, EXCLUDED.{nome('entrada')}), "
+        f"{nome('saida')} = CASE WHEN {entrada} IS NULL THEN {saida} ELSE EXCLUDED.{nome('entrada')} END, "
+        f"{nome('atualizado_em')} = EXCLUDED.{nome('atualizado_em')} "
+        f"WHERE {entrada} IS NULL OR ({saida} IS NULL AND {entrada} <= %s) "
+        f"RETURNING {nome('id')}, {nome('saida')}"
+    )
+
+def _horario(valor):
+    return Ponto._meta.get_field('entrada').to_python(valor)
+
+def bater_ponto(funcionario_id, agora=None):
+    """
+    Registra uma marcação do funcionário agora, no próximo horário vazio do ponto do dia.
+
+    A primeira marcação do dia cria o registro com a entrada; a seguinte preenche a saída. O
+    intervalo do ponto é uma duração, não um horário marcado, e não é alterado. Toda a decisão é
+    tomada pelo banco em uma única instrução (`INSERT ... ON CONFLICT ... DO UPDATE ... WHERE ...
+    RETURNING`), então marcações simultâneas do mesmo funcionário não se sobrescrevem: cada uma
+    preenche um horário diferente ou é recusada.
+
+    Marcações a menos de `PONTO_BATER_INTERVALO_MINIMO` segundos da entrada são recusadas, para que
+    um toque duplo no relógio não registre a saída logo após a entrada.
+
+    Parâmetros:
+    funcionario_id (int): Funcionário que está marcando o ponto.
+    agora (datetime, opcional): Momento da marcação (padrão: agora, no fuso local).
+
+    Retorna:
+    dict: `id` e `data` do ponto, `campo` preenchido ('entrada' ou 'saida') e `horario` marcado.
+
+    Levanta:
+    ValidationError: Se os horários do dia já estiverem todos marcados ou se a marcação for
+        próxima demais da entrada.
+    """
+    agora = localtime(agora).replace(microsecond=0)
+    data, horario = agora.date(), agora.time()
+    # Marcações logo após a meia-noite não têm limite anterior dentro do mesmo dia
+    limite = max(
+        datetime.combine(data, horario) - timedelta(seconds=settings.PONTO_BATER_INTERVALO_MINIMO),
+        datetime.combine(data, time.min),
+    ).time()
+
+    adaptar = connection.ops.adapt_timefield_value
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _sql_bater(),
+                [
+                    funcionario_id, connection.ops.adapt_datefield_value(data), adaptar(horario),
+                    connection.ops.adapt_datetimefield_value(now()), adaptar(limite),
+                ],
+            )
+            linha = cursor.fetchone()
+        if linha is None:
+            ponto = Ponto.objects.filter(funcionario_id=funcionario_id, data=data).values('entrada', 'saida').first()
+            if ponto and ponto['entrada'] and ponto['saida']:
+                raise ValidationError("A entrada e a saída de hoje já foram registradas.", code='completo')
+            raise ValidationError(
+                f"Aguarde {settings.PONTO_BATER_INTERVALO_MINIMO} segundos após a entrada para registrar a saída.",
+                code='intervalo_minimo',
+            )
+        # Escrita direta no banco: sem sinais de Ponto, os resumos do dia são atualizados aqui
+        atualizar_resumo_dia(funcionario_id, data)
+    # Após o commit, inclusive quando a marcação roda dentro de uma transação maior (veja
+    # `ponto.signals.invalidar_relatorios`)
+    transaction.on_commit(incrementar_versao_dados)
+    atualizar_presenca(funcionario_id, data)
+
+    pk, saida = linha
+    campo = 'saida' if saida is not None and _horario(saida) == horario else 'entrada'
+    return {'id': pk, 'data': data, 'campo': campo, 'horario': horario}
+
+async def abater_ponto(funcionario_id, agora=None):
+    """
+    Versão assíncrona de `bater_ponto`, para a view de marcação.
+
+    A marcação é uma única instrução SQL própria (`INSERT ... ON CONFLICT`), sem equivalente no
+    ORM assíncrono, então é executada com `sync_to_async`, como o próprio ORM assíncrono faz.
+    """
+    return await sync_to_async(bater_ponto)(funcionario_id, agora)
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils.text import slugify
+from ponto.utils.processos import inicializar_django
+from ponto.utils.reports import montar_relatorio, renderizar_pdf
+from ponto.utils.zip_stream import BufferZip
+
+# Processos usados quando RELATORIO_PACOTE_WORKERS = 0: um por CPU, até este limite
+MAXIMO_WORKERS_PADRAO = 4
+
+_executores = {}
+_executores_trava = threading.Lock()
+
+def executor_pacotes(workers):
+    """
+    Pool de `workers` processos, compartilhado pelo processo, que gera os relatórios dos pacotes.
+
+    Criado no primeiro pacote e reaproveitado pelos seguintes, em vez de iniciar processos a cada
+    requisição. Os processos são iniciados com "spawn", sem herdar as conexões com o banco nem o
+    estado das threads do servidor, e configuram o Django com os mesmos bancos deste processo
+    (`inicializar_django`); cada um abre a sua própria conexão.
+    """
+    with _executores_trava:
+        executor = _executores.get(workers)
+        if executor is None:
+            executor = _executores[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=inicializar_django,
+                initargs=({alias: connections[alias].settings_dict for alias in connections},),
+            )
+        return executor
+
+def _descartar_executor(workers, executor):
+    # Um processo que morre inutiliza o pool; o próximo pacote cria outro
+    with _executores_trava:
+        if _executores.get(workers) is executor:
+            del _executores[workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def gerar_relatorio_funcionario(funcionario_id, data_inicio=None, data_fim=None):
+    """
+    Lê os pontos de um funcionário, calcula as jornadas, pagina e desenha o seu relatório.
+
+    Retorna:
+    tuple: Nome do arquivo dentro do ZIP e os bytes do PDF.
+    """
+    funcionario, paginas = montar_relatorio({'data_inicio': data_inicio, 'data_fim': data_fim}, funcionario_id)
+    return f'{funcionario.pk}_{slugify(str(funcionario))}.pdf', renderizar_pdf(paginas)
+
+def _gerar_no_worker(funcionario_id, data_inicio, data_fim):
+    # Executada nos processos do pool, que não recebem os sinais de fim de requisição: a conexão
+    # é fechada ou mantida conforme `CONN_MAX_AGE`, como ao final de uma requisição
+    try:
+        return gerar_relatorio_funcionario(funcionario_id, data_inicio, data_fim)
+    finally:
+        close_old_connections()
+
+def gerar_pacote_zip(funcionario_ids, data_inicio=None, data_fim=None, workers=None):
+    """
+    Gera um ZIP com um relatório PDF por funcionário, gerados em paralelo.
+
+    Cada relatório é uma tarefa do pool compartilhado de `executor_pacotes`: o processo do pool lê
+    os pontos do funcionário, calcula as jornadas, pagina e desenha o PDF, e devolve apenas os
+    bytes. Este processo só monta o ZIP, então o pacote escala com o número de processos. As
+    entradas são adicionadas na ordem em que os PDFs ficam prontos e cada uma é enviada assim que
+    é adicionada. No máximo `2 * workers` relatórios ficam em andamento ao mesmo tempo, para que a
+    memória não cresça com o tamanho da empresa.
+
+    Os processos do pool abrem as suas próprias conexões; com um banco SQLite em memória, que
+    eles não enxergam, use `workers=1`.
+
+    Parâmetros:
+    funcionario_ids (Iterable[int]): Funcionários incluídos no pacote.
+    data_inicio, data_fim (str | date, opcionais): Período dos relatórios.
+    workers (int, opcional): Número de processos (padrão `RELATORIO_PACOTE_WORKERS`, ou um por
+        CPU até `MAXIMO_WORKERS_PADRAO`). Com 1, os relatórios são gerados no próprio processo.
+
+    Gera:
+    bytes: Partes consecutivas do arquivo ZIP. Falhas de funcionários individuais são listadas
+    em `erros.txt` ao final do pacote.
+    """
+    workers = workers or settings.RELATORIO_PACOTE_WORKERS or min(os.cpu_count() or 1, MAXIMO_WORKERS_PADRAO)
+    buffer = BufferZip()
+    erros = []
+
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as pacote:
+        def adicionar(funcionario_id, executar):
+            try:
+                nome, pdf = executar()
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                erros.append(f'Funcionário {funcionario_id}: {e}')
+                return b''
+            pacote.writestr(nome, pdf)
+            return buffer.drenar()
+
+        if workers == 1:
+            for funcionario_id in funcionario_ids:
+                yield adicionar(funcionario_id, lambda: gerar_relatorio_funcionario(funcionario_id, data_inicio, data_fim))
+        else:
+            executor = executor_pacotes(workers)
+            pendentes = iter(funcionario_ids)
+            em_andamento = {}
+            try:
+                while True:
+                    for funcionario_id in pendentes:
+                        futuro = executor.submit(_gerar_no_worker, funcionario_id, data_inicio, data_fim)
+                        em_andamento[futuro] = funcionario_id
+                        if len(em_andamento) >= workers * 2:
+                            break
+                    if not em_andamento:
+                        break
+                    concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                    for futuro in concluidos:
+                        yield adicionar(em_andamento.pop(futuro), futuro.result)
+            except BrokenProcessPool:
+                _descartar_executor(workers, executor)
+                raise
+            finally:
+                # Pacote interrompido (por exemplo, o cliente desconectou): libera o pool
+                for futuro in em_andamento:
+                    futuro.cancel()
+
+        if erros:
+            pacote.writestr('erros.txt', '\n'.join(erros))
+    yield buffer.drenar()
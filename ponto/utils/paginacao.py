@@ -0,0 +1,160 @@
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+SALT = 'ponto.paginacao'
+
+class PaginaCursor:
+    """
+    Uma página de resultados paginados por cursor (keyset).
+
+    Atributos:
+        object_list (QuerySet): Registros da página, na ordem da paginação.
+        cursor_proximo (str | None): Cursor da próxima página, ou None na última.
+        cursor_anterior (str | None): Cursor da página anterior, ou None na primeira.
+    """
+    def __init__(self, object_list, cursor_proximo=None, cursor_anterior=None):
+        self.object_list = object_list
+        self.cursor_proximo = cursor_proximo
+        self.cursor_anterior = cursor_anterior
+
+    @property
+    def tem_outras_paginas(self):
+        return bool(self.cursor_proximo or self.cursor_anterior)
+
+
+class PaginadorCursor:
+    """
+    Paginação por cursor sobre uma ordenação única de dois campos, como (data, id).
+
+    Ao contrário da paginação por OFFSET, cada página é buscada a partir da chave do último
+    (ou do primeiro) registro da página atual: `WHERE (data, id) > (ultima_data, ultimo_id)
+    ORDER BY data, id LIMIT n`. Com um índice nesses campos, o custo de uma página não depende
+    da sua posição na listagem.
+
+    Os cursores são a chave de fronteira e a direção, assinados com `django.core.signing`:
+    opacos para o usuário e recusados se alterados.
+
+    Parâmetros:
+    queryset (QuerySet): Registros já filtrados, sem ordenação própria.
+    por_pagina (int): Registros por página.
+    ordenacao (tuple[str, str]): Campo principal e campo de desempate, este último único. Cada um
+        pode ser um campo do modelo ou uma anotação do queryset, e decrescente com o prefixo '-'.
+    """
+    def __init__(self, queryset, por_pagina, ordenacao=('data', 'id')):
+        self.queryset = queryset
+        self.por_pagina = por_pagina
+        self.ordenacao = ordenacao
+        self.nomes = [nome.lstrip('-') for nome in ordenacao]
+        self.decrescentes = [nome.startswith('-') for nome in ordenacao]
+        self.campos = [
+            queryset.query.annotations[nome].output_field if nome in queryset.query.annotations
+            else queryset.model._meta.get_field(nome)
+            for nome in self.nomes
+        ]
+
+    def _chave(self, registro):
+        return tuple(getattr(registro, nome) for nome in self.nomes)
+
+    def _codificar(self, chave, direcao):
+        return signing.dumps([*(str(valor) for valor in chave), direcao], salt=SALT)
+
+    def _decodificar(self, cursor):
+        """
+        Retorna (chave, direção) do cursor, ou None se ele for inválido.
+        """
+        try:
+            *valores, direcao = signing.loads(cursor, salt=SALT)
+            chave = tuple(campo.to_python(valor) for campo, valor in zip(self.campos, valores))
+        except (signing.BadSignature, ValidationError, ValueError, TypeError):
+            return None
+        if len(chave) != len(self.campos) or direcao not in ('proxima', 'anterior'):
+            return None
+        return chave, direcao
+
+    def _lookup(self, indice, depois, inclusive=False):
+        """
+        Lookup que seleciona os valores do campo `indice` depois (ou antes) da chave, na ordem da paginação.
+        """
+        lookup = 'gt' if depois != self.decrescentes[indice] else 'lt'
+        return f"{self.nomes[indice]}__{lookup}{'e' if inclusive else ''}"
+
+    def _depois(self, chave, inclusive=False):
+        (principal, _), (valor, valor_desempate) = self.nomes, chave
+        # O filtro redundante `principal >= valor` (<= se decrescente) permite ao banco limitar a busca no índice
+        return Q(**{self._lookup(0, True, inclusive=True): valor}) & (
+            Q(**{self._lookup(0, True): valor})
+            | Q(**{principal: valor, self._lookup(1, True, inclusive): valor_desempate})
+        )
+
+    def _antes(self, chave):
+        (principal, _), (valor, valor_desempate) = self.nomes, chave
+        return Q(**{self._lookup(0, False, inclusive=True): valor}) & (
+            Q(**{self._lookup(0, False): valor}) | Q(**{principal: valor, self._lookup(1, False): valor_desempate})
+        )
+
+    def _invertida(self):
+        return [nome if decrescente else f'-{nome}' for nome, decrescente in zip(self.nomes, self.decrescentes)]
+
+    def _registros(self, ordenados, decodificado, anteriores):
+        """
+        Consulta (ainda não executada) dos registros da página indicada pelo cursor decodificado.
+        """
+        if decodificado is None:
+            registros = ordenados
+        elif decodificado[1] == 'proxima':
+            registros = ordenados.filter(self._depois(decodificado[0]))
+        else:
+            registros = ordenados.filter(self._antes(decodificado[0]))
+            if anteriores:
+                registros = registros.filter(self._depois(anteriores[-1], inclusive=True))
+        return registros[:self.por_pagina]
+
+    def _consulta_anteriores(self, decodificado):
+        """
+        Ao voltar, consulta os por_pagina registros antes do cursor, para achar o início da página.
+        """
+        if decodificado is None or decodificado[1] == 'proxima':
+            return None
+        invertidos = self.queryset.order_by(*self._invertida())
+        return invertidos.filter(self._antes(decodificado[0])).values_list(*self.nomes)[:self.por_pagina]
+
+    def pagina(self, cursor=None):
+        """
+        Retorna a `PaginaCursor` indicada pelo cursor (a primeira página, se ele faltar ou for inválido).
+        """
+        ordenados = self.queryset.order_by(*self.ordenacao)
+        decodificado = self._decodificar(cursor) if cursor else None
+        anteriores = self._consulta_anteriores(decodificado)
+        object_list = self._registros(ordenados, decodificado, list(anteriores) if anteriores is not None else None)
+
+        itens = list(object_list)
+        cursor_proximo = cursor_anterior = None
+        if itens:
+            primeira, ultima = self._chave(itens[0]), self._chave(itens[-1])
+            if ordenados.filter(self._depois(ultima)).exists():
+                cursor_proximo = self._codificar(ultima, 'proxima')
+            if ordenados.filter(self._antes(primeira)).exists():
+                cursor_anterior = self._codificar(primeira, 'anterior')
+        return PaginaCursor(object_list, cursor_proximo, cursor_anterior)
+
+    async def apagina(self, cursor=None):
+        """
+        Versão assíncrona de `pagina`, com o ORM assíncrono.
+        """
+        ordenados = self.queryset.order_by(*self.ordenacao)
+        decodificado = self._decodificar(cursor) if cursor else None
+        consulta = self._consulta_anteriores(decodificado)
+        anteriores = [chave async for chave in consulta] if consulta is not None else None
+        object_list = self._registros(ordenados, decodificado, anteriores)
+        # A iteração assíncrona preenche o cache do queryset, como `list()` na versão síncrona
+        itens = [registro async for registro in object_list]
+
+        cursor_proximo = cursor_anterior = None
+        if itens:
+            primeira, ultima = self._chave(itens[0]), self._chave(itens[-1])
+            if await ordenados.filter(self._depois(ultima)).aexists():
+                cursor_proximo = self._codificar(ultima, 'proxima')
+            if await ordenados.filter(self._antes(primeira)).aexists():
+                cursor_anterior = self._codificar(primeira, 'anterior')
+        return PaginaCursor(object_list, cursor_proximo, cursor_anterior)
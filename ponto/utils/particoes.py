@@ -0,0 +1,195 @@
+import re
+from datetime import date
+from django.db import connection, transaction
+from django.utils.timezone import localdate
+from ponto.models import Funcionario, Ponto
+from ponto.utils.cache import incrementar_versao_dados
+
+TABELA = Ponto._meta.db_table
+PADRAO = f'{TABELA}_padrao'
+
+def nome_particao(mes):
+    return f'{TABELA}_p{mes:%Y_%m}'
+
+def _mes_da_particao(nome):
+    encontrado = re.fullmatch(rf'{TABELA}_p(\d{{4}})_(\d{{2}})', nome)
+    return date(int(encontrado[1]), int(encontrado[2]), 1) if encontrado else None
+
+def primeiro_dia(data):
+    return data.replace(day=1)
+
+def somar_meses(mes, quantidade):
+    indice = mes.year * 12 + mes.month - 1 + quantidade
+    return date(indice // 12, indice % 12 + 1, 1)
+
+def meses(inicio, fim):
+    """
+    Retorna o primeiro dia de cada mês de `inicio` a `fim`, inclusive.
+    """
+    mes, ultimo = primeiro_dia(inicio), primeiro_dia(fim)
+    resultado = []
+    while mes <= ultimo:
+        resultado.append(mes)
+        mes = somar_meses(mes, 1)
+    return resultado
+
+def _exigir_postgresql():
+    if connection.vendor != 'postgresql':
+        raise RuntimeError("O particionamento da tabela de pontos só é suportado no PostgreSQL.")
+
+def esta_particionada():
+    """
+    Retorna se a tabela de pontos já é particionada (sempre False fora do PostgreSQL).
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [TABELA],
+        )
+        return cursor.fetchone() is not None
+
+def particoes():
+    """
+    Retorna {mês: nome} das partições mensais anexadas à tabela de pontos (sem a partição padrão).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT filha.relname FROM pg_inherits i "
+            "JOIN pg_class pai ON pai.oid = i.inhparent JOIN pg_class filha ON filha.oid = i.inhrelid "
+            "WHERE pai.relname = %s AND pg_table_is_visible(pai.oid)",
+            [TABELA],
+        )
+        nomes = [nome for nome, in cursor.fetchall()]
+    return {_mes_da_particao(nome): nome for nome in nomes if _mes_da_particao(nome)}
+
+def _verificar_restricoes_adiadas(cursor):
+    # O PostgreSQL recusa DROP/ALTER TABLE com verificações de FKs adiadas pendentes na transação
+    cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+def _criar_particao(cursor, mes, tabela=TABELA):
+    cursor.execute(
+        f"CREATE TABLE {nome_particao(mes)} PARTITION OF {tabela} FOR VALUES FROM (%s) TO (%s)",
+        [mes, somar_meses(mes, 1)],
+    )
+
+def converter_tabela(meses_futuros=3):
+    """
+    Converte `ponto_ponto` em uma tabela particionada por mês (RANGE em `data`), preservando os registros.
+
+    A tabela é recriada como particionada, com uma partição por mês entre o primeiro registro e
+    `meses_futuros` meses adiante, mais a partição padrão (`ponto_ponto_padrao`), que recebe datas
+    sem partição própria. Os registros são copiados, e a sequência dos ids, os índices e as
+    restrições do modelo são recriados com os mesmos nomes. Tudo acontece em uma transação, com a
+    tabela bloqueada: rode em uma janela de manutenção.
+
+    No PostgreSQL, a chave primária de uma tabela particionada precisa conter a coluna de partição,
+    então ela passa a ser (id, data); os ids continuam únicos, vindos da mesma sequência.
+
+    Retorna:
+    int: Número de partições mensais criadas.
+    """
+    _exigir_postgresql()
+    if esta_particionada():
+        raise RuntimeError(f"A tabela {TABELA} já é particionada.")
+
+    nova = f'{TABELA}_particionada'
+    sequencia = f'{TABELA}_id_seq'
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            _verificar_restricoes_adiadas(cursor)
+            cursor.execute(f"LOCK TABLE {TABELA} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f"SELECT MIN(data), COALESCE(MAX(id), 0) FROM {TABELA}")
+            primeira_data, ultimo_id = cursor.fetchone()
+
+            cursor.execute(f"CREATE TABLE {nova} (LIKE {TABELA} INCLUDING DEFAULTS) PARTITION BY RANGE (data)")
+            cursor.execute(f"CREATE TABLE {PADRAO} PARTITION OF {nova} DEFAULT")
+            hoje = localdate()
+            mensais = meses(min(primeira_data or hoje, hoje), somar_meses(hoje, meses_futuros))
+            for mes in mensais:
+                _criar_particao(cursor, mes, nova)
+            cursor.execute(f"INSERT INTO {nova} SELECT * FROM {TABELA}")
+
+            cursor.execute(f"DROP TABLE {TABELA}")
+            cursor.execute(f"ALTER TABLE {nova} RENAME TO {TABELA}")
+
+            # Colunas identity não são suportadas em tabelas particionadas em todas as versões: usa uma sequência
+            cursor.execute(f"CREATE SEQUENCE {sequencia} OWNED BY {TABELA}.id")
+            cursor.execute("SELECT setval(%s, %s, false)", [sequencia, ultimo_id + 1])
+            cursor.execute(f"ALTER TABLE {TABELA} ALTER COLUMN id SET DEFAULT nextval('{sequencia}')")
+
+            # Índices criados depois da cópia; no pai particionado, eles são criados em cada partição
+            cursor.execute(f"ALTER TABLE {TABELA} ADD CONSTRAINT {TABELA}_pkey PRIMARY KEY (id, data)")
+            cursor.execute(
+                f"ALTER TABLE {TABELA} ADD CONSTRAINT {TABELA}_funcionario_id_fk FOREIGN KEY (funcionario_id) "
+                f"REFERENCES {Funcionario._meta.db_table} (id) DEFERRABLE INITIALLY DEFERRED"
+            )
+        with connection.schema_editor() as schema_editor:
+            for restricao in Ponto._meta.constraints:
+                schema_editor.add_constraint(Ponto, restricao)
+            for indice in Ponto._meta.indexes:
+                schema_editor.add_index(Ponto, indice)
+    return len(mensais)
+
+def criar_particoes(ate_mes):
+    """
+    Cria as partições mensais que faltam, do mês atual até `ate_mes`.
+
+    Registros que já estejam na partição padrão para um desses meses são movidos para a nova
+    partição na mesma transação.
+
+    Retorna:
+    list[str]: Nomes das partições criadas.
+    """
+    _exigir_postgresql()
+    existentes = particoes()
+    criadas = []
+    for mes in meses(localdate(), ate_mes):
+        if mes in existentes:
+            continue
+        nome = nome_particao(mes)
+        with transaction.atomic(), connection.cursor() as cursor:
+            _verificar_restricoes_adiadas(cursor)
+            # Criar a partição diretamente falharia se a partição padrão tivesse registros do mês
+            cursor.execute(f"CREATE TABLE {nome} (LIKE {TABELA} INCLUDING DEFAULTS)")
+            cursor.execute(
+                f"WITH movidos AS (DELETE FROM {PADRAO} WHERE data >= %s AND data < %s RETURNING *) "
+                f"INSERT INTO {nome} SELECT * FROM movidos",
+                [mes, somar_meses(mes, 1)],
+            )
+            cursor.execute(
+                f"ALTER TABLE {TABELA} ATTACH PARTITION {nome} FOR VALUES FROM (%s) TO (%s)",
+                [mes, somar_meses(mes, 1)],
+            )
+        criadas.append(nome)
+    return criadas
+
+def desanexar_particoes(antes_de, esquema=None):
+    """
+    Desanexa as partições dos meses anteriores a `antes_de`.
+
+    As partições desanexadas viram tabelas comuns, com os mesmos registros, fora das consultas da
+    aplicação; com `esquema`, são movidas para ele (criado se não existir) como arquivo. Os resumos
+    diários e mensais desses meses são mantidos, mas `reconstruir_resumos` os descartaria.
+
+    Retorna:
+    list[str]: Nomes das partições desanexadas.
+    """
+    _exigir_postgresql()
+    desanexadas = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        _verificar_restricoes_adiadas(cursor)
+        if esquema:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {connection.ops.quote_name(esquema)}")
+        for mes, nome in sorted(particoes().items()):
+            if mes >= primeiro_dia(antes_de):
+                break
+            cursor.execute(f"ALTER TABLE {TABELA} DETACH PARTITION {nome}")
+            if esquema:
+                cursor.execute(f"ALTER TABLE {nome} SET SCHEMA {connection.ops.quote_name(esquema)}")
+            desanexadas.append(nome)
+    if desanexadas:
+        incrementar_versao_dados()
+    return desanexadas
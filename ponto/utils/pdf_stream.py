@@ -0,0 +1,126 @@
+import zlib
+
+# Fontes base-14 usadas pelo relatório (as mesmas que o fitz usa em "courier" e "courier-bold")
+FONTES = {
+    'courier': ('F1', 'Courier'),
+    'courier-bold': ('F2', 'Courier-Bold'),
+}
+
+LARGURA_PAGINA = 595
+ALTURA_PAGINA = 842
+
+
+def _escapar(texto):
+    """
+    Codifica o texto em WinAnsi (cp1252) e escapa os caracteres especiais de strings PDF.
+    """
+    dados = texto.encode('cp1252', errors='replace')
+    return dados.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+class PDFStreamWriter:
+    """
+    Escritor de PDF incremental que produz o documento página a página.
+
+    Diferente do fitz, que mantém o documento inteiro em memória até o `write()`, este escritor
+    devolve os bytes de cada página assim que ela é desenhada. Apenas os offsets dos objetos
+    (alguns inteiros por página) ficam em memória, então o consumo é constante em relação ao
+    número de linhas do relatório.
+
+    Uso:
+        writer = PDFStreamWriter()
+        yield writer.iniciar()
+        for textos in paginas:
+            yield writer.pagina(textos)
+        yield writer.finalizar()
+
+    Cada texto é uma tupla (x, y, texto, fontsize, fontname), com a origem no canto superior
+    esquerdo, igual ao `page.insert_text` do fitz.
+    """
+
+    def __init__(self, largura=LARGURA_PAGINA, altura=ALTURA_PAGINA):
+        self.largura = largura
+        self.altura = altura
+        self._posicao = 0
+        self._offsets = []
+        self._paginas = []
+        self._fontes = {}
+        self._recursos = b''
+        self._pages_id = None
+
+    def _reservar(self):
+        self._offsets.append(None)
+        return len(self._offsets)
+
+    def _objeto(self, numero, corpo):
+        dados = b'%d 0 obj\n' % numero + corpo + b'\nendobj\n'
+        self._offsets[numero - 1] = self._posicao
+        self._posicao += len(dados)
+        return dados
+
+    def _bruto(self, dados):
+        self._posicao += len(dados)
+        return dados
+
+    def iniciar(self):
+        """
+        Retorna o cabeçalho do PDF e os objetos de fonte compartilhados por todas as páginas.
+        """
+        saida = [self._bruto(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')]
+        self._pages_id = self._reservar()
+        for fontname, (recurso, base_font) in FONTES.items():
+            numero = self._reservar()
+            self._fontes[fontname] = (recurso.encode(), numero)
+            saida.append(self._objeto(
+                numero,
+                b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % base_font.encode()
+            ))
+        self._recursos = b'<< /Font << %s >> >>' % b' '.join(
+            b'/%s %d 0 R' % (recurso, numero) for recurso, numero in self._fontes.values()
+        )
+        return b''.join(saida)
+
+    def pagina(self, textos):
+        """
+        Desenha uma página com os textos fornecidos e retorna os bytes correspondentes.
+        """
+        comandos = []
+        for x, y, texto, fontsize, fontname in textos:
+            comandos.append(b'BT /%s %g Tf 1 0 0 1 %g %g Tm (%s) Tj ET' % (
+                self._fontes[fontname][0], fontsize, x, self.altura - y, _escapar(texto)
+            ))
+        conteudo = zlib.compress(b'\n'.join(comandos))
+
+        conteudo_id = self._reservar()
+        pagina_id = self._reservar()
+        self._paginas.append(pagina_id)
+        return self._objeto(
+            conteudo_id,
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(conteudo) + conteudo + b'\nendstream'
+        ) + self._objeto(
+            pagina_id,
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>' % (
+                self._pages_id, self.largura, self.altura, self._recursos, conteudo_id
+            )
+        )
+
+    def finalizar(self):
+        """
+        Escreve a árvore de páginas, o catálogo, a tabela xref e o trailer.
+        """
+        kids = b' '.join(b'%d 0 R' % pagina_id for pagina_id in self._paginas)
+        saida = [self._objeto(
+            self._pages_id,
+            b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self._paginas))
+        )]
+        catalogo_id = self._reservar()
+        saida.append(self._objeto(catalogo_id, b'<< /Type /Catalog /Pages %d 0 R >>' % self._pages_id))
+
+        inicio_xref = self._posicao
+        xref = [b'xref\n0 %d\n' % (len(self._offsets) + 1), b'0000000000 65535 f \n']
+        xref.extend(b'%010d 00000 n \n' % offset for offset in self._offsets)
+        xref.append(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(self._offsets) + 1, catalogo_id, inicio_xref
+        ))
+        saida.append(self._bruto(b''.join(xref)))
+        return b''.join(saida)
@@ -0,0 +1,147 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import localdate
+from ponto.models import Empresa, Funcionario, Ponto
+
+CHAVE_PRESENCA = 'ponto:presenca'
+# As entradas não expiram sozinhas antes da virada do dia; a validade é controlada por `calculado_em`
+VALIDADE_ENTRADA = 24 * 60 * 60
+
+def _chave(empresa_id):
+    return f'{CHAVE_PRESENCA}:{empresa_id}'
+
+def _marcar(presenca, funcionario_id, entrada, saida):
+    """
+    Coloca o funcionário no grupo correspondente às marcações do dia (ou em nenhum, se ausente).
+    """
+    presenca['presentes'].pop(funcionario_id, None)
+    presenca['encerrados'].pop(funcionario_id, None)
+    if funcionario_id not in presenca['funcionarios']:
+        return
+    if saida is not None:
+        presenca['encerrados'][funcionario_id] = saida
+    elif entrada is not None:
+        presenca['presentes'][funcionario_id] = entrada
+
+def recalcular_presenca(empresa_ids=None):
+    """
+    Recalcula a partir do banco a presença de hoje das empresas e grava no cache padrão.
+
+    São duas consultas agrupadas, independentemente do número de empresas: os funcionários (em ordem
+    de nome) e os pontos de hoje. Cada empresa vira uma entrada do cache com:
+    - `data`: o dia a que a presença se refere;
+    - `funcionarios`: {id: nome} de todos os funcionários;
+    - `presentes`: {id: entrada} dos que marcaram a entrada e ainda não saíram;
+    - `encerrados`: {id: saída} dos que já marcaram a saída;
+    - `calculado_em`: momento do recálculo (veja `PONTO_PRESENCA_RECALCULO`).
+
+    Parâmetros:
+    empresa_ids (iterável, opcional): Empresas a recalcular (padrão: todas).
+
+    Retorna:
+    dict: {empresa_id: presença}.
+    """
+    hoje = localdate()
+    empresas = Empresa.objects.all()
+    if empresa_ids is not None:
+        empresas = empresas.filter(pk__in=list(empresa_ids))
+    agora = time.time()
+    presencas = {
+        pk: {'data': hoje, 'nome': nome, 'funcionarios': {}, 'presentes': {}, 'encerrados': {}, 'calculado_em': agora}
+        for pk, nome in empresas.values_list('pk', 'nome')
+    }
+    if not presencas:
+        return presencas
+
+    funcionarios = Funcionario.objects.filter(empresa_id__in=presencas).order_by('user__username', 'pk')
+    for pk, empresa_id, username in funcionarios.values_list('pk', 'empresa_id', 'user__username'):
+        presencas[empresa_id]['funcionarios'][pk] = username or "Funcionário sem usuário"
+
+    pontos = Ponto.objects.filter(data=hoje, funcionario__empresa_id__in=presencas).order_by('entrada', 'pk')
+    for funcionario_id, empresa_id, entrada, saida in pontos.values_list(
+        'funcionario_id', 'funcionario__empresa_id', 'entrada', 'saida'
+    ):
+        _marcar(presencas[empresa_id], funcionario_id, entrada, saida)
+
+    cache.set_many({_chave(pk): presenca for pk, presenca in presencas.items()}, timeout=VALIDADE_ENTRADA)
+    return presencas
+
+def atualizar_presenca(funcionario_id, data):
+    """
+    Atualiza no cache a presença de um funcionário após uma mudança no seu ponto do dia.
+
+    Apenas pontos de hoje e empresas já em cache são atualizados; as demais serão calculadas por
+    completo na próxima leitura. Chamada pelos sinais de `Ponto` e por `bater_ponto`.
+    """
+    data = Ponto._meta.get_field('data').to_python(data)
+    if data != localdate():
+        return
+    empresa_id = Funcionario.objects.filter(pk=funcionario_id).values_list('empresa_id', flat=True).first()
+    if empresa_id is None:
+        return
+    presenca = cache.get(_chave(empresa_id))
+    if presenca is None or presenca['data'] != data:
+        return
+    ponto = Ponto.objects.filter(funcionario_id=funcionario_id, data=data).values_list('entrada', 'saida').first()
+    _marcar(presenca, funcionario_id, *(ponto or (None, None)))
+    cache.set(_chave(empresa_id), presenca, timeout=VALIDADE_ENTRADA)
+
+def invalidar_presenca(empresa_ids):
+    """
+    Descarta do cache a presença das empresas, que será recalculada na próxima leitura.
+    Usada quando muda o quadro de funcionários e após gravações em massa de pontos.
+    """
+    cache.delete_many([_chave(pk) for pk in set(empresa_ids) if pk is not None])
+
+def _primeiros(ids, funcionarios, limite):
+    nomes = []
+    for pk in ids:
+        if len(nomes) == limite:
+            break
+        nomes.append(funcionarios[pk])
+    return nomes
+
+def painel_presenca():
+    """
+    Retorna a presença de hoje de cada empresa, pronta para o painel da página inicial.
+
+    As entradas são lidas do cache de uma só vez; as ausentes, de outro dia ou calculadas há mais de
+    `PONTO_PRESENCA_RECALCULO` segundos são recalculadas juntas. Cada grupo traz o total e no máximo
+    `PONTO_PRESENCA_NOMES` nomes, então o custo não cresce com o tamanho das empresas.
+
+    Retorna:
+    list[dict]: Uma entrada por empresa, em ordem de nome, com `nome`, `total` e os grupos
+        `presentes`, `encerrados` e `ausentes` (cada um com `quantidade`, `nomes` e `restantes`).
+    """
+    empresa_ids = list(Empresa.objects.order_by('nome', 'pk').values_list('pk', flat=True))
+    encontradas = cache.get_many([_chave(pk) for pk in empresa_ids])
+    hoje, limite = localdate(), time.time() - settings.PONTO_PRESENCA_RECALCULO
+    presencas = {}
+    for pk in empresa_ids:
+        presenca = encontradas.get(_chave(pk))
+        if presenca is not None and presenca['data'] == hoje and presenca['calculado_em'] > limite:
+            presencas[pk] = presenca
+    desatualizadas = [pk for pk in empresa_ids if pk not in presencas]
+    if desatualizadas:
+        presencas.update(recalcular_presenca(desatualizadas))
+
+    maximo = settings.PONTO_PRESENCA_NOMES
+    painel = []
+    for pk in empresa_ids:
+        presenca = presencas.get(pk)
+        if presenca is None:  # empresa removida entre as consultas
+            continue
+        funcionarios = presenca['funcionarios']
+        ausentes = (f for f in funcionarios if f not in presenca['presentes'] and f not in presenca['encerrados'])
+        grupos = {
+            'presentes': (len(presenca['presentes']), presenca['presentes']),
+            'encerrados': (len(presenca['encerrados']), presenca['encerrados']),
+            'ausentes': (len(funcionarios) - len(presenca['presentes']) - len(presenca['encerrados']), ausentes),
+        }
+        item = {'id': pk, 'nome': presenca['nome'], 'total': len(funcionarios)}
+        for grupo, (quantidade, ids) in grupos.items():
+            nomes = _primeiros(ids, funcionarios, maximo)
+            item[grupo] = {'quantidade': quantidade, 'nomes': nomes, 'restantes': quantidade - len(nomes)}
+        painel.append(item)
+    return painel
@@ -0,0 +1,17 @@
+import django
+from django.conf import settings
+
+
+def inicializar_django(bancos):
+    """
+    Inicializador dos processos iniciados com "spawn" que usam o ORM (`initializer` dos pools).
+
+    O processo filho começa sem o Django configurado e leria os bancos do ambiente; aqui ele recebe
+    os mesmos bancos do processo que criou o pool (nos testes, o banco de teste) antes de
+    `django.setup()`. Este módulo não importa os modelos, para poder ser carregado antes disso.
+
+    Parâmetros:
+    bancos (dict): `settings_dict` de cada alias de `django.db.connections`.
+    """
+    settings.DATABASES.update(bancos)
+    django.setup()
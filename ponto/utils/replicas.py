@@ -0,0 +1,80 @@
+import time
+from contextlib import nullcontext
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from ponto.routers import lendo_da_replica, usando_replica
+
+CHAVE_ESCRITA = 'ponto:escrita'
+
+def _chave_usuario(usuario):
+    return f'{CHAVE_ESCRITA}:{usuario.pk}'
+
+def registrar_escrita(usuario=None):
+    """
+    Marca que os dados mudaram agora (e, com `usuario`, que ele próprio escreveu).
+
+    As marcas ficam no cache padrão por `PONTO_REPLICAS_JANELA` segundos, o atraso máximo esperado
+    da replicação. Chamada por `JanelaEscritaMiddleware` a cada requisição de escrita.
+    """
+    janela = settings.PONTO_REPLICAS_JANELA
+    agora = time.time()
+    cache.set(CHAVE_ESCRITA, agora, timeout=janela)
+    if usuario is not None and usuario.is_authenticated:
+        cache.set(_chave_usuario(usuario), agora, timeout=janela)
+
+def escreveu_recentemente(usuario):
+    """
+    Retorna se o usuário escreveu nos últimos `PONTO_REPLICAS_JANELA` segundos (read-your-writes).
+    """
+    return usuario is not None and usuario.is_authenticated and cache.get(_chave_usuario(usuario)) is not None
+
+def leitura_pode_estar_atrasada():
+    """
+    Retorna se as leituras atuais vêm de uma réplica que pode ainda não ter as últimas escritas.
+
+    Nesse caso, o resultado não deve ser guardado em cache sob a versão atual dos dados
+    (`versao_dados()`), que já considera as escritas.
+    """
+    return lendo_da_replica() and cache.get(CHAVE_ESCRITA) is not None
+
+def leitura_em_replica(usuario):
+    """
+    Contexto que lê da réplica, a menos que não haja réplicas ou que o usuário tenha escrito há pouco.
+    """
+    if not settings.PONTO_REPLICAS or escreveu_recentemente(usuario):
+        return nullcontext()
+    return usando_replica()
+
+def ler_da_replica(view):
+    """
+    Decorador de views somente leitura: GET e HEAD leem dos modelos de ponto em uma réplica.
+
+    Respostas de template são renderizadas ainda dentro do contexto, para que as consultas feitas
+    pelo template também usem a réplica. Aceita views síncronas e assíncronas; a réplica escolhida
+    fica em uma `ContextVar`, que acompanha as consultas do ORM assíncrono.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def envolvida_async(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+            auser = getattr(request, 'auser', None)
+            with leitura_em_replica(await auser() if auser else None):
+                response = await view(request, *args, **kwargs)
+                if hasattr(response, 'render') and not response.is_rendered:
+                    await sync_to_async(response.render)()
+            return response
+        return envolvida_async
+
+    @wraps(view)
+    def envolvida(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        with leitura_em_replica(getattr(request, 'user', None)):
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
+    return envolvida
@@ -1,123 +1,156 @@
-import fitz
-from django.http import HttpResponse
+import asyncio
+import contextvars
+import logging
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from datetime import datetime, timedelta
 from django.utils.timezone import localtime
 from django.shortcuts import render, redirect, get_object_or_404
 from ponto.models import Ponto, Funcionario
+from ponto.utils.pdf_stream import PDFStreamWriter
+from ponto.utils.filtros import filtrar_pontos_por_parametros, limites_de_horas
+from ponto.utils.cache import obter_relatorio_cache
+from ponto.utils.carregamento import ModuloSobDemanda
+from ponto.utils.condicional import aplicar_validadores, aultima_alteracao, resposta_nao_modificada, validadores
+from ponto.utils.replicas import ler_da_replica, leitura_pode_estar_atrasada
+from ponto.engine import (
+    CAMPOS, ResultadoJornadas, calcular_em_lotes, formatar_minutos, regra_do_funcionario, regras_dos_funcionarios,
+)
+from ponto.utils.resumos import totais_mensais
 
-def gerar_relatorio(request):
-    """
-    Gera um relatório em formato PDF com os registros de ponto dos funcionários, 
-    filtrando por funcionário e intervalo de datas, se fornecidos.
+logger = logging.getLogger(__name__)
 
-    Parâmetros:
-    request (HttpRequest): Objeto de requisição HTTP contendo os parâmetros de filtro.
+# O PyMuPDF só é importado ao desenhar o primeiro PDF: as URLs importam este módulo na inicialização
+fitz = ModuloSobDemanda('fitz')
 
-    Parâmetros de filtro:
-    - funcionario: ID do funcionário para filtrar os registros de ponto.
-    - data_inicio: Data de início para filtrar os registros de ponto.
-    - data_fim: Data de fim para filtrar os registros de ponto.
-
-    O relatório inclui:
-    - Data
-    - Horário de entrada
-    - Intervalo
-    - Horário de saída
-    - Horas trabalhadas
-    - Atrasos
-    - Horas extras
+def filtrar_pontos(params, funcionario_id=None):
+    """
+    Aplica os filtros de funcionário, intervalo de datas e horas trabalhadas usados pelos relatórios.
 
-    O PDF gerado contém um cabeçalho com informações do funcionário (se fornecido), 
-    data de emissão e observações sobre a jornada de trabalho. 
-    Os registros de ponto são listados em uma tabela, e os totais de atrasos e horas extras 
-    são calculados e exibidos ao final do relatório.
+    Parâmetros:
+    params (QueryDict): Parâmetros da requisição (`funcionario`, `data_inicio`, `data_fim`, `horas_min`, `horas_max`).
+    funcionario_id (int, opcional): ID do funcionário vindo da URL; tem precedência sobre `params`.
 
     Retorna:
-    HttpResponse: Resposta HTTP contendo o PDF gerado como anexo.
+    tuple: O funcionário filtrado (ou None) e o QuerySet de pontos ordenado por data.
     """
-    # Captura os parâmetros de filtro
-    funcionario_id = request.GET.get('funcionario')
-    data_inicio = request.GET.get('data_inicio')
-    data_fim = request.GET.get('data_fim')
+    funcionario_id = funcionario_id or params.get('funcionario')
 
-    # Filtra os pontos com base nos parâmetros
-    pontos = Ponto.objects.all().order_by('data')
     funcionario = None
     if funcionario_id:
-        funcionario = get_object_or_404(Funcionario, pk=funcionario_id)
-        pontos = pontos.filter(funcionario=funcionario)
-    if data_inicio:
-        pontos = pontos.filter(data__gte=data_inicio)
-    if data_fim:
-        pontos = pontos.filter(data__lte=data_fim)
-
-    # Funções auxiliares para cálculos
-    def calcular_atrasos_e_extras(ponto):
-        """
-        Calcula atrasos e horas extras em formato hh:mm:ss.
-        Retorna dois valores: atraso, extra.
-        """
-        horas_regulamentares = 8  # Horas por dia
-        atraso = timedelta(0)
-        extra = timedelta(0)
+        funcionario = get_object_or_404(Funcionario.objects.select_related('user', 'empresa'), pk=funcionario_id)
+    return funcionario, _pontos_do_relatorio(params, funcionario_id)
+
+async def afiltrar_pontos(params, funcionario_id=None):
+    """
+    Versão assíncrona de `filtrar_pontos`, com o funcionário buscado pelo ORM assíncrono.
+    """
+    funcionario_id = funcionario_id or params.get('funcionario')
 
+    funcionario = None
+    if funcionario_id:
         try:
-            if ponto.entrada and ponto.saida:
-                # Calcula tempo trabalhado real (removendo intervalo)
-                entrada = datetime.combine(ponto.data, ponto.entrada)
-                saida = datetime.combine(ponto.data, ponto.saida)
-                intervalo = timedelta(
-                    hours=ponto.intervalo.hour, minutes=ponto.intervalo.minute
-                ) if ponto.intervalo else timedelta(0)
-                tempo_trabalhado = saida - entrada - intervalo
-
-                # Verifica atraso se as horas trabalhadas forem menores que 8h
-                if tempo_trabalhado < timedelta(hours=8):
-                    atraso = timedelta(hours=8) - tempo_trabalhado
-
-                # Calcula horas extras se exceder 8h
-                if tempo_trabalhado > timedelta(hours=8):
-                    extra = tempo_trabalhado - timedelta(hours=8)
-
-        except Exception as e:
-            # Log do erro para depuração (se necessário)
-            print(f"Erro ao calcular atrasos e extras para o ponto {ponto.id}: {e}")
-        
-        return atraso, extra
+            funcionario = await Funcionario.objects.select_related('user', 'empresa').aget(pk=funcionario_id)
+        except Funcionario.DoesNotExist:
+            raise Http404("Funcionário não encontrado.")
+    return funcionario, _pontos_do_relatorio(params, funcionario_id)
+
+def _pontos_do_relatorio(params, funcionario_id):
+    pontos = filtrar_pontos_por_parametros(Ponto.objects.all(), {
+        'funcionario': funcionario_id,
+        'data_inicio': params.get('data_inicio'),
+        'data_fim': params.get('data_fim'),
+        'horas_min': params.get('horas_min'),
+        'horas_max': params.get('horas_max'),
+    })
+    return pontos.order_by('data')
+
+def _meses_do_relatorio(params, funcionario):
+    # Os resumos não conhecem o filtro de horas: com ele, os totais por mês não são listados
+    if limites_de_horas(params) != (None, None):
+        return []
+    return totais_mensais(funcionario.pk if funcionario else None, params.get('data_inicio'), params.get('data_fim'))
+
+def calcular_atrasos_e_extras(ponto, regra=None):
+    """
+    Calcula atrasos e horas extras em formato hh:mm:ss.
+    Retorna dois valores: atraso, extra.
+
+    A jornada esperada é a do funcionário (`regra_do_funcionario`) no dia da semana do ponto,
+    ou `regra`, se informada. Cálculo linha a linha mantido por compatibilidade; os relatórios
+    usam o motor em lote de `ponto.engine`, que produz os mesmos valores.
+    """
+    regra = regra or regra_do_funcionario(ponto.funcionario_id)
+    jornada = timedelta(seconds=regra.segundos_por_dia[ponto.data.weekday()])
+    tolerancia = timedelta(seconds=regra.tolerancia_segundos)
+    atraso = timedelta(0)
+    extra = timedelta(0)
+
+    try:
+        if ponto.entrada and ponto.saida:
+            # Calcula tempo trabalhado real (removendo intervalo)
+            entrada = datetime.combine(ponto.data, ponto.entrada)
+            saida = datetime.combine(ponto.data, ponto.saida)
+            intervalo = timedelta(
+                hours=ponto.intervalo.hour, minutes=ponto.intervalo.minute
+            ) if ponto.intervalo else timedelta(0)
+            tempo_trabalhado = saida - entrada - intervalo
+
+            # Verifica atraso se as horas trabalhadas forem menores que a jornada (além da tolerância)
+            if jornada - tempo_trabalhado > tolerancia:
+                atraso = jornada - tempo_trabalhado
+
+            # Calcula horas extras se exceder a jornada (além da tolerância)
+            if tempo_trabalhado - jornada > tolerancia:
+                extra = tempo_trabalhado - jornada
+
+    except Exception:
+        logger.exception("Erro ao calcular atrasos e extras para o ponto %s", ponto.id)
+
+    return atraso, extra
 
+def paginar_relatorio(funcionario, linhas, meses=(), observacao=None):
+    """
+    Monta o layout do relatório de pontos, página por página.
+
+    As linhas são consumidas de forma preguiçosa, então `linhas` pode ser o gerador de
+    `calcular_em_lotes` e apenas uma página fica em memória por vez.
+
+    Parâmetros:
+    funcionario (Funcionario | None): Funcionário do cabeçalho, se o relatório for individual.
+    linhas (Iterable[LinhaJornada]): Registros de ponto já calculados, na ordem do relatório.
+    meses (Iterable[dict], opcional): Totais por mês de `totais_mensais`, listados após os totais.
+    observacao (str, opcional): Observação do cabeçalho, como a descrição da jornada.
+
+    Gera:
+    list: Os textos de cada página, como tuplas (x, y, texto, fontsize, fontname).
+    """
     # Totais acumulados
     total_atrasos = timedelta(0)
     total_extras = timedelta(0)
-
-    # Crie o documento PDF
-    pdf = fitz.open()
-    page = pdf.new_page()
+    textos = []
 
     # Adicione cabeçalho com informações
     titulo = "Relatório de Pontos de Funcionários"
     if funcionario:
         titulo += f" - {funcionario.user.username}"
-    page.insert_text(
-        (50, 50), 
-        titulo, 
-        fontsize=18, fontname="courier-bold", color=(0, 0, 0)
-    )
+    textos.append((50, 50, titulo, 18, "courier-bold"))
     if funcionario:
-        page.insert_text(
-            (50, 80), 
-            f"Funcionário: {funcionario.user.username} | Empresa: {funcionario.empresa.nome}", 
-            fontsize=12, fontname="courier", color=(0, 0, 0)
-        )
-    page.insert_text(
-        (50, 100), 
-        f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 
-        fontsize=10, fontname="courier", color=(0, 0, 0)
-    )
-    page.insert_text(
-        (50, 120), 
-        f"Observação: Jornada semanal de 40h (8h às 17h, com 1h de intervalo)", 
-        fontsize=10, fontname="courier", color=(0, 0, 0)
-    )
+        textos.append((
+            50, 80,
+            f"Funcionário: {funcionario.user.username} | Empresa: {funcionario.empresa.nome}",
+            12, "courier"
+        ))
+    textos.append((50, 100, f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 10, "courier"))
+    if observacao:
+        # Até duas linhas de 85 caracteres (largura da página em courier 10) antes da tabela
+        for i, linha in enumerate(textwrap.wrap(f"Observação: {observacao}", 85)[:2]):
+            textos.append((50, 118 + i * 12, linha, 10, "courier"))
 
     # Adicione cabeçalho da tabela
     y = 150
@@ -129,19 +162,19 @@ def gerar_relatorio(request):
     # Desenhe o cabeçalho
     x = 50
     for i, header in enumerate(headers):
-        page.insert_text((x, y), header, fontsize=10, fontname="courier-bold", color=(0, 0, 0))
+        textos.append((x, y, header, 10, "courier-bold"))
         x += col_widths[i]
     y += 20
 
     # Adicione os registros de ponto
-    for ponto in pontos:
-        data = ponto.data.strftime('%d/%m/%Y')
-        entrada = ponto.entrada.strftime('%H:%M') if ponto.entrada else "-"
-        intervalo = ponto.intervalo.strftime('%H:%M') if ponto.intervalo else "-"
-        saida = ponto.saida.strftime('%H:%M') if ponto.saida else "-"
-        horas_trabalhadas = ponto.horas_trabalhadas() if ponto.horas_trabalhadas() != "N/A" else "-"
-
-        atraso, extra = calcular_atrasos_e_extras(ponto)
+    for linha in linhas:
+        data = linha.data.strftime('%d/%m/%Y')
+        entrada = linha.entrada.strftime('%H:%M') if linha.entrada else "-"
+        intervalo = linha.intervalo.strftime('%H:%M') if linha.intervalo else "-"
+        saida = linha.saida.strftime('%H:%M') if linha.saida else "-"
+        horas_trabalhadas = linha.horas_trabalhadas if linha.horas_trabalhadas != "N/A" else "-"
+
+        atraso, extra = linha.atraso, linha.extra
         total_atrasos += atraso
         total_extras += extra
 
@@ -153,27 +186,345 @@ def gerar_relatorio(request):
         ]
         x = 50
         for i, valor in enumerate(valores):
-            page.insert_text((x, y), valor, fontsize=10, fontname="courier", color=(0, 0, 0))
+            textos.append((x, y, valor, 10, "courier"))
             x += col_widths[i]
         y += 15
 
         # Quebra de página se o espaço vertical acabar
         if y > 770:
-            page = pdf.new_page()
+            yield textos
+            textos = []
             y = 50
 
     # Adicione os totais ao final da tabela
     y += 20
-    page.insert_text((50, y), f"Totais:", fontsize=12, fontname="courier-bold", color=(0, 0, 0))
+    textos.append((50, y, "Totais:", 12, "courier-bold"))
     y += 15
-    page.insert_text((50, y), f"Total de Atrasos: {str(total_atrasos)}", fontsize=10, fontname="courier", color=(0, 0, 0))
+    textos.append((50, y, f"Total de Atrasos: {str(total_atrasos)}", 10, "courier"))
     y += 15
-    page.insert_text((50, y), f"Total de Horas Extras: {str(total_extras)}", fontsize=10, fontname="courier", color=(0, 0, 0))
+    textos.append((50, y, f"Total de Horas Extras: {str(total_extras)}", 10, "courier"))
+
+    # Adicione os totais por mês, vindos dos resumos mensais
+    meses = list(meses)
+    if meses:
+        y += 25
+        textos.append((50, y, "Totais por Mês:", 12, "courier-bold"))
+        y += 20
+        colunas_mes = [("Mês", 70), ("Horas Trabalhadas", 130), ("Atrasos", 100), ("Horas Extras", 100)]
+        x = 50
+        for header, largura in colunas_mes:
+            textos.append((x, y, header, 10, "courier-bold"))
+            x += largura
+        for resumo in meses:
+            y += 15
+            if y > 770:
+                yield textos
+                textos = []
+                y = 50
+            valores = [
+                resumo['mes'].strftime('%m/%Y'),
+                formatar_minutos(resumo['minutos_trabalhados']),
+                str(timedelta(seconds=resumo['atraso_segundos'])),
+                str(timedelta(seconds=resumo['extra_segundos'])),
+            ]
+            x = 50
+            for valor, (_, largura) in zip(valores, colunas_mes):
+                textos.append((x, y, valor, 10, "courier"))
+                x += largura
+    yield textos
+
+OBSERVACAO_GERAL = "Atrasos e horas extras calculados pela jornada de cada funcionário"
+
+def montar_relatorio(params, funcionario_id=None):
+    """
+    Filtra os pontos, calcula as jornadas e pagina o relatório.
+
+    Ponto de entrada comum do relatório síncrono, do streaming, dos jobs e do pacote por empresa.
+    Os filtros são aplicados imediatamente (um funcionário inexistente gera 404 aqui); as linhas
+    são calculadas em lotes conforme as páginas são consumidas, e os totais por mês vêm dos
+    resumos mensais (`ponto.utils.resumos`). A observação do cabeçalho descreve a jornada do
+    funcionário.
 
-    # Salve o PDF em um buffer e retorne como resposta HTTP
+    Parâmetros:
+    params (QueryDict | dict): Parâmetros `funcionario`, `data_inicio`, `data_fim`, `horas_min` e `horas_max`.
+    funcionario_id (int, opcional): ID do funcionário vindo da URL; tem precedência sobre `params`.
+
+    Retorna:
+    tuple: O funcionário (ou None) e o gerador de páginas de `paginar_relatorio`.
+    """
+    funcionario, pontos = filtrar_pontos(params, funcionario_id)
+    linhas = calcular_em_lotes(pontos, settings.RELATORIO_CHUNK_SIZE)
+    meses = _meses_do_relatorio(params, funcionario)
+    if funcionario:
+        observacao = regra_do_funcionario(funcionario.pk).descricao
+    else:
+        observacao = OBSERVACAO_GERAL
+    return funcionario, paginar_relatorio(funcionario, linhas, meses, observacao)
+
+def agrupar_colunas(textos):
+    """
+    Agrupa os textos de uma página em blocos que podem ser desenhados de uma só vez.
+
+    Um bloco é uma sequência de textos com o mesmo x, fonte e tamanho, com espaçamento vertical
+    constante, como cada coluna da tabela de pontos. Textos isolados formam blocos de uma linha.
+
+    Parâmetros:
+    textos (list): Textos da página, como tuplas (x, y, texto, fontsize, fontname).
+
+    Gera:
+    tuple: (x, y da primeira linha, espaçamento entre linhas, lista de textos, fontsize, fontname).
+    """
+    colunas = {}
+    for x, y, texto, fontsize, fontname in textos:
+        colunas.setdefault((x, fontsize, fontname), []).append((y, texto))
+
+    for (x, fontsize, fontname), itens in colunas.items():
+        itens.sort(key=lambda item: item[0])
+        inicio = 0
+        while inicio < len(itens):
+            fim = inicio + 1
+            passo = itens[fim][0] - itens[inicio][0] if fim < len(itens) else 0
+            while passo > 0 and fim < len(itens) and itens[fim][0] - itens[fim - 1][0] == passo:
+                fim += 1
+            yield x, itens[inicio][0], passo, [texto for _, texto in itens[inicio:fim]], fontsize, fontname
+            inicio = fim
+
+def renderizar_pdf(paginas):
+    """
+    Desenha as páginas de `paginar_relatorio` em um documento fitz e retorna os bytes do PDF.
+
+    Cada coluna da tabela é desenhada com uma única chamada a `insert_text` (uma linha de texto
+    por registro), em vez de uma chamada por célula, e o documento é salvo com `garbage`/`deflate`.
+    O resultado visual é idêntico ao desenho célula a célula; compare com o comando
+    `benchmark_relatorio`.
+
+    Parâmetros:
+    paginas (Iterable[list]): Textos de cada página.
+
+    Retorna:
+    bytes: O documento PDF completo, compactado.
+    """
+    # Crie o documento PDF
+    pdf = fitz.open()
+    for textos in paginas:
+        page = pdf.new_page()
+        for x, y, passo, linhas, fontsize, fontname in agrupar_colunas(textos):
+            page.insert_text(
+                (x, y), linhas, fontsize=fontsize, fontname=fontname, color=(0, 0, 0),
+                lineheight=passo / fontsize if passo else None,
+            )
+
+    # Salve o PDF em um buffer
+    pdf_buffer = pdf.tobytes(garbage=3, deflate=True)
+    pdf.close()
+    return pdf_buffer
+
+def renderizar_pdf_por_celula(paginas):
+    """
+    Desenha as páginas com uma chamada a `insert_text` por célula, sem compactar o arquivo.
+
+    Renderizador original do relatório, mantido como referência visual para os testes e
+    para o comando `benchmark_relatorio`. Use `renderizar_pdf`.
+    """
+    pdf = fitz.open()
+    for textos in paginas:
+        page = pdf.new_page()
+        for x, y, texto, fontsize, fontname in textos:
+            page.insert_text((x, y), texto, fontsize=fontsize, fontname=fontname, color=(0, 0, 0))
     pdf_buffer = pdf.write()
     pdf.close()
+    return pdf_buffer
+
+_executor_relatorios = None
+_executor_trava = threading.Lock()
+
+def executor_relatorios():
+    """
+    Executor limitado, compartilhado pelo processo, que desenha os PDFs das views assíncronas.
+
+    O cálculo das jornadas e o desenho com o fitz são limitados por CPU e bloqueariam o laço de
+    eventos do ASGI; no executor, no máximo `RELATORIO_ASYNC_WORKERS` relatórios são desenhados ao
+    mesmo tempo, e os demais esperam a sua vez sem ocupar o laço.
+    """
+    global _executor_relatorios
+    with _executor_trava:
+        if _executor_relatorios is None:
+            _executor_relatorios = ThreadPoolExecutor(
+                max_workers=settings.RELATORIO_ASYNC_WORKERS, thread_name_prefix='relatorio-pdf'
+            )
+        return _executor_relatorios
+
+async def _lotes_do_relatorio(pontos):
+    """
+    Lê os registros do relatório com o ORM assíncrono, em lotes de `RELATORIO_CHUNK_SIZE`.
+
+    As regras de jornada dos funcionários de cada lote são carregadas no cache do processo antes
+    de o lote ser entregue, para que o cálculo em `executor_relatorios` não precise consultá-las.
+
+    Gera:
+    list: Tuplas com os `CAMPOS` de cada registro, na ordem do QuerySet.
+    """
+    tamanho = settings.RELATORIO_CHUNK_SIZE
+    lote = []
+    # `values()` e não `values_list()`: no Django 5.1, `values_list().aiterator()` executa a
+    # consulta fora de `sync_to_async` e falha no contexto assíncrono
+    async for registro in pontos.values(*CAMPOS).aiterator(chunk_size=tamanho):
+        lote.append(tuple(registro[campo] for campo in CAMPOS))
+        if len(lote) == tamanho:
+            await sync_to_async(regras_dos_funcionarios)({linha[-1] for linha in lote})
+            yield lote
+            lote = []
+    if lote:
+        await sync_to_async(regras_dos_funcionarios)({linha[-1] for linha in lote})
+        yield lote
+
+async def _proximo_lote(lotes):
+    # `run_coroutine_threadsafe` aceita apenas corrotinas, e não o awaitable retornado por `anext`
+    return await anext(lotes, None)
+
+def _desenhar_relatorio(laco, lotes, funcionario, meses, observacao):
+    """
+    Calcula as jornadas e desenha o PDF. Executada em `executor_relatorios`.
+
+    Os lotes de `_lotes_do_relatorio` são pedidos ao laço de eventos da view um de cada vez,
+    conforme as páginas são montadas, então apenas um lote de registros fica em memória, como em
+    `calcular_em_lotes`. Se o cache das regras de jornada tiver sido invalidado no meio tempo, elas
+    são lidas de novo nesta thread, cuja conexão é fechada ao final.
+    """
+    def linhas():
+        while (lote := asyncio.run_coroutine_threadsafe(_proximo_lote(lotes), laco).result()) is not None:
+            yield from ResultadoJornadas(lote)
+
+    try:
+        return renderizar_pdf(paginar_relatorio(funcionario, linhas(), meses, observacao))
+    finally:
+        connections.close_all()
+
+@ler_da_replica
+async def gerar_relatorio(request, funcionario_id=None):
+    """
+    Gera um relatório em formato PDF com os registros de ponto dos funcionários, 
+    filtrando por funcionário e intervalo de datas, se fornecidos.
+
+    Parâmetros:
+    request (HttpRequest): Objeto de requisição HTTP contendo os parâmetros de filtro.
+    funcionario_id (int, opcional): ID do funcionário vindo da URL `/funcionarios/<id>/relatorio/`.
+
+    Parâmetros de filtro:
+    - funcionario: ID do funcionário para filtrar os registros de ponto.
+    - data_inicio: Data de início para filtrar os registros de ponto.
+    - data_fim: Data de fim para filtrar os registros de ponto.
+
+    O relatório inclui:
+    - Data
+    - Horário de entrada
+    - Intervalo
+    - Horário de saída
+    - Horas trabalhadas
+    - Atrasos
+    - Horas extras
+
+    O PDF gerado contém um cabeçalho com informações do funcionário (se fornecido), 
+    data de emissão e observações sobre a jornada de trabalho. 
+    Os registros de ponto são listados em uma tabela, e os totais de atrasos e horas extras 
+    são calculados e exibidos ao final do relatório.
+
+    O PDF fica no cache de relatórios (`RELATORIO_CACHE`) sob uma chave com os filtros e a versão
+    dos dados; o cabeçalho `X-Cache` indica se a resposta veio do cache (HIT) ou foi gerada (MISS).
+    Os registros são lidos de uma réplica, quando configurada (`ler_da_replica`); logo após uma
+    escrita, o PDF gerado na réplica não é guardado, pois ela pode ainda não ter os dados da versão.
+
+    View assíncrona: os registros são lidos com o ORM assíncrono (`aiterator`, em lotes de
+    `RELATORIO_CHUNK_SIZE`) e o PDF é desenhado em `executor_relatorios`, que calcula e pagina
+    cada lote antes de pedir o próximo; o pico de memória não depende do período do relatório.
+    No ASGI, um único worker atende vários downloads lentos ao mesmo tempo sem atrasar as páginas
+    rápidas.
+
+    Retorna:
+    HttpResponse: Resposta HTTP contendo o PDF gerado como anexo.
+    """
+    # Quem já baixou o relatório e os registros não mudaram recebe 304, sem PDF nem cache
+    atuais = await sync_to_async(validadores)(request, await aultima_alteracao(
+        _pontos_do_relatorio(request.GET, funcionario_id or request.GET.get('funcionario'))
+    ), por_sessao=False)
+    response = resposta_nao_modificada(request, atuais)
+    if response is not None:
+        return aplicar_validadores(response, atuais)
+
+    # Relatórios repetidos com os mesmos filtros e dados inalterados vêm do cache
+    cache = obter_relatorio_cache()
+    chave = await sync_to_async(cache.chave)(
+        funcionario_id or request.GET.get('funcionario'),
+        request.GET.get('data_inicio'),
+        request.GET.get('data_fim'),
+        *limites_de_horas(request.GET),
+    )
+    pdf_buffer = await sync_to_async(cache.get)(chave)
+    cache_hit = pdf_buffer is not None
+
+    if not cache_hit:
+        funcionario, pontos = await afiltrar_pontos(request.GET, funcionario_id)
+        meses = await sync_to_async(_meses_do_relatorio)(request.GET, funcionario)
+        if funcionario:
+            regras = await sync_to_async(regras_dos_funcionarios)({funcionario.pk})
+            observacao = regras[funcionario.pk].descricao
+        else:
+            observacao = OBSERVACAO_GERAL
+        # Os registros são lidos neste laço, lote a lote, enquanto o executor monta as páginas; o
+        # contexto é copiado para que as leituras sigam na réplica escolhida por `ler_da_replica`
+        laco = asyncio.get_running_loop()
+        pdf_buffer = await laco.run_in_executor(
+            executor_relatorios(), contextvars.copy_context().run,
+            _desenhar_relatorio, laco, _lotes_do_relatorio(pontos), funcionario, meses, observacao,
+        )
+        if not leitura_pode_estar_atrasada():
+            await sync_to_async(cache.set)(chave, pdf_buffer)
 
     response = HttpResponse(pdf_buffer, content_type='application/pdf')
+    response['X-Cache'] = 'HIT' if cache_hit else 'MISS'
+    response['Content-Disposition'] = f'attachment; filename="relatorio_pontos.pdf"'
+    return aplicar_validadores(response, atuais)
+
+def stream_pdf(paginas):
+    """
+    Converte as páginas de `paginar_relatorio` em blocos de bytes de um PDF.
+
+    As páginas são agrupadas em blocos de `RELATORIO_PAGINAS_POR_BLOCO` antes de serem
+    enviadas, evitando muitos writes pequenos sem acumular o documento inteiro.
+
+    Parâmetros:
+    paginas (Iterable[list]): Textos de cada página.
+
+    Gera:
+    bytes: Blocos consecutivos do arquivo PDF.
+    """
+    writer = PDFStreamWriter()
+    bloco = [writer.iniciar()]
+    for numero, textos in enumerate(paginas, start=1):
+        bloco.append(writer.pagina(textos))
+        if numero % settings.RELATORIO_PAGINAS_POR_BLOCO == 0:
+            yield b''.join(bloco)
+            bloco = []
+    bloco.append(writer.finalizar())
+    yield b''.join(bloco)
+
+def gerar_relatorio_streaming(request, funcionario_id=None):
+    """
+    Gera o mesmo relatório de `gerar_relatorio`, mas enviando o PDF enquanto ele é desenhado.
+
+    Os pontos são lidos com um cursor no servidor (`.iterator(chunk_size=RELATORIO_CHUNK_SIZE)`),
+    calculados em lotes por `ponto.engine` e cada bloco de páginas é enviado ao cliente assim
+    que fica pronto. O pico de memória não depende do número de registros que os filtros retornam.
+
+    Parâmetros:
+    request (HttpRequest): Objeto de requisição HTTP contendo os parâmetros de filtro.
+    funcionario_id (int, opcional): ID do funcionário vindo da URL.
+
+    Retorna:
+    StreamingHttpResponse: Resposta HTTP com o PDF enviado em blocos como anexo.
+    """
+    _, paginas = montar_relatorio(request.GET, funcionario_id)
+
+    response = StreamingHttpResponse(stream_pdf(paginas), content_type='application/pdf')
     response['Content-Disposition'] = f'attachment; filename="relatorio_pontos.pdf"'
-    return response
\ No newline at end of file
+    return response
@@ -0,0 +1,371 @@
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth
+from ponto.engine import calcular_jornadas, calcular_em_lotes
+from ponto.models import Funcionario, Ponto, ReconstrucaoResumos, ResumoDiario, ResumoMensal
+from ponto.utils.cache import incrementar_versao_dados, registrar_alteracao_cadastros
+from ponto.utils.upsert import upsert
+
+METRICAS = ('minutos_trabalhados', 'atraso_segundos', 'extra_segundos', 'registros', 'marcacoes_faltantes')
+
+def _como_data(valor):
+    """
+    Normaliza o valor do campo `Ponto.data` (date, datetime ou texto ISO) para `date`.
+    """
+    return Ponto._meta.get_field('data').to_python(valor)
+
+def _zeros():
+    return dict.fromkeys(METRICAS, 0)
+
+def _acumular(metricas, linha):
+    """
+    Soma um registro calculado (`LinhaJornada`) às métricas.
+    """
+    metricas['minutos_trabalhados'] += linha.minutos_trabalhados
+    metricas['atraso_segundos'] += int(linha.atraso.total_seconds())
+    metricas['extra_segundos'] += int(linha.extra.total_seconds())
+    metricas['registros'] += 1
+    metricas['marcacoes_faltantes'] += sum(valor is None for valor in (linha.entrada, linha.intervalo, linha.saida))
+    return metricas
+
+def _aplicar_delta(modelo, filtros, delta):
+    """
+    Soma `delta` à linha de resumo identificada por `filtros`, criando-a se não existir.
+
+    A soma é feita com `F()` no próprio banco, então atualizações concorrentes do mesmo
+    resumo de empresa ou de mês não se sobrescrevem. Resumos que ficam sem registros são
+    removidos, como se tivessem sido reconstruídos.
+    """
+    resumo, criado = modelo.objects.get_or_create(**filtros, defaults=delta)
+    if not criado:
+        modelo.objects.filter(pk=resumo.pk).update(**{campo: F(campo) + valor for campo, valor in delta.items()})
+        modelo.objects.filter(pk=resumo.pk, registros__lte=0).delete()
+
+def atualizar_resumo_dia(funcionario_id, data):
+    """
+    Recalcula o resumo de um funcionário em um dia e propaga a diferença para os demais resumos.
+
+    Apenas os pontos daquele funcionário naquele dia são lidos; a diferença em relação ao resumo
+    anterior é somada ao resumo diário da empresa e aos resumos mensais do funcionário e da empresa.
+    Chamada pelos sinais de `Ponto` em cada criação, edição ou exclusão.
+
+    Parâmetros:
+    funcionario_id (int): Funcionário do ponto alterado.
+    data (date | str): Dia do ponto alterado.
+    """
+    data = _como_data(data)
+    empresa_id = Funcionario.objects.filter(pk=funcionario_id).values_list('empresa_id', flat=True).first()
+    if empresa_id is None or data is None:
+        return
+
+    with transaction.atomic():
+        novo = _zeros()
+        for linha in calcular_jornadas(Ponto.objects.filter(funcionario_id=funcionario_id, data=data)):
+            _acumular(novo, linha)
+
+        atual = ResumoDiario.objects.select_for_update().filter(funcionario_id=funcionario_id, data=data).first()
+        antigo = {campo: getattr(atual, campo) for campo in METRICAS} if atual else _zeros()
+        delta = {campo: novo[campo] - antigo[campo] for campo in METRICAS}
+        if not any(delta.values()):
+            return
+
+        if novo['registros'] == 0:
+            atual.delete()
+        elif atual:
+            ResumoDiario.objects.filter(pk=atual.pk).update(**novo)
+        else:
+            ResumoDiario.objects.create(funcionario_id=funcionario_id, empresa_id=empresa_id, data=data, **novo)
+
+        mes = data.replace(day=1)
+        _aplicar_delta(ResumoDiario, {'empresa_id': empresa_id, 'funcionario': None, 'data': data}, delta)
+        _aplicar_delta(ResumoMensal, {'empresa_id': empresa_id, 'funcionario_id': funcionario_id, 'mes': mes}, delta)
+        _aplicar_delta(ResumoMensal, {'empresa_id': empresa_id, 'funcionario': None, 'mes': mes}, delta)
+
+def atualizar_resumos_dias(chaves):
+    """
+    Versão em lote de `atualizar_resumo_dia`, para muitos pares (funcionário, dia) de uma vez.
+
+    Usada após gravações em massa de pontos, que não disparam sinais. Os pontos dos dias são lidos
+    e calculados de uma vez, os resumos diários e mensais dos funcionários são gravados com
+    `upsert`, e as diferenças são somadas aos resumos das empresas, um por empresa e dia ou mês.
+
+    Parâmetros:
+    chaves (Iterable[tuple[int, date | str]]): Pares (funcionario_id, data) alterados.
+    """
+    chaves = {(funcionario_id, _como_data(data)) for funcionario_id, data in chaves}
+    funcionario_ids = {funcionario_id for funcionario_id, _ in chaves}
+    datas = {data for _, data in chaves}
+    empresa_de = dict(Funcionario.objects.filter(pk__in=funcionario_ids).values_list('pk', 'empresa_id'))
+    chaves = {chave for chave in chaves if chave[0] in empresa_de and chave[1] is not None}
+    if not chaves:
+        return
+
+    with transaction.atomic():
+        novos = {chave: _zeros() for chave in chaves}
+        for linha in calcular_jornadas(Ponto.objects.filter(funcionario_id__in=funcionario_ids, data__in=datas)):
+            if (linha.funcionario_id, linha.data) in novos:
+                _acumular(novos[(linha.funcionario_id, linha.data)], linha)
+
+        atuais = {
+            (funcionario_id, data): (pk, dict(zip(METRICAS, metricas)))
+            for pk, funcionario_id, data, *metricas in ResumoDiario.objects.select_for_update()
+            .filter(funcionario_id__in=funcionario_ids, data__in=datas).values_list('pk', 'funcionario_id', 'data', *METRICAS)
+        }
+        gravar, remover = [], []
+        deltas = {'dia': defaultdict(_zeros), 'mes': defaultdict(_zeros), 'mes_empresa': defaultdict(_zeros)}
+        for (funcionario_id, data), novo in novos.items():
+            pk, antigo = atuais.get((funcionario_id, data), (None, _zeros()))
+            if novo == antigo:
+                continue
+            if novo['registros'] == 0:
+                remover.append(pk)
+            else:
+                gravar.append((funcionario_id, empresa_de[funcionario_id], data, *(novo[campo] for campo in METRICAS)))
+            empresa_id, mes = empresa_de[funcionario_id], data.replace(day=1)
+            for chave, delta in (
+                ((empresa_id, data), deltas['dia']),
+                ((funcionario_id, mes), deltas['mes']),
+                ((empresa_id, mes), deltas['mes_empresa']),
+            ):
+                for campo in METRICAS:
+                    delta[chave][campo] += novo[campo] - antigo[campo]
+
+        ResumoDiario.objects.filter(pk__in=remover).delete()
+        upsert(ResumoDiario, ('funcionario_id', 'empresa_id', 'data', *METRICAS), gravar, ('funcionario_id', 'data'), METRICAS)
+
+        # Resumos mensais dos funcionários: os atuais mais as diferenças, gravados de uma vez
+        mensais = {
+            (funcionario_id, mes): (pk, dict(zip(METRICAS, metricas)))
+            for pk, funcionario_id, mes, *metricas in ResumoMensal.objects.select_for_update().filter(
+                funcionario_id__in={funcionario_id for funcionario_id, _ in deltas['mes']},
+                mes__in={mes for _, mes in deltas['mes']},
+            ).values_list('pk', 'funcionario_id', 'mes', *METRICAS)
+        }
+        gravar, remover = [], []
+        for (funcionario_id, mes), delta in deltas['mes'].items():
+            pk, atual = mensais.get((funcionario_id, mes), (None, _zeros()))
+            valores = [atual[campo] + delta[campo] for campo in METRICAS]
+            if valores[METRICAS.index('registros')] > 0:
+                gravar.append((funcionario_id, empresa_de[funcionario_id], mes, *valores))
+            elif pk:
+                remover.append(pk)
+        ResumoMensal.objects.filter(pk__in=remover).delete()
+        upsert(ResumoMensal, ('funcionario_id', 'empresa_id', 'mes', *METRICAS), gravar, ('funcionario_id', 'mes'), METRICAS)
+
+        for (empresa_id, data), delta in deltas['dia'].items():
+            if any(delta.values()):
+                _aplicar_delta(ResumoDiario, {'empresa_id': empresa_id, 'funcionario': None, 'data': data}, delta)
+        for (empresa_id, mes), delta in deltas['mes_empresa'].items():
+            if any(delta.values()):
+                _aplicar_delta(ResumoMensal, {'empresa_id': empresa_id, 'funcionario': None, 'mes': mes}, delta)
+
+def descontar_resumos_funcionario(funcionario):
+    """
+    Remove os resumos de um funcionário e desconta seus valores dos resumos da empresa.
+
+    Chamada antes da exclusão do funcionário: a exclusão em cascata removeria os resumos
+    do funcionário antes dos sinais dos pontos, deixando os totais da empresa desatualizados.
+    """
+    with transaction.atomic():
+        for modelo, campo in ((ResumoDiario, 'data'), (ResumoMensal, 'mes')):
+            for resumo in modelo.objects.filter(funcionario=funcionario).values(campo, *METRICAS):
+                delta = {metrica: -resumo[metrica] for metrica in METRICAS}
+                _aplicar_delta(modelo, {'empresa_id': funcionario.empresa_id, 'funcionario': None, campo: resumo[campo]}, delta)
+            modelo.objects.filter(funcionario=funcionario).delete()
+
+def reconstruir_resumos(funcionario_ids=None, chunk_size=None):
+    """
+    Reconstrói os resumos a partir dos registros de ponto.
+
+    Usada após cargas em massa (`bulk_create`, `update`), que não disparam sinais, pela fila de
+    reconstrução quando uma jornada muda ou um funcionário troca de jornada ou de empresa
+    (`reconstruir_pendentes`). Os pontos são lidos em ordem de funcionário e data, em lotes de
+    `chunk_size`, e os resumos diários dos funcionários são gravados com `bulk_create`; os resumos
+    das empresas e os mensais são agregados a partir deles no próprio banco.
+
+    Parâmetros:
+    funcionario_ids (Iterable[int], opcional): Reconstrói apenas estes funcionários (e os totais
+        das suas empresas). Sem ele, reconstrói tudo.
+    chunk_size (int, opcional): Registros lidos por lote (padrão `RELATORIO_CHUNK_SIZE`).
+
+    Retorna:
+    int: Quantidade de resumos diários de funcionários gravados.
+    """
+    chunk_size = chunk_size or settings.RELATORIO_CHUNK_SIZE
+    somas = {campo: Sum(campo) for campo in METRICAS}
+    total = 0
+
+    with transaction.atomic():
+        funcionarios = Funcionario.objects.all()
+        pontos = Ponto.objects.all()
+        diarios = ResumoDiario.objects.filter(funcionario__isnull=False)
+        mensais = ResumoMensal.objects.filter(funcionario__isnull=False)
+        if funcionario_ids is None:
+            ResumoDiario.objects.all().delete()
+            ResumoMensal.objects.all().delete()
+            novos, diarios_empresas, mensais_empresas = diarios, diarios, mensais
+        else:
+            funcionario_ids = list(funcionario_ids)
+            funcionarios = funcionarios.filter(pk__in=funcionario_ids)
+            pontos = pontos.filter(funcionario_id__in=funcionario_ids)
+            # Inclui a empresa anterior de quem trocou de empresa
+            empresas = set(funcionarios.values_list('empresa_id', flat=True)) | set(
+                mensais.filter(funcionario_id__in=funcionario_ids).values_list('empresa_id', flat=True).distinct()
+            )
+            for modelo in (ResumoDiario, ResumoMensal):
+                modelo.objects.filter(funcionario_id__in=funcionario_ids).delete()
+                modelo.objects.filter(funcionario__isnull=True, empresa_id__in=empresas).delete()
+            novos = diarios.filter(funcionario_id__in=funcionario_ids)
+            diarios_empresas = diarios.filter(empresa_id__in=empresas)
+            mensais_empresas = mensais.filter(empresa_id__in=empresas)
+
+        empresa_de = dict(funcionarios.values_list('pk', 'empresa_id'))
+        lote = []
+        chave, metricas = None, None
+        for linha in calcular_em_lotes(pontos.order_by('funcionario_id', 'data'), chunk_size):
+            if (linha.funcionario_id, linha.data) != chave:
+                if chave:
+                    lote.append(ResumoDiario(funcionario_id=chave[0], empresa_id=empresa_de[chave[0]], data=chave[1], **metricas))
+                    if len(lote) >= chunk_size:
+                        total += len(ResumoDiario.objects.bulk_create(lote))
+                        lote = []
+                chave, metricas = (linha.funcionario_id, linha.data), _zeros()
+            _acumular(metricas, linha)
+        if chave:
+            lote.append(ResumoDiario(funcionario_id=chave[0], empresa_id=empresa_de[chave[0]], data=chave[1], **metricas))
+        total += len(ResumoDiario.objects.bulk_create(lote))
+
+        ResumoMensal.objects.bulk_create(
+            (ResumoMensal(**resumo) for resumo in
+             novos.annotate(mes=TruncMonth('data')).values('empresa_id', 'funcionario_id', 'mes').annotate(**somas).order_by()),
+            batch_size=chunk_size,
+        )
+        ResumoDiario.objects.bulk_create(
+            (ResumoDiario(**resumo) for resumo in diarios_empresas.values('empresa_id', 'data').annotate(**somas).order_by()),
+            batch_size=chunk_size,
+        )
+        ResumoMensal.objects.bulk_create(
+            (ResumoMensal(**resumo) for resumo in mensais_empresas.values('empresa_id', 'mes').annotate(**somas).order_by()),
+            batch_size=chunk_size,
+        )
+    return total
+
+def agendar_reconstrucao(jornada=None, funcionario=None):
+    """
+    Enfileira a reconstrução dos resumos afetados por uma jornada alterada ou excluída, ou dos
+    resumos de um funcionário que trocou de jornada ou de empresa.
+
+    Chamada pelos sinais de `Jornada` e `Funcionario`: o salvamento grava apenas o pedido, com custo
+    constante, e os resumos são refeitos depois pelo worker (`reconstruir_pendentes`).
+
+    Parâmetros:
+    jornada (Jornada, opcional): Jornada alterada ou excluída.
+    funcionario (Funcionario, opcional): Funcionário que trocou de jornada ou de empresa.
+    """
+    if funcionario is not None:
+        ReconstrucaoResumos.objects.create(empresa_id=funcionario.empresa_id, funcionario_id=funcionario.pk)
+    else:
+        ReconstrucaoResumos.objects.create(empresa_id=jornada.empresa_id, jornada_id=jornada.pk)
+
+def reconstruir_pendentes():
+    """
+    Processa o pedido de reconstrução mais antigo da fila (`ReconstrucaoResumos`).
+
+    No pedido de uma jornada, são afetados os funcionários com a jornada e, como ela pode ser (ou
+    ter deixado de ser) a padrão da empresa, os funcionários da empresa sem jornada própria, lidos
+    agora e não no momento do pedido. No pedido de um funcionário, apenas ele (e os totais da
+    empresa atual e da anterior). Os pedidos são bloqueados com `SELECT ... FOR UPDATE SKIP LOCKED`,
+    como os jobs de relatório, e só saem da fila com a reconstrução: se o worker parar no meio, são
+    refeitos. Outros pedidos da mesma jornada, ou de funcionários, ainda na fila são atendidos pela
+    mesma reconstrução.
+
+    Retorna:
+    int | None: Funcionários reconstruídos, ou None se a fila estiver vazia.
+    """
+    with transaction.atomic():
+        fila = ReconstrucaoResumos.objects.select_for_update(skip_locked=True)
+        pedido = fila.order_by('pk').first()
+        if pedido is None:
+            return None
+        if pedido.funcionario_id is not None:
+            mesmos = fila.filter(funcionario_id__isnull=False, pk__gt=pedido.pk)
+            funcionario_ids = sorted({pedido.funcionario_id, *mesmos.values_list('funcionario_id', flat=True)})
+        else:
+            mesmos = fila.filter(
+                empresa_id=pedido.empresa_id, jornada_id=pedido.jornada_id, funcionario_id__isnull=True, pk__gt=pedido.pk,
+            )
+            funcionario_ids = list(
+                Funcionario.objects.filter(Q(jornada_id=pedido.jornada_id) | Q(jornada__isnull=True), empresa_id=pedido.empresa_id)
+                .values_list('pk', flat=True)
+            )
+        pedidos = [pedido.pk, *mesmos.values_list('pk', flat=True)]
+        if funcionario_ids:
+            reconstruir_resumos(funcionario_ids)
+        ReconstrucaoResumos.objects.filter(pk__in=pedidos).delete()
+
+    # Os totais por mês dos relatórios mudaram
+    incrementar_versao_dados()
+    registrar_alteracao_cadastros()
+    return len(funcionario_ids)
+
+def totais_mensais(funcionario_id=None, data_inicio=None, data_fim=None):
+    """
+    Retorna os totais por mês de um funcionário (ou de todas as empresas) no período.
+
+    Os meses inteiramente dentro do período vêm de `ResumoMensal`; apenas os meses parciais
+    nas bordas do período são somados a partir de `ResumoDiario`. O custo depende do número
+    de meses, não do número de registros de ponto.
+
+    Parâmetros:
+    funcionario_id (int, opcional): Funcionário; sem ele, soma os resumos de todas as empresas.
+    data_inicio, data_fim (date | str, opcionais): Período, inclusivo.
+
+    Retorna:
+    list[dict]: Um dicionário por mês, em ordem, com `mes` e as métricas de `METRICAS`.
+    """
+    data_inicio = _como_data(data_inicio) if data_inicio else None
+    data_fim = _como_data(data_fim) if data_fim else None
+    filtro = {'funcionario_id': funcionario_id} if funcionario_id else {'funcionario__isnull': True}
+    somas = {campo: Sum(campo) for campo in METRICAS}
+
+    # Primeiro e último mês cobertos por inteiro
+    primeiro_mes = data_inicio and (
+        data_inicio if data_inicio.day == 1 else (data_inicio.replace(day=1) + timedelta(days=31)).replace(day=1)
+    )
+    ultimo_mes = data_fim and (
+        data_fim.replace(day=1) if data_fim.day == monthrange(data_fim.year, data_fim.month)[1]
+        else (data_fim.replace(day=1) - timedelta(days=1)).replace(day=1)
+    )
+
+    mensais = ResumoMensal.objects.filter(**filtro)
+    if primeiro_mes:
+        mensais = mensais.filter(mes__gte=primeiro_mes)
+    if ultimo_mes:
+        mensais = mensais.filter(mes__lte=ultimo_mes)
+    consultas = [mensais.values('mes').annotate(**somas).order_by()]
+
+    # Dias dos meses parciais nas bordas do período
+    bordas = []
+    if data_inicio and data_inicio != primeiro_mes:
+        bordas.append((data_inicio, min(primeiro_mes - timedelta(days=1), data_fim or date.max)))
+    if data_fim and data_fim.replace(day=1) != ultimo_mes:
+        inicio = max(data_fim.replace(day=1), data_inicio or date.min)
+        if not bordas or inicio > bordas[0][1]:
+            bordas.append((inicio, data_fim))
+    for inicio, fim in bordas:
+        consultas.append(
+            ResumoDiario.objects.filter(**filtro, data__range=(inicio, fim))
+            .annotate(mes=TruncMonth('data')).values('mes').annotate(**somas).order_by()
+        )
+
+    meses = {}
+    for consulta in consultas:
+        for resumo in consulta:
+            acumulado = meses.setdefault(resumo['mes'], _zeros())
+            for campo in METRICAS:
+                acumulado[campo] += resumo[campo] or 0
+    return [{'mes': mes, **meses[mes]} for mes in sorted(meses)]
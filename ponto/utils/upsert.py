@@ -0,0 +1,70 @@
+from django.db import connection, models
+
+def _adaptador(campo):
+    """
+    Conversão do valor Python para o banco, como em `get_db_prep_save`, apenas para datas e horários.
+    """
+    if isinstance(campo, models.DateTimeField):
+        return connection.ops.adapt_datetimefield_value
+    if isinstance(campo, models.DateField):
+        return connection.ops.adapt_datefield_value
+    if isinstance(campo, models.TimeField):
+        return connection.ops.adapt_timefield_value
+    return None
+
+def upsert(modelo, colunas, linhas, unicos, atualizar, preservar=(), retornar=(), tamanho_lote=None):
+    """
+    Insere ou atualiza muitas linhas com INSERT ... ON CONFLICT, em lotes de uma instrução.
+
+    Mais leve que `bulk_create(update_conflicts=True)` para lotes grandes: as linhas são tuplas de
+    valores Python, sem instâncias de modelo, e apenas datas e horários passam pelos adaptadores
+    do banco. A sintaxe é a do PostgreSQL, também aceita pelo SQLite. Não dispara sinais.
+
+    Parâmetros:
+    modelo (Model): Modelo da tabela.
+    colunas (Sequence[str]): Nomes das colunas, na ordem dos valores de cada linha.
+    linhas (Iterable[tuple]): Valores de cada linha.
+    unicos (Sequence[str]): Colunas da restrição única que identifica as linhas existentes.
+    atualizar (Sequence[str]): Colunas sobrescritas quando a linha já existe.
+    preservar (Sequence[str]): Dentre `atualizar`, colunas que mantêm o valor atual quando o novo é nulo.
+    retornar (Sequence[str]): Colunas devolvidas de cada linha gravada (RETURNING), se o banco suportar.
+    tamanho_lote (int, opcional): Máximo de linhas por instrução, além do limite de parâmetros do banco.
+
+    Retorna:
+    list[tuple]: Os valores de `retornar` das linhas gravadas, em ordem indefinida.
+    """
+    tabela = connection.ops.quote_name(modelo._meta.db_table)
+    nome = connection.ops.quote_name
+    atribuicoes = ', '.join(
+        f"{nome(coluna)} = COALESCE(EXCLUDED.{nome(coluna)}, {tabela}.{nome(coluna)})" if coluna in preservar
+        else f"{nome(coluna)} = EXCLUDED.{nome(coluna)}"
+        for coluna in atualizar
+    )
+    retornar = retornar if connection.features.can_return_rows_from_bulk_insert else ()
+    sufixo = (
+        f" ON CONFLICT ({', '.join(map(nome, unicos))}) DO UPDATE SET {atribuicoes}"
+        + (f" RETURNING {', '.join(map(nome, retornar))}" if retornar else '')
+    )
+    marcadores = f"({', '.join(['%s'] * len(colunas))})"
+
+    campos = [modelo._meta.get_field(coluna) for coluna in colunas]
+    adaptadores = [_adaptador(campo) for campo in campos]
+    if any(adaptadores):
+        linhas = [
+            tuple(adaptar(valor) if adaptar else valor for adaptar, valor in zip(adaptadores, linha))
+            for linha in linhas
+        ]
+    else:
+        linhas = list(linhas)
+    tamanho = max(min(connection.ops.bulk_batch_size(campos, linhas), tamanho_lote or len(linhas)), 1)
+    retornados = []
+    with connection.cursor() as cursor:
+        for inicio in range(0, len(linhas), tamanho):
+            lote = linhas[inicio:inicio + tamanho]
+            cursor.execute(
+                f"INSERT INTO {tabela} ({', '.join(map(nome, colunas))}) VALUES {', '.join([marcadores] * len(lote))}{sufixo}",
+                [valor for linha in lote for valor in linha],
+            )
+            if retornar:
+                retornados.extend(cursor.fetchall())
+    return retornados
@@ -0,0 +1,104 @@
+import zipfile
+from itertools import chain
+from xml.sax.saxutils import escape
+from ponto.utils.zip_stream import BufferZip
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{nome}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+SHEET_INICIO = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+SHEET_FIM = b'</sheetData></worksheet>'
+
+def _coluna(indice):
+    """
+    Converte o índice da coluna (0, 1, ...) na letra da planilha (A, B, ..., Z, AA, ...).
+    """
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+def _linha_xml(numero, valores):
+    celulas = []
+    for indice, valor in enumerate(valores):
+        referencia = f'{_coluna(indice)}{numero}'
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            celulas.append(f'<c r="{referencia}"><v>{valor}</v></c>')
+        elif valor not in (None, ''):
+            celulas.append(f'<c r="{referencia}" t="inlineStr"><is><t>{escape(str(valor))}</t></is></c>')
+    return f'<row r="{numero}">{"".join(celulas)}</row>'.encode()
+
+def gerar_xlsx(cabecalho, linhas, nome_planilha='Planilha', linhas_por_bloco=1000):
+    """
+    Gera uma planilha XLSX em partes, sem montar o arquivo inteiro em memória.
+
+    Bibliotecas como o openpyxl, mesmo no modo write-only, só entregam o arquivo no `save()`.
+    Aqui a planilha é escrita direto em um ZIP não pesquisável (`BufferZip`) e cada bloco de
+    linhas já compactado é enviado assim que fica pronto, então o download começa de imediato
+    e a memória não cresce com o número de linhas.
+
+    Parâmetros:
+    cabecalho (list[str]): Títulos das colunas.
+    linhas (Iterable[list]): Valores de cada linha (str, int ou float; vazios ficam em branco).
+    nome_planilha (str): Nome da aba.
+    linhas_por_bloco (int): Quantas linhas são escritas antes de cada envio.
+
+    Gera:
+    bytes: Partes consecutivas do arquivo XLSX.
+    """
+    buffer = BufferZip()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as xlsx:
+        xlsx.writestr('[Content_Types].xml', CONTENT_TYPES)
+        xlsx.writestr('_rels/.rels', RELS)
+        xlsx.writestr('xl/workbook.xml', WORKBOOK.format(nome=escape(nome_planilha, {'"': '&quot;'})))
+        xlsx.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS)
+        yield buffer.drenar()
+
+        with xlsx.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as planilha:
+            planilha.write(SHEET_INICIO)
+            for numero, valores in enumerate(chain([cabecalho], linhas), start=1):
+                planilha.write(_linha_xml(numero, valores))
+                if numero % linhas_por_bloco == 0:
+                    yield buffer.drenar()
+            planilha.write(SHEET_FIM)
+    yield buffer.drenar()
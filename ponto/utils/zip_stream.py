@@ -0,0 +1,33 @@
+import io
+
+
+class BufferZip(io.RawIOBase):
+    """
+    Destino não pesquisável (sem seek/tell) para o `zipfile`, que assim grava cada entrada com
+    data descriptor e permite enviar o ZIP em partes, enquanto ele é montado.
+
+    Uso:
+        buffer = BufferZip()
+        with zipfile.ZipFile(buffer, 'w') as arquivo:
+            arquivo.writestr('a.txt', '...')
+            yield buffer.drenar()
+        yield buffer.drenar()
+    """
+
+    def __init__(self):
+        self._partes = []
+
+    def writable(self):
+        return True
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def drenar(self):
+        """
+        Retorna os bytes escritos desde a última chamada e esvazia o buffer.
+        """
+        dados = b''.join(self._partes)
+        self._partes = []
+        return dados
@@ -0,0 +1,90 @@
+import hashlib
+from django.core.exceptions import ValidationError
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import exceptions, status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.versioning import URLPathVersioning
+from ponto.models import Empresa, Funcionario, Ponto
+from ponto.pagination import PaginacaoCursor
+from ponto.serializers import EmpresaSerializer, FuncionarioSerializer, PontoSerializer
+from ponto.utils.cache import versao_dados
+from ponto.utils.filtros import filtrar_pontos_por_parametros
+from ponto.utils.replicas import leitura_em_replica, leitura_pode_estar_atrasada
+
+class ApiViewSet(viewsets.ModelViewSet):
+    """
+    Base dos endpoints da API versionada (`/api/v1/`): leitura e escrita para usuários autenticados,
+    paginação por cursor (`PaginacaoCursor`) e `?fields=` nos serializers.
+
+    As leituras respondem com um ETag derivado da versão dos dados (`versao_dados()`), da URL e
+    do formato. Como a versão muda a cada alteração de Ponto, Funcionario, Empresa ou Jornada, um
+    `If-None-Match` com o ETag atual recebe 304 sem nenhuma consulta ao banco.
+
+    As leituras vão para uma réplica, quando configurada (`leitura_em_replica`). Logo após uma
+    escrita, respostas lidas da réplica saem sem ETag, pois podem ainda não refletir a versão atual.
+
+    Atributos:
+        ordenacao_cursor (tuple[str, str]): Ordenação da paginação (campo principal e desempate).
+    """
+    permission_classes = [IsAuthenticated]
+    versioning_class = URLPathVersioning
+    pagination_class = PaginacaoCursor
+    ordenacao_cursor = ('id', 'id')
+
+    def get_etag(self, request):
+        chave = f'{versao_dados()}:{request.get_full_path()}:{request.accepted_renderer.format}'
+        return quote_etag(hashlib.sha256(chave.encode()).hexdigest()[:32])
+
+    def _condicional(self, request, leitura, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            with leitura_em_replica(request.user):
+                response = leitura(request, *args, **kwargs)
+                if leitura_pode_estar_atrasada():
+                    return response
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            # Clientes e proxies revalidam a cada uso; a resposta depende do usuário autenticado
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._condicional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._condicional(request, super().retrieve, *args, **kwargs)
+
+class EmpresaViewSet(ApiViewSet):
+    queryset = Empresa.objects.all()
+    serializer_class = EmpresaSerializer
+    ordenacao_cursor = ('nome', 'id')
+
+class FuncionarioViewSet(ApiViewSet):
+    queryset = Funcionario.objects.select_related('user', 'empresa')
+    serializer_class = FuncionarioSerializer
+    ordenacao_cursor = ('empresa_id', 'id')
+
+class PontoViewSet(ApiViewSet):
+    """
+    Pontos, com os mesmos filtros da listagem (`funcionario`, `data_inicio`, `data_fim`) e as horas
+    trabalhadas calculadas em lote para cada página.
+    """
+    queryset = Ponto.objects.select_related('funcionario__user')
+    serializer_class = PontoSerializer
+    ordenacao_cursor = ('data', 'id')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        try:
+            queryset = filtrar_pontos_por_parametros(queryset, self.request.query_params)
+        except (ValidationError, ValueError) as erro:
+            # Filtros inválidos (por exemplo, datas fora do formato) respondem 400, e não 500
+            raise exceptions.ValidationError({'detail': getattr(erro, 'messages', [str(erro)])})
+        return queryset
@@ -1,13 +1,18 @@
+from django.http import JsonResponse
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView
 from ponto.models import Empresa
 from ponto.forms import EmpresaForm
+from ponto.utils.autocomplete import buscar_empresas
 from django.contrib import messages
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
+from ponto.utils.condicional import ListaCondicionalMixin
+from ponto.utils.replicas import ler_da_replica
 
 @method_decorator(login_required, name='dispatch')
-class EmpresaListView(ListView):
+@method_decorator(ler_da_replica, name='dispatch')
+class EmpresaListView(ListaCondicionalMixin, ListView):
     """
     Uma view baseada em classe que exibe uma lista de objetos do modelo Empresa.
 
@@ -19,6 +24,8 @@ class EmpresaListView(ListView):
         - get_queryset(): Retorna o queryset que será utilizado para exibir a lista de objetos.
         - get_context_data(**kwargs): Retorna o contexto que será passado para o template.
         - get_template_names(): Retorna a lista de nomes de templates que serão utilizados para renderizar a view.
+
+    Responde com 304 quando nenhuma empresa mudou (`ListaCondicionalMixin`).
     """
     model = Empresa
     template_name = 'empresa_list.html'
@@ -68,3 +75,17 @@ class EmpresaUpdateView(UpdateView):
     def form_valid(self, form):
         messages.success(self.request, "Empresa atualizada com sucesso!")
         return super().form_valid(form)
+
+def empresa_autocomplete(request):
+    """
+    Busca de empresas para os campos com carregamento sob demanda (`AutocompleteSelect`).
+
+    Não exige login: o formulário de registro de usuários também escolhe a empresa.
+
+    Args:
+        request (HttpRequest): Requisição com o texto digitado em `q` (qualquer trecho do nome).
+
+    Returns:
+        JsonResponse: {"resultados": [{"id": ..., "texto": ...}, ...]}
+    """
+    return JsonResponse({'resultados': buscar_empresas(request.GET.get('q'))})
@@ -1,13 +1,18 @@
+from django.http import JsonResponse
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView
 from ponto.models import Funcionario
 from ponto.forms import FuncionarioForm, FuncionarioUpdateForm
+from ponto.utils.autocomplete import buscar_funcionarios
 from django.contrib import messages
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
+from ponto.utils.condicional import ListaCondicionalMixin
+from ponto.utils.replicas import ler_da_replica
 
 @method_decorator(login_required, name='dispatch')
-class FuncionarioListView(ListView):
+@method_decorator(ler_da_replica, name='dispatch')
+class FuncionarioListView(ListaCondicionalMixin, ListView):
     """
     Uma view baseada em classe que exibe uma lista de objetos Funcionario.
 
@@ -18,8 +23,13 @@ class FuncionarioListView(ListView):
     Métodos Herdados:
         - get_queryset(): Retorna o queryset que será utilizado para exibir a lista de objetos.
         - get_context_data(**kwargs): Retorna o contexto adicional para renderizar o template.
+
+    O usuário e a empresa de cada funcionário são carregados na mesma consulta (`select_related`).
+    Responde com 304 quando nada mudou (`ListaCondicionalMixin`) e guarda em cache a linha de cada
+    funcionário, sob uma chave com a sua data de alteração.
     """
     model = Funcionario
+    queryset = Funcionario.objects.select_related('user', 'empresa')
     template_name = 'funcionario_list.html'
 
 @method_decorator(login_required, name='dispatch')
@@ -79,4 +89,17 @@ class FuncionarioUpdateView(UpdateView):
 
     def form_valid(self, form):
         messages.success(self.request, "Funcionário atualizado com sucesso!")
-        return super().form_valid(form)
\ No newline at end of file
+        return super().form_valid(form)
+
+@login_required
+def funcionario_autocomplete(request):
+    """
+    Busca de funcionários para os campos com carregamento sob demanda (`AutocompleteSelect`).
+
+    Args:
+        request (HttpRequest): Requisição com o texto digitado em `q` (início do nome de usuário ou do e-mail).
+
+    Returns:
+        JsonResponse: {"resultados": [{"id": ..., "texto": ...}, ...]}
+    """
+    return JsonResponse({'resultados': buscar_funcionarios(request.GET.get('q'))})
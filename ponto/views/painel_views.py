@@ -0,0 +1,20 @@
+from django.shortcuts import render
+from ponto.utils.presenca import painel_presenca
+
+def home(request):
+    """
+    Página inicial. Para usuários autenticados, exibe o painel de presença de hoje por empresa.
+
+    A presença vem do cache (`ponto.utils.presenca`), mantida pelos sinais de ponto e recalculada
+    periodicamente, então a página não consulta os pontos a cada acesso.
+
+    Args:
+        request (HttpRequest): Requisição GET.
+
+    Returns:
+        HttpResponse: Página inicial renderizada.
+    """
+    contexto = {}
+    if request.user.is_authenticated:
+        contexto['empresas'] = painel_presenca()
+    return render(request, 'home.html', contexto)
@@ -1,56 +1,203 @@
+import base64
+import binascii
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Sum
 from django.urls import reverse_lazy
+from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView
 from ponto.models import Ponto, Funcionario
+from ponto.forms import PontoForm
+from ponto.engine import calcular_jornadas, formatar_minutos
+from ponto.utils.filtros import filtrar_pontos_por_parametros, limites_de_horas
+from ponto.utils.paginacao import PaginadorCursor
 from django.contrib import messages
 from django.utils.decorators import method_decorator
+from django.contrib.auth import aauthenticate
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from ponto.parsers import CSVParser
+from ponto.utils.condicional import (
+    aplicar_validadores, aultima_alteracao, contexto_fragmentos, resposta_nao_modificada, validadores,
+)
+from ponto.utils.ingestao import ingerir_pontos
+from ponto.utils.marcacao import abater_ponto
+from ponto.utils.replicas import ler_da_replica
+from ponto.utils.resumos import totais_mensais
+
+# Métricas somadas nos totais da listagem, com os nomes das colunas dos resumos
+TOTAIS = ('registros', 'minutos_trabalhados', 'atraso_segundos', 'extra_segundos')
 
-@method_decorator(login_required, name='dispatch')
 class PontoListView(ListView):
     """
     Exibe uma lista de objetos Ponto com base nos filtros fornecidos.
 
+    View assíncrona: as consultas usam o ORM assíncrono do Django, então, no ASGI, a listagem não
+    espera atrás de downloads lentos de relatório (veja `ponto.utils.reports.gerar_relatorio`).
+
     Atributos:
         model (Model): O modelo que será utilizado para listar os objetos.
         template_name (str): O nome do template que será renderizado.
 
     Métodos:
         get_queryset(): Retorna o queryset filtrado com base nos parâmetros de consulta fornecidos.
+        get(request): Busca a página, os totais e o funcionário do filtro e renderiza a listagem.
         get_context_data(**kwargs): Adiciona dados adicionais ao contexto do template.
 
     Filtros de consulta:
         funcionario (int): ID do funcionário para filtrar os pontos.
         data_inicio (str): Data de início para filtrar os pontos (formato YYYY-MM-DD).
         data_fim (str): Data de fim para filtrar os pontos (formato YYYY-MM-DD).
+        horas_min, horas_max (float): Limites, em horas, das horas trabalhadas no dia.
+        ordenar (str): Uma das chaves de `ORDENACOES` (padrão 'data').
+        cursor (str): Cursor opaco da página, vindo dos links de próxima/anterior.
+        por_pagina (int): Registros por página (padrão `PONTO_LISTA_POR_PAGINA`, até
+            `PONTO_LISTA_MAXIMO_POR_PAGINA`).
+
+    Paginação:
+        Por cursor sobre (data, id), com `PaginadorCursor`: o custo de cada página é o mesmo
+        na primeira ou na milésima página. Nas ordenações por horas, atraso ou extra, o cursor
+        é sobre (valor calculado, id).
+
+    Horas, atrasos e extras vêm de `Ponto.objects.com_horas()`: os filtros e as ordenações são
+    calculados pelo banco, sem carregar os registros fora da página. Os totais vêm dos resumos
+    (`ponto.utils.resumos`), exceto com o filtro de horas.
+
+    Respostas condicionais: antes de montar a página, o maior `atualizado_em` dos pontos filtrados
+    (uma consulta) dá o ETag e o Last-Modified (`ponto.utils.condicional`); se o cliente já tem a
+    versão atual, a resposta é 304. As linhas da tabela ficam em cache, sob chaves com a data de
+    alteração de cada ponto.
 
     Contexto adicional:
-        funcionarios (QuerySet): Lista de todos os funcionários.
+        object_list (QuerySet): Os pontos da página, cada um com o atributo `jornada` (LinhaJornada)
+            calculado em lote por `ponto.engine`.
+        pagina (PaginaCursor): A página atual, com os cursores da próxima e da anterior.
+        url_proxima, url_anterior (str | None): Query strings das páginas vizinhas, com os filtros atuais.
+        funcionario_selecionado (Funcionario | None): Funcionário do filtro; os demais são buscados
+            sob demanda em `funcionario-autocomplete`.
         data_inicio (str): Valor do parâmetro de consulta 'data_inicio'.
         data_fim (str): Valor do parâmetro de consulta 'data_fim'.
+        totais (dict | None): Registros, horas trabalhadas, atrasos e extras de todos os pontos
+            filtrados (não apenas da página), já formatados (veja `aget_totais`).
+        ordenar, ordenacoes: Ordenação atual e as opções disponíveis.
+        cadastros_alterados_em, validade_fragmentos: Chave e validade dos fragmentos das linhas.
     """
     model = Ponto
     template_name = 'ponto_list.html'
 
+    # Parâmetro `ordenar` -> (rótulo, ordenação da paginação); o id desempata
+    ORDENACOES = {
+        'data': ("Data", ('data', 'id')),
+        '-horas': ("Mais horas", ('-minutos_trabalhados', 'id')),
+        'horas': ("Menos horas", ('minutos_trabalhados', 'id')),
+        '-atraso': ("Maior atraso", ('-atraso_segundos', 'id')),
+        '-extra': ("Mais horas extras", ('-extra_segundos', 'id')),
+    }
+
+    def get_por_pagina(self):
+        try:
+            por_pagina = int(self.request.GET.get('por_pagina', settings.PONTO_LISTA_POR_PAGINA))
+        except ValueError:
+            por_pagina = settings.PONTO_LISTA_POR_PAGINA
+        return min(max(por_pagina, 1), settings.PONTO_LISTA_MAXIMO_POR_PAGINA)
+
+    def get_ordenar(self):
+        ordenar = self.request.GET.get('ordenar', 'data')
+        return ordenar if ordenar in self.ORDENACOES else 'data'
+
     def get_queryset(self):
-        queryset = super().get_queryset()
-        funcionario_id = self.request.GET.get('funcionario')
-        data_inicio = self.request.GET.get('data_inicio')
-        data_fim = self.request.GET.get('data_fim')
+        return filtrar_pontos_por_parametros(
+            super().get_queryset().com_horas().select_related('funcionario__user'), self.request.GET
+        )
 
-        if funcionario_id:
-            queryset = queryset.filter(funcionario_id=funcionario_id)
-        if data_inicio:
-            queryset = queryset.filter(data__gte=data_inicio)
-        if data_fim:
-            queryset = queryset.filter(data__lte=data_fim)
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Decorada aqui, e não com `method_decorator`, que não preserva métodos assíncronos no Django 5.1
+        return login_required(ler_da_replica(super().as_view(**initkwargs)))
 
-        return queryset
+    async def get(self, request, *args, **kwargs):
+        self.filtrados = self.get_queryset()
+        # Antes de montar a página, uma consulta decide se o cliente já tem a versão atual
+        atuais = await sync_to_async(validadores)(request, await aultima_alteracao(self.filtrados))
+        response = resposta_nao_modificada(request, atuais)
+        if response is not None:
+            return aplicar_validadores(response, atuais)
+
+        _, ordenacao = self.ORDENACOES[self.get_ordenar()]
+        paginador = PaginadorCursor(self.filtrados, self.get_por_pagina(), ordenacao)
+        self.pagina = await paginador.apagina(request.GET.get('cursor'))
+        self.object_list = self.pagina.object_list
+        # As instâncias vêm do cache do queryset; as regras de jornada podem vir do banco (`cache_regras`)
+        pontos = list(self.object_list)
+        for ponto, jornada in zip(pontos, await sync_to_async(calcular_jornadas)(pontos)):
+            ponto.jornada = jornada
+        self.totais = await self.aget_totais()
+        funcionario = request.GET.get('funcionario', '')
+        self.funcionario_selecionado = (
+            await Funcionario.objects.select_related('user').filter(pk=funcionario).afirst() if funcionario.isdigit() else None
+        )
+        self.fragmentos = await sync_to_async(contexto_fragmentos)()
+        return aplicar_validadores(self.render_to_response(self.get_context_data()), atuais)
+
+    async def aget_totais(self):
+        """
+        Soma as horas, atrasos e extras de todos os pontos filtrados, não apenas da página.
+
+        Sem o filtro de horas, os totais vêm dos resumos mensais e diários (`totais_mensais`), com
+        custo proporcional ao número de meses, e não de registros, inclusive na lista sem filtros.
+        O filtro de horas não existe nos resumos: os pontos filtrados são somados em uma consulta,
+        mas apenas quando o funcionário ou o período restringem a busca. Sem eles, a soma
+        percorreria a tabela inteira, e os totais não são exibidos (None).
+        """
+        params = self.request.GET
+        if limites_de_horas(params) == (None, None):
+            meses = await sync_to_async(totais_mensais)(
+                params.get('funcionario') or None, params.get('data_inicio') or None, params.get('data_fim') or None
+            )
+            totais = {campo: sum(mes[campo] for mes in meses) for campo in TOTAIS}
+        elif any(params.get(parametro) for parametro in ('funcionario', 'data_inicio', 'data_fim')):
+            # Os aliases não podem repetir os nomes das anotações de `com_horas()`
+            somas = await self.filtrados.aaggregate(
+                total_registros=Count('id'),
+                **{f'total_{campo}': Sum(campo, default=0) for campo in TOTAIS if campo != 'registros'},
+            )
+            totais = {campo: somas[f'total_{campo}'] for campo in TOTAIS}
+        else:
+            return None
+        return {
+            'registros': totais['registros'],
+            'horas_trabalhadas': formatar_minutos(totais['minutos_trabalhados']),
+            'atraso': formatar_minutos(totais['atraso_segundos'] // 60),
+            'extra': formatar_minutos(totais['extra_segundos'] // 60),
+        }
+
+    def _url_pagina(self, cursor):
+        if not cursor:
+            return None
+        parametros = self.request.GET.copy()
+        parametros['cursor'] = cursor
+        return f"?{parametros.urlencode()}"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['funcionarios'] = Funcionario.objects.all()
+        context['pagina'] = self.pagina
+        context['url_proxima'] = self._url_pagina(self.pagina.cursor_proximo)
+        context['url_anterior'] = self._url_pagina(self.pagina.cursor_anterior)
+        context['funcionario_selecionado'] = self.funcionario_selecionado
         context['data_inicio'] = self.request.GET.get('data_inicio', '')
         context['data_fim'] = self.request.GET.get('data_fim', '')
+        context['totais'] = self.totais
+        context['ordenar'] = self.get_ordenar()
+        context['ordenacoes'] = [(chave, rotulo) for chave, (rotulo, _) in self.ORDENACOES.items()]
+        context.update(self.fragmentos)
         return context
 
 @method_decorator(login_required, name='dispatch')
@@ -60,7 +207,7 @@ class PontoCreateView(CreateView):
 
     Atributos:
         model (Model): O modelo utilizado para criar o registro de ponto.
-        fields (list): Lista de campos do modelo que serão exibidos no formulário.
+        form_class (Form): O formulário utilizado para criar o registro de ponto.
         template_name (str): Nome do template utilizado para renderizar o formulário.
         success_url (str): URL para redirecionamento após a criação bem-sucedida do registro de ponto.
 
@@ -73,7 +220,7 @@ class PontoCreateView(CreateView):
                 HttpResponse: Resposta HTTP após o formulário ser validado.
     """
     model = Ponto
-    fields = ['funcionario', 'data', 'entrada', 'intervalo', 'saida']
+    form_class = PontoForm
     template_name = 'ponto_form.html'
     success_url = reverse_lazy('ponto-list')
 
@@ -88,7 +235,7 @@ class PontoUpdateView(UpdateView):
 
     Atributos:
         model (Model): O modelo que será atualizado.
-        fields (list): Lista de campos que serão exibidos no formulário.
+        form_class (Form): O formulário utilizado para atualizar o registro de ponto.
         template_name (str): Nome do template que será renderizado.
         success_url (str): URL para redirecionamento após a atualização bem-sucedida.
 
@@ -97,10 +244,122 @@ class PontoUpdateView(UpdateView):
             Exibe uma mensagem de sucesso e chama o método form_valid da classe pai.
     """
     model = Ponto
-    fields = ['funcionario', 'data', 'entrada', 'intervalo', 'saida']
+    form_class = PontoForm
     template_name = 'ponto_form.html'
     success_url = reverse_lazy('ponto-list')
 
     def form_valid(self, form):
         messages.success(self.request, "Registro de ponto atualizado com sucesso!")
         return super().form_valid(form)
+
+class IngestaoPontosView(APIView):
+    """
+    Recebe lotes de registros de ponto de relógios de ponto e do aplicativo.
+
+    Aceita JSON (uma lista de itens, ou um objeto com a lista em "pontos") ou CSV com cabeçalho
+    (colunas funcionario ou usuario, data, entrada, intervalo, saida, ou o cabeçalho da
+    exportação de pontos). Cada item cria o registro
+    do funcionário no dia ou atualiza os horários informados; a validação e a gravação do lote
+    são feitas por `ingerir_pontos`. Dispositivos autenticam com HTTP Basic.
+
+    Respostas:
+        200: Todos os itens gravados.
+        207: Parte dos itens gravada; os demais têm `status` "erro" e os motivos em `erros`.
+        400: Nenhum item válido, corpo inválido ou mais de `PONTO_INGESTAO_MAXIMO_ITENS` itens.
+
+        O corpo traz as contagens (`criados`, `atualizados`, `erros`) e um resultado por item, na
+        ordem do lote.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, CSVParser]
+
+    def post(self, request):
+        itens = request.data
+        if isinstance(itens, dict):
+            itens = itens.get('pontos')
+        if not isinstance(itens, list) or not itens:
+            return Response({'detail': "Envie uma lista de pontos."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(itens) > settings.PONTO_INGESTAO_MAXIMO_ITENS:
+            return Response(
+                {'detail': f"O lote aceita no máximo {settings.PONTO_INGESTAO_MAXIMO_ITENS} pontos."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        resultado = ingerir_pontos(itens)
+        if not resultado['erros']:
+            codigo = status.HTTP_200_OK
+        elif resultado['criados'] or resultado['atualizados']:
+            codigo = status.HTTP_207_MULTI_STATUS
+        else:
+            codigo = status.HTTP_400_BAD_REQUEST
+        return Response(resultado, status=codigo)
+
+def _credenciais_basic(request):
+    """
+    Retorna (usuário, senha) do cabeçalho `Authorization: Basic ...`, ou None se não houver.
+    """
+    tipo, _, valor = request.headers.get('Authorization', '').partition(' ')
+    if tipo.lower() != 'basic' or not valor:
+        return None
+    try:
+        usuario, separador, senha = base64.b64decode(valor).decode('utf-8').partition(':')
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    return (usuario, senha) if separador else None
+
+def _csrf_recusado(request):
+    """
+    Confere o token CSRF de uma requisição autenticada pela sessão, como o Django REST framework.
+    Retorna a resposta de recusa do `CsrfViewMiddleware`, ou None se o token for válido.
+    """
+    verificacao = CsrfViewMiddleware(lambda request: None)
+    verificacao.process_request(request)
+    return verificacao.process_view(request, None, (), {})
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BaterPontoView(View):
+    """
+    Marca o ponto do funcionário logado agora, em um toque, sem o formulário de edição.
+
+    A marcação preenche o próximo horário vazio do ponto do dia (entrada, depois saída) com uma
+    única instrução no banco (`abater_ponto`), segura contra marcações simultâneas.
+
+    View assíncrona, para que, no ASGI, as marcações do horário de entrada não esperem atrás de
+    relatórios lentos. Autentica como a API: pela sessão (com o token CSRF) ou por HTTP Basic,
+    usado pelos relógios de ponto.
+
+    Respostas:
+        201: Entrada registrada.
+        200: Saída registrada.
+        401: Sem autenticação ou com credenciais inválidas.
+        403: Usuário sem funcionário vinculado, ou token CSRF ausente na sessão.
+        409: Entrada e saída já registradas, ou marcação próxima demais da entrada.
+
+        O corpo traz o `id` e a `data` do ponto, o `campo` preenchido e o `horario` marcado.
+    """
+    http_method_names = ['post', 'options']
+
+    async def post(self, request):
+        credenciais = _credenciais_basic(request)
+        if credenciais:
+            usuario = await aauthenticate(request, username=credenciais[0], password=credenciais[1])
+        else:
+            usuario = await request.auser()
+            if usuario.is_authenticated and _csrf_recusado(request):
+                return JsonResponse({'detail': "Token CSRF ausente ou inválido."}, status=status.HTTP_403_FORBIDDEN)
+        if usuario is None or not usuario.is_authenticated:
+            response = JsonResponse({'detail': "Autenticação necessária."}, status=status.HTTP_401_UNAUTHORIZED)
+            response['WWW-Authenticate'] = 'Basic realm="api"'
+            return response
+        # Para a janela de leitura no banco principal (`JanelaEscritaMiddleware`)
+        request.user = usuario
+
+        funcionario_id = await Funcionario.objects.filter(user_id=usuario.pk).values_list('pk', flat=True).afirst()
+        if funcionario_id is None:
+            return JsonResponse({'detail': "Usuário sem funcionário vinculado."}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            marcacao = await abater_ponto(funcionario_id)
+        except ValidationError as erro:
+            return JsonResponse({'detail': erro.messages[0], 'codigo': erro.code}, status=status.HTTP_409_CONFLICT)
+        codigo = status.HTTP_201_CREATED if marcacao['campo'] == 'entrada' else status.HTTP_200_OK
+        return JsonResponse(marcacao, status=codigo)
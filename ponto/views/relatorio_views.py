@@ -0,0 +1,102 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.utils.text import slugify
+from django.views.decorators.http import require_POST
+from ponto.forms import RelatorioFiltroForm
+from ponto.models import Empresa, RelatorioJob
+from ponto.utils.pacote import gerar_pacote_zip
+
+@login_required
+@require_POST
+def solicitar_relatorio(request):
+    """
+    Enfileira um relatório de pontos para ser gerado pelo worker `processar_relatorios`.
+
+    Args:
+        request (HttpRequest): Requisição POST com os filtros `funcionario`, `data_inicio` e `data_fim`.
+
+    Returns:
+        HttpResponseRedirect: Redireciona para a página de status do job criado, ou de volta
+                              para a lista de pontos se os filtros forem inválidos.
+    """
+    form = RelatorioFiltroForm(request.POST)
+    if not form.is_valid():
+        messages.error(request, "Filtros inválidos para o relatório.")
+        return redirect('ponto-list')
+
+    job = RelatorioJob.objects.create(usuario=request.user, **form.cleaned_data)
+    messages.success(request, "Relatório solicitado! Ele será gerado em segundo plano.")
+    return redirect('relatorio-status', pk=job.pk)
+
+@login_required
+def status_relatorio(request, pk):
+    """
+    Exibe a situação de um job de relatório do usuário logado.
+
+    Com `?format=json`, retorna apenas o status em JSON, usado pela página para consultar
+    o job periodicamente até que ele termine.
+
+    Args:
+        request (HttpRequest): O objeto de solicitação HTTP.
+        pk (int): ID do job.
+
+    Returns:
+        HttpResponse | JsonResponse: A página de status ou o status em JSON.
+    """
+    job = get_object_or_404(RelatorioJob, pk=pk, usuario=request.user)
+    if request.GET.get('format') == 'json':
+        concluido = job.status == RelatorioJob.Status.CONCLUIDO
+        return JsonResponse({
+            'id': job.pk,
+            'status': job.status,
+            'erro': job.erro,
+            'download': reverse('relatorio-download', args=[job.pk]) if concluido else None,
+        })
+    return render(request, 'relatorio_status.html', {'job': job})
+
+@login_required
+def baixar_relatorio(request, pk):
+    """
+    Envia o PDF de um job de relatório concluído do usuário logado.
+
+    Args:
+        request (HttpRequest): O objeto de solicitação HTTP.
+        pk (int): ID do job.
+
+    Returns:
+        FileResponse: O PDF gerado como anexo (404 se o job não existir ou não estiver concluído).
+    """
+    job = get_object_or_404(RelatorioJob, pk=pk, usuario=request.user, status=RelatorioJob.Status.CONCLUIDO)
+    return FileResponse(job.arquivo.open('rb'), as_attachment=True, filename='relatorio_pontos.pdf')
+
+@login_required
+def gerar_pacote_relatorios(request, pk):
+    """
+    Envia um ZIP com o relatório em PDF de cada funcionário de uma empresa.
+
+    Os relatórios são gerados em paralelo no pool de processos compartilhado pelas requisições
+    (`RELATORIO_PACOTE_WORKERS` processos) e o ZIP é enviado em partes, à medida que cada PDF
+    fica pronto.
+
+    Args:
+        request (HttpRequest): Requisição com os filtros opcionais `data_inicio` e `data_fim`.
+        pk (int): ID da empresa.
+
+    Returns:
+        StreamingHttpResponse: O arquivo ZIP como anexo (400 se as datas forem inválidas).
+    """
+    empresa = get_object_or_404(Empresa, pk=pk)
+    form = RelatorioFiltroForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest("Filtros inválidos para o relatório.")
+
+    funcionario_ids = list(empresa.funcionarios.order_by('pk').values_list('pk', flat=True))
+    response = StreamingHttpResponse(
+        gerar_pacote_zip(funcionario_ids, form.cleaned_data['data_inicio'], form.cleaned_data['data_fim']),
+        content_type='application/zip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="relatorios_{slugify(empresa.nome)}.zip"'
+    return response